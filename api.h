@@ -19,6 +19,26 @@
 #define crypto_sign_signature MQOM_PUBLIC_API_NAMESPACE(crypto_sign_signature)
 #define crypto_sign_open MQOM_PUBLIC_API_NAMESPACE(crypto_sign_open)
 #define crypto_sign_verify MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify)
+#define crypto_sign_keypair_expand MQOM_PUBLIC_API_NAMESPACE(crypto_sign_keypair_expand)
+#define crypto_sign_signature_with_ctx MQOM_PUBLIC_API_NAMESPACE(crypto_sign_signature_with_ctx)
+#define crypto_sign_expanded_key_free MQOM_PUBLIC_API_NAMESPACE(crypto_sign_expanded_key_free)
+#define crypto_sign_verify_batch MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_batch)
+#define crypto_sign_init MQOM_PUBLIC_API_NAMESPACE(crypto_sign_init)
+#define crypto_sign_update MQOM_PUBLIC_API_NAMESPACE(crypto_sign_update)
+#define crypto_sign_final MQOM_PUBLIC_API_NAMESPACE(crypto_sign_final)
+#define crypto_sign_final_with_ctx MQOM_PUBLIC_API_NAMESPACE(crypto_sign_final_with_ctx)
+#define crypto_sign_verify_init MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_init)
+#define crypto_sign_verify_update MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_update)
+#define crypto_sign_verify_final MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_final)
+#define crypto_sign_stream_free MQOM_PUBLIC_API_NAMESPACE(crypto_sign_stream_free)
+#define crypto_sign_workspace_size MQOM_PUBLIC_API_NAMESPACE(crypto_sign_workspace_size)
+#define crypto_sign_signature_ws MQOM_PUBLIC_API_NAMESPACE(crypto_sign_signature_ws)
+#define crypto_sign_verify_ws MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_ws)
+
+/* Opaque expanded secret key context (see sign.h) */
+struct sign_ctx_t;
+/* Opaque streaming message context (see sign.h) */
+struct sign_stream_t;
 
 #if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
 /*************************************************
@@ -102,6 +122,237 @@ int crypto_sign_verify(const unsigned char *sig, unsigned long long siglen, cons
 **************************************************/
 int crypto_sign_open(unsigned char* m, unsigned long long* mlen, const unsigned char* sm,
                      unsigned long long smlen, const unsigned char *pk);
+
+/*************************************************
+* Name:        crypto_sign_keypair_expand
+*
+* Description: Loads a secret key into an expanded key context: the
+*              secret key is parsed and the MQ equations are expanded
+*              once, to be reused by all the signatures under this key.
+*
+* Arguments:   - struct sign_ctx_t **ctx: pointer to output allocated context
+*              - const uint8_t *sk:       pointer to bit-packed secret key
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk);
+
+/*************************************************
+* Name:        crypto_sign_signature_with_ctx
+*
+* Description: Computes signature from an expanded key context. The
+*              output is the same as crypto_sign_signature with the
+*              underlying secret key.
+*
+* Arguments:   - uint8_t *sig:   pointer to output signature (of length CRYPTO_BYTES)
+*              - size_t *siglen: pointer to output length of signature
+*              - uint8_t *m:     pointer to message to be signed
+*              - size_t mlen:    length of message
+*              - const struct sign_ctx_t *ctx: pointer to expanded key context
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_signature_with_ctx(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                                   unsigned long long mlen, const struct sign_ctx_t *ctx);
+
+/*************************************************
+* Name:        crypto_sign_expanded_key_free
+*
+* Description: Wipes and releases an expanded key context.
+*
+* Arguments:   - struct sign_ctx_t *ctx: pointer to expanded key context
+**************************************************/
+void crypto_sign_expanded_key_free(struct sign_ctx_t *ctx);
+
+/*************************************************
+* Name:        crypto_sign_verify_batch
+*
+* Description: Verifies a batch of signatures under the same public key.
+*              The MQ equations are expanded only once for the whole batch.
+*
+* Arguments:   - const uint8_t *pk:    pointer to bit-packed public key
+*              - const uint8_t **m:    array of n pointers to messages
+*              - const size_t *mlen:   array of n message lengths
+*              - const uint8_t **sig:  array of n pointers to signatures
+*                                      (each of length CRYPTO_BYTES)
+*              - size_t n:             number of signatures
+*              - int *results:         array of n output verdicts (0 if the
+*                                      signature is valid, -1 otherwise)
+*
+* Returns 0 if all the signatures could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_verify_batch(const unsigned char *pk, const unsigned char **m, const unsigned long long *mlen,
+                             const unsigned char **sig, unsigned long long n, int *results);
+
+/*************************************************
+* Name:        crypto_sign_init
+*
+* Description: Starts a streaming signature: the message is then fed by
+*              chunks with crypto_sign_update, and the detached signature
+*              is computed by crypto_sign_final (or crypto_sign_final_with_ctx).
+*              The signature is the same as crypto_sign_signature on the
+*              concatenation of the chunks, and the memory usage does not
+*              depend on the message length.
+*
+* Arguments:   - struct sign_stream_t **stream: pointer to output allocated stream
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_init(struct sign_stream_t **stream);
+
+/*************************************************
+* Name:        crypto_sign_update
+*
+* Description: Absorbs a chunk of the message to be signed.
+*
+* Arguments:   - struct sign_stream_t *stream: pointer to stream
+*              - uint8_t *m:                   pointer to message chunk
+*              - size_t mlen:                  length of message chunk
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen);
+
+/*************************************************
+* Name:        crypto_sign_final
+*
+* Description: Computes the signature of the streamed message. The stream
+*              is released, whatever the outcome.
+*
+* Arguments:   - uint8_t *sig:   pointer to output signature (of length CRYPTO_BYTES)
+*              - size_t *siglen: pointer to output length of signature
+*              - struct sign_stream_t *stream: pointer to stream
+*              - uint8_t *sk:    pointer to bit-packed secret key
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_final(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, const unsigned char *sk);
+
+/*************************************************
+* Name:        crypto_sign_final_with_ctx
+*
+* Description: Same as crypto_sign_final, from an expanded key context.
+*
+* Arguments:   - uint8_t *sig:   pointer to output signature (of length CRYPTO_BYTES)
+*              - size_t *siglen: pointer to output length of signature
+*              - struct sign_stream_t *stream: pointer to stream
+*              - const struct sign_ctx_t *ctx: pointer to expanded key context
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_final_with_ctx(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream,
+                               const struct sign_ctx_t *ctx);
+
+/*************************************************
+* Name:        crypto_sign_verify_init
+*
+* Description: Starts a streaming verification: the message is then fed by
+*              chunks with crypto_sign_verify_update, and the detached
+*              signature is checked by crypto_sign_verify_final.
+*
+* Arguments:   - struct sign_stream_t **stream: pointer to output allocated stream
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_verify_init(struct sign_stream_t **stream);
+
+/*************************************************
+* Name:        crypto_sign_verify_update
+*
+* Description: Absorbs a chunk of the message to be verified.
+*
+* Arguments:   - struct sign_stream_t *stream: pointer to stream
+*              - uint8_t *m:                   pointer to message chunk
+*              - size_t mlen:                  length of message chunk
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_verify_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen);
+
+/*************************************************
+* Name:        crypto_sign_verify_final
+*
+* Description: Verifies the signature of the streamed message. The stream
+*              is released, whatever the outcome.
+*
+* Arguments:   - uint8_t *sig:    pointer to input signature
+*              - size_t siglen:   length of signature
+*              - struct sign_stream_t *stream: pointer to stream
+*              - const uint8_t *pk: pointer to bit-packed public key
+*
+* Returns 0 if signature could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_verify_final(const unsigned char *sig, unsigned long long siglen, struct sign_stream_t *stream,
+                             const unsigned char *pk);
+
+/*************************************************
+* Name:        crypto_sign_stream_free
+*
+* Description: Releases a stream that is not finalized (e.g. when the
+*              message reading fails).
+*
+* Arguments:   - struct sign_stream_t *stream: pointer to stream
+**************************************************/
+void crypto_sign_stream_free(struct sign_stream_t *stream);
+
+/*************************************************
+* Name:        crypto_sign_workspace_size
+*
+* Description: Gets the size in bytes of the workspace needed by
+*              crypto_sign_signature_ws and crypto_sign_verify_ws: it
+*              holds the expanded MQ equations and the PRG caches that
+*              are otherwise allocated on the heap at each call. The
+*              size depends on the parameter set, on the build options and
+*              on the number of threads (see crypto_sign_set_nb_threads).
+*
+* Returns the workspace size in bytes
+**************************************************/
+unsigned long long crypto_sign_workspace_size(void);
+
+/*************************************************
+* Name:        crypto_sign_signature_ws
+*
+* Description: Same as crypto_sign_signature, without any heap allocation:
+*              the temporary buffers are carved from a caller-owned
+*              workspace, which is wiped before returning and can be reused
+*              for any number of calls. A workspace must not be used by two
+*              calls at the same time, but several threads can sign (or
+*              verify) concurrently with one workspace per thread.
+*
+* Arguments:   - uint8_t *sig:   pointer to output signature (of length CRYPTO_BYTES)
+*              - size_t *siglen: pointer to output length of signature
+*              - uint8_t *m:     pointer to message to be signed
+*              - size_t mlen:    length of message
+*              - uint8_t *sk:    pointer to bit-packed secret key
+*              - void *ws:       pointer to workspace
+*              - size_t wslen:   length of workspace, at least
+*                                crypto_sign_workspace_size()
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_signature_ws(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                             unsigned long long mlen, const unsigned char *sk, void *ws, unsigned long long wslen);
+
+/*************************************************
+* Name:        crypto_sign_verify_ws
+*
+* Description: Same as crypto_sign_verify, with the temporary buffers
+*              carved from a caller-owned workspace (see
+*              crypto_sign_signature_ws).
+*
+* Arguments:   - uint8_t *sig:    pointer to input signature
+*              - size_t siglen:   length of signature
+*              - const uint8_t *m: pointer to message
+*              - size_t mlen:     length of message
+*              - const uint8_t *pk: pointer to bit-packed public key
+*              - void *ws:        pointer to workspace
+*              - size_t wslen:    length of workspace, at least
+*                                 crypto_sign_workspace_size()
+*
+* Returns 0 if signature could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_verify_ws(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                          unsigned long long mlen, const unsigned char *pk, void *ws, unsigned long long wslen);
 #endif
 
 #if defined(MQOM2_FOR_MUPQ)
@@ -128,6 +379,69 @@ int
 crypto_sign_verify(const unsigned char  *sig, size_t siglen,
                    const unsigned char  *m, size_t mlen,
                    const unsigned char  *pk);
+
+int
+crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk);
+
+int
+crypto_sign_signature_with_ctx(unsigned char *sig, size_t *siglen,
+                               const unsigned char *m, size_t mlen,
+                               const struct sign_ctx_t *ctx);
+
+void
+crypto_sign_expanded_key_free(struct sign_ctx_t *ctx);
+
+int
+crypto_sign_verify_batch(const unsigned char *pk,
+                         const unsigned char **m, const size_t *mlen,
+                         const unsigned char **sig, size_t n, int *results);
+
+int
+crypto_sign_init(struct sign_stream_t **stream);
+
+int
+crypto_sign_update(struct sign_stream_t *stream,
+                   const unsigned char *m, size_t mlen);
+
+int
+crypto_sign_final(unsigned char *sig, size_t *siglen,
+                  struct sign_stream_t *stream,
+                  const unsigned char *sk);
+
+int
+crypto_sign_final_with_ctx(unsigned char *sig, size_t *siglen,
+                           struct sign_stream_t *stream,
+                           const struct sign_ctx_t *ctx);
+
+int
+crypto_sign_verify_init(struct sign_stream_t **stream);
+
+int
+crypto_sign_verify_update(struct sign_stream_t *stream,
+                          const unsigned char *m, size_t mlen);
+
+int
+crypto_sign_verify_final(const unsigned char *sig, size_t siglen,
+                         struct sign_stream_t *stream,
+                         const unsigned char *pk);
+
+void
+crypto_sign_stream_free(struct sign_stream_t *stream);
+
+size_t
+crypto_sign_workspace_size(void);
+
+int
+crypto_sign_signature_ws(unsigned char *sig, size_t *siglen,
+                         const unsigned char *m, size_t mlen,
+                         const unsigned char *sk,
+                         void *ws, size_t wslen);
+
+int
+crypto_sign_verify_ws(const unsigned char *sig, size_t siglen,
+                      const unsigned char *m, size_t mlen,
+                      const unsigned char *pk,
+                      void *ws, size_t wslen);
 #endif
 
 #if defined(MQOM2_FOR_LIBOQS)
@@ -154,6 +468,69 @@ int
 crypto_sign_verify(const unsigned char *sig, size_t siglen,
                    const unsigned char *m, size_t mlen,
                    const unsigned char *pk);
+
+int
+crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk);
+
+int
+crypto_sign_signature_with_ctx(unsigned char *sig, size_t *siglen,
+                               const unsigned char *m, size_t mlen,
+                               const struct sign_ctx_t *ctx);
+
+void
+crypto_sign_expanded_key_free(struct sign_ctx_t *ctx);
+
+int
+crypto_sign_verify_batch(const unsigned char *pk,
+                         const unsigned char **m, const size_t *mlen,
+                         const unsigned char **sig, size_t n, int *results);
+
+int
+crypto_sign_init(struct sign_stream_t **stream);
+
+int
+crypto_sign_update(struct sign_stream_t *stream,
+                   const unsigned char *m, size_t mlen);
+
+int
+crypto_sign_final(unsigned char *sig, size_t *siglen,
+                  struct sign_stream_t *stream,
+                  const unsigned char *sk);
+
+int
+crypto_sign_final_with_ctx(unsigned char *sig, size_t *siglen,
+                           struct sign_stream_t *stream,
+                           const struct sign_ctx_t *ctx);
+
+int
+crypto_sign_verify_init(struct sign_stream_t **stream);
+
+int
+crypto_sign_verify_update(struct sign_stream_t *stream,
+                          const unsigned char *m, size_t mlen);
+
+int
+crypto_sign_verify_final(const unsigned char *sig, size_t siglen,
+                         struct sign_stream_t *stream,
+                         const unsigned char *pk);
+
+void
+crypto_sign_stream_free(struct sign_stream_t *stream);
+
+size_t
+crypto_sign_workspace_size(void);
+
+int
+crypto_sign_signature_ws(unsigned char *sig, size_t *siglen,
+                         const unsigned char *m, size_t mlen,
+                         const unsigned char *sk,
+                         void *ws, size_t wslen);
+
+int
+crypto_sign_verify_ws(const unsigned char *sig, size_t siglen,
+                      const unsigned char *m, size_t mlen,
+                      const unsigned char *pk,
+                      void *ws, size_t wslen);
 #endif
 
 #endif /* __MQOM_API_H__ */
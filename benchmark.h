@@ -32,6 +32,16 @@
 #define B_PIN_C 17
 #define B_PIN_D 18
 
+/* The sub-timers of BLC.Commit and PIOP.Compute run in the parallel_for tasks:
+ * with PARALLEL_REPETITIONS, these tasks run concurrently in the worker threads
+ * while the timers are global, hence the sub-timers are disabled (they stay at
+ * zero) and only the top-level timers are kept */
+#ifdef PARALLEL_REPETITIONS
+#define BENCHMARK_TIMER_ENABLED(label) (((label) < BS_BLC_EXPAND_TREE) || ((label) > BS_PIOP_BATCH_AND_MASK))
+#else
+#define BENCHMARK_TIMER_ENABLED(label) 1
+#endif
+
 #ifndef BENCHMARK
 #define __BENCHMARK_START__(label) {}
 #define __BENCHMARK_STOP__(label) {}
@@ -50,8 +60,8 @@ __attribute__((weak, noinline)) void btimer_end(btimer_t *timer) {
 	(void)timer;
 }
 
-#define __BENCHMARK_START__(label) btimer_start(&timers[label])
-#define __BENCHMARK_STOP__(label) btimer_end(&timers[label])
+#define __BENCHMARK_START__(label) { if (BENCHMARK_TIMER_ENABLED(label)) { btimer_start(&timers[label]); } }
+#define __BENCHMARK_STOP__(label) { if (BENCHMARK_TIMER_ENABLED(label)) { btimer_end(&timers[label]); } }
 #endif
 
 #endif /* __BENCHMARK_H__ */
@@ -1,6 +1,8 @@
 #include <stdio.h>
 #include <math.h>
 #include <stdlib.h>
+#include <string.h>
+#include <inttypes.h>
 
 #include "timing.h"
 #include "utils.h"
@@ -12,6 +14,8 @@
 #define B_VERIFY_ALGO 2
 #define NUMBER_OF_ALGO_BENCHES 3
 
+static const char *algo_keys[NUMBER_OF_ALGO_BENCHES] = { "keygen", "sign", "verify" };
+
 int randombytes(unsigned char* x, unsigned long long xlen) {
 	for (unsigned long long j = 0; j < xlen; j++) {
 		x[j] = (uint8_t) rand();
@@ -22,48 +26,386 @@ int randombytes(unsigned char* x, unsigned long long xlen) {
 #ifdef BENCHMARK
 btimer_t timers[NUMBER_OF_BENCHES];
 
+/* The detailed timers, in display order */
+typedef struct {
+	int num;
+	const char *section;
+	const char *label;
+	const char *key;
+} detailed_timer_t;
+
+static const detailed_timer_t detailed_timers[NUMBER_OF_BENCHES] = {
+	{ BS_BLC_COMMIT, "Signing", "BLC.Commit", "blc_commit_total" },
+	{ BS_BLC_EXPAND_TREE, "Signing", "[BLC.Commit] Expand Trees", "blc_commit_expand_trees" },
+	{ BS_BLC_SEED_COMMIT, "Signing", "[BLC.Commit] Seed Commit", "blc_commit_seed_commit" },
+	{ BS_BLC_PRG, "Signing", "[BLC.Commit] PRG", "blc_commit_prg" },
+	{ BS_BLC_XOF, "Signing", "[BLC.Commit] XOF", "blc_commit_xof" },
+	{ BS_BLC_ARITH, "Signing", "[BLC.Commit] Arithm", "blc_commit_arithm" },
+	{ BS_PIOP_COMPUTE, "Signing", "PIOP.Compute", "piop_compute_total" },
+	{ BS_PIOP_EXPAND_MQ, "Signing", "[PIOP.Compute] ExpandMQ", "piop_compute_expand_mq" },
+	{ BS_PIOP_EXPAND_BATCHING_MAT, "Signing", "[PIOP.Compute] Expand Batching Mat", "piop_compute_expand_batching_mat" },
+	{ BS_PIOP_MAT_MUL_EXT, "Signing", "[PIOP.Compute] Matrix Mul Ext", "piop_compute_matrix_mult_ext" },
+	{ BS_PIOP_COMPUTE_T1, "Signing", "[PIOP.Compute] Compute t1", "piop_compute_compute_t1" },
+	{ BS_PIOP_COMPUTE_PZI, "Signing", "[PIOP.Compute] Compute P_zi", "piop_compute_compute_p_zi" },
+	{ BS_PIOP_BATCH_AND_MASK, "Signing", "[PIOP.Compute] Batch and Mask", "piop_compute_batch_and_mask" },
+	{ BS_SAMPLE_CHALLENGE, "Signing", "Sample Challenge", "sample_challenge_total" },
+	{ BS_BLC_OPEN, "Signing", "BLC.Open", "blc_open_total" },
+	{ B_PIN_A, "Others", "Pin A", "pin_a" },
+	{ B_PIN_B, "Others", "Pin B", "pin_b" },
+	{ B_PIN_C, "Others", "Pin C", "pin_c" },
+	{ B_PIN_D, "Others", "Pin D", "pin_d" },
+};
+
+#ifdef BENCHMARK_CYCLES
+#define display_enabled_timer(label,num) printf("   - %s: %f ms (%f cycles)\n", label, btimer_get(&timers[num]), btimer_get_cycles(&timers[num]))
+#else
+#define display_enabled_timer(label,num) printf("   - %s: %f ms\n", label, btimer_get(&timers[num]))
+#endif
+#define display_timer(label,num) { \
+	if (BENCHMARK_TIMER_ENABLED(num)) { \
+		display_enabled_timer(label, num); \
+	} else { \
+		printf("   - %s: disabled with PARALLEL_REPETITIONS\n", label); \
+	} \
+}
+#endif
+
 #ifdef BENCHMARK_CYCLES
-#define display_timer(label,num) printf("   - " label ": %f ms (%f cycles)\n", btimer_get(&timers[num]), btimer_get_cycles(&timers[num]))
+#define algo_diff_cycles(timer) btimer_diff_cycles(timer)
 #else
-#define display_timer(label,num) printf("   - " label ": %f ms\n", btimer_get(&timers[num]))
+#define algo_diff_cycles(timer) 0
+#endif
+
+#ifdef BENCHMARK_PERF
+/* Per-iteration means of the hardware performance counters of a timer (null
+ * for the events not available on this CPU), with the derived IPC */
+static void json_print_perf(btimer_t *timer) {
+	printf("\"perf\": {");
+	for (int e = 0; e < BTIMER_PERF_EVENTS; e++) {
+		if (btimer_perf_available(e)) {
+			printf("\"%s\": %.2f, ", btimer_perf_names[e], btimer_get_perf(timer, e));
+		} else {
+			printf("\"%s\": null, ", btimer_perf_names[e]);
+		}
+	}
+	if (btimer_perf_available(BTIMER_PERF_INSTRUCTIONS) && btimer_perf_available(BTIMER_PERF_CYCLES) && (timer->perf[BTIMER_PERF_CYCLES] != 0)) {
+		printf("\"ipc\": %.4f}", (double)timer->perf[BTIMER_PERF_INSTRUCTIONS] / (double)timer->perf[BTIMER_PERF_CYCLES]);
+	} else {
+		printf("\"ipc\": null}");
+	}
+}
+
+static void display_perf_value(btimer_t *timer, int event) {
+	if (btimer_perf_available(event)) {
+		printf(" %14.0f", btimer_get_perf(timer, event));
+	} else {
+		printf(" %14s", "n/a");
+	}
+}
+
+static void display_perf(const char *label, btimer_t *timer) {
+	printf("   %-40s", label);
+	display_perf_value(timer, BTIMER_PERF_INSTRUCTIONS);
+	if (btimer_perf_available(BTIMER_PERF_INSTRUCTIONS) && btimer_perf_available(BTIMER_PERF_CYCLES) && (timer->perf[BTIMER_PERF_CYCLES] != 0)) {
+		printf(" %6.2f", (double)timer->perf[BTIMER_PERF_INSTRUCTIONS] / (double)timer->perf[BTIMER_PERF_CYCLES]);
+	} else {
+		printf(" %6s", "n/a");
+	}
+	for (int e = BTIMER_PERF_L1D_READ_MISSES; e < BTIMER_PERF_EVENTS; e++) {
+		display_perf_value(timer, e);
+	}
+	printf("\n");
+}
+#endif
+
+/* Raw per-iteration samples, kept for the JSON output */
+typedef struct {
+	int nb;
+	double *ms;
+	uint64_t *cycles;
+} samples_t;
+
+static int samples_init(samples_t *s, int nb_tests) {
+	s->nb = 0;
+	s->ms = (double*) malloc(nb_tests * sizeof(double));
+	s->cycles = (uint64_t*) malloc(nb_tests * sizeof(uint64_t));
+	return ((s->ms == NULL) || (s->cycles == NULL)) ? -1 : 0;
+}
+
+static void samples_add(samples_t *s, double ms, uint64_t cycles) {
+	s->ms[s->nb] = ms;
+	s->cycles[s->nb] = cycles;
+	s->nb++;
+}
+
+static void samples_free(samples_t *s) {
+	free(s->ms);
+	free(s->cycles);
+}
+
+static void json_print_samples(const samples_t *s) {
+	printf("\"samples_ms\": [");
+	for (int i = 0; i < s->nb; i++) {
+		printf("%s%.6f", (i == 0) ? "" : ", ", s->ms[i]);
+	}
+	printf("]");
+#ifdef BENCHMARK_CYCLES
+	printf(", \"samples_cycles\": [");
+	for (int i = 0; i < s->nb; i++) {
+		printf("%s%" PRIu64, (i == 0) ? "" : ", ", s->cycles[i]);
+	}
+	printf("]");
+#endif
+}
+
+/* Tail latency: the reported percentiles (nearest-rank) */
+#define NUMBER_OF_PERCENTILES 4
+static const double percentiles[NUMBER_OF_PERCENTILES] = { 50., 90., 99., 99.9 };
+static const char *percentiles_labels[NUMBER_OF_PERCENTILES] = { "p50", "p90", "p99", "p99.9" };
+/* Resolution of the log-bucketed histograms */
+#define HISTOGRAM_BUCKETS_PER_OCTAVE 8
+
+/* Standard deviation from the mean of the squares and the mean: the rounding
+ * errors can make the variance slightly negative for constant samples */
+static double std_dev(double mean_pow2, double mean) {
+	double variance = mean_pow2 - pow(mean, 2);
+	return (variance > 0) ? sqrt(variance) : 0.;
+}
+
+static int cmp_double(const void *a, const void *b) {
+	double x = *(const double*)a, y = *(const double*)b;
+	return (x > y) - (x < y);
+}
+
+/* Copy the samples in the scratch buffer and sort them */
+static const double *samples_sorted_ms(const samples_t *s, double *scratch) {
+	memcpy(scratch, s->ms, s->nb * sizeof(double));
+	qsort(scratch, s->nb, sizeof(double), cmp_double);
+	return scratch;
+}
+
+#ifdef BENCHMARK_CYCLES
+static const double *samples_sorted_cycles(const samples_t *s, double *scratch) {
+	for (int i = 0; i < s->nb; i++) {
+		scratch[i] = (double)s->cycles[i];
+	}
+	qsort(scratch, s->nb, sizeof(double), cmp_double);
+	return scratch;
+}
 #endif
+
+static double percentile(const double *sorted, int n, double p) {
+	int rank;
+
+	if (n == 0) {
+		return 0.;
+	}
+	rank = (int)ceil((p / 100.) * n);
+	rank = (rank < 1) ? 1 : rank;
+	return sorted[rank - 1];
+}
+
+static void print_percentiles(const char *label, const double *sorted, int n, int decimals, const char *unit) {
+	printf(" - %s", label);
+	for (int k = 0; k < NUMBER_OF_PERCENTILES; k++) {
+		printf(" %s=%.*f", percentiles_labels[k], decimals, percentile(sorted, n, percentiles[k]));
+	}
+	printf(" max=%.*f %s\n", decimals, (n == 0) ? 0. : sorted[n - 1], unit);
+}
+
+/* Bucket of a sample: log-bucketed with HISTOGRAM_BUCKETS_PER_OCTAVE
+ * buckets per power of 2, or the exact value */
+static double histogram_bucket(double v, int log_buckets) {
+	if ((!log_buckets) || (v <= 0.)) {
+		return v;
+	}
+	return floor(HISTOGRAM_BUCKETS_PER_OCTAVE * log2(v));
+}
+
+/* JSON "percentiles_<suffix>" and "histogram_<suffix>" members: the histogram is
+ * a list of [low, high, count] for the non empty buckets */
+static void json_print_distribution(const char *suffix, const double *sorted, int n, int log_buckets) {
+	printf("\"percentiles_%s\": {", suffix);
+	for (int k = 0; k < NUMBER_OF_PERCENTILES; k++) {
+		printf("\"%s\": %.6f, ", percentiles_labels[k], percentile(sorted, n, percentiles[k]));
+	}
+	printf("\"min\": %.6f, \"max\": %.6f}, ", (n == 0) ? 0. : sorted[0], (n == 0) ? 0. : sorted[n - 1]);
+	printf("\"histogram_%s\": [", suffix);
+	for (int i = 0, first = 1; i < n; first = 0) {
+		double bucket = histogram_bucket(sorted[i], log_buckets);
+		double low = sorted[i], high = sorted[i];
+		int count = 0;
+		for (; (i < n) && (histogram_bucket(sorted[i], log_buckets) == bucket); i++) {
+			count++;
+		}
+		if (log_buckets && (low > 0.)) {
+			low = exp2(bucket / HISTOGRAM_BUCKETS_PER_OCTAVE);
+			high = exp2((bucket + 1) / HISTOGRAM_BUCKETS_PER_OCTAVE);
+		}
+		printf("%s[%.6f, %.6f, %d]", first ? "" : ", ", low, high, count);
+	}
+	printf("]");
+}
+
+/* Distribution-free 95% confidence interval of the median, from the order
+ * statistics of the sorted samples */
+static void median_ci(const double *sorted, int n, double *low, double *high) {
+	double h = 1.959964 * sqrt((double)n) / 2.;
+	int j = (int)floor((n / 2.) - h), k = (int)ceil((n / 2.) + h) + 1;
+
+	if (n == 0) {
+		*low = *high = 0.;
+		return;
+	}
+	j = (j < 1) ? 1 : j;
+	k = (k > n) ? n : k;
+	*low = sorted[j - 1];
+	*high = sorted[k - 1];
+}
+
+/* Adaptive repetitions: the confidence intervals of the medians of all the
+ * algorithms are narrower than target_ci percent of the medians (+/-) */
+static int median_ci_reached(const samples_t *samples, int nb, double target_ci, double *scratch) {
+	for (int j = 0; j < nb; j++) {
+		double low, high;
+		const double *sorted = samples_sorted_ms(&samples[j], scratch);
+		double median = percentile(sorted, samples[j].nb, 50.);
+		median_ci(sorted, samples[j].nb, &low, &high);
+		if ((high - low) > 2. * (target_ci / 100.) * median) {
+			return 0;
+		}
+	}
+	return 1;
+}
+
+static void json_print_samples_distributions(const samples_t *s, double *scratch) {
+	json_print_distribution("ms", samples_sorted_ms(s, scratch), s->nb, 1);
+#ifdef BENCHMARK_CYCLES
+	printf(", ");
+	json_print_distribution("cycles", samples_sorted_cycles(s, scratch), s->nb, 1);
 #endif
+}
 
 int main(int argc, char *argv[]) {
 	srand((unsigned int) time(NULL));
 
-	int nb_tests = get_number_of_tests(argc, argv, 1);
+	/* "--json" selects the machine readable output: one JSON record on stdout.
+	 * "--warmup <n>" runs n discarded iterations first, and "--target-ci <p>"
+	 * repeats beyond nb_tests (up to "--max-tests <n>", 10 * nb_tests by default)
+	 * until the 95% confidence intervals of the median times are within +/- p% */
+	int json = 0;
+	int nb_warmup = 0, max_tests = 0;
+	double target_ci = 0.;
+	int nb_args = 0;
+	char *args[2] = { argv[0], NULL };
+	for (int i = 0; i < argc; i++) {
+		if ((i > 0) && (strcmp(argv[i], "--json") == 0)) {
+			json = 1;
+		} else if ((i > 0) && (i + 1 < argc) && (strcmp(argv[i], "--warmup") == 0) && (sscanf(argv[i + 1], "%d", &nb_warmup) == 1) && (nb_warmup >= 0)) {
+			i++;
+		} else if ((i > 0) && (i + 1 < argc) && (strcmp(argv[i], "--target-ci") == 0) && (sscanf(argv[i + 1], "%lf", &target_ci) == 1) && (target_ci > 0.)) {
+			i++;
+		} else if ((i > 0) && (i + 1 < argc) && (strcmp(argv[i], "--max-tests") == 0) && (sscanf(argv[i + 1], "%d", &max_tests) == 1) && (max_tests > 0)) {
+			i++;
+		} else if ((nb_args < 2) && ((i == 0) || (argv[i][0] != '-'))) {
+			args[nb_args++] = argv[i];
+		} else {
+			printf("Usage: %s [nb_tests] [--json] [--warmup <n>] [--target-ci <percent>] [--max-tests <n>]\n", argv[0]);
+			exit(EXIT_FAILURE);
+		}
+	}
+	FILE *out_err = json ? stderr : stdout;
+
+	int nb_tests = get_number_of_tests(nb_args, args, 1);
 	if (nb_tests < 0) {
 		exit(EXIT_FAILURE);
 	}
+	if (target_ci <= 0.) {
+		max_tests = nb_tests;
+	} else if (max_tests == 0) {
+		max_tests = 10 * nb_tests;
+	}
+	max_tests = (max_tests < nb_tests) ? nb_tests : max_tests;
 
-	print_configuration();
-	printf("\n");
+	if (!json) {
+		print_configuration();
+		printf("\n");
+	}
 
 	btimer_t timers_algos[NUMBER_OF_ALGO_BENCHES];
 	double std_timer[NUMBER_OF_ALGO_BENCHES];
+	samples_t samples_algos[NUMBER_OF_ALGO_BENCHES];
 
 	// Initialisation
 	double timer_pow2[NUMBER_OF_ALGO_BENCHES];
 	for (int j = 0; j < NUMBER_OF_ALGO_BENCHES; j++) {
 		btimer_init(&timers_algos[j]);
 		timer_pow2[j] = 0;
+		if (samples_init(&samples_algos[j], max_tests)) {
+			fprintf(stderr, "Error: cannot allocate the samples\n");
+			exit(EXIT_FAILURE);
+		}
 	}
 #ifdef BENCHMARK
+	samples_t samples_detailed[NUMBER_OF_BENCHES];
 	for (int num = 0; num < NUMBER_OF_BENCHES; num++) {
 		btimer_init(&timers[num]);
+		if (samples_init(&samples_detailed[num], max_tests)) {
+			fprintf(stderr, "Error: cannot allocate the samples\n");
+			exit(EXIT_FAILURE);
+		}
 	}
 #endif
 	double mean_of_sig_size = 0;
 	double sig_size_pow2 = 0;
+	/* Signature sizes samples, and the scratch buffer to sort the samples */
+	int nb_sig_sizes = 0;
+	double *sig_sizes = (double*) malloc(max_tests * sizeof(double));
+	double *scratch = (double*) malloc(max_tests * sizeof(double));
+	if ((sig_sizes == NULL) || (scratch == NULL)) {
+		fprintf(stderr, "Error: cannot allocate the samples\n");
+		exit(EXIT_FAILURE);
+	}
+
+	// Warmup (caches, branch predictors, frequency), not measured
+#define MLEN 32
+	for (int i = 0; i < nb_warmup; i++) {
+		uint8_t pk[CRYPTO_PUBLICKEYBYTES];
+		uint8_t sk[CRYPTO_SECRETKEYBYTES];
+		uint8_t m[MLEN] = {1, 2, 3, 4};
+		uint8_t m2[MLEN] = {0};
+		uint8_t sm[MLEN + CRYPTO_BYTES];
+		unsigned long long smlen = 0, m2len = 0;
+		if (crypto_sign_keypair(pk, sk) || crypto_sign(sm, &smlen, m, MLEN, sk) || crypto_sign_open(m2, &m2len, sm, smlen, pk)) {
+			fprintf(out_err, "Failure (warmup %d)\n", i);
+		}
+	}
+#ifdef BENCHMARK
+	for (int num = 0; num < NUMBER_OF_BENCHES; num++) {
+		btimer_init(&timers[num]);
+	}
+#endif
 
 	// Execution
 	int score = 0;
 	int ret;
-	for (int i = 0; i < nb_tests; i++) {
+	int nb_done, next_check = nb_tests;
+	for (nb_done = 0; nb_done < max_tests; nb_done++) {
+		int i = nb_done;
+		if ((i >= nb_tests) && (i == next_check)) {
+			if (median_ci_reached(samples_algos, NUMBER_OF_ALGO_BENCHES, target_ci, scratch)) {
+				break;
+			}
+			next_check = i + (((i / 10) > 0) ? (i / 10) : 1);
+		}
 #ifdef BENCHMARK
+		/* The detailed timers accumulate: the sample of an iteration is the difference */
+		double detailed_ms[NUMBER_OF_BENCHES];
+		uint64_t detailed_cycles[NUMBER_OF_BENCHES];
 		for (int num = 0; num < NUMBER_OF_BENCHES; num++) {
 			btimer_count(&timers[num]);
+			detailed_ms[num] = timers[num].nb_milliseconds;
+			detailed_cycles[num] = timers[num].nb_cycles;
 		}
 #endif
 
@@ -74,14 +416,14 @@ int main(int argc, char *argv[]) {
 		ret = crypto_sign_keypair(pk, sk);
 		btimer_end(&timers_algos[B_KEY_GENERATION]);
 		btimer_count(&timers_algos[B_KEY_GENERATION]);
-		timer_pow2[B_KEY_GENERATION] += pow(btimer_diff(&timers_algos[B_KEY_GENERATION]), 2) / nb_tests;
+		timer_pow2[B_KEY_GENERATION] += pow(btimer_diff(&timers_algos[B_KEY_GENERATION]), 2);
+		samples_add(&samples_algos[B_KEY_GENERATION], btimer_diff(&timers_algos[B_KEY_GENERATION]), algo_diff_cycles(&timers_algos[B_KEY_GENERATION]));
 		if (ret) {
-			printf("Failure (num %d): crypto_sign_keypair\n", i);
+			fprintf(out_err, "Failure (num %d): crypto_sign_keypair\n", i);
 			continue;
 		}
 
 		// Select the message
-#define MLEN 32
 		uint8_t m[MLEN] = {1, 2, 3, 4};
 		uint8_t m2[MLEN] = {0};
 		unsigned long long m2len = 0;
@@ -93,13 +435,20 @@ int main(int argc, char *argv[]) {
 		ret = crypto_sign(sm, &smlen, m, MLEN, sk);
 		btimer_end(&timers_algos[B_SIGN_ALGO]);
 		btimer_count(&timers_algos[B_SIGN_ALGO]);
-		timer_pow2[B_SIGN_ALGO] += pow(btimer_diff(&timers_algos[B_SIGN_ALGO]), 2) / nb_tests;
+		timer_pow2[B_SIGN_ALGO] += pow(btimer_diff(&timers_algos[B_SIGN_ALGO]), 2);
+		samples_add(&samples_algos[B_SIGN_ALGO], btimer_diff(&timers_algos[B_SIGN_ALGO]), algo_diff_cycles(&timers_algos[B_SIGN_ALGO]));
+#ifdef BENCHMARK
+		for (int num = 0; num < NUMBER_OF_BENCHES; num++) {
+			samples_add(&samples_detailed[num], timers[num].nb_milliseconds - detailed_ms[num], timers[num].nb_cycles - detailed_cycles[num]);
+		}
+#endif
 		// Update statistics
 		size_t signature_len = smlen - MLEN;
-		mean_of_sig_size += (double) signature_len / nb_tests;
-		sig_size_pow2 += pow(signature_len, 2) / nb_tests;
+		mean_of_sig_size += (double) signature_len;
+		sig_size_pow2 += pow(signature_len, 2);
+		sig_sizes[nb_sig_sizes++] = (double) signature_len;
 		if (ret) {
-			printf("Failure (num %d): crypto_sign\n", i);
+			fprintf(out_err, "Failure (num %d): crypto_sign\n", i);
 			continue;
 		}
 
@@ -108,20 +457,21 @@ int main(int argc, char *argv[]) {
 		ret = crypto_sign_open(m2, &m2len, sm, smlen, pk);
 		btimer_end(&timers_algos[B_VERIFY_ALGO]);
 		btimer_count(&timers_algos[B_VERIFY_ALGO]);
-		timer_pow2[B_VERIFY_ALGO] += pow(btimer_diff(&timers_algos[B_VERIFY_ALGO]), 2) / nb_tests;
+		timer_pow2[B_VERIFY_ALGO] += pow(btimer_diff(&timers_algos[B_VERIFY_ALGO]), 2);
+		samples_add(&samples_algos[B_VERIFY_ALGO], btimer_diff(&timers_algos[B_VERIFY_ALGO]), algo_diff_cycles(&timers_algos[B_VERIFY_ALGO]));
 		if (ret) {
-			printf("Failure (num %d): crypto_sign_open\n", i);
+			fprintf(out_err, "Failure (num %d): crypto_sign_open\n", i);
 			continue;
 		}
 
 		// Test of correction of the primitives
 		if (m2len != MLEN) {
-			printf("Failure (num %d): message size does not match\n", i);
+			fprintf(out_err, "Failure (num %d): message size does not match\n", i);
 			continue;
 		}
 		for (int h = 0; h < MLEN; h++)
 			if (m[h] != m2[h]) {
-				printf("Failure (num %d): message does not match (char %d)\n", i, h);
+				fprintf(out_err, "Failure (num %d): message does not match (char %d)\n", i, h);
 				continue;
 			}
 
@@ -129,14 +479,93 @@ int main(int argc, char *argv[]) {
 	}
 
 	// Compute some statistics
-	std_timer[B_KEY_GENERATION] = sqrt(timer_pow2[B_KEY_GENERATION] - pow(btimer_get(&timers_algos[B_KEY_GENERATION]), 2));
-	std_timer[B_SIGN_ALGO] = sqrt(timer_pow2[B_SIGN_ALGO] - pow(btimer_get(&timers_algos[B_SIGN_ALGO]), 2));
-	std_timer[B_VERIFY_ALGO] = sqrt(timer_pow2[B_VERIFY_ALGO] - pow(btimer_get(&timers_algos[B_VERIFY_ALGO]), 2));
-	double std_sig_size = sqrt(sig_size_pow2 - pow(mean_of_sig_size, 2));
+	for (int j = 0; j < NUMBER_OF_ALGO_BENCHES; j++) {
+		timer_pow2[j] /= nb_done;
+	}
+	mean_of_sig_size /= nb_done;
+	sig_size_pow2 /= nb_done;
+	std_timer[B_KEY_GENERATION] = std_dev(timer_pow2[B_KEY_GENERATION], btimer_get(&timers_algos[B_KEY_GENERATION]));
+	std_timer[B_SIGN_ALGO] = std_dev(timer_pow2[B_SIGN_ALGO], btimer_get(&timers_algos[B_SIGN_ALGO]));
+	std_timer[B_VERIFY_ALGO] = std_dev(timer_pow2[B_VERIFY_ALGO], btimer_get(&timers_algos[B_VERIFY_ALGO]));
+	double std_sig_size = std_dev(sig_size_pow2, mean_of_sig_size);
+
+	double ci_low, ci_high;
+	if (json) {
+		printf("{");
+		print_configuration_json();
+		printf(", \"nb_tests\": %d, \"correctness\": %d, ", nb_done, score);
+		printf("\"nb_warmup\": %d, \"target_ci\": %.2f, \"max_tests\": %d, ", nb_warmup, target_ci, max_tests);
+#if (defined(BENCHMARK) || defined(BENCHMARK_CYCLES) || defined(BENCHMARK_TIME)) && !defined(NO_ALLOC_PROBE)
+		printf("\"alloc_peak_usage\": %ld, ", alloc_peak_usage);
+#endif
+#ifdef BENCHMARK_PERF
+		if (btimer_perf_error() != NULL) {
+			json_print_key_string("perf_error", btimer_perf_error(), 0);
+		} else {
+			printf("\"perf_error\": null, ");
+		}
+#endif
+		printf("\"sizes\": {\"pk\": %ld, \"sk\": %ld, \"sig_max\": %ld, \"sig_mean\": %.2f, \"sig_std\": %.2f, ",
+		       CRYPTO_PUBLICKEYBYTES, CRYPTO_SECRETKEYBYTES, CRYPTO_BYTES, mean_of_sig_size, std_sig_size);
+		qsort(sig_sizes, nb_sig_sizes, sizeof(double), cmp_double);
+		json_print_distribution("sig", sig_sizes, nb_sig_sizes, 0);
+		printf("}, ");
+		printf("\"algorithms\": {");
+		for (int j = 0; j < NUMBER_OF_ALGO_BENCHES; j++) {
+			printf("%s\"%s\": {\"mean_ms\": %.6f, \"std_ms\": %.6f, ", (j == 0) ? "" : ", ", algo_keys[j],
+			       btimer_get(&timers_algos[j]), std_timer[j]);
+#ifdef BENCHMARK_CYCLES
+			printf("\"mean_cycles\": %.2f, ", btimer_get_cycles(&timers_algos[j]));
+#endif
+			json_print_samples(&samples_algos[j]);
+			printf(", ");
+			json_print_samples_distributions(&samples_algos[j], scratch);
+			median_ci(samples_sorted_ms(&samples_algos[j], scratch), samples_algos[j].nb, &ci_low, &ci_high);
+			printf(", \"median_ci_ms\": [%.6f, %.6f]", ci_low, ci_high);
+#ifdef BENCHMARK_PERF
+			printf(", ");
+			json_print_perf(&timers_algos[j]);
+#endif
+			printf("}");
+		}
+		printf("}");
+#ifdef BENCHMARK
+		printf(", \"detailed\": {");
+		for (int d = 0; d < NUMBER_OF_BENCHES; d++) {
+			int num = detailed_timers[d].num;
+			printf("%s\"%s\": {", (d == 0) ? "" : ", ", detailed_timers[d].key);
+			json_print_key_string("label", detailed_timers[d].label, 0);
+			json_print_key_string("section", detailed_timers[d].section, 0);
+			printf("\"enabled\": %s, ", BENCHMARK_TIMER_ENABLED(num) ? "true" : "false");
+			printf("\"mean_ms\": %.6f, ", btimer_get(&timers[num]));
+#ifdef BENCHMARK_CYCLES
+			printf("\"mean_cycles\": %.2f, ", btimer_get_cycles(&timers[num]));
+#endif
+			json_print_samples(&samples_detailed[num]);
+			printf(", ");
+			json_print_samples_distributions(&samples_detailed[num], scratch);
+#ifdef BENCHMARK_PERF
+			printf(", ");
+			json_print_perf(&timers[num]);
+#endif
+			printf("}");
+		}
+		printf("}");
+#endif
+		printf("}\n");
+		goto end;
+	}
 
 	// Display Infos
 	printf("===== SUMMARY =====\n");
-	printf("Correctness: %d/%d\n", score, nb_tests);
+	printf("Correctness: %d/%d\n", score, nb_done);
+	if ((nb_warmup > 0) || (target_ci > 0.)) {
+		printf("Repetitions: %d (+%d warmup)", nb_done, nb_warmup);
+		if (target_ci > 0.) {
+			printf(", median 95%% CI target +/-%.2f%% %s", target_ci, median_ci_reached(samples_algos, NUMBER_OF_ALGO_BENCHES, target_ci, scratch) ? "reached" : "NOT reached");
+		}
+		printf("\n");
+	}
 	printf("\n");
 
 	print_alloc_usage("keygen+sign+verif");
@@ -157,12 +586,33 @@ int main(int argc, char *argv[]) {
 	      );
 	printf("\n");
 
+	printf("Latency percentiles in ms:\n");
+	print_percentiles("Key Gen:", samples_sorted_ms(&samples_algos[B_KEY_GENERATION], scratch), samples_algos[B_KEY_GENERATION].nb, 2, "ms");
+	print_percentiles("Sign:   ", samples_sorted_ms(&samples_algos[B_SIGN_ALGO], scratch), samples_algos[B_SIGN_ALGO].nb, 2, "ms");
+	print_percentiles("Verify: ", samples_sorted_ms(&samples_algos[B_VERIFY_ALGO], scratch), samples_algos[B_VERIFY_ALGO].nb, 2, "ms");
+	printf("\n");
+
+	printf("Median 95%% confidence intervals in ms:\n");
+	for (int j = 0; j < NUMBER_OF_ALGO_BENCHES; j++) {
+		const double *sorted = samples_sorted_ms(&samples_algos[j], scratch);
+		median_ci(sorted, samples_algos[j].nb, &ci_low, &ci_high);
+		printf(" - %-8s %.2f ms [%.2f, %.2f]\n", (j == B_KEY_GENERATION) ? "Key Gen:" : ((j == B_SIGN_ALGO) ? "Sign:" : "Verify:"),
+		       percentile(sorted, samples_algos[j].nb, 50.), ci_low, ci_high);
+	}
+	printf("\n");
+
 #ifdef BENCHMARK_CYCLES
 	printf("Timing in cycles:\n");
 	printf(" - Key Gen: %.2f cycles\n", btimer_get_cycles(&timers_algos[B_KEY_GENERATION]));
 	printf(" - Sign:    %.2f cycles\n", btimer_get_cycles(&timers_algos[B_SIGN_ALGO]));
 	printf(" - Verify:  %.2f cycles\n", btimer_get_cycles(&timers_algos[B_VERIFY_ALGO]));
 	printf("\n");
+
+	printf("Latency percentiles in cycles:\n");
+	print_percentiles("Key Gen:", samples_sorted_cycles(&samples_algos[B_KEY_GENERATION], scratch), samples_algos[B_KEY_GENERATION].nb, 0, "cycles");
+	print_percentiles("Sign:   ", samples_sorted_cycles(&samples_algos[B_SIGN_ALGO], scratch), samples_algos[B_SIGN_ALGO].nb, 0, "cycles");
+	print_percentiles("Verify: ", samples_sorted_cycles(&samples_algos[B_VERIFY_ALGO], scratch), samples_algos[B_VERIFY_ALGO].nb, 0, "cycles");
+	printf("\n");
 #endif
 
 	printf("Communication cost:\n");
@@ -170,31 +620,50 @@ int main(int argc, char *argv[]) {
 	printf(" - SK size: %ld B\n", CRYPTO_SECRETKEYBYTES);
 	printf(" - Signature size (MAX): %ld B\n", CRYPTO_BYTES);
 	printf(" - Signature size: %.0f B (std=%.0f)\n", mean_of_sig_size, std_sig_size);
+	qsort(sig_sizes, nb_sig_sizes, sizeof(double), cmp_double);
+	print_percentiles("Signature size percentiles:", sig_sizes, nb_sig_sizes, 0, "B");
 	printf("\n");
 
 #ifdef BENCHMARK
 	printf("\n===== DETAILED BENCHMARK =====\n");
-	printf(" - Signing\n");
-	display_timer("BLC.Commit", BS_BLC_COMMIT);
-	display_timer("[BLC.Commit] Expand Trees", BS_BLC_EXPAND_TREE);
-	display_timer("[BLC.Commit] Seed Commit", BS_BLC_SEED_COMMIT);
-	display_timer("[BLC.Commit] PRG", BS_BLC_PRG);
-	display_timer("[BLC.Commit] XOF", BS_BLC_XOF);
-	display_timer("[BLC.Commit] Arithm", BS_BLC_ARITH);
-	display_timer("PIOP.Compute", BS_PIOP_COMPUTE);
-	display_timer("[PIOP.Compute] ExpandMQ", BS_PIOP_EXPAND_MQ);
-	display_timer("[PIOP.Compute] Expand Batching Mat", BS_PIOP_EXPAND_BATCHING_MAT);
-	display_timer("[PIOP.Compute] Matrix Mul Ext", BS_PIOP_MAT_MUL_EXT);
-	display_timer("[PIOP.Compute] Compute t1", BS_PIOP_COMPUTE_T1);
-	display_timer("[PIOP.Compute] Compute P_zi", BS_PIOP_COMPUTE_PZI);
-	display_timer("[PIOP.Compute] Batch and Mask", BS_PIOP_BATCH_AND_MASK);
-	display_timer("Sample Challenge", BS_SAMPLE_CHALLENGE);
-	display_timer("BLC.Open", BS_BLC_OPEN);
-	printf(" - Others\n");
-	display_timer("Pin A", B_PIN_A);
-	display_timer("Pin B", B_PIN_B);
-	display_timer("Pin C", B_PIN_C);
-	display_timer("Pin D", B_PIN_D);
+	for (int d = 0; d < NUMBER_OF_BENCHES; d++) {
+		if ((d == 0) || (strcmp(detailed_timers[d].section, detailed_timers[d - 1].section) != 0)) {
+			printf(" - %s\n", detailed_timers[d].section);
+		}
+		display_timer(detailed_timers[d].label, detailed_timers[d].num);
+	}
+#endif
+#ifdef BENCHMARK_PERF
+	printf("\n===== PERFORMANCE COUNTERS (per iteration) =====\n");
+	if (btimer_perf_error() != NULL) {
+		printf("Unavailable: %s\n", btimer_perf_error());
+	} else {
+		printf("   %-40s %14s %6s %14s %14s %14s %14s %14s\n", "", "instructions", "IPC", "L1D rd misses", "LLC misses", "branch misses", "stalls front", "stalls back");
+		printf(" - Algorithms\n");
+		display_perf("Key Generation", &timers_algos[B_KEY_GENERATION]);
+		display_perf("Signing", &timers_algos[B_SIGN_ALGO]);
+		display_perf("Verification", &timers_algos[B_VERIFY_ALGO]);
+#ifdef BENCHMARK
+		for (int d = 0; d < NUMBER_OF_BENCHES; d++) {
+			if ((d == 0) || (strcmp(detailed_timers[d].section, detailed_timers[d - 1].section) != 0)) {
+				printf(" - %s\n", detailed_timers[d].section);
+			}
+			display_perf(detailed_timers[d].label, &timers[detailed_timers[d].num]);
+		}
+#endif
+	}
+#endif
+
+end:
+	free(sig_sizes);
+	free(scratch);
+	for (int j = 0; j < NUMBER_OF_ALGO_BENCHES; j++) {
+		samples_free(&samples_algos[j]);
+	}
+#ifdef BENCHMARK
+	for (int num = 0; num < NUMBER_OF_BENCHES; num++) {
+		samples_free(&samples_detailed[num]);
+	}
 #endif
 
 	return 0;
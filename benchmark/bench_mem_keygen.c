@@ -13,7 +13,8 @@ int randombytes(unsigned char* x, unsigned long long xlen) {
 	return 0;
 }
 
-int main(void) {
+int main(int argc, char *argv[]) {
+	int probe = get_mem_probe_mode(argc, argv);
 	srand((unsigned int) time(NULL));
 
 	print_configuration();
@@ -22,7 +23,13 @@ int main(void) {
 	uint8_t sk[CRYPTO_SECRETKEYBYTES];
 
 	// Generate the key pair
+	if (probe) {
+		mem_probe_start();
+	}
 	int ret = crypto_sign_keypair(pk, sk);
+	if (probe) {
+		mem_probe_report();
+	}
 	if (ret) {
 		printf("Failure: crypto_sign_keypair\n");
 		return 0;
@@ -45,6 +52,9 @@ int main(void) {
 	// Display Infos
 	printf("===== SUMMARY =====\n");
 	printf("Key pair saved in bench-sig-keys.txt\n");
+	if (!probe) {
+		print_peak_memory();
+	}
 
 	return 0;
 }
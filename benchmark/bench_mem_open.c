@@ -15,7 +15,8 @@ int randombytes(unsigned char* x, unsigned long long xlen) {
 
 #define MLEN 32
 
-int main(void) {
+int main(int argc, char *argv[]) {
+	int probe = get_mem_probe_mode(argc, argv);
 	srand((unsigned int) time(NULL));
 
 	print_configuration();
@@ -62,7 +63,13 @@ int main(void) {
 	fclose(fptr);
 
 	// Verify/Open the signature
+	if (probe) {
+		mem_probe_start();
+	}
 	int ret = crypto_sign_open(m2, &m2len, sm, smlen, pk);
+	if (probe) {
+		mem_probe_report();
+	}
 	if (ret) {
 		printf("Failure: crypto_sign_open\n");
 		return 0;
@@ -82,6 +89,9 @@ int main(void) {
 	// Display Infos
 	printf("===== SUMMARY =====\n");
 	printf("Everything is fine.\n");
+	if (!probe) {
+		print_peak_memory();
+	}
 
 	return 0;
 }
@@ -15,7 +15,8 @@ int randombytes(unsigned char* x, unsigned long long xlen) {
 
 #define MLEN 32
 
-int main(void) {
+int main(int argc, char *argv[]) {
+	int probe = get_mem_probe_mode(argc, argv);
 	srand((unsigned int) time(NULL));
 
 	print_configuration();
@@ -44,7 +45,13 @@ int main(void) {
 	// Sign the message
 	uint8_t sm[MLEN + CRYPTO_BYTES];
 	unsigned long long smlen;
+	if (probe) {
+		mem_probe_start();
+	}
 	int ret = crypto_sign(sm, &smlen, m, MLEN, sk);
+	if (probe) {
+		mem_probe_report();
+	}
 	if (ret) {
 		printf("Failure: crypto_sign\n");
 		return 0;
@@ -65,6 +72,9 @@ int main(void) {
 	// Display Infos
 	printf("===== SUMMARY =====\n");
 	printf("Signature saved in bench-sig.txt\n");
+	if (!probe) {
+		print_peak_memory();
+	}
 
 	return 0;
 }
@@ -0,0 +1,203 @@
+#include <stdlib.h>
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/wait.h>
+
+#include "api.h"
+#include "utils.h"
+
+/* Throughput benchmark: nb_workers processes sign (then verify) under the same
+ * key for a fixed duration. Workers are processes (and not threads) so that the
+ * library global states (allocation probes, benchmark timers) are not shared */
+
+int randombytes(unsigned char* x, unsigned long long xlen) {
+	for (unsigned long long j = 0; j < xlen; j++) {
+		x[j] = (uint8_t) rand();
+	}
+	return 0;
+}
+
+#define MLEN 32
+#define MAX_WORKERS 1024
+
+typedef struct {
+	uint64_t nb_ops[2];
+	double elapsed[2];
+	uint64_t nb_failures;
+} worker_result_t;
+
+#define PHASE_SIGN 0
+#define PHASE_VERIFY 1
+static const char *phase_keys[2] = { "sign", "verify" };
+
+static double now(void) {
+	struct timespec t;
+	clock_gettime(CLOCK_MONOTONIC, &t);
+	return (double)t.tv_sec + (double)t.tv_nsec * 1e-9;
+}
+
+static void run_worker(int phase, double duration, const uint8_t *pk, const uint8_t *sk, const struct sign_ctx_t *ctx,
+                       const uint8_t *ref_sig, worker_result_t *res) {
+	uint8_t m[MLEN] = {1, 2, 3, 4};
+	uint8_t sig[CRYPTO_BYTES];
+	unsigned long long siglen;
+	uint64_t nb_ops = 0;
+	double start = now(), elapsed;
+	int ret;
+
+	do {
+		if (phase == PHASE_SIGN) {
+			m[MLEN - 1] = (uint8_t)nb_ops;
+			if (ctx != NULL) {
+				ret = crypto_sign_signature_with_ctx(sig, &siglen, m, MLEN, ctx);
+			} else {
+				ret = crypto_sign_signature(sig, &siglen, m, MLEN, sk);
+			}
+		} else {
+			ret = crypto_sign_verify(ref_sig, CRYPTO_BYTES, m, MLEN, pk);
+		}
+		if (ret) {
+			res->nb_failures++;
+		}
+		nb_ops++;
+		elapsed = now() - start;
+	} while (elapsed < duration);
+
+	res->nb_ops[phase] = nb_ops;
+	res->elapsed[phase] = elapsed;
+}
+
+int main(int argc, char *argv[]) {
+	int json = 0, expanded_key = 0, nb_values = 0;
+	long int values[2] = { 1, 5 };
+	int nb_workers, go[2], results[2];
+	double duration;
+	pid_t workers[MAX_WORKERS];
+	worker_result_t res[MAX_WORKERS];
+	struct sign_ctx_t *ctx = NULL;
+
+	for (int i = 1; i < argc; i++) {
+		if (strcmp(argv[i], "--json") == 0) {
+			json = 1;
+		} else if (strcmp(argv[i], "--expanded-key") == 0) {
+			expanded_key = 1;
+		} else if ((nb_values < 2) && (sscanf(argv[i], "%ld", &values[nb_values]) == 1) && (values[nb_values] > 0)) {
+			nb_values++;
+		} else {
+			printf("Usage: %s [nb_workers] [duration_seconds] [--expanded-key] [--json]\n", argv[0]);
+			exit(EXIT_FAILURE);
+		}
+	}
+	nb_workers = (int)values[0];
+	duration = (double)values[1];
+	if (nb_workers > MAX_WORKERS) {
+		printf("Error: at most %d workers\n", MAX_WORKERS);
+		exit(EXIT_FAILURE);
+	}
+
+	srand((unsigned int) time(NULL));
+	if (!json) {
+		print_configuration();
+		printf("\n");
+	}
+
+	/* The key and the reference signature to verify are shared by all the workers */
+	uint8_t pk[CRYPTO_PUBLICKEYBYTES];
+	uint8_t sk[CRYPTO_SECRETKEYBYTES];
+	uint8_t m[MLEN] = {1, 2, 3, 4};
+	uint8_t ref_sig[CRYPTO_BYTES];
+	unsigned long long siglen;
+	if (crypto_sign_keypair(pk, sk) || crypto_sign_signature(ref_sig, &siglen, m, MLEN, sk)) {
+		fprintf(stderr, "Failure: crypto_sign_keypair/crypto_sign_signature\n");
+		exit(EXIT_FAILURE);
+	}
+	if (expanded_key && crypto_sign_keypair_expand(&ctx, sk)) {
+		fprintf(stderr, "Failure: crypto_sign_keypair_expand\n");
+		exit(EXIT_FAILURE);
+	}
+
+	/* The workers all start when the "go" pipe is closed */
+	if (pipe(go) || pipe(results)) {
+		fprintf(stderr, "Error: pipe\n");
+		exit(EXIT_FAILURE);
+	}
+	fflush(stdout);
+	for (int w = 0; w < nb_workers; w++) {
+		workers[w] = fork();
+		if (workers[w] < 0) {
+			fprintf(stderr, "Error: fork\n");
+			exit(EXIT_FAILURE);
+		}
+		if (workers[w] == 0) {
+			worker_result_t r;
+			char c;
+			memset(&r, 0, sizeof(r));
+			srand((unsigned int) time(NULL) ^ (unsigned int) getpid());
+			close(go[1]);
+			close(results[0]);
+			while (read(go[0], &c, 1) > 0);
+			run_worker(PHASE_SIGN, duration, pk, sk, ctx, ref_sig, &r);
+			run_worker(PHASE_VERIFY, duration, pk, sk, ctx, ref_sig, &r);
+			if (write(results[1], &r, sizeof(r)) != sizeof(r)) {
+				_exit(EXIT_FAILURE);
+			}
+			_exit(EXIT_SUCCESS);
+		}
+	}
+	close(go[0]);
+	close(results[1]);
+	/* Go! */
+	close(go[1]);
+	for (int w = 0; w < nb_workers; w++) {
+		if (read(results[0], &res[w], sizeof(res[w])) != sizeof(res[w])) {
+			fprintf(stderr, "Error: worker result\n");
+			exit(EXIT_FAILURE);
+		}
+	}
+	for (int w = 0; w < nb_workers; w++) {
+		waitpid(workers[w], NULL, 0);
+	}
+	close(results[0]);
+	if (ctx != NULL) {
+		crypto_sign_expanded_key_free(ctx);
+	}
+
+	/* Aggregate */
+	uint64_t nb_failures = 0;
+	uint64_t nb_ops[2] = { 0, 0 };
+	double ops_per_sec[2] = { 0., 0. };
+	for (int w = 0; w < nb_workers; w++) {
+		nb_failures += res[w].nb_failures;
+		for (int p = 0; p < 2; p++) {
+			nb_ops[p] += res[w].nb_ops[p];
+			ops_per_sec[p] += (double)res[w].nb_ops[p] / res[w].elapsed[p];
+		}
+	}
+
+	if (json) {
+		printf("{");
+		print_configuration_json();
+		printf(", \"nb_workers\": %d, \"duration\": %.2f, \"expanded_key\": %d, \"failures\": %lu",
+		       nb_workers, duration, expanded_key, (unsigned long)nb_failures);
+		for (int p = 0; p < 2; p++) {
+			printf(", \"%s\": {\"ops\": %lu, \"ops_per_sec\": %.3f, \"per_worker_ops_per_sec\": [", phase_keys[p],
+			       (unsigned long)nb_ops[p], ops_per_sec[p]);
+			for (int w = 0; w < nb_workers; w++) {
+				printf("%s%.3f", (w == 0) ? "" : ", ", (double)res[w].nb_ops[p] / res[w].elapsed[p]);
+			}
+			printf("]}");
+		}
+		printf("}\n");
+	} else {
+		printf("===== SUMMARY =====\n");
+		printf("Workers: %d, duration: %.2f s per phase%s\n", nb_workers, duration, expanded_key ? " (expanded key)" : "");
+		printf("Failures: %lu\n", (unsigned long)nb_failures);
+		printf(" - Sign:   %.2f ops/s (%lu ops)\n", ops_per_sec[PHASE_SIGN], (unsigned long)nb_ops[PHASE_SIGN]);
+		printf(" - Verify: %.2f ops/s (%lu ops)\n", ops_per_sec[PHASE_VERIFY], (unsigned long)nb_ops[PHASE_VERIFY]);
+	}
+
+	return (nb_failures == 0) ? EXIT_SUCCESS : EXIT_FAILURE;
+}
@@ -104,6 +104,87 @@ extern long long platform_get_cycles(void);
 #endif
 #endif
 
+#ifdef BENCHMARK_PERF
+/* ====================================================== */
+/* Hardware performance counters through the Linux perf events */
+#if !defined(__linux__)
+#error "BENCHMARK_PERF is only supported on Linux"
+#endif
+#include <errno.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/syscall.h>
+#include <linux/perf_event.h>
+
+#define PERF_HW_CACHE(cache, op, result) ((cache) | ((op) << 8) | ((result) << 16))
+static const struct {
+	uint32_t type;
+	uint64_t config;
+} perf_events[BTIMER_PERF_EVENTS] = {
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS },
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES },
+	{ PERF_TYPE_HW_CACHE, PERF_HW_CACHE(PERF_COUNT_HW_CACHE_L1D, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS) },
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES },
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_MISSES },
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_STALLED_CYCLES_FRONTEND },
+	{ PERF_TYPE_HARDWARE, PERF_COUNT_HW_STALLED_CYCLES_BACKEND },
+};
+const char *btimer_perf_names[BTIMER_PERF_EVENTS] = {
+	"instructions", "cycles", "l1d_read_misses", "llc_misses", "branch_misses", "stalled_cycles_frontend", "stalled_cycles_backend",
+};
+static int perf_fds[BTIMER_PERF_EVENTS];
+static int perf_errno = 0;
+
+/* NOTE: the events are opened independently (not as a group), so that the
+ * events not supported by the CPU are only skipped, and that the kernel can
+ * multiplex them when there are not enough counters (the counts are then
+ * scaled). Only the calling thread is counted, in user space. */
+__attribute__((constructor)) static void perf_counters_setup(void) {
+	for (int i = 0; i < BTIMER_PERF_EVENTS; i++) {
+		struct perf_event_attr pe;
+		memset(&pe, 0, sizeof(pe));
+		pe.size = sizeof(pe);
+		pe.type = perf_events[i].type;
+		pe.config = perf_events[i].config;
+		pe.exclude_kernel = 1;
+		pe.exclude_hv = 1;
+		pe.read_format = PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING;
+		perf_fds[i] = (int)syscall(__NR_perf_event_open, &pe, 0, -1, -1, 0);
+		if (perf_fds[i] == -1) {
+			perf_errno = errno;
+		}
+	}
+}
+
+static inline void perf_read(uint64_t values[BTIMER_PERF_EVENTS]) {
+	for (int i = 0; i < BTIMER_PERF_EVENTS; i++) {
+		/* value, time enabled, time running */
+		uint64_t v[3];
+		values[i] = 0;
+		if ((perf_fds[i] != -1) && (read(perf_fds[i], v, sizeof(v)) == (ssize_t)sizeof(v))) {
+			values[i] = ((v[2] != 0) && (v[2] < v[1])) ? (uint64_t)((double)v[0] * ((double)v[1] / (double)v[2])) : v[0];
+		}
+	}
+}
+
+int btimer_perf_available(int event) {
+	return (event >= 0) && (event < BTIMER_PERF_EVENTS) && (perf_fds[event] != -1);
+}
+
+const char *btimer_perf_error(void) {
+	for (int i = 0; i < BTIMER_PERF_EVENTS; i++) {
+		if (perf_fds[i] != -1) {
+			return NULL;
+		}
+	}
+	return strerror(perf_errno);
+}
+
+double btimer_get_perf(btimer_t *timer, int event) {
+	return (double)timer->perf[event] / timer->counter;
+}
+#endif
+
 void btimer_init(btimer_t* timer) {
 	if (timer != NULL) {
 		timer->counter = 0;
@@ -111,6 +192,11 @@ void btimer_init(btimer_t* timer) {
 		timer->nb_cycles = 0;
 		timer->start.tv_sec = timer->start.tv_usec = 0;
 		timer->stop.tv_sec = timer->stop.tv_usec = 0;
+#ifdef BENCHMARK_PERF
+		for (int i = 0; i < BTIMER_PERF_EVENTS; i++) {
+			timer->perf[i] = timer->perf_start[i] = 0;
+		}
+#endif
 	}
 }
 void btimer_count(btimer_t *timer) {
@@ -139,6 +225,9 @@ void btimer_start(btimer_t *timer) {
 #endif /* BENCHMARK_TIME */
 #ifdef BENCHMARK_CYCLES
 		timer->cstart = platform_get_cycles();
+#endif
+#ifdef BENCHMARK_PERF
+		perf_read(timer->perf_start);
 #endif
 	}
 }
@@ -150,6 +239,13 @@ uint64_t btimer_diff_cycles(btimer_t *timer) {
 }
 void btimer_end(btimer_t *timer) {
 	if (timer != NULL) {
+#ifdef BENCHMARK_PERF
+		uint64_t perf_stop[BTIMER_PERF_EVENTS];
+		perf_read(perf_stop);
+		for (int i = 0; i < BTIMER_PERF_EVENTS; i++) {
+			timer->perf[i] += perf_stop[i] - timer->perf_start[i];
+		}
+#endif
 #ifdef BENCHMARK_TIME
 #if defined(CLOCK_MONOTONIC_COARSE) && !defined(BENCHMARK_USE_GETTIMEOFDAY)
 		/* NOTE: when available, we use CLOCK_MONOTONIC_COARSE
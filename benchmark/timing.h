@@ -40,6 +40,22 @@ extern void gettimeofday(struct timeval*, void*);
 #define btimer_diff_cycles MQOM_NAMESPACE(btimer_diff_cycles)
 #define btimer_get MQOM_NAMESPACE(btimer_get)
 #define btimer_get_cycles MQOM_NAMESPACE(btimer_get_cycles)
+#define btimer_perf_names MQOM_NAMESPACE(btimer_perf_names)
+#define btimer_perf_available MQOM_NAMESPACE(btimer_perf_available)
+#define btimer_perf_error MQOM_NAMESPACE(btimer_perf_error)
+#define btimer_get_perf MQOM_NAMESPACE(btimer_get_perf)
+
+#ifdef BENCHMARK_PERF
+/* Hardware performance counters (Linux perf events) collected by the timers */
+#define BTIMER_PERF_INSTRUCTIONS 0
+#define BTIMER_PERF_CYCLES 1
+#define BTIMER_PERF_L1D_READ_MISSES 2
+#define BTIMER_PERF_LLC_MISSES 3
+#define BTIMER_PERF_BRANCH_MISSES 4
+#define BTIMER_PERF_STALLED_CYCLES_FRONTEND 5
+#define BTIMER_PERF_STALLED_CYCLES_BACKEND 6
+#define BTIMER_PERF_EVENTS 7
+#endif
 
 typedef struct btimer_t {
 	unsigned int counter;
@@ -50,6 +66,11 @@ typedef struct btimer_t {
 	uint64_t nb_cycles;
 	unsigned int garbage;
 	uint64_t cstart, cstop;
+#ifdef BENCHMARK_PERF
+	// perf events
+	uint64_t perf[BTIMER_PERF_EVENTS];
+	uint64_t perf_start[BTIMER_PERF_EVENTS];
+#endif
 } btimer_t;
 
 void btimer_init(btimer_t* timer);
@@ -60,5 +81,14 @@ double btimer_diff(btimer_t *timer);
 uint64_t btimer_diff_cycles(btimer_t *timer);
 double btimer_get(btimer_t *timer);
 double btimer_get_cycles(btimer_t *timer);
+#ifdef BENCHMARK_PERF
+extern const char *btimer_perf_names[BTIMER_PERF_EVENTS];
+/* Whether an event could be opened (not all the events exist on all the CPUs) */
+int btimer_perf_available(int event);
+/* Reason of the failure when no event could be opened, NULL otherwise */
+const char *btimer_perf_error(void);
+/* Mean count of an event per timer count (scaled when multiplexed) */
+double btimer_get_perf(btimer_t *timer, int event);
+#endif
 
 #endif /* MQOM_TIMING_H */
@@ -110,7 +110,9 @@ static inline void print_configuration(void) {
 #endif
 #ifdef MEMORY_EFFICIENT_BLC
 	printf("  BLC: memopt\r\n");
-#if defined(BLC_INTERNAL_X4)
+#if defined(BLC_INTERNAL_X8)
+	printf("    BLC_INTERNAL: X8\r\n");
+#elif defined(BLC_INTERNAL_X4)
 	printf("    BLC_INTERNAL: X4\r\n");
 #elif defined(BLC_INTERNAL_X2)
 	printf("    BLC_INTERNAL: X2\r\n");
@@ -163,6 +165,11 @@ static inline void print_configuration(void) {
 #else
 	printf("    - USE_XOF_X4: OFF\r\n");
 #endif
+#ifdef USE_XOF_X8
+	printf("    - USE_XOF_X8: ON\r\n");
+#else
+	printf("    - USE_XOF_X8: OFF\r\n");
+#endif
 
 #ifdef PRG_ONE_RIJNDAEL_CTX
 	printf("    - PRG_ONE_RIJNDAEL_CTX: ON (forcing only one Rijndael ctx for PRG_x1)\r\n");
@@ -201,4 +208,303 @@ static inline void print_configuration(void) {
 #endif
 }
 
+/* JSON helpers for the machine readable outputs */
+static inline void json_print_string(const char *str) {
+	putchar('"');
+	for (; *str != '\0'; str++) {
+		if ((*str == '"') || (*str == '\\')) {
+			putchar('\\');
+		}
+		putchar(*str);
+	}
+	putchar('"');
+}
+
+static inline void json_print_key_string(const char *key, const char *value, int last) {
+	printf("\"%s\": ", key);
+	json_print_string(value);
+	printf("%s", last ? "" : ", ");
+}
+
+static inline void json_print_key_int(const char *key, long int value, int last) {
+	printf("\"%s\": %ld%s", key, value, last ? "" : ", ");
+}
+
+/* Same elements as print_configuration, as a JSON "config" member */
+static inline void print_configuration_json(void) {
+	const char *sep = "";
+
+	printf("\"config\": {");
+	json_print_key_string("name", CRYPTO_ALGNAME, 0);
+	json_print_key_string("version", CRYPTO_VERSION, 0);
+	json_print_key_int("security", MQOM2_PARAM_SECURITY, 0);
+	json_print_key_int("base_field", MQOM2_PARAM_BASE_FIELD, 0);
+	json_print_key_int("trade_off", MQOM2_PARAM_TRADEOFF, 0);
+	json_print_key_int("nb_rounds", MQOM2_PARAM_NBROUNDS, 0);
+	json_print_key_int("tau", MQOM2_PARAM_TAU, 0);
+	json_print_key_string("platform", COMPILER_PLATFORM, 0);
+	printf("\"instruction_sets\": [");
+#ifdef __SSE__
+	printf("%s\"SSE\"", sep);
+	sep = ", ";
+#endif
+#ifdef __AVX__
+	printf("%s\"AVX\"", sep);
+	sep = ", ";
+#endif
+#ifdef __AVX2__
+	printf("%s\"AVX2\"", sep);
+	sep = ", ";
+#endif
+#if defined(__AVX512BW__) && defined(__AVX512F__) && defined(__AVX512VL__) && defined(__AVX512VPOPCNTDQ__) && defined(__AVX512VBMI__)
+	printf("%s\"AVX512BW\", \"AVX512F\", \"AVX512VL\", \"AVX512VPOPCNTDQ\", \"AVX512VBMI\"", sep);
+	sep = ", ";
+#endif
+#if defined(__GFNI__) && !defined(NO_GFNI)
+	printf("%s\"GFNI\"", sep);
+	sep = ", ";
+#endif
+#ifdef __AES__
+	printf("%s\"AES-NI\"", sep);
+	sep = ", ";
+#endif
+	(void)sep;
+	printf("], ");
+#if defined(KECCAK_PLATFORM)
+	json_print_key_string("keccak", STR(KECCAK_PLATFORM), 0);
+#else
+	json_print_key_string("keccak", "unknown", 0);
+#endif
+#ifdef MEMORY_EFFICIENT_KEYGEN
+	json_print_key_string("keygen", "memopt", 0);
+#else
+	json_print_key_string("keygen", "default", 0);
+#endif
+#ifdef VERIFY_MEMOPT
+	json_print_key_string("verify", "memopt", 0);
+#else
+	json_print_key_string("verify", "default", 0);
+#endif
+#if defined(PIOP_BITSLICE)
+	json_print_key_string("piop", "bitslice", 0);
+#elif defined(MEMORY_EFFICIENT_PIOP)
+	json_print_key_string("piop", "memopt", 0);
+#ifdef PIOP_NB_PARALLEL_REPETITIONS_SIGN
+	json_print_key_int("piop_nb_parallel_repetitions_sign", PIOP_NB_PARALLEL_REPETITIONS_SIGN, 0);
+#else
+	json_print_key_int("piop_nb_parallel_repetitions_sign", MQOM2_PARAM_TAU, 0);
+#endif
+#ifdef PIOP_NB_PARALLEL_REPETITIONS_VERIFY
+	json_print_key_int("piop_nb_parallel_repetitions_verify", PIOP_NB_PARALLEL_REPETITIONS_VERIFY, 0);
+#else
+	json_print_key_int("piop_nb_parallel_repetitions_verify", MQOM2_PARAM_TAU, 0);
+#endif
+#else
+	json_print_key_string("piop", "default", 0);
+#endif
+#ifdef MEMORY_EFFICIENT_BLC
+	json_print_key_string("blc", "memopt", 0);
+#if defined(BLC_INTERNAL_X8)
+	json_print_key_string("blc_internal", "x8", 0);
+#elif defined(BLC_INTERNAL_X4)
+	json_print_key_string("blc_internal", "x4", 0);
+#elif defined(BLC_INTERNAL_X2)
+	json_print_key_string("blc_internal", "x2", 0);
+#else
+	json_print_key_string("blc_internal", "x1", 0);
+#endif
+#ifdef BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE
+	json_print_key_int("blc_nb_seed_commitments_per_hash_update", BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE, 0);
+#else
+	json_print_key_int("blc_nb_seed_commitments_per_hash_update", 1, 0);
+#endif
+#ifdef GGMTREE_NB_ENC_CTX_IN_MEMORY
+	json_print_key_int("ggmtree_nb_enc_ctx_in_memory", GGMTREE_NB_ENC_CTX_IN_MEMORY, 0);
+#else
+	json_print_key_int("ggmtree_nb_enc_ctx_in_memory", 1, 0);
+#endif
+#ifdef SEED_COMMIT_MEMOPT
+	json_print_key_int("seed_commit_memopt", 1, 0);
+#else
+	json_print_key_int("seed_commit_memopt", 0, 0);
+#endif
+#else
+	json_print_key_string("blc", "default", 0);
+#endif
+#ifdef USE_PRG_CACHE
+	json_print_key_int("prg_cache", 1, 0);
+#else
+	json_print_key_int("prg_cache", 0, 0);
+#endif
+#if defined(USE_PIOP_CACHE) && !defined(MEMORY_EFFICIENT_PIOP)
+	json_print_key_int("piop_cache", 1, 0);
+#else
+	json_print_key_int("piop_cache", 0, 0);
+#endif
+	json_print_key_string("rijndael", rijndael_conf, 0);
+	json_print_key_string("rijndael_pub", rijndael_conf_pub, 0);
+	json_print_key_string("fields", fields_conf, 0);
+#if defined(PIOP_BITSLICE)
+	json_print_key_string("fields_bitslice", fields_bitslice_conf, 0);
+#endif
+#ifdef USE_ENC_X8
+	json_print_key_int("use_enc_x8", 1, 0);
+#else
+	json_print_key_int("use_enc_x8", 0, 0);
+#endif
+#ifdef USE_XOF_X4
+	json_print_key_int("use_xof_x4", 1, 0);
+#else
+	json_print_key_int("use_xof_x4", 0, 0);
+#endif
+#ifdef USE_XOF_X8
+	json_print_key_int("use_xof_x8", 1, 0);
+#else
+	json_print_key_int("use_xof_x8", 0, 0);
+#endif
+#ifdef PRG_ONE_RIJNDAEL_CTX
+	json_print_key_int("prg_one_rijndael_ctx", 1, 0);
+#else
+	json_print_key_int("prg_one_rijndael_ctx", 0, 0);
+#endif
+#if defined(USE_PRG_CACHE) && defined(NO_EXPANDMQ_PRG_CACHE)
+	json_print_key_int("no_expandmq_prg_cache", 1, 0);
+#else
+	json_print_key_int("no_expandmq_prg_cache", 0, 0);
+#endif
+#if defined(USE_PRG_CACHE) && defined(NO_BLC_PRG_CACHE)
+	json_print_key_int("no_blc_prg_cache", 1, 0);
+#else
+	json_print_key_int("no_blc_prg_cache", 0, 0);
+#endif
+#ifdef USE_ENC_CTX_CLEANSING
+	json_print_key_int("use_enc_ctx_cleansing", 1, 0);
+#else
+	json_print_key_int("use_enc_ctx_cleansing", 0, 0);
+#endif
+#ifdef USE_SIGNATURE_BUFFER_AS_TEMP
+	json_print_key_int("use_signature_buffer_as_temp", 1, 0);
+#else
+	json_print_key_int("use_signature_buffer_as_temp", 0, 0);
+#endif
+#ifndef NDEBUG
+	json_print_key_string("debug", "On", 1);
+#else
+	json_print_key_string("debug", "Off", 1);
+#endif
+	printf("}");
+}
+
+/* Peak memory of the process: resident set high water mark and stack size
+ * (in kB), as accounted by Linux since the process start */
+static inline void print_peak_memory(void) {
+#if defined(__linux__)
+	char line[128];
+	unsigned long value;
+	FILE *fptr = fopen("/proc/self/status", "r");
+	if (fptr == NULL) {
+		return;
+	}
+	while (fgets(line, sizeof(line), fptr) != NULL) {
+		if (sscanf(line, "VmHWM: %lu kB", &value) == 1) {
+			printf("Peak resident memory: %lu kB\n", value);
+		}
+		else if (sscanf(line, "VmStk: %lu kB", &value) == 1) {
+			printf("Stack size: %lu kB\n", value);
+		}
+	}
+	fclose(fptr);
+#endif
+}
+
+/* Native peak memory measurement (the "--probe" mode of the bench_mem_*
+ * programs), much faster than valgrind massif:
+ * - the stack high water mark is found by painting the unused part of the
+ *   stack with a pattern before the measured call, and by looking for the
+ *   deepest byte that has been overwritten afterwards (only the calling
+ *   thread stack is painted);
+ * - the heap peak is the one of the mqom_malloc/mqom_calloc allocation
+ *   probes (see common.h), without the allocator overhead.
+ */
+#if defined(__unix__) || (defined(__APPLE__) && defined(__MACH__))
+#include <string.h>
+#include <sys/resource.h>
+#define MEM_PROBE_PATTERN 0xa5
+/* Part of the stack limit that is not painted (frames of the callers,
+ * environment, ...) */
+#define MEM_PROBE_STACK_MARGIN (512 * 1024)
+#define MEM_PROBE_STACK_MAX (64 * 1024 * 1024)
+
+static uint8_t *mem_probe_stack_ref = NULL;
+static uint8_t *mem_probe_stack_bottom = NULL;
+static size_t mem_probe_stack_size = 0;
+
+static inline int get_mem_probe_mode(int argc, char *argv[]) {
+	return (argc == 2) && (strcmp(argv[1], "--probe") == 0);
+}
+
+/* Paint the stack below the frame of the caller: the measured call must
+ * be made from the same function as mem_probe_start */
+static __attribute__((noinline)) void mem_probe_paint(size_t size) {
+	volatile uint8_t *buf = (volatile uint8_t*)__builtin_alloca(size);
+	size_t i;
+
+	for (i = 0; i < size; i++) {
+		buf[i] = MEM_PROBE_PATTERN;
+	}
+	mem_probe_stack_bottom = (uint8_t*)buf;
+	mem_probe_stack_ref = (uint8_t*)__builtin_frame_address(0);
+}
+
+static inline void mem_probe_start(void) {
+	struct rlimit rl;
+	size_t size = 8 * 1024 * 1024;
+
+	if ((getrlimit(RLIMIT_STACK, &rl) == 0) && (rl.rlim_cur != RLIM_INFINITY)) {
+		size = (size_t)rl.rlim_cur;
+	}
+	if (size > MEM_PROBE_STACK_MAX) {
+		size = MEM_PROBE_STACK_MAX;
+	}
+	mem_probe_stack_size = size - MEM_PROBE_STACK_MARGIN;
+	mem_probe_paint(mem_probe_stack_size);
+#if defined(MAX_TRACKED_POINTERS)
+	reset_alloc_usage();
+#endif
+}
+
+static inline void mem_probe_report(void) {
+	size_t i;
+	long int stack_peak;
+
+	for (i = 0; i < mem_probe_stack_size; i++) {
+		if (mem_probe_stack_bottom[i] != MEM_PROBE_PATTERN) {
+			break;
+		}
+	}
+	if (i == 0) {
+		/* The whole painted area has been used: the measure is a lower bound */
+		printf("[-] WARNING: the stack usage exceeds the painted area\n");
+	}
+	stack_peak = (long int)(mem_probe_stack_ref - &mem_probe_stack_bottom[i]);
+	printf("Stack peak usage: %ld bytes\n", (stack_peak > 0) ? stack_peak : 0);
+#if defined(MAX_TRACKED_POINTERS)
+	printf("Heap peak usage: %ld bytes\n", alloc_peak_usage);
+#else
+	/* No allocation probes in this build (e.g. NO_BENCHMARK_TIME=1) */
+	printf("Heap peak usage: unavailable\n");
+#endif
+}
+#else
+static inline int get_mem_probe_mode(int argc, char *argv[]) {
+	(void)argc;
+	(void)argv;
+	return 0;
+}
+static inline void mem_probe_start(void) {
+}
+static inline void mem_probe_report(void) {
+}
+#endif
+
 #endif /* MQOM_BENCH_UTILS_H */
@@ -2,6 +2,7 @@
 #include "ggm_tree.h"
 #include "benchmark.h"
 #include "seed_commit.h"
+#include "threadpool.h"
 
 #if defined(SUPERCOP)
 #include "crypto_declassify.h"
@@ -9,52 +10,136 @@
 
 #include "blc_common.h"
 
-int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], uint8_t com1[MQOM2_PARAM_DIGEST_SIZE], blc_key_default_t* key, field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+/* Deal with X4/X8 XOF buffering optimization in BLC_Commit and BLC_Eval:
+ * the tau repetitions are processed by groups of LS_COMM_E_ALLOC, each
+ * group being an independent task of the (possibly multi-threaded) loop */
+#if defined(USE_XOF_X8)
+#define LS_COMM_E_ALLOC 8
+#elif defined(USE_XOF_X4)
+#define LS_COMM_E_ALLOC 4
+#else
+#define LS_COMM_E_ALLOC 1
+#endif
+#define BLC_NB_TASKS ((MQOM2_PARAM_TAU + LS_COMM_E_ALLOC - 1) / LS_COMM_E_ALLOC)
+
+/* Hash the seed commitments ls_com[0 ... e_end - e_start - 1] of the repetitions e_start ... e_end - 1 */
+static inline int BLC_HashSeedCommitments(uint32_t e_start, uint32_t e_end, const uint8_t (*const ls_com[LS_COMM_E_ALLOC])[MQOM2_PARAM_DIGEST_SIZE], uint8_t hash_ls_com[MQOM2_PARAM_TAU][MQOM2_PARAM_DIGEST_SIZE]) {
 	int ret = -1;
-	enc_ctx DECL_VAR(ctx_seed_commit1), DECL_VAR(ctx_seed_commit2);
+	uint32_t e = e_start, i;
 	xof_context DECL_VAR(xof_ctx);
-	uint8_t tweaked_salt[MQOM2_PARAM_SALT_SIZE];
-	uint8_t delta[MQOM2_PARAM_SEED_SIZE];
-	uint8_t rseed[MQOM2_PARAM_TAU][MQOM2_PARAM_SEED_SIZE];
-	uint32_t e, i;
-	/* The serialization of x */
-	uint8_t _x[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)];
-	/* Tree rseed PRG salt, set to 0 */
-	uint8_t tree_prg_salt[MQOM2_PARAM_SALT_SIZE] = { 0 };
-	/* PRG cache */
-	prg_key_sched_cache_x8 *prg_cache_x8 = NULL;
+#if defined(USE_XOF_X8)
+	xof_context_x8 DECL_VAR(xof_ctx_x8);
+#endif
+#if defined(USE_XOF_X4) || defined(USE_XOF_X8)
+	xof_context_x4 DECL_VAR(xof_ctx_x4);
+#endif
 
-	/* Compute the rseed table */
-	ret = PRG(tree_prg_salt, 0, mseed, MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE, (uint8_t*)rseed, NULL);
-	ERR(ret, err);
-	/* Compute delta */
-	field_base_serialize(x, MQOM2_PARAM_MQ_N, _x);
-	memcpy(delta, _x, MQOM2_PARAM_SEED_SIZE);
+#if defined(USE_XOF_X8)
+	if ((e_end - e) == 8) {
+		/* Use the X8 XOF on the 8 repetitions */
+		const uint8_t *constant_6[8];
+		const uint8_t *to_hash_ptr[8];
+		uint8_t *hash_ptr[8];
+		for (i = 0; i < 8; i++) {
+			constant_6[i] = (const uint8_t*) "\x06";
+			to_hash_ptr[i] = (const uint8_t*) ls_com[e - e_start + i];
+			hash_ptr[i] = hash_ls_com[e + i];
+		}
+		ret = xof_init_x8(&xof_ctx_x8);
+		ERR(ret, err);
+		ret = xof_update_x8(&xof_ctx_x8, constant_6, 1);
+		ERR(ret, err);
+		ret = xof_update_x8(&xof_ctx_x8, to_hash_ptr, MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+		ret = xof_squeeze_x8(&xof_ctx_x8, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+		e += 8;
+	}
+#endif
+#if defined(USE_XOF_X4) || defined(USE_XOF_X8)
+	if ((e_end - e) >= 4) {
+		/* Use the X4 XOF on 4 repetitions */
+		const uint8_t *constant_6[4];
+		const uint8_t *to_hash_ptr[4];
+		uint8_t *hash_ptr[4];
+		for (i = 0; i < 4; i++) {
+			constant_6[i] = (const uint8_t*) "\x06";
+			to_hash_ptr[i] = (const uint8_t*) ls_com[e - e_start + i];
+			hash_ptr[i] = hash_ls_com[e + i];
+		}
+		ret = xof_init_x4(&xof_ctx_x4);
+		ERR(ret, err);
+		ret = xof_update_x4(&xof_ctx_x4, constant_6, 1);
+		ERR(ret, err);
+		ret = xof_update_x4(&xof_ctx_x4, to_hash_ptr, MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+		ret = xof_squeeze_x4(&xof_ctx_x4, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+		e += 4;
+	}
+#endif
+	/* Remaining repetitions: no room for the X4/X8 XOF, perform regular */
+	for (; e < e_end; e++) {
+		ret = xof_init(&xof_ctx);
+		ERR(ret, err);
+		ret = xof_update(&xof_ctx, (const uint8_t*) "\x06", 1);
+		ERR(ret, err);
+		ret = xof_update(&xof_ctx, (const uint8_t*) ls_com[e - e_start], MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+		ret = xof_squeeze(&xof_ctx, hash_ls_com[e], MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+	}
 
-#ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
-	memcpy(key->salt, salt, MQOM2_PARAM_SALT_SIZE);
-	memcpy(key->delta, delta, MQOM2_PARAM_SEED_SIZE);
-	memcpy((uint8_t*) key->rseed, (uint8_t*) rseed, sizeof(rseed));
+	ret = 0;
+err:
+#if defined(USE_XOF_X8)
+	xof_clean_ctx_x8(&xof_ctx_x8);
+#endif
+#if defined(USE_XOF_X4) || defined(USE_XOF_X8)
+	xof_clean_ctx_x4(&xof_ctx_x4);
 #endif
+	xof_clean_ctx(&xof_ctx);
+	return ret;
+}
 
-	uint8_t hash_ls_com[MQOM2_PARAM_TAU][MQOM2_PARAM_DIGEST_SIZE];
+/* Shared (read only, or written at task specific indices) data of the BLC_Commit tasks */
+typedef struct {
+	const uint8_t *salt;
+	const uint8_t *delta;
+	const uint8_t (*rseed)[MQOM2_PARAM_SEED_SIZE];
+	const field_base_elt *x;
+	blc_key_default_t *key;
+	field_ext_elt (*x0)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*u0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt (*u1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	uint8_t (*hash_ls_com)[MQOM2_PARAM_DIGEST_SIZE];
+} blc_commit_task_t;
+
+/* Commit the repetitions of the group task, i.e. e = LS_COMM_E_ALLOC * task ... */
+static int BLC_Commit_task(void *arg, uint32_t task) {
+	int ret = -1;
+	const blc_commit_task_t *t = (const blc_commit_task_t*) arg;
+	const uint8_t *salt = t->salt;
+	const field_base_elt *x = t->x;
+	blc_key_default_t *key = t->key;
+	field_ext_elt (*x0)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)] = t->x0;
+	field_ext_elt (*u0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)] = t->u0;
+	field_ext_elt (*u1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)] = t->u1;
+	enc_ctx DECL_VAR(ctx_seed_commit1), DECL_VAR(ctx_seed_commit2);
+	uint8_t tweaked_salt[MQOM2_PARAM_SALT_SIZE];
+	uint32_t e, i;
+	uint32_t e_start = task * LS_COMM_E_ALLOC;
+	uint32_t e_end = ((e_start + LS_COMM_E_ALLOC) < MQOM2_PARAM_TAU) ? (e_start + LS_COMM_E_ALLOC) : MQOM2_PARAM_TAU;
+	/* PRG cache */
+	prg_key_sched_cache_x8 *prg_cache_x8 = NULL;
 
 	/* Define "node" and "ls_com" that point either to the BLC key or to local arrays */
 #ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
 	uint8_t node_e[MQOM2_PARAM_FULL_TREE_SIZE + 1][MQOM2_PARAM_SEED_SIZE];
-	uint8_t ls_com_e[4][MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_DIGEST_SIZE];
-#endif
-	uint8_t (*node[MQOM2_PARAM_TAU])[MQOM2_PARAM_SEED_SIZE];
-	uint8_t (*ls_com[MQOM2_PARAM_TAU])[MQOM2_PARAM_DIGEST_SIZE];
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
-#ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
-		node[e] = node_e;
-		ls_com[e] = ls_com_e[e % 4];
-#else
-		node[e] = key->node[e];
-		ls_com[e] = key->ls_com[e];
+	uint8_t ls_com_e[LS_COMM_E_ALLOC][MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_DIGEST_SIZE];
 #endif
-	}
+	uint8_t (*node)[MQOM2_PARAM_SEED_SIZE];
+	uint8_t (*ls_com[LS_COMM_E_ALLOC])[MQOM2_PARAM_DIGEST_SIZE];
 
 	uint8_t lseed[MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_SEED_SIZE];
 	uint8_t exp[MQOM2_PARAM_NB_EVALS][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA)];
@@ -65,14 +150,21 @@ int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 	field_base_elt acc_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
 	uint8_t data_folding[MQOM2_PARAM_NB_EVALS_LOG][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA)];
 	uint8_t acc[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA)];
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+	for (e = e_start; e < e_end; e++) {
+#ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
+		node = node_e;
+		ls_com[e - e_start] = ls_com_e[e - e_start];
+#else
+		node = key->node[e];
+		ls_com[e - e_start] = key->ls_com[e];
+#endif
 		/* Initialize the PRG cache when used */
 #ifndef NO_BLC_PRG_CACHE
 		prg_cache_x8 = init_prg_cache_x8(PRG_BLC_SIZE);
 #endif
 
 		__BENCHMARK_START__(BS_BLC_EXPAND_TREE);
-		ret = GGMTree_Expand(salt, rseed[e], delta, e, node[e], lseed);
+		ret = GGMTree_Expand(salt, t->rseed[e], t->delta, e, node, lseed);
 		ERR(ret, err);
 		__BENCHMARK_STOP__(BS_BLC_EXPAND_TREE);
 
@@ -90,11 +182,10 @@ int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 		for (i = 0; i < MQOM2_PARAM_NB_EVALS; i += 8) {
 			__BENCHMARK_START__(BS_BLC_SEED_COMMIT);
 			SeedCommit_x4(&ctx_seed_commit1, &ctx_seed_commit2,
-			              lseed[i + 0], lseed[i + 1], lseed[i + 2], lseed[i + 3], ls_com[e][i + 0], ls_com[e][i + 1], ls_com[e][i + 2], ls_com[e][i + 3]);
+			              lseed[i + 0], lseed[i + 1], lseed[i + 2], lseed[i + 3], ls_com[e - e_start][i + 0], ls_com[e - e_start][i + 1], ls_com[e - e_start][i + 2], ls_com[e - e_start][i + 3]);
 			SeedCommit_x4(&ctx_seed_commit1, &ctx_seed_commit2,
-			              lseed[i + 4], lseed[i + 5], lseed[i + 6], lseed[i + 7], ls_com[e][i + 4], ls_com[e][i + 5], ls_com[e][i + 6], ls_com[e][i + 7]);
+			              lseed[i + 4], lseed[i + 5], lseed[i + 6], lseed[i + 7], ls_com[e - e_start][i + 4], ls_com[e - e_start][i + 5], ls_com[e - e_start][i + 6], ls_com[e - e_start][i + 7]);
 			__BENCHMARK_STOP__(BS_BLC_SEED_COMMIT);
-
 			__BENCHMARK_START__(BS_BLC_PRG);
 			memcpy(exp[i + 0], lseed[i + 0], MQOM2_PARAM_SEED_SIZE);
 			memcpy(exp[i + 1], lseed[i + 1], MQOM2_PARAM_SEED_SIZE);
@@ -155,48 +246,61 @@ int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 		field_base_serialize(delta_x, MQOM2_PARAM_MQ_N, serialized_delta_x);
 		memcpy(key->partial_delta_x[e], serialized_delta_x + MQOM2_PARAM_SEED_SIZE, BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE);
 		__BENCHMARK_STOP__(BS_BLC_ARITH);
+	}
 
-		__BENCHMARK_START__(BS_BLC_XOF);
-#if defined(USE_XOF_X4)
-		if ((e % 4) == 3) {
-			xof_context_x4 DECL_VAR(xof_ctx_x4);
-			/* Use the X4 XOF on the previously computed 4 */
-			const uint8_t *constant_6[4] = { (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06" };
-			const uint8_t *to_hash_ptr[4] = { (const uint8_t*) ls_com[e - 3], (const uint8_t*) ls_com[e - 2], (const uint8_t*) ls_com[e - 1], (const uint8_t*) ls_com[e] };
-			uint8_t *hash_ptr[4] = { hash_ls_com[e - 3], hash_ls_com[e - 2], hash_ls_com[e - 1], hash_ls_com[e] };
-			ret = xof_init_x4(&xof_ctx_x4);
-			ERR(ret, err);
-			ret = xof_update_x4(&xof_ctx_x4, constant_6, 1);
-			ERR(ret, err);
-			ret = xof_update_x4(&xof_ctx_x4, to_hash_ptr, MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			ret = xof_squeeze_x4(&xof_ctx_x4, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			xof_clean_ctx_x4(&xof_ctx_x4);
-		} else if (e >= (4 * (MQOM2_PARAM_TAU / 4)))
-			/* No room for X4 XOF, perform regular */
-		{
-			ret = xof_init(&xof_ctx);
-			ERR(ret, err);
-			ret = xof_update(&xof_ctx, (const uint8_t*) "\x06", 1);
-			ERR(ret, err);
-			ret = xof_update(&xof_ctx, (const uint8_t*) ls_com[e], MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			ret = xof_squeeze(&xof_ctx, hash_ls_com[e], MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-		}
-#else
-		ret = xof_init(&xof_ctx);
-		ERR(ret, err);
-		ret = xof_update(&xof_ctx, (const uint8_t*) "\x06", 1);
-		ERR(ret, err);
-		ret = xof_update(&xof_ctx, (const uint8_t*) ls_com[e], MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-		ERR(ret, err);
-		ret = xof_squeeze(&xof_ctx, hash_ls_com[e], MQOM2_PARAM_DIGEST_SIZE);
-		ERR(ret, err);
+	__BENCHMARK_START__(BS_BLC_XOF);
+	ret = BLC_HashSeedCommitments(e_start, e_end, (const uint8_t (*const *)[MQOM2_PARAM_DIGEST_SIZE]) ls_com, t->hash_ls_com);
+	__BENCHMARK_STOP__(BS_BLC_XOF);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	enc_clean_ctx(&ctx_seed_commit1);
+	enc_clean_ctx(&ctx_seed_commit2);
+	destroy_prg_cache_x8(prg_cache_x8);
+	return ret;
+}
+
+int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], uint8_t com1[MQOM2_PARAM_DIGEST_SIZE], blc_key_default_t* key, field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	xof_context DECL_VAR(xof_ctx);
+	uint8_t delta[MQOM2_PARAM_SEED_SIZE];
+	uint8_t rseed[MQOM2_PARAM_TAU][MQOM2_PARAM_SEED_SIZE];
+	uint32_t e;
+	/* The serialization of x */
+	uint8_t _x[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)];
+	/* Tree rseed PRG salt, set to 0 */
+	uint8_t tree_prg_salt[MQOM2_PARAM_SALT_SIZE] = { 0 };
+
+	/* Compute the rseed table */
+	ret = PRG(tree_prg_salt, 0, mseed, MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE, (uint8_t*)rseed, NULL);
+	ERR(ret, err);
+	/* Compute delta */
+	field_base_serialize(x, MQOM2_PARAM_MQ_N, _x);
+	memcpy(delta, _x, MQOM2_PARAM_SEED_SIZE);
+
+#ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
+	memcpy(key->salt, salt, MQOM2_PARAM_SALT_SIZE);
+	memcpy(key->delta, delta, MQOM2_PARAM_SEED_SIZE);
+	memcpy((uint8_t*) key->rseed, (uint8_t*) rseed, sizeof(rseed));
 #endif
-		__BENCHMARK_STOP__(BS_BLC_XOF);
-	}
+
+	uint8_t hash_ls_com[MQOM2_PARAM_TAU][MQOM2_PARAM_DIGEST_SIZE];
+
+	/* The repetitions are independent: commit them (possibly in parallel) */
+	blc_commit_task_t task = {
+		.salt = salt,
+		.delta = delta,
+		.rseed = (const uint8_t (*)[MQOM2_PARAM_SEED_SIZE]) rseed,
+		.x = x,
+		.key = key,
+		.x0 = x0,
+		.u0 = u0,
+		.u1 = u1,
+		.hash_ls_com = hash_ls_com,
+	};
+	ret = parallel_for(BLC_NB_TASKS, BLC_Commit_task, &task);
+	ERR(ret, err);
 
 	__BENCHMARK_START__(BS_BLC_XOF);
 	ret = xof_init(&xof_ctx);
@@ -217,50 +321,54 @@ int BLC_Commit_default(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 
 	ret = 0;
 err:
-	enc_clean_ctx(&ctx_seed_commit1);
-	enc_clean_ctx(&ctx_seed_commit2);
 	xof_clean_ctx(&xof_ctx);
-	destroy_prg_cache_x8(prg_cache_x8);
 	return ret;
 }
 
-int BLC_Open_default(const blc_key_default_t* key, const uint16_t i_star[MQOM2_PARAM_TAU], uint8_t opening[MQOM2_PARAM_OPENING_SIZE]) {
+typedef struct {
+	const blc_key_default_t *key;
+	const uint16_t *i_star;
+	uint8_t *opening;
+} blc_open_task_t;
+
+/* Open the repetition e */
+static int BLC_Open_task(void *arg, uint32_t e) {
 	int ret = -1;
-	int e;
+	const blc_open_task_t *t = (const blc_open_task_t*) arg;
+	const blc_key_default_t *key = t->key;
+	const uint16_t *i_star = t->i_star;
 #ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
 	enc_ctx DECL_VAR(ctx_seed_commit1), DECL_VAR(ctx_seed_commit2);
 	uint8_t lseed[MQOM2_PARAM_SEED_SIZE];
 	uint8_t tweaked_salt[MQOM2_PARAM_SALT_SIZE];
 #endif
 
-	uint8_t *path = &opening[0];
-	uint8_t *out_ls_com = &opening[MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG];
-	uint8_t *partial_delta_x = &opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
+	uint8_t *path = &t->opening[0];
+	uint8_t *out_ls_com = &t->opening[MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG];
+	uint8_t *partial_delta_x = &t->opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
 
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
 #if defined(SUPERCOP)
-		/* XXX: NOTE: we explicitly declassify i_star[e] as it is public data but comes from a dataflow involving secret data
-		 * through hashing */
-		crypto_declassify(&i_star[e], sizeof(i_star[e]));
+	/* XXX: NOTE: we explicitly declassify i_star[e] as it is public data but comes from a dataflow involving secret data
+	 * through hashing */
+	crypto_declassify(&i_star[e], sizeof(i_star[e]));
 #endif
 #ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
-		ret = GGMTree_ExpandPath(key->salt, key->rseed[e], key->delta, e, i_star[e], (uint8_t(*)[MQOM2_PARAM_SEED_SIZE]) &path[e * (MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE)], lseed);
-		ERR(ret, err);
-		TweakSalt(key->salt, tweaked_salt, 0, e, 0);
-		ret = enc_key_sched(&ctx_seed_commit1, tweaked_salt);
-		ERR(ret, err);
-		tweaked_salt[0] ^= 0x01;
-		ret = enc_key_sched(&ctx_seed_commit2, tweaked_salt);
-		ERR(ret, err);
-		SeedCommit(&ctx_seed_commit1, &ctx_seed_commit2, lseed, &out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE]);
+	ret = GGMTree_ExpandPath(key->salt, key->rseed[e], key->delta, e, i_star[e], (uint8_t(*)[MQOM2_PARAM_SEED_SIZE]) &path[e * (MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE)], lseed);
+	ERR(ret, err);
+	TweakSalt(key->salt, tweaked_salt, 0, e, 0);
+	ret = enc_key_sched(&ctx_seed_commit1, tweaked_salt);
+	ERR(ret, err);
+	tweaked_salt[0] ^= 0x01;
+	ret = enc_key_sched(&ctx_seed_commit2, tweaked_salt);
+	ERR(ret, err);
+	SeedCommit(&ctx_seed_commit1, &ctx_seed_commit2, lseed, &out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE]);
 #else
-		ret = GGMTree_Open(key->node[e], i_star[e], (uint8_t(*)[MQOM2_PARAM_SEED_SIZE]) &path[e * (MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE)]);
-		ERR(ret, err);
-		memcpy(&out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE], key->ls_com[e][i_star[e]], MQOM2_PARAM_DIGEST_SIZE);
+	ret = GGMTree_Open(key->node[e], i_star[e], (uint8_t(*)[MQOM2_PARAM_SEED_SIZE]) &path[e * (MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE)]);
+	ERR(ret, err);
+	memcpy(&out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE], key->ls_com[e][i_star[e]], MQOM2_PARAM_DIGEST_SIZE);
 #endif
 
-		memcpy(&partial_delta_x[e * (BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE)], key->partial_delta_x[e], BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE);
-	}
+	memcpy(&partial_delta_x[e * (BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE)], key->partial_delta_x[e], BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE);
 
 	ret = 0;
 err:
@@ -271,36 +379,68 @@ err:
 	return ret;
 }
 
-/* Deal with X4 XOF buffering optimization in BLC_Eval */
-#if defined(USE_XOF_X4)
-#define LS_COMM_E_ALLOC 4
-#define LS_COMM_E_COEFF(e) ((e) % 4)
+int BLC_Open_default(const blc_key_default_t* key, const uint16_t i_star[MQOM2_PARAM_TAU], uint8_t opening[MQOM2_PARAM_OPENING_SIZE]) {
+	int ret = -1;
+	blc_open_task_t task = {
+		.key = key,
+		.i_star = i_star,
+		.opening = opening,
+	};
+
+#ifndef BLC_KEEP_ALL_TREES_IN_MEMORY
+	/* Each path is recomputed from its root seed: spread the repetitions */
+	ret = parallel_for(MQOM2_PARAM_TAU, BLC_Open_task, &task);
+	ERR(ret, err);
 #else
-#define LS_COMM_E_ALLOC 1
-#define LS_COMM_E_COEFF(e) 0
+	/* Only copies from the key, not worth dispatching */
+	uint32_t e;
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+		ret = BLC_Open_task(&task, e);
+		ERR(ret, err);
+	}
 #endif
 
-int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t com1[MQOM2_PARAM_DIGEST_SIZE], const uint8_t opening[MQOM2_PARAM_OPENING_SIZE], const uint16_t i_star[MQOM2_PARAM_TAU], field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	ret = 0;
+err:
+	return ret;
+}
+
+typedef struct {
+	const uint8_t *salt;
+	const uint8_t *opening;
+	const uint16_t *i_star;
+	field_ext_elt (*x_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*u_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	uint8_t (*hash_ls_com)[MQOM2_PARAM_DIGEST_SIZE];
+} blc_eval_task_t;
+
+/* Evaluate the repetitions of the group task, i.e. e = LS_COMM_E_ALLOC * task ... */
+static int BLC_Eval_task(void *arg, uint32_t task) {
 	int ret = -1;
+	const blc_eval_task_t *t = (const blc_eval_task_t*) arg;
+	const uint8_t *salt = t->salt;
+	const uint16_t *i_star = t->i_star;
+	field_ext_elt (*x_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)] = t->x_eval;
+	field_ext_elt (*u_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)] = t->u_eval;
 	enc_ctx_pub DECL_VAR(ctx_seed_commit1), DECL_VAR(ctx_seed_commit2);
-	xof_context DECL_VAR(xof_ctx);
 	uint32_t e, i;
+	uint32_t e_start = task * LS_COMM_E_ALLOC;
+	uint32_t e_end = ((e_start + LS_COMM_E_ALLOC) < MQOM2_PARAM_TAU) ? (e_start + LS_COMM_E_ALLOC) : MQOM2_PARAM_TAU;
 	uint8_t tweaked_salt[MQOM2_PARAM_SALT_SIZE];
 	uint8_t lseed[MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_SEED_SIZE];
-	uint8_t com1_[MQOM2_PARAM_DIGEST_SIZE];
 	uint8_t ls_com_e[LS_COMM_E_ALLOC][MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_DIGEST_SIZE];
+	const uint8_t (*ls_com[LS_COMM_E_ALLOC])[MQOM2_PARAM_DIGEST_SIZE];
 	uint8_t exp[MQOM2_PARAM_NB_EVALS][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA)];
 
-	const uint8_t *path = &opening[0];
-	const uint8_t *out_ls_com = &opening[MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG];
-	const uint8_t *partial_delta_x = &opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
-
-	uint8_t hash_ls_com[MQOM2_PARAM_TAU][MQOM2_PARAM_DIGEST_SIZE];
+	const uint8_t *path = &t->opening[0];
+	const uint8_t *out_ls_com = &t->opening[MQOM2_PARAM_TAU * MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG];
+	const uint8_t *partial_delta_x = &t->opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
 
 	/* PRG cache */
 	prg_key_sched_cache_pub_x8 *prg_cache_x8 = NULL;
 
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+	for (e = e_start; e < e_end; e++) {
+		ls_com[e - e_start] = (const uint8_t (*)[MQOM2_PARAM_DIGEST_SIZE]) ls_com_e[e - e_start];
 		/* Initialize the PRG cache when used */
 #ifndef NO_BLC_PRG_CACHE
 		prg_cache_x8 = init_prg_cache_pub_x8(PRG_BLC_SIZE);
@@ -333,9 +473,9 @@ int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t co
 			// it does not prevent to compute seed commitment of it,
 			// but we will not use the result
 			SeedCommit_x4_pub(&ctx_seed_commit1, &ctx_seed_commit2, lseed[i + 0], lseed[i + 1], lseed[i + 2], lseed[i + 3],
-			                  ls_com_e[LS_COMM_E_COEFF(e)][i + 0], ls_com_e[LS_COMM_E_COEFF(e)][i + 1], ls_com_e[LS_COMM_E_COEFF(e)][i + 2], ls_com_e[LS_COMM_E_COEFF(e)][i + 3]);
+			                  ls_com_e[e - e_start][i + 0], ls_com_e[e - e_start][i + 1], ls_com_e[e - e_start][i + 2], ls_com_e[e - e_start][i + 3]);
 			SeedCommit_x4_pub(&ctx_seed_commit1, &ctx_seed_commit2, lseed[i + 4], lseed[i + 5], lseed[i + 6], lseed[i + 7],
-			                  ls_com_e[LS_COMM_E_COEFF(e)][i + 4], ls_com_e[LS_COMM_E_COEFF(e)][i + 5], ls_com_e[LS_COMM_E_COEFF(e)][i + 6], ls_com_e[LS_COMM_E_COEFF(e)][i + 7]);
+			                  ls_com_e[e - e_start][i + 4], ls_com_e[e - e_start][i + 5], ls_com_e[e - e_start][i + 6], ls_com_e[e - e_start][i + 7]);
 
 			memcpy(exp[i + 0], lseed[i + 0], MQOM2_PARAM_SEED_SIZE);
 			memcpy(exp[i + 1], lseed[i + 1], MQOM2_PARAM_SEED_SIZE);
@@ -360,7 +500,7 @@ int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t co
 
 			for (uint32_t i_ = 0; i_ < 8; i_++) {
 				if (i + i_ == i_star[e]) {
-					memcpy(ls_com_e[LS_COMM_E_COEFF(e)][i_star[e]], &out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE], MQOM2_PARAM_DIGEST_SIZE);
+					memcpy(ls_com_e[e - e_start][i_star[e]], &out_ls_com[e * MQOM2_PARAM_DIGEST_SIZE], MQOM2_PARAM_DIGEST_SIZE);
 					memset(exp[i_star[e]], 0, MQOM2_PARAM_SEED_SIZE + PRG_BLC_SIZE);
 				}
 				field_base_vect_add(acc, exp[i + i_], acc, MQOM2_PARAM_MQ_N + MQOM2_PARAM_ETA * MQOM2_PARAM_MU);
@@ -400,47 +540,41 @@ int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t co
 		field_ext_parse(acc + BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N), MQOM2_PARAM_ETA, tmp_eta);
 		field_ext_constant_vect_mult(r, tmp_eta, tmp_eta, MQOM2_PARAM_ETA);
 		field_ext_vect_add(u_eval[e], tmp_eta, u_eval[e], MQOM2_PARAM_ETA);
-
-#if defined(USE_XOF_X4)
-		if ((e % 4) == 3) {
-			/* Use the X4 XOF on the previously computed 4 */
-			xof_context_x4 DECL_VAR(xof_ctx_x4);
-			const uint8_t *constant_6[4] = { (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06" };
-			const uint8_t *to_hash_ptr[4] = { (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e - 3)], (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e - 2)], (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e - 1)], (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e)] };
-			uint8_t *hash_ptr[4] = { hash_ls_com[e - 3], hash_ls_com[e - 2], hash_ls_com[e - 1], hash_ls_com[e] };
-			ret = xof_init_x4(&xof_ctx_x4);
-			ERR(ret, err);
-			ret = xof_update_x4(&xof_ctx_x4, constant_6, 1);
-			ERR(ret, err);
-			ret = xof_update_x4(&xof_ctx_x4, to_hash_ptr, MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			ret = xof_squeeze_x4(&xof_ctx_x4, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			xof_clean_ctx_x4(&xof_ctx_x4);
-		} else if (e >= (4 * (MQOM2_PARAM_TAU / 4)))
-			/* No room for X4 XOF, perform regular */
-		{
-			ret = xof_init(&xof_ctx);
-			ERR(ret, err);
-			ret = xof_update(&xof_ctx, (const uint8_t*) "\x06", 1);
-			ERR(ret, err);
-			ret = xof_update(&xof_ctx, (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e)], MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-			ret = xof_squeeze(&xof_ctx, hash_ls_com[e], MQOM2_PARAM_DIGEST_SIZE);
-			ERR(ret, err);
-		}
-#else
-		ret = xof_init(&xof_ctx);
-		ERR(ret, err);
-		ret = xof_update(&xof_ctx, (const uint8_t*) "\x06", 1);
-		ERR(ret, err);
-		ret = xof_update(&xof_ctx, (const uint8_t*) ls_com_e[LS_COMM_E_COEFF(e)], MQOM2_PARAM_NB_EVALS * MQOM2_PARAM_DIGEST_SIZE);
-		ERR(ret, err);
-		ret = xof_squeeze(&xof_ctx, hash_ls_com[e], MQOM2_PARAM_DIGEST_SIZE);
-		ERR(ret, err);
-#endif
 	}
 
+	ret = BLC_HashSeedCommitments(e_start, e_end, ls_com, t->hash_ls_com);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	enc_clean_ctx_pub(&ctx_seed_commit1);
+	enc_clean_ctx_pub(&ctx_seed_commit2);
+	destroy_prg_cache_pub_x8(prg_cache_x8);
+	return ret;
+}
+
+int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t com1[MQOM2_PARAM_DIGEST_SIZE], const uint8_t opening[MQOM2_PARAM_OPENING_SIZE], const uint16_t i_star[MQOM2_PARAM_TAU], field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	xof_context DECL_VAR(xof_ctx);
+	uint32_t e;
+	uint8_t com1_[MQOM2_PARAM_DIGEST_SIZE];
+
+	const uint8_t *partial_delta_x = &opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
+
+	uint8_t hash_ls_com[MQOM2_PARAM_TAU][MQOM2_PARAM_DIGEST_SIZE];
+
+	/* The repetitions are independent: evaluate them (possibly in parallel) */
+	blc_eval_task_t task = {
+		.salt = salt,
+		.opening = opening,
+		.i_star = i_star,
+		.x_eval = x_eval,
+		.u_eval = u_eval,
+		.hash_ls_com = hash_ls_com,
+	};
+	ret = parallel_for(BLC_NB_TASKS, BLC_Eval_task, &task);
+	ERR(ret, err);
+
 	ret = xof_init(&xof_ctx);
 	ERR(ret, err);
 	ret = xof_update(&xof_ctx, (const uint8_t*) "\x07", 1);
@@ -463,9 +597,6 @@ int BLC_Eval_default(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t co
 
 	ret = 0;
 err:
-	enc_clean_ctx_pub(&ctx_seed_commit1);
-	enc_clean_ctx_pub(&ctx_seed_commit2);
 	xof_clean_ctx(&xof_ctx);
-	destroy_prg_cache_pub_x8(prg_cache_x8);
 	return ret;
 }
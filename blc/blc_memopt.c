@@ -29,7 +29,21 @@ int BLC_Commit_memopt(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 	ERR(ret, err);
 
 	e = 0;
-#if defined(BLC_INTERNAL_X4)
+#if defined(BLC_INTERNAL_X8)
+	uint8_t hash_ls_com_x8[8][MQOM2_PARAM_DIGEST_SIZE];
+	for (; e + 7 < MQOM2_PARAM_TAU; e+=8) {
+		uint32_t es[8] = {e + 0, e + 1, e + 2, e + 3, e + 4, e + 5, e + 6, e + 7};
+		ret = BLC_Commit_x8_memopt(es, &key->rseed[e], salt, x, key->delta, hash_ls_com_x8, &key->partial_delta_x[e], &x0[e], &u0[e], &u1[e]);
+		ERR(ret, err);
+		__BENCHMARK_START__(BS_BLC_XOF);
+		for (uint32_t e_ = 0; e_ < 8; e_++) {
+			ret = xof_update(&xof_ctx_hash_ls_com, hash_ls_com_x8[e_], MQOM2_PARAM_DIGEST_SIZE);
+			ERR(ret, err);
+		}
+		__BENCHMARK_STOP__(BS_BLC_XOF);
+	}
+#endif
+#if defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
 	uint8_t hash_ls_com_x4[4][MQOM2_PARAM_DIGEST_SIZE];
 	for (; e + 3 < MQOM2_PARAM_TAU; e+=4) {
 		uint32_t es[4] = {e + 0, e + 1, e + 2, e + 3};
@@ -47,7 +61,7 @@ int BLC_Commit_memopt(const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], const uint8_t
 		__BENCHMARK_STOP__(BS_BLC_XOF);
 	}
 #endif
-#if defined(BLC_INTERNAL_X2) || defined(BLC_INTERNAL_X4)
+#if defined(BLC_INTERNAL_X2) || defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
 	uint8_t hash_ls_com_x2[2][MQOM2_PARAM_DIGEST_SIZE];
 	for (; e + 1 < MQOM2_PARAM_TAU; e+=2) {
 		uint32_t es[2] = {e + 0, e + 1};
@@ -133,7 +147,30 @@ int BLC_Eval_memopt(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t com
 	const uint8_t *partial_delta_x = &opening[MQOM2_PARAM_TAU * (MQOM2_PARAM_SEED_SIZE * MQOM2_PARAM_NB_EVALS_LOG + MQOM2_PARAM_DIGEST_SIZE)];
 
 	e = 0;
-#if defined(BLC_INTERNAL_X4)
+#if defined(BLC_INTERNAL_X8)
+	uint8_t hash_ls_com_x8[8][MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t path_e_x8[8][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG];
+	uint8_t out_ls_com_e_x8[8][MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t partial_delta_x_e_x8[8][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE];
+	for (; e + 7 < MQOM2_PARAM_TAU; e+=8) {
+		uint32_t es[8] = {e + 0, e + 1, e + 2, e + 3, e + 4, e + 5, e + 6, e + 7};
+
+		for (uint32_t e_ = 0; e_ < 8; e_++) {
+			memcpy(path_e_x8[e_], &path[es[e_] * (MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE)], MQOM2_PARAM_NB_EVALS_LOG * MQOM2_PARAM_SEED_SIZE);
+			memcpy(out_ls_com_e_x8[e_], &out_ls_com[es[e_] * MQOM2_PARAM_DIGEST_SIZE], MQOM2_PARAM_DIGEST_SIZE);
+			memcpy(partial_delta_x_e_x8[e_], &partial_delta_x[es[e_] * (BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE)], BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE);
+		}
+
+		ret = BLC_Eval_x8_memopt(es, salt, path_e_x8, out_ls_com_e_x8, partial_delta_x_e_x8, &i_star[e], hash_ls_com_x8, &x_eval[e], &u_eval[e]);
+		ERR(ret, err);
+
+		for (uint32_t e_ = 0; e_ < 8; e_++) {
+			ret = xof_update(&xof_ctx_hash_ls_com, hash_ls_com_x8[e_], MQOM2_PARAM_DIGEST_SIZE);
+			ERR(ret, err);
+		}
+	}
+#endif
+#if defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
 	uint8_t hash_ls_com_x4[4][MQOM2_PARAM_DIGEST_SIZE];
 	uint8_t path_e_x4[4][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG];
 	uint8_t out_ls_com_e_x4[4][MQOM2_PARAM_DIGEST_SIZE];
@@ -160,7 +197,7 @@ int BLC_Eval_memopt(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t com
 		ERR(ret, err);
 	}
 #endif
-#if defined(BLC_INTERNAL_X2) || defined(BLC_INTERNAL_X4)
+#if defined(BLC_INTERNAL_X2) || defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
 	uint8_t hash_ls_com_x2[2][MQOM2_PARAM_DIGEST_SIZE];
 	uint8_t path_e_x2[2][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG];
 	uint8_t out_ls_com_e_x2[2][MQOM2_PARAM_DIGEST_SIZE];
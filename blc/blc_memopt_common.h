@@ -22,6 +22,8 @@
 #define BLC_Eval_x2_memopt MQOM_NAMESPACE(BLC_Eval_x2_memopt)
 #define BLC_Commit_x4_memopt MQOM_NAMESPACE(BLC_Commit_x4_memopt)
 #define BLC_Eval_x4_memopt MQOM_NAMESPACE(BLC_Eval_x4_memopt)
+#define BLC_Commit_x8_memopt MQOM_NAMESPACE(BLC_Commit_x8_memopt)
+#define BLC_Eval_x8_memopt MQOM_NAMESPACE(BLC_Eval_x8_memopt)
 
 // Times 1
 int BLC_Commit_x1_memopt(uint32_t e, const uint8_t rseed[MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], uint8_t com[MQOM2_PARAM_DIGEST_SIZE], uint8_t partial_delta_x[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], field_ext_elt x0[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]);
@@ -35,6 +37,10 @@ int BLC_Eval_x2_memopt(const uint32_t e[2], const uint8_t salt[MQOM2_PARAM_SALT_
 int BLC_Commit_x4_memopt(const uint32_t e[4], const uint8_t rseed[4][MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], uint8_t com[4][MQOM2_PARAM_DIGEST_SIZE], uint8_t partial_delta_x[4][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], field_ext_elt x0[4][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[4][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[4][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]);
 int BLC_Eval_x4_memopt(const uint32_t e[4], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t path[4][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG], const uint8_t out_ls_com[4][MQOM2_PARAM_DIGEST_SIZE], const uint8_t partial_delta_x[4][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], const uint16_t i_star[4], uint8_t com[4][MQOM2_PARAM_DIGEST_SIZE], field_ext_elt x_eval[4][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u_eval[4][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]);
 
+// Times 8
+int BLC_Commit_x8_memopt(const uint32_t e[8], const uint8_t rseed[8][MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], uint8_t com[8][MQOM2_PARAM_DIGEST_SIZE], uint8_t partial_delta_x[8][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], field_ext_elt x0[8][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]);
+int BLC_Eval_x8_memopt(const uint32_t e[8], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t path[8][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG], const uint8_t out_ls_com[8][MQOM2_PARAM_DIGEST_SIZE], const uint8_t partial_delta_x[8][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], const uint16_t i_star[8], uint8_t com[8][MQOM2_PARAM_DIGEST_SIZE], field_ext_elt x_eval[8][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u_eval[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]);
+
 
 
 #endif /* __BLC_MEMOPT_COMMON_H__ */
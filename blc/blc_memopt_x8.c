@@ -0,0 +1,270 @@
+#include "blc_memopt.h"
+#include "ggm_tree.h"
+#include "benchmark.h"
+#include "seed_commit.h"
+#include "blc_memopt_common.h"
+
+/* Size of the PRG output of a leaf seed (prefixed with the seed), i.e. of the serialized (x, u) of one repetition */
+#define BLC_X8_EXP_SIZE (BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA))
+
+int BLC_Commit_x8_memopt(const uint32_t e[8], const uint8_t rseed[8][MQOM2_PARAM_SEED_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], uint8_t com[8][MQOM2_PARAM_DIGEST_SIZE], uint8_t partial_delta_x[8][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], field_ext_elt x0[8][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u0[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt u1[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	uint32_t i, e_;
+	prg_key_sched_cache_x8* prg_cache_x8 = NULL;
+
+	seedcommit_ctx_x8_t DECL_VAR(seedcommit_ctx_x8);
+	uint8_t lseed_x8[8][MQOM2_PARAM_SEED_SIZE];
+	uint8_t ls_com_x8[8][BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE][MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t exp_x8[8 * BLC_X8_EXP_SIZE];
+	field_base_elt bar_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt bar_u[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt tmp_n[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt tmp_eta[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_base_elt acc_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	uint8_t data_folding_x8[MQOM2_PARAM_NB_EVALS_LOG][8 * BLC_X8_EXP_SIZE];
+	uint8_t acc_x8[8 * BLC_X8_EXP_SIZE];
+	xof_context_x8 DECL_VAR(xof_ctx_x8);
+	ggmtree_ctx_x8_t DECL_VAR(ggm_tree_x8);
+	const uint8_t *ls_com_x8_ptr[8];
+	uint8_t *exp_ptr[8];
+	for (e_ = 0; e_ < 8; e_++) {
+		ls_com_x8_ptr[e_] = (const uint8_t*) ls_com_x8[e_];
+		exp_ptr[e_] = &exp_x8[e_ * BLC_X8_EXP_SIZE + MQOM2_PARAM_SEED_SIZE];
+	}
+
+	/* Initialize the PRG cache when used */
+#ifndef NO_BLC_PRG_CACHE
+	prg_cache_x8 = init_prg_cache_x8(PRG_BLC_SIZE);
+#endif
+
+	__BENCHMARK_START__(BS_BLC_EXPAND_TREE);
+	ret = GGMTree_InitIncrementalExpansion_x8(&ggm_tree_x8, salt, rseed, delta, e);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_EXPAND_TREE);
+
+	__BENCHMARK_START__(BS_BLC_SEED_COMMIT);
+	ret = init_seedcommit_x8(&seedcommit_ctx_x8, salt, e);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_SEED_COMMIT);
+
+	__BENCHMARK_START__(BS_BLC_XOF);
+	ret = xof_init_x8(&xof_ctx_x8);
+	ERR(ret, err);
+	const uint8_t *constant_6[8] = {
+		(const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06",
+		(const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06"
+	};
+	ret = xof_update_x8(&xof_ctx_x8, constant_6, 1);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_XOF);
+
+	memset((uint8_t*) data_folding_x8, 0, sizeof(data_folding_x8));
+	memset((uint8_t*) acc_x8, 0, sizeof(acc_x8));
+	for (i = 0; i < MQOM2_PARAM_NB_EVALS; i++) {
+		uint32_t i_mod = i % BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE;
+		uint8_t *ls_com_i[8];
+		__BENCHMARK_START__(BS_BLC_EXPAND_TREE);
+		GGMTree_GetNextLeaf_x8(&ggm_tree_x8, lseed_x8);
+		__BENCHMARK_STOP__(BS_BLC_EXPAND_TREE);
+
+		__BENCHMARK_START__(BS_BLC_SEED_COMMIT);
+		for (e_ = 0; e_ < 8; e_++) {
+			ls_com_i[e_] = ls_com_x8[e_][i_mod];
+		}
+		SeedCommit_x8_x8(&seedcommit_ctx_x8, (const uint8_t (*)[MQOM2_PARAM_SEED_SIZE])lseed_x8, ls_com_i);
+		__BENCHMARK_STOP__(BS_BLC_SEED_COMMIT);
+
+		if (i_mod == BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE - 1) {
+			__BENCHMARK_START__(BS_BLC_XOF);
+			ret = xof_update_x8(&xof_ctx_x8, ls_com_x8_ptr, BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE * MQOM2_PARAM_DIGEST_SIZE);
+			ERR(ret, err);
+			__BENCHMARK_STOP__(BS_BLC_XOF);
+		}
+
+		__BENCHMARK_START__(BS_BLC_PRG);
+		for (e_ = 0; e_ < 8; e_++) {
+			memcpy(&exp_x8[e_ * BLC_X8_EXP_SIZE], lseed_x8[e_], MQOM2_PARAM_SEED_SIZE);
+		}
+		ret = PRG_x8(salt, e, (const uint8_t (*)[MQOM2_PARAM_SEED_SIZE])lseed_x8, PRG_BLC_SIZE, exp_ptr, prg_cache_x8, 8);
+		ERR(ret, err);
+		__BENCHMARK_STOP__(BS_BLC_PRG);
+
+		__BENCHMARK_START__(BS_BLC_ARITH);
+		field_base_vect_add(acc_x8, exp_x8, acc_x8, 8 * (MQOM2_PARAM_MQ_N + MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+		uint8_t j = get_gray_code_bit_position(i);
+		field_base_vect_add(data_folding_x8[j], acc_x8, data_folding_x8[j], 8 * (MQOM2_PARAM_MQ_N + MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+		__BENCHMARK_STOP__(BS_BLC_ARITH);
+	}
+
+	__BENCHMARK_START__(BS_BLC_ARITH);
+	field_base_elt delta_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	uint8_t serialized_delta_x[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)];
+	for (e_ = 0; e_ < 8; e_++) {
+		memset(x0[e_], 0, BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_N));
+		for (uint32_t j = 0; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+			field_base_parse(data_folding_x8[j] + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_MQ_N, bar_x);
+			field_ext_base_constant_vect_mult((1 << j), bar_x, tmp_n, MQOM2_PARAM_MQ_N);
+			field_ext_vect_add(x0[e_], tmp_n, x0[e_], MQOM2_PARAM_MQ_N);
+		}
+
+		memset(u0[e_], 0, BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA));
+		for (uint32_t j = 0; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+			field_ext_parse(data_folding_x8[j] + BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_ETA, bar_u);
+			field_ext_constant_vect_mult((1 << j), bar_u, tmp_eta, MQOM2_PARAM_ETA);
+			field_ext_vect_add(u0[e_], tmp_eta, u0[e_], MQOM2_PARAM_ETA);
+		}
+
+		field_ext_parse(acc_x8 + BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_ETA, u1[e_]);
+
+		field_base_parse(&acc_x8[e_ * BLC_X8_EXP_SIZE], MQOM2_PARAM_MQ_N, acc_x);
+		field_base_vect_add(x, acc_x, delta_x, MQOM2_PARAM_MQ_N);
+		field_base_serialize(delta_x, MQOM2_PARAM_MQ_N, serialized_delta_x);
+		memcpy(partial_delta_x[e_], serialized_delta_x + MQOM2_PARAM_SEED_SIZE, BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE);
+	}
+	__BENCHMARK_STOP__(BS_BLC_ARITH);
+
+	__BENCHMARK_START__(BS_BLC_XOF);
+	uint8_t *hash_ptr[8] = { com[0], com[1], com[2], com[3], com[4], com[5], com[6], com[7] };
+	ret = xof_squeeze_x8(&xof_ctx_x8, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_XOF);
+
+	ret = 0;
+err:
+	seedcommit_clean_ctx_x8(&seedcommit_ctx_x8);
+	destroy_prg_cache_x8(prg_cache_x8);
+	xof_clean_ctx_x8(&xof_ctx_x8);
+	ggmtree_ctx_x8_t_clean(&ggm_tree_x8);
+	return ret;
+}
+
+int BLC_Eval_x8_memopt(const uint32_t e[8], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t path[8][MQOM2_PARAM_SEED_SIZE*MQOM2_PARAM_NB_EVALS_LOG], const uint8_t out_ls_com[8][MQOM2_PARAM_DIGEST_SIZE], const uint8_t partial_delta_x[8][BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)-MQOM2_PARAM_SEED_SIZE], const uint16_t i_star[8], uint8_t com[8][MQOM2_PARAM_DIGEST_SIZE], field_ext_elt x_eval[8][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt u_eval[8][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	uint32_t i, e_;
+	prg_key_sched_cache_pub_x8* prg_cache_x8 = NULL;
+
+	seedcommit_ctx_pub_x8_t DECL_VAR(seedcommit_ctx_x8);
+	uint8_t lseed_x8[8][MQOM2_PARAM_SEED_SIZE];
+	uint8_t ls_com_x8[8][BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE][MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t exp_x8[8 * BLC_X8_EXP_SIZE];
+	uint8_t data_folding_x8[MQOM2_PARAM_NB_EVALS_LOG][8 * BLC_X8_EXP_SIZE];
+	uint8_t acc_x8[8 * BLC_X8_EXP_SIZE];
+	field_base_elt bar_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt bar_u[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt tmp_n[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt tmp_eta[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_base_elt acc_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	xof_context_x8 DECL_VAR(xof_ctx_x8);
+	ggmtree_ctx_partial_x8_t DECL_VAR(ggm_tree_x8);
+	const uint8_t *ls_com_x8_ptr[8];
+	uint8_t *exp_ptr[8];
+	const uint8_t (*paths[8])[MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE];
+	uint32_t i_star_uint32[8];
+	for (e_ = 0; e_ < 8; e_++) {
+		ls_com_x8_ptr[e_] = (const uint8_t*) ls_com_x8[e_];
+		exp_ptr[e_] = &exp_x8[e_ * BLC_X8_EXP_SIZE + MQOM2_PARAM_SEED_SIZE];
+		paths[e_] = (const uint8_t(*)[MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE]) &path[e_];
+		i_star_uint32[e_] = i_star[e_];
+	}
+
+	/* Initialize the PRG cache when used */
+#ifndef NO_BLC_PRG_CACHE
+	prg_cache_x8 = init_prg_cache_pub_x8(PRG_BLC_SIZE);
+#endif
+
+	ret = GGMTree_InitIncrementalPartialExpansion_x8(&ggm_tree_x8, salt, paths, e, i_star_uint32);
+	ERR(ret, err);
+
+	ret = init_seedcommit_pub_x8(&seedcommit_ctx_x8, salt, e);
+	ERR(ret, err);
+
+	ret = xof_init_x8(&xof_ctx_x8);
+	ERR(ret, err);
+	const uint8_t *constant_6[8] = {
+		(const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06",
+		(const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06", (const uint8_t*) "\x06"
+	};
+	ret = xof_update_x8(&xof_ctx_x8, constant_6, 1);
+	ERR(ret, err);
+
+	memset((uint8_t*) data_folding_x8, 0, sizeof(data_folding_x8));
+	memset((uint8_t*) acc_x8, 0, sizeof(acc_x8));
+	for (i = 0; i < MQOM2_PARAM_NB_EVALS; i++) {
+		uint32_t i_mod = i % BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE;
+		uint8_t *ls_com_i[8];
+		GGMTree_GetNextLeafPartial_x8(&ggm_tree_x8, lseed_x8);
+
+		for (e_ = 0; e_ < 8; e_++) {
+			ls_com_i[e_] = ls_com_x8[e_][i_mod];
+		}
+		SeedCommit_x8_x8_pub(&seedcommit_ctx_x8, (const uint8_t (*)[MQOM2_PARAM_SEED_SIZE])lseed_x8, ls_com_i);
+
+		for (e_ = 0; e_ < 8; e_++) {
+			if (i == i_star[e_]) {
+				memcpy(ls_com_x8[e_][i_mod], out_ls_com[e_], MQOM2_PARAM_DIGEST_SIZE);
+			}
+		}
+
+		if (i_mod == BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE - 1) {
+			ret = xof_update_x8(&xof_ctx_x8, ls_com_x8_ptr, BLC_NB_SEED_COMMITMENTS_PER_HASH_UPDATE * MQOM2_PARAM_DIGEST_SIZE);
+			ERR(ret, err);
+		}
+
+		for (e_ = 0; e_ < 8; e_++) {
+			memcpy(&exp_x8[e_ * BLC_X8_EXP_SIZE], lseed_x8[e_], MQOM2_PARAM_SEED_SIZE);
+		}
+		ret = PRG_x8_pub(salt, e, (const uint8_t (*)[MQOM2_PARAM_SEED_SIZE])lseed_x8, PRG_BLC_SIZE, exp_ptr, prg_cache_x8, 8);
+		ERR(ret, err);
+		for (e_ = 0; e_ < 8; e_++) {
+			if (i == i_star[e_]) {
+				memset(&exp_x8[e_ * BLC_X8_EXP_SIZE], 0, MQOM2_PARAM_SEED_SIZE + PRG_BLC_SIZE);
+			}
+		}
+
+		uint8_t j = get_gray_code_bit_position(i);
+		field_base_vect_add(acc_x8, exp_x8, acc_x8, 8 * (MQOM2_PARAM_MQ_N + MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+		field_base_vect_add(data_folding_x8[j], acc_x8, data_folding_x8[j], 8 * (MQOM2_PARAM_MQ_N + MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+	}
+
+	for (e_ = 0; e_ < 8; e_++) {
+		field_ext_elt r = get_evaluation_point(i_star[e_]);
+		field_base_elt delta_x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+		uint8_t serialized_delta_x[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N)];
+		memset(serialized_delta_x, 0, MQOM2_PARAM_SEED_SIZE);
+		memcpy(serialized_delta_x + MQOM2_PARAM_SEED_SIZE, partial_delta_x[e_], BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) - MQOM2_PARAM_SEED_SIZE);
+		field_base_parse(serialized_delta_x, MQOM2_PARAM_MQ_N, delta_x);
+
+		memset(x_eval[e_], 0, BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_N));
+		for (uint32_t j = 0; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+			field_base_parse(data_folding_x8[j] + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_MQ_N, bar_x);
+			field_ext_base_constant_vect_mult((1 << j), bar_x, tmp_n, MQOM2_PARAM_MQ_N);
+			field_ext_vect_add(x_eval[e_], tmp_n, x_eval[e_], MQOM2_PARAM_MQ_N);
+		}
+		field_base_parse(acc_x8 + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_MQ_N, acc_x);
+		field_base_vect_add(acc_x, delta_x, acc_x, MQOM2_PARAM_MQ_N);
+		field_ext_base_constant_vect_mult(r, acc_x, tmp_n, MQOM2_PARAM_MQ_N);
+		field_ext_vect_add(x_eval[e_], tmp_n, x_eval[e_], MQOM2_PARAM_MQ_N);
+
+		memset(u_eval[e_], 0, BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_ETA));
+		for (uint32_t j = 0; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+			field_ext_parse(data_folding_x8[j] + BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_ETA, bar_u);
+			field_ext_constant_vect_mult((1 << j), bar_u, tmp_eta, MQOM2_PARAM_ETA);
+			field_ext_vect_add(u_eval[e_], tmp_eta, u_eval[e_], MQOM2_PARAM_ETA);
+		}
+		field_ext_parse(acc_x8 + BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_MQ_N) + e_ * BLC_X8_EXP_SIZE, MQOM2_PARAM_ETA, tmp_eta);
+		field_ext_constant_vect_mult(r, tmp_eta, tmp_eta, MQOM2_PARAM_ETA);
+		field_ext_vect_add(u_eval[e_], tmp_eta, u_eval[e_], MQOM2_PARAM_ETA);
+	}
+
+	uint8_t *hash_ptr[8] = { com[0], com[1], com[2], com[3], com[4], com[5], com[6], com[7] };
+	ret = xof_squeeze_x8(&xof_ctx_x8, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	seedcommit_clean_ctx_pub_x8(&seedcommit_ctx_x8);
+	destroy_prg_cache_pub_x8(prg_cache_x8);
+	xof_clean_ctx_x8(&xof_ctx_x8);
+	ggmtree_ctx_partial_x8_t_clean(&ggm_tree_x8);
+	return ret;
+}
@@ -17,4 +17,41 @@
 #include "seed_commit_default.h"
 #endif
 
+/* SeedCommit of 8 repetitions, as two groups of 4 repetitions: with USE_ENC_X8,
+ * each group already fills the 8 lanes of the encryption */
+typedef struct {
+	seedcommit_ctx_x4_t ctx_x4[2];
+} seedcommit_ctx_x8_t;
+typedef struct {
+	seedcommit_ctx_pub_x4_t ctx_x4[2];
+} seedcommit_ctx_pub_x8_t;
+
+static inline int init_seedcommit_x8(seedcommit_ctx_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint32_t* e) {
+	int ret = init_seedcommit_x4(&ctx->ctx_x4[0], salt, &e[0]);
+	ret |= init_seedcommit_x4(&ctx->ctx_x4[1], salt, &e[4]);
+	return ret;
+}
+static inline void seedcommit_clean_ctx_x8(seedcommit_ctx_x8_t* ctx) {
+	seedcommit_clean_ctx_x4(&ctx->ctx_x4[0]);
+	seedcommit_clean_ctx_x4(&ctx->ctx_x4[1]);
+}
+static inline void SeedCommit_x8_x8(seedcommit_ctx_x8_t *ctx, const uint8_t seed[8][MQOM2_PARAM_SEED_SIZE], uint8_t *seed_com[8]) {
+	SeedCommit_x4_x4(&ctx->ctx_x4[0], seed[0], seed[1], seed[2], seed[3], seed_com[0], seed_com[1], seed_com[2], seed_com[3]);
+	SeedCommit_x4_x4(&ctx->ctx_x4[1], seed[4], seed[5], seed[6], seed[7], seed_com[4], seed_com[5], seed_com[6], seed_com[7]);
+}
+
+static inline int init_seedcommit_pub_x8(seedcommit_ctx_pub_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint32_t* e) {
+	int ret = init_seedcommit_pub_x4(&ctx->ctx_x4[0], salt, &e[0]);
+	ret |= init_seedcommit_pub_x4(&ctx->ctx_x4[1], salt, &e[4]);
+	return ret;
+}
+static inline void seedcommit_clean_ctx_pub_x8(seedcommit_ctx_pub_x8_t* ctx) {
+	seedcommit_clean_ctx_pub_x4(&ctx->ctx_x4[0]);
+	seedcommit_clean_ctx_pub_x4(&ctx->ctx_x4[1]);
+}
+static inline void SeedCommit_x8_x8_pub(seedcommit_ctx_pub_x8_t *ctx, const uint8_t seed[8][MQOM2_PARAM_SEED_SIZE], uint8_t *seed_com[8]) {
+	SeedCommit_x4_x4_pub(&ctx->ctx_x4[0], seed[0], seed[1], seed[2], seed[3], seed_com[0], seed_com[1], seed_com[2], seed_com[3]);
+	SeedCommit_x4_x4_pub(&ctx->ctx_x4[1], seed[4], seed[5], seed[6], seed[7], seed_com[4], seed_com[5], seed_com[6], seed_com[7]);
+}
+
 #endif /* __SEED_COMMIT_H__ */
@@ -94,6 +94,19 @@ __attribute__((weak)) living_pointer living_pointers[MAX_TRACKED_POINTERS] = { 0
 
 __attribute__((weak)) long int alloc_peak_usage = 0;
 
+#if defined(USE_PTHREADS)
+/* The tracking table is shared by all the threads (e.g. the workers of the
+ * parallel repetitions) */
+#include <pthread.h>
+#define alloc_probe_mutex MQOM_NAMESPACE(alloc_probe_mutex)
+__attribute__((weak)) pthread_mutex_t alloc_probe_mutex = PTHREAD_MUTEX_INITIALIZER;
+#define alloc_probe_lock() pthread_mutex_lock(&alloc_probe_mutex)
+#define alloc_probe_unlock() pthread_mutex_unlock(&alloc_probe_mutex)
+#else
+#define alloc_probe_lock()
+#define alloc_probe_unlock()
+#endif
+
 static void update_alloc_stats(void) {
 	long int alloc_current_usage = 0;
 	unsigned int i;
@@ -109,6 +122,7 @@ static void update_alloc_stats(void) {
 
 static inline void *mqom_malloc(size_t size) {
 	void *ptr = malloc(size); // IGNORE memory-check
+	alloc_probe_lock();
 	if (ptr != NULL) {
 		/* Find a suitable slot */
 		unsigned int i;
@@ -128,12 +142,14 @@ static inline void *mqom_malloc(size_t size) {
 	}
 out:
 	update_alloc_stats();
+	alloc_probe_unlock();
 	return ptr;
 }
 
 static inline void *mqom_calloc(size_t nmemb, size_t size) {
 	void *ptr = calloc(nmemb, size); // IGNORE memory-check
 	size = nmemb * size;
+	alloc_probe_lock();
 	if (ptr != NULL) {
 		/* Find a suitable slot */
 		unsigned int i;
@@ -153,11 +169,13 @@ static inline void *mqom_calloc(size_t nmemb, size_t size) {
 	}
 out:
 	update_alloc_stats();
+	alloc_probe_unlock();
 	return ptr;
 }
 
 static inline void mqom_free(void *ptr, size_t len) {
 	(void)len;
+	alloc_probe_lock();
 	if (ptr != NULL) {
 		/* Find the slot */
 		unsigned int i;
@@ -182,6 +200,7 @@ static inline void mqom_free(void *ptr, size_t len) {
 out:
 	free(ptr); // IGNORE memory-check
 	update_alloc_stats();
+	alloc_probe_unlock();
 }
 
 #define reset_alloc_usage() do { \
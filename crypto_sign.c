@@ -6,6 +6,8 @@
 #endif
 
 #include "sign.h"
+#include "threadpool.h"
+#include "workspace.h"
 
 #if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
 #ifdef SUPERCOP
@@ -67,6 +69,89 @@ err:
 	return ret;
 }
 
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_signature_with_ctx(uint8_t *sig,
+                                   unsigned long long *siglen,
+                                   const uint8_t *m,
+                                   unsigned long long mlen,
+                                   const struct sign_ctx_t *ctx)
+#else
+int
+crypto_sign_signature_with_ctx(unsigned char *sig, size_t *siglen,
+                               const unsigned char *m, size_t mlen,
+                               const struct sign_ctx_t *ctx)
+#endif
+{
+	int ret = -1;
+
+	// Sample mseed
+	uint8_t mseed[MQOM2_PARAM_SEED_SIZE];
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+	randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+#else
+	ret = randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+	ERR(ret, err);
+#endif
+	// Sample salt
+	uint8_t salt[MQOM2_PARAM_SALT_SIZE];
+
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+	randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+#else
+	ret = randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+	ERR(ret, err);
+#endif
+
+#ifdef SUPERCOP
+        /* Salt declassification (as it is public) for SUPERCOP */
+        crypto_declassify(salt, MQOM2_PARAM_SALT_SIZE);
+#endif
+
+	// Build the signature from the expanded key
+	ret = Sign_with_ctx(ctx, m, mlen, salt, mseed, sig);
+	ERR(ret, err);
+	if (siglen != NULL) {
+		*siglen = (unsigned long long) MQOM2_SIG_SIZE;
+	}
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk)
+{
+	int ret = -1;
+	sign_ctx_t *c = NULL;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	(*ctx) = NULL;
+	c = (sign_ctx_t*)mqom_malloc(sizeof(sign_ctx_t));
+	if (c == NULL) {
+		goto err;
+	}
+	ret = SignCtx_init(sk, c);
+	ERR(ret, err);
+	(*ctx) = c;
+
+	ret = 0;
+err:
+	if (ret && (c != NULL)) {
+		mqom_free(c, sizeof(sign_ctx_t));
+	}
+	return ret;
+}
+
+void crypto_sign_expanded_key_free(struct sign_ctx_t *ctx)
+{
+	if (ctx != NULL) {
+		SignCtx_clean(ctx);
+		mqom_free(ctx, sizeof(sign_ctx_t));
+	}
+}
+
 #if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
 int crypto_sign(
     unsigned char *sm, unsigned long long *smlen,
@@ -82,7 +167,10 @@ crypto_sign(unsigned char *sm, size_t *smlen,
 	int ret = -1;
 
 	uint8_t *message = sm;
-	memmove(message, m, mlen);
+	/* Zero-copy when the message is signed in place */
+	if (sm != m) {
+		memmove(message, m, mlen);
+	}
 	ret = crypto_sign_signature(sm + mlen, smlen, message, mlen, sk);
 	ERR(ret, err);
 	if (smlen != NULL) {
@@ -114,6 +202,52 @@ crypto_sign_verify(const unsigned char  *sig, size_t siglen,
 	return Verify(pk, m, mlen, sig);
 }
 
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_batch(const unsigned char *pk,
+                             const unsigned char **m, const unsigned long long *mlen,
+                             const unsigned char **sig, unsigned long long n, int *results)
+#else
+int
+crypto_sign_verify_batch(const unsigned char *pk,
+                         const unsigned char **m, const size_t *mlen,
+                         const unsigned char **sig, size_t n, int *results)
+#endif
+{
+	int ret = -1, ret_x4;
+	verify_ctx_t ctx;
+	unsigned long long i;
+	uint32_t l, nb;
+	unsigned long long mlen_x4[4];
+
+	if ((pk == NULL) || (m == NULL) || (mlen == NULL) || (sig == NULL) || (results == NULL)) {
+		return -1;
+	}
+	for (i = 0; i < n; i++) {
+		results[i] = -1;
+	}
+
+	/* Expand the equations once for all the batch */
+	ret = VerifyCtx_init(pk, &ctx);
+	ERR(ret, err);
+
+	/* Process the signatures by groups of 4 */
+	ret = 0;
+	for (i = 0; i < n; i += nb) {
+		nb = ((n - i) < 4) ? (uint32_t)(n - i) : 4;
+		for (l = 0; l < nb; l++) {
+			mlen_x4[l] = (unsigned long long) mlen[i + l];
+		}
+		ret_x4 = Verify_with_ctx_x4(&ctx, &m[i], mlen_x4, &sig[i], nb, &results[i]);
+		if (ret_x4) {
+			ret = -1;
+		}
+	}
+
+err:
+	VerifyCtx_clean(&ctx);
+	return ret;
+}
+
 #if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
 int crypto_sign_open(
     unsigned char *m, unsigned long long *mlen,
@@ -139,7 +273,239 @@ crypto_sign_open(unsigned char *m, size_t *mlen,
 		return ret;
 	}
 
-	memmove(m, message, *mlen);
+	/* Zero-copy when the signed message is opened in place */
+	if (m != message) {
+		memmove(m, message, *mlen);
+	}
 	return 0;
 }
 
+int crypto_sign_init(struct sign_stream_t **stream)
+{
+	int ret = -1;
+	sign_stream_t *s = NULL;
+
+	if (stream == NULL) {
+		goto err;
+	}
+	(*stream) = NULL;
+	s = (sign_stream_t*)mqom_malloc(sizeof(sign_stream_t));
+	if (s == NULL) {
+		goto err;
+	}
+	ret = HashMessage_init(s);
+	ERR(ret, err);
+	(*stream) = s;
+
+	ret = 0;
+err:
+	if (ret && (s != NULL)) {
+		mqom_free(s, sizeof(sign_stream_t));
+	}
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen)
+#else
+int
+crypto_sign_update(struct sign_stream_t *stream,
+                   const unsigned char *m, size_t mlen)
+#endif
+{
+	return HashMessage_update(stream, m, mlen);
+}
+
+void crypto_sign_stream_free(struct sign_stream_t *stream)
+{
+	if (stream != NULL) {
+		xof_clean_ctx(&stream->xof_ctx);
+		mqom_cleanse((void*)stream, sizeof(sign_stream_t));
+		mqom_free(stream, sizeof(sign_stream_t));
+	}
+}
+
+/* Finalize the message hash and sign it, from the secret key or from
+ * the expanded key context when not NULL. The stream is released. */
+static int crypto_sign_final_internal(uint8_t *sig, struct sign_stream_t *stream, const uint8_t *sk, const struct sign_ctx_t *ctx)
+{
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	ret = HashMessage_final(stream, msg_hash);
+	ERR(ret, err);
+
+	// Sample mseed
+	uint8_t mseed[MQOM2_PARAM_SEED_SIZE];
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+	randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+#else
+	ret = randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+	ERR(ret, err);
+#endif
+	// Sample salt
+	uint8_t salt[MQOM2_PARAM_SALT_SIZE];
+
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+	randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+#else
+	ret = randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+	ERR(ret, err);
+#endif
+
+#ifdef SUPERCOP
+        /* Salt declassification (as it is public) for SUPERCOP */
+        crypto_declassify(salt, MQOM2_PARAM_SALT_SIZE);
+#endif
+
+	// Build the signature of the message hash
+	if (ctx != NULL) {
+		ret = Sign_with_ctx_hashed(ctx, msg_hash, salt, mseed, sig);
+	}
+	else {
+		ret = Sign_hashed(sk, msg_hash, salt, mseed, sig);
+	}
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	mqom_cleanse((void*)msg_hash, sizeof(msg_hash));
+	crypto_sign_stream_free(stream);
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_final(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, const unsigned char *sk)
+#else
+int
+crypto_sign_final(unsigned char *sig, size_t *siglen,
+                  struct sign_stream_t *stream,
+                  const unsigned char *sk)
+#endif
+{
+	int ret = crypto_sign_final_internal(sig, stream, sk, NULL);
+	if ((ret == 0) && (siglen != NULL)) {
+		*siglen = (unsigned long long) MQOM2_SIG_SIZE;
+	}
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_final_with_ctx(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream,
+                               const struct sign_ctx_t *ctx)
+#else
+int
+crypto_sign_final_with_ctx(unsigned char *sig, size_t *siglen,
+                           struct sign_stream_t *stream,
+                           const struct sign_ctx_t *ctx)
+#endif
+{
+	int ret = -1;
+
+	if (ctx == NULL) {
+		crypto_sign_stream_free(stream);
+		return -1;
+	}
+	ret = crypto_sign_final_internal(sig, stream, NULL, ctx);
+	if ((ret == 0) && (siglen != NULL)) {
+		*siglen = (unsigned long long) MQOM2_SIG_SIZE;
+	}
+	return ret;
+}
+
+int crypto_sign_verify_init(struct sign_stream_t **stream)
+{
+	return crypto_sign_init(stream);
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen)
+#else
+int
+crypto_sign_verify_update(struct sign_stream_t *stream,
+                          const unsigned char *m, size_t mlen)
+#endif
+{
+	return HashMessage_update(stream, m, mlen);
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_final(const unsigned char *sig, unsigned long long siglen, struct sign_stream_t *stream,
+                             const unsigned char *pk)
+#else
+int
+crypto_sign_verify_final(const unsigned char *sig, size_t siglen,
+                         struct sign_stream_t *stream,
+                         const unsigned char *pk)
+#endif
+{
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	if (siglen != (unsigned long long) MQOM2_SIG_SIZE) {
+		goto err;
+	}
+	ret = HashMessage_final(stream, msg_hash);
+	ERR(ret, err);
+	ret = Verify_hashed(pk, msg_hash, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	crypto_sign_stream_free(stream);
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+unsigned long long crypto_sign_workspace_size(void)
+#else
+size_t
+crypto_sign_workspace_size(void)
+#endif
+{
+	return workspace_size(crypto_sign_get_nb_threads());
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_signature_ws(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                             unsigned long long mlen, const unsigned char *sk, void *ws, unsigned long long wslen)
+#else
+int
+crypto_sign_signature_ws(unsigned char *sig, size_t *siglen,
+                         const unsigned char *m, size_t mlen,
+                         const unsigned char *sk,
+                         void *ws, size_t wslen)
+#endif
+{
+	int ret = -1;
+
+	ret = workspace_attach(ws, (size_t)wslen, crypto_sign_get_nb_threads());
+	ERR(ret, err);
+	ret = crypto_sign_signature(sig, siglen, m, mlen, sk);
+	workspace_detach();
+
+err:
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_ws(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                          unsigned long long mlen, const unsigned char *pk, void *ws, unsigned long long wslen)
+#else
+int
+crypto_sign_verify_ws(const unsigned char *sig, size_t siglen,
+                      const unsigned char *m, size_t mlen,
+                      const unsigned char *pk,
+                      void *ws, size_t wslen)
+#endif
+{
+	int ret = -1;
+
+	ret = workspace_attach(ws, (size_t)wslen, crypto_sign_get_nb_threads());
+	ERR(ret, err);
+	ret = crypto_sign_verify(sig, siglen, m, mlen, pk);
+	workspace_detach();
+
+err:
+	return ret;
+}
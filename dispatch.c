@@ -0,0 +1,305 @@
+#include "dispatch.h"
+
+#include <stdlib.h>
+#include <string.h>
+#if defined(USE_PTHREADS)
+#include <pthread.h>
+#endif
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__))
+#include <cpuid.h>
+#define DISPATCH_HAS_CPUID
+#endif
+
+/* Declare the namespaced entry points of a backend and its function table entry */
+#define DISPATCH_DECLARE_BACKEND(b) \
+	int mqom2_##b##_crypto_sign_keypair(unsigned char *pk, unsigned char *sk); \
+	int mqom2_##b##_crypto_sign_signature(unsigned char *sig, unsigned long long *siglen, const unsigned char *m, \
+	                                      unsigned long long mlen, const unsigned char *sk); \
+	int mqom2_##b##_crypto_sign(unsigned char *sm, unsigned long long *smlen, const unsigned char *m, \
+	                            unsigned long long mlen, const unsigned char *sk); \
+	int mqom2_##b##_crypto_sign_verify(const unsigned char *sig, unsigned long long siglen, const unsigned char *m, \
+	                                   unsigned long long mlen, const unsigned char *pk); \
+	int mqom2_##b##_crypto_sign_open(unsigned char *m, unsigned long long *mlen, const unsigned char *sm, \
+	                                 unsigned long long smlen, const unsigned char *pk); \
+	int mqom2_##b##_crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk); \
+	int mqom2_##b##_crypto_sign_signature_with_ctx(unsigned char *sig, unsigned long long *siglen, const unsigned char *m, \
+	                                               unsigned long long mlen, const struct sign_ctx_t *ctx); \
+	void mqom2_##b##_crypto_sign_expanded_key_free(struct sign_ctx_t *ctx); \
+	int mqom2_##b##_crypto_sign_verify_batch(const unsigned char *pk, const unsigned char **m, const unsigned long long *mlen, \
+	                                         const unsigned char **sig, unsigned long long n, int *results); \
+	int mqom2_##b##_crypto_sign_init(struct sign_stream_t **stream); \
+	int mqom2_##b##_crypto_sign_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen); \
+	int mqom2_##b##_crypto_sign_final(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, \
+	                                  const unsigned char *sk); \
+	int mqom2_##b##_crypto_sign_final_with_ctx(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, \
+	                                           const struct sign_ctx_t *ctx); \
+	int mqom2_##b##_crypto_sign_verify_init(struct sign_stream_t **stream); \
+	int mqom2_##b##_crypto_sign_verify_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen); \
+	int mqom2_##b##_crypto_sign_verify_final(const unsigned char *sig, unsigned long long siglen, struct sign_stream_t *stream, \
+	                                         const unsigned char *pk); \
+	void mqom2_##b##_crypto_sign_stream_free(struct sign_stream_t *stream); \
+	unsigned long long mqom2_##b##_crypto_sign_workspace_size(void); \
+	int mqom2_##b##_crypto_sign_signature_ws(unsigned char *sig, unsigned long long *siglen, const unsigned char *m, \
+	                                         unsigned long long mlen, const unsigned char *sk, void *ws, \
+	                                         unsigned long long wslen); \
+	int mqom2_##b##_crypto_sign_verify_ws(const unsigned char *sig, unsigned long long siglen, const unsigned char *m, \
+	                                      unsigned long long mlen, const unsigned char *pk, void *ws, \
+	                                      unsigned long long wslen);
+
+#define DISPATCH_BACKEND_ENTRY(b, features) { \
+	#b, features, \
+	mqom2_##b##_crypto_sign_keypair, \
+	mqom2_##b##_crypto_sign_signature, \
+	mqom2_##b##_crypto_sign, \
+	mqom2_##b##_crypto_sign_verify, \
+	mqom2_##b##_crypto_sign_open, \
+	mqom2_##b##_crypto_sign_keypair_expand, \
+	mqom2_##b##_crypto_sign_signature_with_ctx, \
+	mqom2_##b##_crypto_sign_expanded_key_free, \
+	mqom2_##b##_crypto_sign_verify_batch, \
+	mqom2_##b##_crypto_sign_init, \
+	mqom2_##b##_crypto_sign_update, \
+	mqom2_##b##_crypto_sign_final, \
+	mqom2_##b##_crypto_sign_final_with_ctx, \
+	mqom2_##b##_crypto_sign_verify_init, \
+	mqom2_##b##_crypto_sign_verify_update, \
+	mqom2_##b##_crypto_sign_verify_final, \
+	mqom2_##b##_crypto_sign_stream_free, \
+	mqom2_##b##_crypto_sign_workspace_size, \
+	mqom2_##b##_crypto_sign_signature_ws, \
+	mqom2_##b##_crypto_sign_verify_ws, \
+},
+
+#if defined(DISPATCH_BACKEND_AVX512_GFNI)
+DISPATCH_DECLARE_BACKEND(avx512_gfni)
+#endif
+#if defined(DISPATCH_BACKEND_AVX512)
+DISPATCH_DECLARE_BACKEND(avx512)
+#endif
+#if defined(DISPATCH_BACKEND_AVX2_GFNI)
+DISPATCH_DECLARE_BACKEND(avx2_gfni)
+#endif
+#if defined(DISPATCH_BACKEND_AVX2)
+DISPATCH_DECLARE_BACKEND(avx2)
+#endif
+#if defined(DISPATCH_BACKEND_REF)
+DISPATCH_DECLARE_BACKEND(ref)
+#endif
+
+#if !defined(DISPATCH_BACKEND_REF)
+#error "The runtime dispatching library needs at least the ref backend"
+#endif
+
+/* The compiled backends, from the fastest to the slowest */
+static const dispatch_backend_t backends[] = {
+#if defined(DISPATCH_BACKEND_AVX512_GFNI)
+	DISPATCH_BACKEND_ENTRY(avx512_gfni, CPU_FEATURES_AVX512 | CPU_FEATURE_GFNI)
+#endif
+#if defined(DISPATCH_BACKEND_AVX512)
+	DISPATCH_BACKEND_ENTRY(avx512, CPU_FEATURES_AVX512)
+#endif
+#if defined(DISPATCH_BACKEND_AVX2_GFNI)
+	DISPATCH_BACKEND_ENTRY(avx2_gfni, CPU_FEATURES_AVX2 | CPU_FEATURE_GFNI)
+#endif
+#if defined(DISPATCH_BACKEND_AVX2)
+	DISPATCH_BACKEND_ENTRY(avx2, CPU_FEATURES_AVX2)
+#endif
+	DISPATCH_BACKEND_ENTRY(ref, 0)
+};
+
+static const dispatch_backend_t *selected_backend = NULL;
+
+#if defined(DISPATCH_HAS_CPUID)
+static inline uint64_t dispatch_xgetbv(void) {
+	uint32_t eax, edx;
+	__asm__ volatile("xgetbv" : "=a"(eax), "=d"(edx) : "c"(0));
+	return ((uint64_t)edx << 32) | eax;
+}
+
+static uint32_t dispatch_cpu_features(void) {
+	uint32_t features = 0;
+	unsigned int eax, ebx, ecx, edx;
+	uint64_t xcr0;
+
+	if (!__get_cpuid(1, &eax, &ebx, &ecx, &edx)) {
+		goto end;
+	}
+	if (ecx & bit_AES) {
+		features |= CPU_FEATURE_AES;
+	}
+	/* The vector states must be enabled by the OS */
+	if (!(ecx & bit_OSXSAVE)) {
+		goto end;
+	}
+	xcr0 = dispatch_xgetbv();
+	if ((xcr0 & 0x6) != 0x6) {
+		/* No XMM/YMM state */
+		goto end;
+	}
+	if (!__get_cpuid_count(7, 0, &eax, &ebx, &ecx, &edx)) {
+		goto end;
+	}
+	if (ebx & (1 << 5)) {
+		features |= CPU_FEATURE_AVX2;
+	}
+	if (ecx & (1 << 8)) {
+		features |= CPU_FEATURE_GFNI;
+	}
+	if ((xcr0 & 0xe6) != 0xe6) {
+		/* No opmask/ZMM state */
+		goto end;
+	}
+	if (ebx & (1 << 16)) {
+		features |= CPU_FEATURE_AVX512F;
+	}
+	if (ebx & (1 << 30)) {
+		features |= CPU_FEATURE_AVX512BW;
+	}
+	if (ebx & (1U << 31)) {
+		features |= CPU_FEATURE_AVX512VL;
+	}
+	if (ecx & (1 << 1)) {
+		features |= CPU_FEATURE_AVX512VBMI;
+	}
+	if (ecx & (1 << 14)) {
+		features |= CPU_FEATURE_AVX512VPOPCNTDQ;
+	}
+
+end:
+	return features;
+}
+#else
+static uint32_t dispatch_cpu_features(void) {
+	return 0;
+}
+#endif
+
+static void dispatch_init(void) {
+	uint32_t i, features = dispatch_cpu_features();
+	const dispatch_backend_t *best = NULL, *forced = NULL;
+	const char *env = getenv("MQOM2_DISPATCH");
+
+	for (i = 0; i < sizeof(backends) / sizeof(backends[0]); i++) {
+		if ((backends[i].required_features & features) != backends[i].required_features) {
+			continue;
+		}
+		if (best == NULL) {
+			best = &backends[i];
+		}
+		if ((env != NULL) && (strcmp(env, backends[i].name) == 0)) {
+			forced = &backends[i];
+		}
+	}
+	/* Unknown or unsupported forced backends fall back to the best one */
+	selected_backend = (forced != NULL) ? forced : best;
+}
+
+#if defined(USE_PTHREADS)
+static pthread_once_t dispatch_once = PTHREAD_ONCE_INIT;
+
+static inline const dispatch_backend_t *dispatch_get(void) {
+	pthread_once(&dispatch_once, dispatch_init);
+	return selected_backend;
+}
+#else
+static inline const dispatch_backend_t *dispatch_get(void) {
+	if (selected_backend == NULL) {
+		dispatch_init();
+	}
+	return selected_backend;
+}
+#endif
+
+const char *crypto_sign_dispatch_backend(void) {
+	return dispatch_get()->name;
+}
+
+int crypto_sign_keypair(unsigned char *pk, unsigned char *sk) {
+	return dispatch_get()->keypair(pk, sk);
+}
+
+int crypto_sign_signature(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                          unsigned long long mlen, const unsigned char *sk) {
+	return dispatch_get()->signature(sig, siglen, m, mlen, sk);
+}
+
+int crypto_sign(unsigned char *sm, unsigned long long *smlen, const unsigned char *m,
+                unsigned long long mlen, const unsigned char *sk) {
+	return dispatch_get()->sign(sm, smlen, m, mlen, sk);
+}
+
+int crypto_sign_verify(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                       unsigned long long mlen, const unsigned char *pk) {
+	return dispatch_get()->verify(sig, siglen, m, mlen, pk);
+}
+
+int crypto_sign_open(unsigned char *m, unsigned long long *mlen, const unsigned char *sm,
+                     unsigned long long smlen, const unsigned char *pk) {
+	return dispatch_get()->open(m, mlen, sm, smlen, pk);
+}
+
+int crypto_sign_keypair_expand(struct sign_ctx_t **ctx, const unsigned char *sk) {
+	return dispatch_get()->keypair_expand(ctx, sk);
+}
+
+int crypto_sign_signature_with_ctx(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                                   unsigned long long mlen, const struct sign_ctx_t *ctx) {
+	return dispatch_get()->signature_with_ctx(sig, siglen, m, mlen, ctx);
+}
+
+void crypto_sign_expanded_key_free(struct sign_ctx_t *ctx) {
+	dispatch_get()->expanded_key_free(ctx);
+}
+
+int crypto_sign_verify_batch(const unsigned char *pk, const unsigned char **m, const unsigned long long *mlen,
+                             const unsigned char **sig, unsigned long long n, int *results) {
+	return dispatch_get()->verify_batch(pk, m, mlen, sig, n, results);
+}
+
+int crypto_sign_init(struct sign_stream_t **stream) {
+	return dispatch_get()->init(stream);
+}
+
+int crypto_sign_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen) {
+	return dispatch_get()->update(stream, m, mlen);
+}
+
+int crypto_sign_final(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, const unsigned char *sk) {
+	return dispatch_get()->final(sig, siglen, stream, sk);
+}
+
+int crypto_sign_final_with_ctx(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream,
+                               const struct sign_ctx_t *ctx) {
+	return dispatch_get()->final_with_ctx(sig, siglen, stream, ctx);
+}
+
+int crypto_sign_verify_init(struct sign_stream_t **stream) {
+	return dispatch_get()->verify_init(stream);
+}
+
+int crypto_sign_verify_update(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen) {
+	return dispatch_get()->verify_update(stream, m, mlen);
+}
+
+int crypto_sign_verify_final(const unsigned char *sig, unsigned long long siglen, struct sign_stream_t *stream,
+                             const unsigned char *pk) {
+	return dispatch_get()->verify_final(sig, siglen, stream, pk);
+}
+
+void crypto_sign_stream_free(struct sign_stream_t *stream) {
+	dispatch_get()->stream_free(stream);
+}
+
+unsigned long long crypto_sign_workspace_size(void) {
+	return dispatch_get()->workspace_size();
+}
+
+int crypto_sign_signature_ws(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+                             unsigned long long mlen, const unsigned char *sk, void *ws, unsigned long long wslen) {
+	return dispatch_get()->signature_ws(sig, siglen, m, mlen, sk, ws, wslen);
+}
+
+int crypto_sign_verify_ws(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                          unsigned long long mlen, const unsigned char *pk, void *ws, unsigned long long wslen) {
+	return dispatch_get()->verify_ws(sig, siglen, m, mlen, pk, ws, wslen);
+}
@@ -0,0 +1,79 @@
+#ifndef __DISPATCH_H__
+#define __DISPATCH_H__
+
+#include "api.h"
+
+#if defined(MQOM2_FOR_MUPQ) || defined(MQOM2_FOR_LIBOQS)
+#error "The runtime dispatching library only exposes the native API"
+#endif
+
+/* Deal with namespacing */
+#define crypto_sign_dispatch_backend MQOM_PUBLIC_API_NAMESPACE(crypto_sign_dispatch_backend)
+
+/* CPU features the backends may depend on */
+#define CPU_FEATURE_AES             (1 << 0)
+#define CPU_FEATURE_AVX2            (1 << 1)
+#define CPU_FEATURE_GFNI            (1 << 2)
+#define CPU_FEATURE_AVX512F         (1 << 3)
+#define CPU_FEATURE_AVX512BW        (1 << 4)
+#define CPU_FEATURE_AVX512VL        (1 << 5)
+#define CPU_FEATURE_AVX512VPOPCNTDQ (1 << 6)
+#define CPU_FEATURE_AVX512VBMI      (1 << 7)
+
+#define CPU_FEATURES_AVX2   (CPU_FEATURE_AES | CPU_FEATURE_AVX2)
+#define CPU_FEATURES_AVX512 (CPU_FEATURE_AES | CPU_FEATURE_AVX2 | CPU_FEATURE_AVX512F | CPU_FEATURE_AVX512BW | \
+                             CPU_FEATURE_AVX512VL | CPU_FEATURE_AVX512VPOPCNTDQ | CPU_FEATURE_AVX512VBMI)
+
+/* Function table of one of the compiled backends: each backend is a full build
+ * of the library with its own FORCE_PLATFORM_* flags and its own namespace */
+typedef struct {
+	const char *name;
+	uint32_t required_features;
+	int (*keypair)(unsigned char *pk, unsigned char *sk);
+	int (*signature)(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+	                 unsigned long long mlen, const unsigned char *sk);
+	int (*sign)(unsigned char *sm, unsigned long long *smlen, const unsigned char *m,
+	            unsigned long long mlen, const unsigned char *sk);
+	int (*verify)(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+	              unsigned long long mlen, const unsigned char *pk);
+	int (*open)(unsigned char *m, unsigned long long *mlen, const unsigned char *sm,
+	            unsigned long long smlen, const unsigned char *pk);
+	int (*keypair_expand)(struct sign_ctx_t **ctx, const unsigned char *sk);
+	int (*signature_with_ctx)(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+	                          unsigned long long mlen, const struct sign_ctx_t *ctx);
+	void (*expanded_key_free)(struct sign_ctx_t *ctx);
+	int (*verify_batch)(const unsigned char *pk, const unsigned char **m, const unsigned long long *mlen,
+	                    const unsigned char **sig, unsigned long long n, int *results);
+	int (*init)(struct sign_stream_t **stream);
+	int (*update)(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen);
+	int (*final)(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream, const unsigned char *sk);
+	int (*final_with_ctx)(unsigned char *sig, unsigned long long *siglen, struct sign_stream_t *stream,
+	                      const struct sign_ctx_t *ctx);
+	int (*verify_init)(struct sign_stream_t **stream);
+	int (*verify_update)(struct sign_stream_t *stream, const unsigned char *m, unsigned long long mlen);
+	int (*verify_final)(const unsigned char *sig, unsigned long long siglen, struct sign_stream_t *stream,
+	                    const unsigned char *pk);
+	void (*stream_free)(struct sign_stream_t *stream);
+	unsigned long long (*workspace_size)(void);
+	int (*signature_ws)(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+	                    unsigned long long mlen, const unsigned char *sk, void *ws, unsigned long long wslen);
+	int (*verify_ws)(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+	                 unsigned long long mlen, const unsigned char *pk, void *ws, unsigned long long wslen);
+} dispatch_backend_t;
+
+/*************************************************
+* Name:        crypto_sign_dispatch_backend
+*
+* Description: Gets the name of the backend selected by the runtime
+*              dispatching library ("ref", "avx2", "avx2_gfni", "avx512"
+*              or "avx512_gfni"). The CPU is probed once, at the first call
+*              of this function or of any crypto_sign_* function: the fastest
+*              backend supported by the CPU is selected, unless the
+*              MQOM2_DISPATCH environment variable names another supported
+*              backend.
+*
+* Returns the name of the selected backend
+**************************************************/
+const char *crypto_sign_dispatch_backend(void);
+
+#endif /* __DISPATCH_H__ */
@@ -0,0 +1,308 @@
+#include "api.h"
+
+#include <stdlib.h>
+#include "common.h"
+#include "xof.h"
+#include "eqstore.h"
+#include "eqcache.h"
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+#ifdef SUPERCOP
+extern void randombytes(unsigned char* x, unsigned long long xlen);
+#else
+extern int randombytes(unsigned char* x, unsigned long long xlen);
+#endif
+#else
+#include "randombytes.h"
+#endif
+
+#if defined(USE_PTHREADS)
+#define eqcache_lock(cache) pthread_mutex_lock(&(cache)->lock)
+#define eqcache_unlock(cache) pthread_mutex_unlock(&(cache)->lock)
+#else
+#define eqcache_lock(cache) ((void)(cache))
+#define eqcache_unlock(cache) ((void)(cache))
+#endif
+
+/* Bytes accounted for one cached public key */
+#define EQCACHE_ENTRY_SIZE (sizeof(eqcache_entry_t) + MQOM2_EXPANDED_EQUATIONS_SIZE)
+/* Bound on the size of the hash table for large budgets */
+#define EQCACHE_MAX_BUCKETS (1UL << 20)
+
+/* Bucket of a public key: the hash is salted per cache so that the
+ * distribution of the buckets cannot be chosen by the owners of the keys */
+static int eqcache_bucket(const eqcache_t *cache, const uint8_t pk[MQOM2_PK_SIZE], uint32_t *bucket) {
+	int ret = -1;
+	uint8_t h[4];
+	xof_context DECL_VAR(xof_ctx);
+
+	ret = xof_init(&xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, cache->salt, sizeof(cache->salt));
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, pk, MQOM2_PK_SIZE);
+	ERR(ret, err);
+	ret = xof_squeeze(&xof_ctx, h, sizeof(h));
+	ERR(ret, err);
+	/* The number of buckets is a power of 2 */
+	*bucket = (((uint32_t)h[0]) | ((uint32_t)h[1] << 8) | ((uint32_t)h[2] << 16) | ((uint32_t)h[3] << 24)) & (cache->nb_buckets - 1);
+
+	ret = 0;
+err:
+	xof_clean_ctx(&xof_ctx);
+	return ret;
+}
+
+static void eqcache_entry_free(eqcache_entry_t *entry) {
+	if (entry == NULL) {
+		return;
+	}
+	mqom_free(entry->eq, MQOM2_EXPANDED_EQUATIONS_SIZE);
+	mqom_free(entry, sizeof(eqcache_entry_t));
+}
+
+/**** LRU list, must be called with the cache locked *********/
+static void eqcache_list_remove(eqcache_t *cache, eqcache_entry_t *entry) {
+	if (entry->prev != NULL) {
+		entry->prev->next = entry->next;
+	} else {
+		cache->head = entry->next;
+	}
+	if (entry->next != NULL) {
+		entry->next->prev = entry->prev;
+	} else {
+		cache->tail = entry->prev;
+	}
+	entry->prev = entry->next = NULL;
+}
+
+static void eqcache_list_push_front(eqcache_t *cache, eqcache_entry_t *entry) {
+	entry->prev = NULL;
+	entry->next = cache->head;
+	if (cache->head != NULL) {
+		cache->head->prev = entry;
+	} else {
+		cache->tail = entry;
+	}
+	cache->head = entry;
+}
+
+static eqcache_entry_t *eqcache_find(eqcache_t *cache, uint32_t bucket, const uint8_t pk[MQOM2_PK_SIZE]) {
+	eqcache_entry_t *entry;
+
+	for (entry = cache->buckets[bucket]; entry != NULL; entry = entry->chain) {
+		if (memcmp(entry->pk, pk, MQOM2_PK_SIZE) == 0) {
+			return entry;
+		}
+	}
+
+	return NULL;
+}
+
+/* Unlink the least recently used entry: it is released now, or by the last
+ * verification pinning it */
+static void eqcache_evict(eqcache_t *cache) {
+	eqcache_entry_t *entry = cache->tail, **link;
+
+	if (entry == NULL) {
+		return;
+	}
+	for (link = &cache->buckets[entry->bucket]; (*link) != NULL; link = &(*link)->chain) {
+		if ((*link) == entry) {
+			(*link) = entry->chain;
+			break;
+		}
+	}
+	eqcache_list_remove(cache, entry);
+	entry->chain = NULL;
+	entry->cached = 0;
+	cache->stats.bytes -= EQCACHE_ENTRY_SIZE;
+	cache->stats.entries--;
+	cache->stats.evictions++;
+	if (entry->refs == 0) {
+		eqcache_entry_free(entry);
+	}
+}
+
+/* Unpin an entry used by a verification */
+static void eqcache_release(eqcache_t *cache, eqcache_entry_t *entry) {
+	eqcache_lock(cache);
+	entry->refs--;
+	if ((entry->refs == 0) && !entry->cached) {
+		eqcache_entry_free(entry);
+	}
+	eqcache_unlock(cache);
+}
+
+/* Get the pinned entry of pk, expanding its equations on a miss */
+static int eqcache_get(eqcache_t *cache, const uint8_t pk[MQOM2_PK_SIZE], eqcache_entry_t **out) {
+	int ret = -1;
+	uint32_t bucket;
+	eqcache_entry_t *entry, *found;
+
+	ret = eqcache_bucket(cache, pk, &bucket);
+	ERR(ret, err);
+
+	eqcache_lock(cache);
+	entry = eqcache_find(cache, bucket, pk);
+	if (entry != NULL) {
+		entry->refs++;
+		eqcache_list_remove(cache, entry);
+		eqcache_list_push_front(cache, entry);
+		cache->stats.hits++;
+	} else {
+		cache->stats.misses++;
+	}
+	eqcache_unlock(cache);
+	if (entry != NULL) {
+		*out = entry;
+		ret = 0;
+		goto err;
+	}
+
+	/* Miss: expand the equations out of the lock */
+	ret = -1;
+	entry = (eqcache_entry_t*)mqom_calloc(1, sizeof(eqcache_entry_t));
+	if (entry == NULL) {
+		goto err;
+	}
+	entry->eq = (uint8_t*)mqom_malloc(MQOM2_EXPANDED_EQUATIONS_SIZE);
+	if (entry->eq == NULL) {
+		eqcache_entry_free(entry);
+		goto err;
+	}
+	memcpy(entry->pk, pk, MQOM2_PK_SIZE);
+	entry->bucket = bucket;
+	ret = crypto_sign_expand_equations(entry->eq, pk);
+	if (ret) {
+		eqcache_entry_free(entry);
+		goto err;
+	}
+	entry->refs = 1;
+
+	eqcache_lock(cache);
+	/* The same key may have been inserted concurrently: ours is then private */
+	found = eqcache_find(cache, bucket, pk);
+	if ((found == NULL) && (EQCACHE_ENTRY_SIZE <= cache->stats.budget)) {
+		while ((cache->stats.bytes + EQCACHE_ENTRY_SIZE) > cache->stats.budget) {
+			eqcache_evict(cache);
+		}
+		entry->chain = cache->buckets[bucket];
+		cache->buckets[bucket] = entry;
+		eqcache_list_push_front(cache, entry);
+		entry->cached = 1;
+		cache->stats.bytes += EQCACHE_ENTRY_SIZE;
+		cache->stats.entries++;
+	}
+	eqcache_unlock(cache);
+	*out = entry;
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_eqcache_init(eqcache_t **cache, size_t budget) {
+	int ret = -1;
+	uint64_t capacity;
+	eqcache_t *c = NULL;
+
+	if (cache == NULL) {
+		goto err;
+	}
+	(*cache) = NULL;
+
+	c = (eqcache_t*)mqom_calloc(1, sizeof(eqcache_t));
+	if (c == NULL) {
+		goto err;
+	}
+	/* Size the hash table for the number of entries fitting in the budget */
+	capacity = (uint64_t)budget / EQCACHE_ENTRY_SIZE;
+	c->nb_buckets = 1;
+	while ((c->nb_buckets < capacity) && (c->nb_buckets < EQCACHE_MAX_BUCKETS)) {
+		c->nb_buckets <<= 1;
+	}
+	c->buckets = (eqcache_entry_t**)mqom_calloc(c->nb_buckets, sizeof(eqcache_entry_t*));
+	if (c->buckets == NULL) {
+		goto err;
+	}
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+	randombytes(c->salt, sizeof(c->salt));
+#else
+	ret = randombytes(c->salt, sizeof(c->salt));
+	ERR(ret, err);
+	ret = -1;
+#endif
+#if defined(USE_PTHREADS)
+	if (pthread_mutex_init(&c->lock, NULL)) {
+		goto err;
+	}
+#endif
+	c->stats.budget = (uint64_t)budget;
+	c->stats.entry_size = EQCACHE_ENTRY_SIZE;
+	(*cache) = c;
+
+	ret = 0;
+err:
+	if (ret && (c != NULL)) {
+		mqom_free(c->buckets, c->nb_buckets * sizeof(eqcache_entry_t*));
+		mqom_free(c, sizeof(eqcache_t));
+	}
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_cached(eqcache_t *cache, const unsigned char *sig, unsigned long long siglen,
+                              const unsigned char *m, unsigned long long mlen, const unsigned char *pk)
+#else
+int
+crypto_sign_verify_cached(eqcache_t *cache, const unsigned char *sig, size_t siglen,
+                          const unsigned char *m, size_t mlen, const unsigned char *pk)
+#endif
+{
+	int ret = -1;
+	eqcache_entry_t *entry = NULL;
+
+	if ((cache == NULL) || (pk == NULL)) {
+		goto err;
+	}
+	ret = eqcache_get(cache, pk, &entry);
+	ERR(ret, err);
+	ret = crypto_sign_verify_expanded(sig, siglen, m, mlen, pk, entry->eq);
+	eqcache_release(cache, entry);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_eqcache_stats(eqcache_t *cache, eqcache_stats_t *stats) {
+	if ((cache == NULL) || (stats == NULL)) {
+		return -1;
+	}
+	eqcache_lock(cache);
+	memcpy(stats, &cache->stats, sizeof(eqcache_stats_t));
+	eqcache_unlock(cache);
+
+	return 0;
+}
+
+void crypto_sign_eqcache_destroy(eqcache_t *cache) {
+	eqcache_entry_t *entry, *next;
+
+	if (cache == NULL) {
+		return;
+	}
+	for (entry = cache->head; entry != NULL; entry = next) {
+		next = entry->next;
+		eqcache_entry_free(entry);
+	}
+	mqom_free(cache->buckets, cache->nb_buckets * sizeof(eqcache_entry_t*));
+#if defined(USE_PTHREADS)
+	pthread_mutex_destroy(&cache->lock);
+#endif
+	mqom_free(cache, sizeof(eqcache_t));
+
+	return;
+}
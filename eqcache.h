@@ -0,0 +1,114 @@
+#ifndef __EQCACHE_H__
+#define __EQCACHE_H__
+
+#include "common.h"
+#include "eqstore.h"
+
+#if defined(USE_PTHREADS)
+#include <pthread.h>
+#endif
+
+/* Deal with namespacing */
+#define crypto_sign_eqcache_init MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqcache_init)
+#define crypto_sign_verify_cached MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_cached)
+#define crypto_sign_eqcache_stats MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqcache_stats)
+#define crypto_sign_eqcache_destroy MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqcache_destroy)
+
+/* A cached public key with its expanded equations (A_hat then b_hat, see
+ * crypto_sign_expand_equations). An entry is pinned by the verifications
+ * using it, so that it is released by the last of them when it is evicted
+ * in the meantime */
+typedef struct eqcache_entry_t {
+	uint8_t pk[MQOM2_PK_SIZE];
+	uint8_t *eq;
+	uint32_t bucket;
+	uint32_t refs;
+	uint8_t cached;
+	/* LRU list, from the most to the least recently used */
+	struct eqcache_entry_t *prev;
+	struct eqcache_entry_t *next;
+	/* Hash bucket chain */
+	struct eqcache_entry_t *chain;
+} eqcache_entry_t;
+
+typedef struct {
+	uint64_t budget;       /* Byte budget of the cached entries */
+	uint64_t entry_size;   /* Bytes accounted for one cached public key */
+	uint64_t bytes;        /* Bytes currently used by the cached entries */
+	uint32_t entries;      /* Number of cached public keys */
+	uint64_t hits;         /* Verifications that found the equations in the cache */
+	uint64_t misses;       /* Verifications that expanded the equations */
+	uint64_t evictions;    /* Entries evicted to stay within the budget */
+} eqcache_stats_t;
+
+typedef struct {
+	uint8_t salt[MQOM2_PARAM_SEED_SIZE];
+	uint32_t nb_buckets;
+	eqcache_entry_t **buckets;
+	eqcache_entry_t *head;
+	eqcache_entry_t *tail;
+	eqcache_stats_t stats;
+#if defined(USE_PTHREADS)
+	pthread_mutex_t lock;
+#endif
+} eqcache_t;
+
+/*************************************************
+* Name:        crypto_sign_eqcache_init
+*
+* Description: Allocates an empty cache of expanded equations, holding at
+*              most budget bytes of entries (entries are evicted in least
+*              recently used order to stay within the budget).
+*
+* Arguments:   - eqcache_t **cache: pointer to the allocated cache
+*              - size_t budget:     byte budget of the cache (at least
+*                                   one entry, see eqcache_stats_t)
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_eqcache_init(eqcache_t **cache, size_t budget);
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+/*************************************************
+* Name:        crypto_sign_verify_cached
+*
+* Description: Same as crypto_sign_verify, with the expanded equations of pk
+*              taken from the cache on a hit, and expanded then inserted in
+*              the cache on a miss. Thread safe when USE_PTHREADS is set.
+*
+* Arguments:   - eqcache_t *cache:  pointer to the cache
+*              - uint8_t *sig:      pointer to input signature
+*              - size_t siglen:     length of signature
+*              - const uint8_t *m:  pointer to message
+*              - size_t mlen:       length of message
+*              - const uint8_t *pk: pointer to bit-packed public key
+*
+* Returns 0 if signature could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_verify_cached(eqcache_t *cache, const unsigned char *sig, unsigned long long siglen,
+                              const unsigned char *m, unsigned long long mlen, const unsigned char *pk);
+#else
+int
+crypto_sign_verify_cached(eqcache_t *cache, const unsigned char *sig, size_t siglen,
+                          const unsigned char *m, size_t mlen, const unsigned char *pk);
+#endif
+
+/*************************************************
+* Name:        crypto_sign_eqcache_stats
+*
+* Description: Gets a snapshot of the cache statistics (occupancy and
+*              hit/miss/eviction counters).
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_eqcache_stats(eqcache_t *cache, eqcache_stats_t *stats);
+
+/*************************************************
+* Name:        crypto_sign_eqcache_destroy
+*
+* Description: Releases the cache and all its entries. No verification
+*              must be using the cache anymore.
+**************************************************/
+void crypto_sign_eqcache_destroy(eqcache_t *cache);
+
+#endif /* __EQCACHE_H__ */
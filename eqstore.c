@@ -0,0 +1,456 @@
+#include "api.h"
+
+#include <stdio.h>
+#include <stdlib.h>
+#include "common.h"
+#include "fields.h"
+#include "xof.h"
+#include "expand_mq.h"
+#include "sign.h"
+#include "eqstore.h"
+
+#if defined(__unix__) || (defined(__APPLE__) && defined(__MACH__))
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#define EQSTORE_HAS_MMAP
+#endif
+
+#if defined(USE_PTHREADS)
+#define eqstore_lock(store) pthread_mutex_lock(&(store)->lock)
+#define eqstore_unlock(store) pthread_mutex_unlock(&(store)->lock)
+#else
+#define eqstore_lock(store)
+#define eqstore_unlock(store)
+#endif
+
+#define EQSTORE_CHUNK(len) ((((uint64_t)(len)) + EQSTORE_ALIGN - 1) & ~((uint64_t)EQSTORE_ALIGN - 1))
+#define EQSTORE_HEADER_SIZE EQSTORE_CHUNK(sizeof(eqstore_header_t))
+#define EQSTORE_INDEX_SIZE(n) EQSTORE_CHUNK((n) * sizeof(eqstore_index_t))
+#define EQSTORE_ENTRY_SIZE (EQSTORE_CHUNK(MQOM2_PK_SIZE) + EQSTORE_CHUNK(MQOM2_EXPANDED_EQUATIONS_SIZE))
+
+/* Domain separated hash of a || b */
+static int eqstore_hash(const char *domain, const uint8_t *a, size_t alen, const uint8_t *b, size_t blen, uint8_t out[MQOM2_PARAM_DIGEST_SIZE]) {
+	int ret = -1;
+	xof_context DECL_VAR(xof_ctx);
+
+	ret = xof_init(&xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, (const uint8_t*) domain, strlen(domain));
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, a, alen);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, b, blen);
+	ERR(ret, err);
+	ret = xof_squeeze(&xof_ctx, out, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	xof_clean_ctx(&xof_ctx);
+	return ret;
+}
+
+/* The key of a public key in the index */
+static int eqstore_key(const uint8_t pk[MQOM2_PK_SIZE], uint8_t key[MQOM2_PARAM_DIGEST_SIZE]) {
+	return eqstore_hash("MQOM2-EQSTORE-KEY", (const uint8_t*) MQOM2_PARAM_LABEL, strlen(MQOM2_PARAM_LABEL), pk, MQOM2_PK_SIZE, key);
+}
+
+/* The digest of an entry: the public key and its expanded equations */
+static int eqstore_entry_digest(const uint8_t *entry, uint8_t digest[MQOM2_PARAM_DIGEST_SIZE]) {
+	return eqstore_hash("MQOM2-EQSTORE-ENTRY", entry, MQOM2_PK_SIZE, entry + EQSTORE_CHUNK(MQOM2_PK_SIZE), MQOM2_EXPANDED_EQUATIONS_SIZE, digest);
+}
+
+/* The digest of the header (with a zero digest) and of the index */
+static int eqstore_header_digest(const eqstore_header_t *header, const eqstore_index_t *index, uint8_t digest[MQOM2_PARAM_DIGEST_SIZE]) {
+	eqstore_header_t h = *header;
+
+	memset(h.digest, 0, sizeof(h.digest));
+	return eqstore_hash("MQOM2-EQSTORE-INDEX", (const uint8_t*) &h, sizeof(h), (const uint8_t*) index, header->nb_entries * sizeof(eqstore_index_t), digest);
+}
+
+unsigned long long crypto_sign_expanded_equations_size(void)
+{
+	return (unsigned long long) MQOM2_EXPANDED_EQUATIONS_SIZE;
+}
+
+int crypto_sign_expand_equations(unsigned char *eq, const unsigned char *pk)
+{
+	if ((eq == NULL) || (pk == NULL)) {
+		return -1;
+	}
+
+	return ExpandEquations(&pk[0], (field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)]) eq,
+	                       (field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)]) &eq[MQOM2_A_HAT_SIZE]);
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_verify_expanded(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                                unsigned long long mlen, const unsigned char *pk, const unsigned char *eq)
+#else
+int
+crypto_sign_verify_expanded(const unsigned char *sig, size_t siglen,
+                            const unsigned char *m, size_t mlen,
+                            const unsigned char *pk, const unsigned char *eq)
+#endif
+{
+	if ((siglen != (unsigned long long) MQOM2_SIG_SIZE) || (eq == NULL)) {
+		return -1;
+	}
+
+	return Verify_expanded(pk, (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)]) eq,
+	                       (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)]) &eq[MQOM2_A_HAT_SIZE], m, mlen, sig);
+}
+
+/**** Store building *********/
+static int eqstore_index_cmp(const void *a, const void *b) {
+	return memcmp(((const eqstore_index_t*) a)->key, ((const eqstore_index_t*) b)->key, MQOM2_PARAM_DIGEST_SIZE);
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_eqstore_build(const char *path, const unsigned char **pk, unsigned long long n)
+#else
+int
+crypto_sign_eqstore_build(const char *path, const unsigned char **pk, size_t n)
+#endif
+{
+	int ret = -1;
+	uint64_t i, nb_entries = 0, offset;
+	eqstore_header_t header;
+	eqstore_index_t *index = NULL;
+	uint8_t *entry = NULL;
+	char *tmp_path = NULL;
+	FILE *f = NULL;
+	int created = 0;
+
+	if ((path == NULL) || ((pk == NULL) && (n != 0))) {
+		goto err;
+	}
+	index = (eqstore_index_t*) mqom_calloc((n != 0) ? n : 1, sizeof(eqstore_index_t));
+	entry = (uint8_t*) mqom_calloc(1, EQSTORE_ENTRY_SIZE);
+	tmp_path = (char*) mqom_malloc(strlen(path) + 5);
+	if ((index == NULL) || (entry == NULL) || (tmp_path == NULL)) {
+		goto err;
+	}
+	sprintf(tmp_path, "%s.tmp", path);
+
+	/* Sort the public keys by key, and drop the duplicates. The offset
+	 * temporarily holds the position of the public key in the input */
+	for (i = 0; i < n; i++) {
+		ret = eqstore_key(pk[i], index[i].key);
+		ERR(ret, err);
+		index[i].offset = i;
+	}
+	qsort(index, n, sizeof(eqstore_index_t), eqstore_index_cmp);
+	for (i = 0; i < n; i++) {
+		if ((nb_entries == 0) || memcmp(index[nb_entries - 1].key, index[i].key, MQOM2_PARAM_DIGEST_SIZE)) {
+			index[nb_entries++] = index[i];
+		}
+	}
+
+	memset(&header, 0, sizeof(header));
+	memcpy(header.magic, EQSTORE_MAGIC, sizeof(header.magic));
+	header.version = EQSTORE_VERSION;
+	header.endianness = EQSTORE_ENDIANNESS;
+	strncpy(header.label, MQOM2_PARAM_LABEL, EQSTORE_LABEL_SIZE - 1);
+	header.field_ext_elt_size = sizeof(field_ext_elt);
+	header.pk_size = MQOM2_PK_SIZE;
+	header.equations_size = MQOM2_EXPANDED_EQUATIONS_SIZE;
+	header.entry_size = EQSTORE_ENTRY_SIZE;
+	header.nb_entries = nb_entries;
+	header.file_size = EQSTORE_HEADER_SIZE + EQSTORE_INDEX_SIZE(nb_entries) + (nb_entries * EQSTORE_ENTRY_SIZE);
+
+	/* Write under a temporary name: the header and the index are written last */
+	f = fopen(tmp_path, "wb");
+	if (f == NULL) {
+		ret = -1;
+		goto err;
+	}
+	created = 1;
+	offset = EQSTORE_HEADER_SIZE + EQSTORE_INDEX_SIZE(nb_entries);
+	for (i = 0; i < nb_entries; i++) {
+		const uint8_t *entry_pk = pk[index[i].offset];
+		memcpy(entry, entry_pk, MQOM2_PK_SIZE);
+		ret = crypto_sign_expand_equations(&entry[EQSTORE_CHUNK(MQOM2_PK_SIZE)], entry_pk);
+		ERR(ret, err);
+		ret = eqstore_entry_digest(entry, index[i].digest);
+		ERR(ret, err);
+		index[i].offset = offset;
+		if (fseek(f, (long) offset, SEEK_SET) || (fwrite(entry, 1, EQSTORE_ENTRY_SIZE, f) != EQSTORE_ENTRY_SIZE)) {
+			ret = -1;
+			goto err;
+		}
+		offset += EQSTORE_ENTRY_SIZE;
+	}
+	ret = eqstore_header_digest(&header, index, header.digest);
+	ERR(ret, err);
+	if (fseek(f, 0, SEEK_SET) || (fwrite(&header, 1, sizeof(header), f) != sizeof(header)) ||
+	    fseek(f, (long) EQSTORE_HEADER_SIZE, SEEK_SET) ||
+	    (fwrite(index, sizeof(eqstore_index_t), nb_entries, f) != nb_entries)) {
+		ret = -1;
+		goto err;
+	}
+	/* The header of an empty store is padded as well */
+	if ((nb_entries == 0) && (fseek(f, (long) (header.file_size - 1), SEEK_SET) || (fputc(0, f) == EOF))) {
+		ret = -1;
+		goto err;
+	}
+	ret = fclose(f);
+	f = NULL;
+	ERR(ret, err);
+	ret = rename(tmp_path, path);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	if (f != NULL) {
+		fclose(f);
+	}
+	if (ret && created) {
+		remove(tmp_path);
+	}
+	if (index != NULL) {
+		mqom_free(index, ((n != 0) ? n : 1) * sizeof(eqstore_index_t));
+	}
+	if (entry != NULL) {
+		mqom_free(entry, EQSTORE_ENTRY_SIZE);
+	}
+	if (tmp_path != NULL) {
+		mqom_free(tmp_path, strlen(path) + 5);
+	}
+	return ret;
+}
+
+/**** Store usage *********/
+/* Check the header and the index of a mapping */
+static int eqstore_check_header(const uint8_t *map, size_t map_size) {
+	int ret = -1;
+	uint64_t i;
+	const eqstore_header_t *header = (const eqstore_header_t*) map;
+	const eqstore_index_t *index = (const eqstore_index_t*) &map[EQSTORE_HEADER_SIZE];
+	uint8_t digest[MQOM2_PARAM_DIGEST_SIZE];
+
+	if ((map_size < EQSTORE_HEADER_SIZE) || memcmp(header->magic, EQSTORE_MAGIC, sizeof(header->magic)) ||
+	    (header->version != EQSTORE_VERSION) || (header->endianness != EQSTORE_ENDIANNESS)) {
+		goto err;
+	}
+	/* Same parameter set and same layout of the equations */
+	if ((strncmp(header->label, MQOM2_PARAM_LABEL, EQSTORE_LABEL_SIZE) != 0) ||
+	    (header->field_ext_elt_size != sizeof(field_ext_elt)) || (header->pk_size != MQOM2_PK_SIZE) ||
+	    (header->equations_size != MQOM2_EXPANDED_EQUATIONS_SIZE) || (header->entry_size != EQSTORE_ENTRY_SIZE)) {
+		goto err;
+	}
+	/* Bounds of the index and of the entries */
+	if ((header->file_size != map_size) || (header->nb_entries > (map_size / EQSTORE_ENTRY_SIZE)) ||
+	    (header->file_size != (EQSTORE_HEADER_SIZE + EQSTORE_INDEX_SIZE(header->nb_entries) + (header->nb_entries * EQSTORE_ENTRY_SIZE)))) {
+		goto err;
+	}
+	ret = eqstore_header_digest(header, index, digest);
+	ERR(ret, err);
+	if (memcmp(digest, header->digest, MQOM2_PARAM_DIGEST_SIZE)) {
+		ret = -1;
+		goto err;
+	}
+	for (i = 0; i < header->nb_entries; i++) {
+		if ((index[i].offset < (EQSTORE_HEADER_SIZE + EQSTORE_INDEX_SIZE(header->nb_entries))) ||
+		    (index[i].offset > (map_size - EQSTORE_ENTRY_SIZE)) || (index[i].offset % EQSTORE_ALIGN) ||
+		    ((i > 0) && (memcmp(index[i - 1].key, index[i].key, MQOM2_PARAM_DIGEST_SIZE) >= 0))) {
+			ret = -1;
+			goto err;
+		}
+	}
+
+	ret = 0;
+err:
+	return ret;
+}
+
+/* Check the digest of the entry i, once per process */
+static int eqstore_check_entry(eqstore_t *store, uint64_t i) {
+	int ret = -1;
+	uint8_t checked, digest[MQOM2_PARAM_DIGEST_SIZE];
+
+	eqstore_lock(store);
+	checked = store->checked[i];
+	eqstore_unlock(store);
+	if (checked) {
+		return 0;
+	}
+	ret = eqstore_entry_digest(&store->map[store->index[i].offset], digest);
+	ERR(ret, err);
+	if (memcmp(digest, store->index[i].digest, MQOM2_PARAM_DIGEST_SIZE)) {
+		ret = -1;
+		goto err;
+	}
+	eqstore_lock(store);
+	store->checked[i] = 1;
+	eqstore_unlock(store);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_eqstore_open(eqstore_t **store, const char *path, int flags)
+{
+	int ret = -1;
+#if defined(EQSTORE_HAS_MMAP)
+	int fd = -1;
+	struct stat st;
+	void *map = MAP_FAILED;
+	eqstore_t *s = NULL;
+
+	if ((store == NULL) || (path == NULL)) {
+		goto err;
+	}
+	*store = NULL;
+	fd = open(path, O_RDONLY);
+	if ((fd < 0) || fstat(fd, &st) || (st.st_size < (off_t) EQSTORE_HEADER_SIZE)) {
+		goto err;
+	}
+	map = mmap(NULL, (size_t) st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+	if (map == MAP_FAILED) {
+		goto err;
+	}
+	ret = eqstore_check_header((const uint8_t*) map, (size_t) st.st_size);
+	ERR(ret, err);
+
+	ret = -1;
+	s = (eqstore_t*) mqom_calloc(1, sizeof(eqstore_t));
+	if (s == NULL) {
+		goto err;
+	}
+	s->map = (const uint8_t*) map;
+	s->map_size = (size_t) st.st_size;
+	s->header = (const eqstore_header_t*) map;
+	s->index = (const eqstore_index_t*) &s->map[EQSTORE_HEADER_SIZE];
+	s->checked = (uint8_t*) mqom_calloc((s->header->nb_entries != 0) ? s->header->nb_entries : 1, sizeof(uint8_t));
+	if (s->checked == NULL) {
+		goto err;
+	}
+#if defined(USE_PTHREADS)
+	if (pthread_mutex_init(&s->lock, NULL)) {
+		goto err;
+	}
+#endif
+	map = MAP_FAILED;
+	*store = s;
+	s = NULL;
+	if (flags & EQSTORE_CHECK_ALL) {
+		ret = crypto_sign_eqstore_check(*store);
+		if (ret) {
+			crypto_sign_eqstore_close(*store);
+			*store = NULL;
+			goto err;
+		}
+	}
+
+	ret = 0;
+err:
+	if (fd >= 0) {
+		close(fd);
+	}
+	if (s != NULL) {
+		if (s->checked != NULL) {
+			mqom_free(s->checked, ((s->header->nb_entries != 0) ? s->header->nb_entries : 1) * sizeof(uint8_t));
+		}
+		mqom_free(s, sizeof(eqstore_t));
+	}
+	if (map != MAP_FAILED) {
+		munmap(map, (size_t) st.st_size);
+	}
+#else
+	/* No memory mapping on this platform */
+	(void)store;
+	(void)path;
+	(void)flags;
+#endif
+	return ret;
+}
+
+int crypto_sign_eqstore_check(eqstore_t *store)
+{
+	int ret = -1;
+	uint64_t i;
+
+	if (store == NULL) {
+		goto err;
+	}
+	for (i = 0; i < store->header->nb_entries; i++) {
+		ret = eqstore_check_entry(store, i);
+		ERR(ret, err);
+	}
+
+	ret = 0;
+err:
+	return ret;
+}
+
+const unsigned char *crypto_sign_eqstore_lookup(eqstore_t *store, const unsigned char *pk)
+{
+	uint64_t lo, hi, mid;
+	int cmp;
+	uint8_t key[MQOM2_PARAM_DIGEST_SIZE];
+	const uint8_t *entry;
+
+	if ((store == NULL) || (pk == NULL) || eqstore_key(pk, key)) {
+		return NULL;
+	}
+	/* Binary search in the sorted index */
+	lo = 0;
+	hi = store->header->nb_entries;
+	while (lo < hi) {
+		mid = lo + ((hi - lo) / 2);
+		cmp = memcmp(store->index[mid].key, key, MQOM2_PARAM_DIGEST_SIZE);
+		if (cmp == 0) {
+			entry = &store->map[store->index[mid].offset];
+			if (memcmp(entry, pk, MQOM2_PK_SIZE) || eqstore_check_entry(store, mid)) {
+				return NULL;
+			}
+			return &entry[EQSTORE_CHUNK(MQOM2_PK_SIZE)];
+		}
+		if (cmp < 0) {
+			lo = mid + 1;
+		} else {
+			hi = mid;
+		}
+	}
+
+	return NULL;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_eqstore_verify(eqstore_t *store, const unsigned char *sig, unsigned long long siglen,
+                               const unsigned char *m, unsigned long long mlen, const unsigned char *pk)
+#else
+int
+crypto_sign_eqstore_verify(eqstore_t *store, const unsigned char *sig, size_t siglen,
+                           const unsigned char *m, size_t mlen, const unsigned char *pk)
+#endif
+{
+	const unsigned char *eq = crypto_sign_eqstore_lookup(store, pk);
+
+	if (eq == NULL) {
+		/* Cold key: expand the equations */
+		return crypto_sign_verify(sig, siglen, m, mlen, pk);
+	}
+
+	return crypto_sign_verify_expanded(sig, siglen, m, mlen, pk, eq);
+}
+
+void crypto_sign_eqstore_close(eqstore_t *store)
+{
+	if (store == NULL) {
+		return;
+	}
+	/* The header is in the mapping */
+	mqom_free(store->checked, ((store->header->nb_entries != 0) ? store->header->nb_entries : 1) * sizeof(uint8_t));
+#if defined(EQSTORE_HAS_MMAP)
+	munmap((void*) store->map, store->map_size);
+#endif
+#if defined(USE_PTHREADS)
+	pthread_mutex_destroy(&store->lock);
+#endif
+	mqom_free(store, sizeof(eqstore_t));
+}
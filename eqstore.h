@@ -0,0 +1,230 @@
+#ifndef __EQSTORE_H__
+#define __EQSTORE_H__
+
+#include "common.h"
+#include "fields.h"
+
+#if defined(USE_PTHREADS)
+#include <pthread.h>
+#endif
+
+/* Deal with namespacing */
+#define crypto_sign_expanded_equations_size MQOM_PUBLIC_API_NAMESPACE(crypto_sign_expanded_equations_size)
+#define crypto_sign_expand_equations MQOM_PUBLIC_API_NAMESPACE(crypto_sign_expand_equations)
+#define crypto_sign_verify_expanded MQOM_PUBLIC_API_NAMESPACE(crypto_sign_verify_expanded)
+#define crypto_sign_eqstore_build MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_build)
+#define crypto_sign_eqstore_open MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_open)
+#define crypto_sign_eqstore_check MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_check)
+#define crypto_sign_eqstore_lookup MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_lookup)
+#define crypto_sign_eqstore_verify MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_verify)
+#define crypto_sign_eqstore_close MQOM_PUBLIC_API_NAMESPACE(crypto_sign_eqstore_close)
+
+/* Size of the expanded equations of a public key: A_hat followed by b_hat,
+ * in the in-memory layout of the field elements of the build */
+#define MQOM2_A_HAT_SIZE ((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt))
+#define MQOM2_B_HAT_SIZE ((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt))
+#define MQOM2_EXPANDED_EQUATIONS_SIZE (MQOM2_A_HAT_SIZE + MQOM2_B_HAT_SIZE)
+
+/* On-disk store of expanded equations, made to be mapped read-only and shared
+ * by many verifier processes. All the fields are in the native byte order:
+ * - a header, checked when opening the store;
+ * - an index of nb_entries entries sorted by key, where the key is a hash of
+ *   the parameter set label and of the public key;
+ * - the entries, each one aligned on EQSTORE_ALIGN bytes: the public key padded
+ *   to EQSTORE_ALIGN bytes, followed by the expanded equations.
+ * The header digest covers the header (with a zero digest) and the index, and
+ * the digest of each index entry covers its public key and equations.
+ */
+#define EQSTORE_MAGIC "MQOM2EQS"
+#define EQSTORE_VERSION 1
+#define EQSTORE_ENDIANNESS 0x01020304
+#define EQSTORE_ALIGN 64
+#define EQSTORE_LABEL_SIZE 64
+
+typedef struct {
+	char magic[8];
+	uint32_t version;
+	uint32_t endianness;
+	char label[EQSTORE_LABEL_SIZE];
+	uint32_t field_ext_elt_size;
+	uint32_t pk_size;
+	uint64_t equations_size;
+	uint64_t entry_size;
+	uint64_t nb_entries;
+	uint64_t file_size;
+	uint8_t digest[MQOM2_PARAM_DIGEST_SIZE];
+} eqstore_header_t;
+
+typedef struct {
+	uint8_t key[MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t digest[MQOM2_PARAM_DIGEST_SIZE];
+	uint64_t offset;
+} eqstore_index_t;
+
+typedef struct {
+	const uint8_t *map;
+	size_t map_size;
+	const eqstore_header_t *header;
+	const eqstore_index_t *index;
+	/* Entries whose digest has already been checked by this process */
+	uint8_t *checked;
+#if defined(USE_PTHREADS)
+	pthread_mutex_t lock;
+#endif
+} eqstore_t;
+
+/* Flags of crypto_sign_eqstore_open */
+#define EQSTORE_CHECK_ALL 1
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+/*************************************************
+* Name:        crypto_sign_expanded_equations_size
+*
+* Description: Gets the size in bytes of the expanded equations of a
+*              public key (see crypto_sign_expand_equations).
+*
+* Returns the size in bytes
+**************************************************/
+unsigned long long crypto_sign_expanded_equations_size(void);
+
+/*************************************************
+* Name:        crypto_sign_expand_equations
+*
+* Description: Expands the MQ equations (A_hat then b_hat) of a public key,
+*              in the in-memory layout expected by crypto_sign_verify_expanded.
+*
+* Arguments:   - uint8_t *eq:       pointer to output equations (of length
+*                                   crypto_sign_expanded_equations_size(),
+*                                   aligned on 8 bytes)
+*              - const uint8_t *pk: pointer to bit-packed public key
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_expand_equations(unsigned char *eq, const unsigned char *pk);
+
+/*************************************************
+* Name:        crypto_sign_verify_expanded
+*
+* Description: Same as crypto_sign_verify, with the already expanded
+*              equations of pk: ExpandEquations is not run. The equations
+*              are trusted, they must come from crypto_sign_expand_equations
+*              on the same public key or from an integrity checked store.
+*
+* Arguments:   - uint8_t *sig:      pointer to input signature
+*              - size_t siglen:     length of signature
+*              - const uint8_t *m:  pointer to message
+*              - size_t mlen:       length of message
+*              - const uint8_t *pk: pointer to bit-packed public key
+*              - const uint8_t *eq: pointer to the expanded equations of pk
+*
+* Returns 0 if signature could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_verify_expanded(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+                                unsigned long long mlen, const unsigned char *pk, const unsigned char *eq);
+
+/*************************************************
+* Name:        crypto_sign_eqstore_build
+*
+* Description: Expands the equations of n public keys and writes them in a
+*              store file (duplicate keys are stored once). The file is
+*              written under a temporary name and then renamed, so that the
+*              processes mapping a previous version are not disturbed.
+*
+* Arguments:   - const char *path:   path of the store file
+*              - const uint8_t **pk: array of n pointers to public keys
+*              - size_t n:           number of public keys
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_eqstore_build(const char *path, const unsigned char **pk, unsigned long long n);
+
+/*************************************************
+* Name:        crypto_sign_eqstore_verify
+*
+* Description: Same as crypto_sign_verify, with the equations of pk taken
+*              from the store when it holds them, and expanded otherwise.
+*
+* Arguments:   - eqstore_t *store:  pointer to the store (can be NULL)
+*              - uint8_t *sig:      pointer to input signature
+*              - size_t siglen:     length of signature
+*              - const uint8_t *m:  pointer to message
+*              - size_t mlen:       length of message
+*              - const uint8_t *pk: pointer to bit-packed public key
+*
+* Returns 0 if signature could be verified correctly and -1 otherwise
+**************************************************/
+int crypto_sign_eqstore_verify(eqstore_t *store, const unsigned char *sig, unsigned long long siglen,
+                               const unsigned char *m, unsigned long long mlen, const unsigned char *pk);
+#else
+unsigned long long
+crypto_sign_expanded_equations_size(void);
+
+int
+crypto_sign_expand_equations(unsigned char *eq, const unsigned char *pk);
+
+int
+crypto_sign_verify_expanded(const unsigned char *sig, size_t siglen,
+                            const unsigned char *m, size_t mlen,
+                            const unsigned char *pk, const unsigned char *eq);
+
+int
+crypto_sign_eqstore_build(const char *path, const unsigned char **pk, size_t n);
+
+int
+crypto_sign_eqstore_verify(eqstore_t *store, const unsigned char *sig, size_t siglen,
+                           const unsigned char *m, size_t mlen, const unsigned char *pk);
+#endif
+
+/*************************************************
+* Name:        crypto_sign_eqstore_open
+*
+* Description: Maps a store file read-only (the mapping is shared by all
+*              the processes opening the same file). The header and the
+*              index are always checked (parameter set, layout of the field
+*              elements, digest). With EQSTORE_CHECK_ALL, the digests of all
+*              the entries are checked as well; otherwise an entry is
+*              checked the first time it is looked up.
+*
+* Arguments:   - eqstore_t **store: pointer to output allocated store
+*              - const char *path:  path of the store file
+*              - int flags:         0 or EQSTORE_CHECK_ALL
+*
+* Returns 0 (success) and -1 otherwise (including on integrity failures)
+**************************************************/
+int crypto_sign_eqstore_open(eqstore_t **store, const char *path, int flags);
+
+/*************************************************
+* Name:        crypto_sign_eqstore_check
+*
+* Description: Checks the digests of all the entries of the store.
+*
+* Arguments:   - eqstore_t *store: pointer to the store
+*
+* Returns 0 when all the entries are intact and -1 otherwise
+**************************************************/
+int crypto_sign_eqstore_check(eqstore_t *store);
+
+/*************************************************
+* Name:        crypto_sign_eqstore_lookup
+*
+* Description: Looks up the expanded equations of a public key.
+*
+* Arguments:   - eqstore_t *store:  pointer to the store
+*              - const uint8_t *pk: pointer to bit-packed public key
+*
+* Returns a pointer to the expanded equations in the mapping (valid until
+* crypto_sign_eqstore_close), or NULL when pk is not in the store or when
+* its entry is corrupted
+**************************************************/
+const unsigned char *crypto_sign_eqstore_lookup(eqstore_t *store, const unsigned char *pk);
+
+/*************************************************
+* Name:        crypto_sign_eqstore_close
+*
+* Description: Unmaps and releases a store.
+*
+* Arguments:   - eqstore_t *store: pointer to the store
+**************************************************/
+void crypto_sign_eqstore_close(eqstore_t *store);
+
+#endif /* __EQSTORE_H__ */
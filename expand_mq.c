@@ -1,4 +1,5 @@
 #include "expand_mq.h"
+#include "workspace.h"
 #ifdef SUPERCOP
 #include "crypto_declassify.h"
 #endif
@@ -140,7 +141,7 @@ int ExpandEquations(const uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE], field_ext
 	nb_eq = nf_eq * FIELD_EXT_LOG2_CARD  / 8;
 
 	/* Allocate stream */
-	stream = (uint8_t*)mqom_malloc(nb_eq * sizeof(uint8_t));
+	stream = (uint8_t*)workspace_malloc(nb_eq * sizeof(uint8_t));
 	if (stream == NULL) {
 		ret = -1;
 		goto err;
@@ -241,9 +242,10 @@ left_over:
 
 	ret = 0;
 err:
+	/* Release in the reverse order of the allocations */
+	destroy_prg_cache_pub(prg_cache);
 	if (stream != NULL) {
-		mqom_free(stream, nb_eq * sizeof(uint8_t));
+		workspace_free(stream, nb_eq * sizeof(uint8_t));
 	}
-	destroy_prg_cache_pub(prg_cache);
 	return ret;
 }
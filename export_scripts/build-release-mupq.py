@@ -27,6 +27,10 @@ MQOM2_C_SOURCE_CODE_FILES = [
     'sign_memopt.c',
     'sign.h',
     'crypto_sign.c',
+    'threadpool.c',
+    'threadpool.h',
+    'workspace.c',
+    'workspace.h',
     'xof.c',
     'xof.h',
     'blc/seed_commit.h',
@@ -40,6 +44,7 @@ MQOM2_C_SOURCE_CODE_FILES = [
     'blc/blc_memopt_x1.c',
     'blc/blc_memopt_x2.c',
     'blc/blc_memopt_x4.c',
+    'blc/blc_memopt_x8.c',
     'blc/blc_common.h',
     'blc/blc.h',
     'fields/fields_handling.h',
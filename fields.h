@@ -156,6 +156,7 @@ static const char fields_conf[] = "Fields AVX512 implementation (without GFNI)";
 #define _field_ext_constant_vect_mult concat3(FIELD_EXT_PREFIX, _constant_vect_mult_, FIELD_IMPLEMENTATION_SUFFIX)
 #define _field_ext_vect_mult concat3(FIELD_EXT_PREFIX, _vect_mult_, FIELD_IMPLEMENTATION_SUFFIX)
 #define _field_ext_mat_mult concat3(FIELD_EXT_PREFIX, _mat_mult_, FIELD_IMPLEMENTATION_SUFFIX)
+#define _field_ext_mat_mult_multi concat3(FIELD_EXT_PREFIX, _mat_mult_multi_, FIELD_IMPLEMENTATION_SUFFIX)
 /* Hybrid multiplications */
 #define _field_base_ext_constant_vect_mult concat5(FIELD_BASE_PREFIX, _, FIELD_EXT_PREFIX, _constant_vect_mult_, FIELD_IMPLEMENTATION_SUFFIX)
 #define _field_ext_base_constant_vect_mult concat5(FIELD_EXT_PREFIX, _, FIELD_BASE_PREFIX, _constant_vect_mult_, FIELD_IMPLEMENTATION_SUFFIX)
@@ -183,6 +184,12 @@ static inline void field_ext_mat_mult(const field_ext_elt *A, const field_ext_el
 	return;
 }
 
+/* Y_k = A * X_k for the nb vectors X_k = &X[n * k] (resp. Y_k = &Y[n * k]), with A streamed once */
+static inline void field_ext_mat_mult_multi(const field_ext_elt *A, const field_ext_elt *X, field_ext_elt *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	_field_ext_mat_mult_multi(A, X, Y, n, mtype, nb);
+	return;
+}
+
 static inline void field_base_ext_constant_vect_mult(field_base_elt a, const field_ext_elt *b, field_ext_elt *c, uint32_t len) {
 	_field_base_ext_constant_vect_mult(a, b, c, len);
 	return;
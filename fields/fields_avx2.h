@@ -416,6 +416,49 @@ static inline void gf256_mat_mult_avx2(const uint8_t *A, const uint8_t *X, uint8
 	GF256_MAT_MULT(A, X, Y, n, mtype, gf256_vect_mult_avx2);
 }
 
+/*
+ * Vector to vectors multiplication in GF(256): the vector a of length 'len' is multiplied by
+ * the MAT_MULT_MULTI_WIDTH vectors starting at b[k * stride], and the results are stored in
+ * c[k * stride]. Each chunk of a is loaded once for all the vectors.
+ */
+static inline void gf256_vect_mult4_avx2(const uint8_t *a, const uint8_t *b, uint32_t stride, uint8_t *c, uint32_t len) {
+	uint32_t i, k;
+	__m256i accu[MAT_MULT_MULTI_WIDTH], _a, _b;
+
+	/* Set the accumulators to 0 */
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		accu[k] = _mm256_setzero_si256();
+	}
+
+	for (i = 0; i < len; i += 32) {
+		if ((len - i) < 32) {
+			_a = load_incomplete_m256(&a[i], len - i);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = load_incomplete_m256(&b[(k * stride) + i], len - i);
+				accu[k] ^= gf256_mult_vectorized_avx2(_a, _b);
+			}
+		} else {
+			/* Obvious 256-bit */
+			_a = _mm256_lddqu_si256((__m256i*)&a[i]);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = _mm256_lddqu_si256((__m256i*)&b[(k * stride) + i]);
+				accu[k] ^= gf256_mult_vectorized_avx2(_a, _b);
+			}
+		}
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		c[k * stride] = sum_uint8_avx2(accu[k]);
+	}
+
+	return;
+}
+
+/* Matrix multiplication over GF(256) by nb vectors at once, see GF256_MAT_MULT_MULTI */
+static inline void gf256_mat_mult_multi_avx2(const uint8_t *A, const uint8_t *X, uint8_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256_vect_mult4_avx2, gf256_vect_mult_avx2);
+}
+
 /*
  * "Hybrid" scalar multiplication of a vector in GF(2) and a vector in GF(256)
  */
@@ -775,6 +818,49 @@ static inline void gf256to2_mat_mult_avx2(const uint16_t *A, const uint16_t *X,
 	GF256to2_MAT_MULT(A, X, Y, n, mtype, gf256to2_vect_mult_avx2);
 }
 
+/*
+ * GF(2^16) vector to vectors multiplication, see gf256_vect_mult4_avx2
+ */
+static inline void gf256to2_vect_mult4_avx2(const uint16_t *a, const uint16_t *b, uint32_t stride, uint16_t *c, uint32_t len) {
+	uint32_t i, k;
+	__m256i accu[MAT_MULT_MULTI_WIDTH], _a, _b;
+
+	/* Set the accumulators to 0 */
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		accu[k] = _mm256_setzero_si256();
+	}
+
+	for (i = 0; i < (2 * len); i += 32) {
+		if (((2 * len) - i) < 32) {
+			_a = load_incomplete_m256((const uint8_t*)&a[i / 2], ((2 * len) - i));
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = load_incomplete_m256((const uint8_t*)&b[(k * stride) + (i / 2)], ((2 * len) - i));
+				accu[k] ^= gf256to2_mult_vectorized_avx2(_a, _b);
+			}
+		} else {
+			/* Obvious 256-bit */
+			_a = _mm256_lddqu_si256((__m256i*)&a[i / 2]);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = _mm256_lddqu_si256((__m256i*)&b[(k * stride) + (i / 2)]);
+				accu[k] ^= gf256to2_mult_vectorized_avx2(_a, _b);
+			}
+		}
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		c[k * stride] = sum_uint16_avx2(accu[k]);
+	}
+
+	return;
+}
+
+/*
+ * GF(2^16) matrix multiplication by nb vectors at once, see GF256_MAT_MULT_MULTI
+ */
+static inline void gf256to2_mat_mult_multi_avx2(const uint16_t *A, const uint16_t *X, uint16_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256to2_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256to2_vect_mult4_avx2, gf256to2_vect_mult_avx2);
+}
+
 /*
  * "Hybrid" constant multiplication of a constant in GF(2) and a vector in GF(256^2)
  */
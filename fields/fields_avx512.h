@@ -273,6 +273,49 @@ static inline void gf256_mat_mult_avx512(const uint8_t *A, const uint8_t *X, uin
 	GF256_MAT_MULT(A, X, Y, n, mtype, gf256_vect_mult_avx512);
 }
 
+/*
+ * Vector to vectors multiplication in GF(256): the vector a of length 'len' is multiplied by
+ * the MAT_MULT_MULTI_WIDTH vectors starting at b[k * stride], and the results are stored in
+ * c[k * stride]. Each chunk of a is loaded once for all the vectors.
+ */
+static inline void gf256_vect_mult4_avx512(const uint8_t *a, const uint8_t *b, uint32_t stride, uint8_t *c, uint32_t len) {
+	uint32_t i, k;
+	__m512i accu[MAT_MULT_MULTI_WIDTH], _a, _b;
+
+	/* Set the accumulators to 0 */
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		accu[k] = _mm512_setzero_epi32();
+	}
+
+	for (i = 0; i < len; i += 64) {
+		if ((len - i) < 64) {
+			_a = load_incomplete_m512(&a[i], len - i);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = load_incomplete_m512(&b[(k * stride) + i], len - i);
+				accu[k] ^= gf256_mult_vectorized_avx512(_a, _b);
+			}
+		} else {
+			/* Obvious 512-bit */
+			_a = _mm512_loadu_epi64((__m512i*)&a[i]);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = _mm512_loadu_epi64((__m512i*)&b[(k * stride) + i]);
+				accu[k] ^= gf256_mult_vectorized_avx512(_a, _b);
+			}
+		}
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		c[k * stride] = sum_uint8_avx512(accu[k]);
+	}
+
+	return;
+}
+
+/* Matrix multiplication over GF(256) by nb vectors at once, see GF256_MAT_MULT_MULTI */
+static inline void gf256_mat_mult_multi_avx512(const uint8_t *A, const uint8_t *X, uint8_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256_vect_mult4_avx512, gf256_vect_mult_avx512);
+}
+
 
 /*
  * "Hybrid" multiplication of a constant in GF(2) and a vector in GF(256)
@@ -774,6 +817,49 @@ static inline void gf256to2_mat_mult_avx512(const uint16_t *A, const uint16_t *X
 	GF256to2_MAT_MULT(A, X, Y, n, mtype, gf256to2_vect_mult_avx512);
 }
 
+/*
+ * GF(2^16) vector to vectors multiplication, see gf256_vect_mult4_avx512
+ */
+static inline void gf256to2_vect_mult4_avx512(const uint16_t *a, const uint16_t *b, uint32_t stride, uint16_t *c, uint32_t len) {
+	uint32_t i, k;
+	__m512i accu[MAT_MULT_MULTI_WIDTH], _a, _b;
+
+	/* Set the accumulators to 0 */
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		accu[k] = _mm512_setzero_epi32();
+	}
+
+	for (i = 0; i < (2 * len); i += 64) {
+		if (((2 * len) - i) < 64) {
+			_a = load_incomplete_m512((const uint8_t*)&a[i / 2], ((2 * len) - i));
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = load_incomplete_m512((const uint8_t*)&b[(k * stride) + (i / 2)], ((2 * len) - i));
+				accu[k] ^= gf256to2_mult_vectorized_avx512(_a, _b);
+			}
+		} else {
+			/* Obvious 512-bit */
+			_a = _mm512_loadu_epi64((__m512i*)&a[i / 2]);
+			for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+				_b = _mm512_loadu_epi64((__m512i*)&b[(k * stride) + (i / 2)]);
+				accu[k] ^= gf256to2_mult_vectorized_avx512(_a, _b);
+			}
+		}
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+		c[k * stride] = sum_uint16_avx512(accu[k]);
+	}
+
+	return;
+}
+
+/*
+ * GF(2^16) matrix multiplication by nb vectors at once, see GF256_MAT_MULT_MULTI
+ */
+static inline void gf256to2_mat_mult_multi_avx512(const uint16_t *A, const uint16_t *X, uint16_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256to2_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256to2_vect_mult4_avx512, gf256to2_vect_mult_avx512);
+}
+
 
 /*
  * "Hybrid" matrix multiplication of a matrix in GF(256) and a vector in GF(256^2), resulting
@@ -134,6 +134,29 @@ typedef enum {
 
 /* Matrix multiplication over GF256to2: this is fundamentally the same as GF256 */
 #define GF256to2_MAT_MULT GF256_MAT_MULT
+
+/* Common macro for the multiplication of a matrix by nb vectors at once over GF(256)
+ * (or GF(256^2)): Y_k = A * X_k, where the vectors X_k (resp. Y_k) are stored one
+ * after the other (X_k starting at X[n * k]).
+ * The rows of A are in the outer loop: the matrix is streamed once from memory for all
+ * the vectors (instead of once per vector), each row being multiplied by the vectors
+ * while it is in the cache. fun4 multiplies a row by MAT_MULT_MULTI_WIDTH vectors at
+ * once (sharing the loads of the row between them), and fun by the remaining ones */
+#define MAT_MULT_MULTI_WIDTH 4
+#define GF256_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, fun4, fun) do { \
+        uint32_t i, k, off, len; \
+        for(i = 0; i < n; i++){ \
+                off = (mtype == TRI_SUP) ? i : 0; \
+                len = (mtype == TRI_SUP) ? (n - i) : ((mtype == TRI_INF) ? (i + 1) : n); \
+                for(k = 0; (k + MAT_MULT_MULTI_WIDTH) <= nb; k += MAT_MULT_MULTI_WIDTH){ \
+                        fun4(&A[(n * i) + off], &X[(n * k) + off], n, &Y[(n * k) + i], len); \
+                } \
+                for(; k < nb; k++){ \
+                        Y[(n * k) + i] = fun(&A[(n * i) + off], &X[(n * k) + off], len); \
+                } \
+        } \
+} while(0)
+#define GF256to2_MAT_MULT_MULTI GF256_MAT_MULT_MULTI
 #define GF2_GF256to2_MAT_MULT GF2_GF256_MAT_MULT
 #define GF256to2_GF2_MAT_MULT GF256_GF2_MAT_MULT
 #define GF256_GF4_MAT_MULT GF256_GF2_MAT_MULT
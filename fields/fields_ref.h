@@ -319,6 +319,49 @@ static inline void gf256_mat_mult_ref(const uint8_t *A, const uint8_t *X, uint8_
 	GF256_MAT_MULT(A, X, Y, n, mtype, gf256_vect_mult_ref);
 }
 
+/*
+ * Vector to vectors multiplication in GF(256): the vector a of length 'len' is multiplied by
+ * the MAT_MULT_MULTI_WIDTH vectors starting at b[k * stride], and the results are stored in
+ * c[k * stride]
+ */
+static inline void gf256_vect_mult4_ref(const uint8_t *a, const uint8_t *b, uint32_t stride, uint8_t *c, uint32_t len) {
+	uint32_t i, k;
+	uint32_t res32[MAT_MULT_MULTI_WIDTH] = { 0 };
+
+	i = 0;
+#if defined(GF256_MULT_X4)
+	while (i < (4 * (len / 4))) {
+		uint32_t a_, b_;
+		memcpy(&a_, &a[i], 4);
+		for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+			memcpy(&b_, &b[(k * stride) + i], 4);
+			res32[k] ^= gf256_mult4_ref(a_, b_);
+		}
+		i += 4;
+	}
+#endif
+	while (i < len) {
+		for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+			res32[k] ^= gf256_mult_ref(a[i], b[(k * stride) + i]);
+		}
+		i++;
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+#if defined(GF256_MULT_X4)
+		res32[k] = (res32[k] & 0xff) ^ ((res32[k] >> 8) & 0xff) ^ ((res32[k] >> 16) & 0xff) ^ (res32[k] >> 24);
+#endif
+		c[k * stride] = (uint8_t)res32[k];
+	}
+
+	return;
+}
+
+/* Matrix multiplication over GF(256) by nb vectors at once, see GF256_MAT_MULT_MULTI */
+static inline void gf256_mat_mult_multi_ref(const uint8_t *A, const uint8_t *X, uint8_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256_vect_mult4_ref, gf256_vect_mult_ref);
+}
+
 /*
  * "Hybrid" multiplication of a constant in GF(2) and a vector in GF(256)
  */
@@ -683,6 +726,49 @@ static inline void gf256to2_mat_mult_ref(const uint16_t *A, const uint16_t *X, u
 	GF256to2_MAT_MULT(A, X, Y, n, mtype, gf256to2_vect_mult_ref);
 }
 
+/*
+ * GF(2^16) vector to vectors multiplication, see gf256_vect_mult4_ref
+ */
+static inline void gf256to2_vect_mult4_ref(const uint16_t *a, const uint16_t *b, uint32_t stride, uint16_t *c, uint32_t len) {
+	uint32_t i, k;
+	uint64_t res64[MAT_MULT_MULTI_WIDTH] = { 0 };
+
+	i = 0;
+#if defined(GF256_MULT_X4)
+	while (i < (4 * (len / 4))) {
+		uint64_t a_, b_;
+		memcpy(&a_, &a[i], 8);
+		for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+			memcpy(&b_, &b[(k * stride) + i], 8);
+			res64[k] ^= gf256to2_mult4_ref(a_, b_);
+		}
+		i += 4;
+	}
+#endif
+	while (i < len) {
+		for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+			res64[k] ^= gf256to2_mult_ref(a[i], b[(k * stride) + i]);
+		}
+		i++;
+	}
+
+	for (k = 0; k < MAT_MULT_MULTI_WIDTH; k++) {
+#if defined(GF256_MULT_X4)
+		res64[k] = (res64[k] & 0xffff) ^ ((res64[k] >> 16) & 0xffff) ^ ((res64[k] >> 32) & 0xffff) ^ ((res64[k] >> 48) & 0xffff);
+#endif
+		c[k * stride] = (uint16_t)res64[k];
+	}
+
+	return;
+}
+
+/*
+ * GF(2^16) matrix multiplication by nb vectors at once, see GF256_MAT_MULT_MULTI
+ */
+static inline void gf256to2_mat_mult_multi_ref(const uint16_t *A, const uint16_t *X, uint16_t *Y, uint32_t n, matrix_type mtype, uint32_t nb) {
+	GF256to2_MAT_MULT_MULTI(A, X, Y, n, mtype, nb, gf256to2_vect_mult4_ref, gf256to2_vect_mult_ref);
+}
+
 /*
  * "Hybrid" constant multiplication of a constant in GF(2) and a vector in GF(256^2)
  */
@@ -15,6 +15,18 @@ static inline void gf256_bitslice32_vect_pack_gf2_default(uint8_t x, uint32_t x_
 	x_bitsliced[0] |= (x << index32);
 }
 
+static inline void gf256_bitslice32_vect_pack_gf4_default(uint8_t x, uint32_t x_bitsliced[8], uint32_t index32) {
+	uint8_t b0 = x & 0x01, b1 = (x >> 1) & 0x01;
+	x_bitsliced[0] |= ((b0) << index32);
+	//x_bitsliced[1] |= ((0) << index32);
+	x_bitsliced[2] |= ((b1) << index32);
+	x_bitsliced[3] |= ((b1) << index32);
+	x_bitsliced[4] |= ((b1) << index32);
+	x_bitsliced[5] |= ((b1) << index32);
+	//x_bitsliced[6] |= ((0) << index32);
+	x_bitsliced[7] |= ((b1) << index32);
+}
+
 static inline void gf256_bitslice32_vect_pack_gf16_default(uint8_t x, uint32_t x_bitsliced[8], uint32_t index32) {
 	uint8_t b0 = x & 0x01, b1 = (x >> 1) & 0x01, b2 = (x >> 2) & 0x01, b3 = (x >> 3) & 0x01;
 	x_bitsliced[0] |= ((b0 ^ b2) << index32);
@@ -133,6 +145,11 @@ static inline void gf256_bitslice32_mult_hybrid_gf2_default(uint32_t res[8], uin
 	gf256_bitslice32_mult_hybrid_default(res, x, y);
 }
 
+static inline void gf256_bitslice32_mult_hybrid_gf4_default(uint32_t res[8], uint8_t x, const uint32_t y[8]) {
+	x = (x & 1) ^ (-(x >> 1) & 0xBC);
+	gf256_bitslice32_mult_hybrid_default(res, x, y);
+}
+
 static inline void gf256_bitslice32_mult_hybrid_gf16_default(uint32_t res[8], uint8_t x, const uint32_t y[8]) {
 	x = (x & 1) ^ (-((x >> 1) & 1) & 0xE0) ^ (-((x >> 2) & 1) & 0x5D) ^ (-(x >> 3) & 0xB0);
 	gf256_bitslice32_mult_hybrid_default(res, x, y);
@@ -213,6 +230,18 @@ static inline void gf256to2_bitslice32_vect_pack_gf2_default(uint8_t x, uint32_t
 	x_bitsliced[0] |= (x << index32);
 }
 
+static inline void gf256to2_bitslice32_vect_pack_gf4_default(uint8_t x, uint32_t x_bitsliced[16], uint32_t index32) {
+	uint8_t b0 = x & 0x01, b1 = (x >> 1) & 0x01;
+	x_bitsliced[0] |= ((b0) << index32);
+	//x_bitsliced[1] |= ((0) << index32);
+	x_bitsliced[2] |= ((b1) << index32);
+	x_bitsliced[3] |= ((b1) << index32);
+	x_bitsliced[4] |= ((b1) << index32);
+	x_bitsliced[5] |= ((b1) << index32);
+	//x_bitsliced[6] |= ((0) << index32);
+	x_bitsliced[7] |= ((b1) << index32);
+}
+
 static inline void gf256to2_bitslice32_vect_pack_gf16_default(uint8_t x, uint32_t x_bitsliced[16], uint32_t index32) {
 	uint8_t b0 = x & 0x01, b1 = (x >> 1) & 0x01, b2 = (x >> 2) & 0x01, b3 = (x >> 3) & 0x01;
 	x_bitsliced[0] |= ((b0 ^ b2) << index32);
@@ -289,6 +318,11 @@ static inline void gf256to2_bitslice32_mult_hybrid_gf2_default(uint32_t res[16],
 	gf256to2_bitslice32_mult_hybrid_default(res, (uint16_t) x, y);
 }
 
+static inline void gf256to2_bitslice32_mult_hybrid_gf4_default(uint32_t res[16], uint8_t x, const uint32_t y[16]) {
+	x = (x & 1) ^ (-(x >> 1) & 0xBC);
+	gf256to2_bitslice32_mult_hybrid_default(res, (uint16_t) x, y);
+}
+
 static inline void gf256to2_bitslice32_mult_hybrid_gf16_default(uint32_t res[16], uint8_t x, const uint32_t y[16]) {
 	x = (x & 1) ^ (-((x >> 1) & 1) & 0xE0) ^ (-((x >> 2) & 1) & 0x5D) ^ (-(x >> 3) & 0xB0);
 	gf256to2_bitslice32_mult_hybrid_default(res, (uint16_t) x, y);
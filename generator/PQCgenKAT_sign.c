@@ -20,15 +20,23 @@ You are solely responsible for determining the appropriateness of using and dist
 #define KAT_DATA_ERROR      -3
 #define KAT_CRYPTO_FAILURE  -4
 
+#define KAT_NUM_VECTORS     100
+
 int     FindMarker(FILE *infile, const char *marker);
 int     ReadHex(FILE *infile, unsigned char *A, int Length, char *str);
 void    fprintBstr(FILE *fp, char *S, unsigned char *A, unsigned long long L);
 
 char    AlgName[] = "My Alg Name";
 
+/* Usage: kat_gen [<first> <last>]
+ * Without arguments, generates the PQCsignKAT_<sk size>.req/.rsp files with all the
+ * vectors. With a count range, only generates the vectors of counts in [first, last)
+ * in the PQCsignKAT_<sk size>.req.<first>/.rsp.<first> shard files (the header is in
+ * the shard of count 0): the concatenation of the shards in count order is the same
+ * as the full files, so that the shards can be generated by parallel processes. */
 int
-main(void) {
-	char                fn_req[32], fn_rsp[32];
+main(int argc, char *argv[]) {
+	char                fn_req[64], fn_rsp[64];
 	FILE                *fp_req, *fp_rsp;
 	unsigned char       seed[48];
 	unsigned char       msg[3300];
@@ -39,14 +47,29 @@ main(void) {
 	int                 done;
 	unsigned char       pk[CRYPTO_PUBLICKEYBYTES], sk[CRYPTO_SECRETKEYBYTES];
 	int                 ret_val;
+	int                 first = 0, last = KAT_NUM_VECTORS;
+
+	if ( argc == 3 ) {
+		first = atoi(argv[1]);
+		last = atoi(argv[2]);
+	}
+	if ( ((argc != 1) && (argc != 3)) || (first < 0) || (last > KAT_NUM_VECTORS) || (first >= last) ) {
+		printf("Usage: %s [<first> <last>] (generate the counts in [first, last) of [0, %d))\n", argv[0], KAT_NUM_VECTORS);
+		return KAT_DATA_ERROR;
+	}
 
 	// Create the REQUEST file
-	sprintf(fn_req, "PQCsignKAT_%ld.req", CRYPTO_SECRETKEYBYTES);
+	if ( argc == 3 ) {
+		sprintf(fn_req, "PQCsignKAT_%ld.req.%03d", CRYPTO_SECRETKEYBYTES, first);
+		sprintf(fn_rsp, "PQCsignKAT_%ld.rsp.%03d", CRYPTO_SECRETKEYBYTES, first);
+	} else {
+		sprintf(fn_req, "PQCsignKAT_%ld.req", CRYPTO_SECRETKEYBYTES);
+		sprintf(fn_rsp, "PQCsignKAT_%ld.rsp", CRYPTO_SECRETKEYBYTES);
+	}
 	if ( (fp_req = fopen(fn_req, "w")) == NULL ) {
 		printf("Couldn't open <%s> for write\n", fn_req);
 		return KAT_FILE_OPEN_ERROR;
 	}
-	sprintf(fn_rsp, "PQCsignKAT_%ld.rsp", CRYPTO_SECRETKEYBYTES);
 	if ( (fp_rsp = fopen(fn_rsp, "w")) == NULL ) {
 		printf("Couldn't open <%s> for write\n", fn_rsp);
 		return KAT_FILE_OPEN_ERROR;
@@ -57,13 +80,18 @@ main(void) {
 	}
 
 	randombytes_init(entropy_input, NULL, 256);
-	for (int i = 0; i < 100; i++) {
-		fprintf(fp_req, "count = %d\n", i);
+	for (int i = 0; i < last; i++) {
+		// The seeds and messages of the counts before the range are drawn as well,
+		// so that the vectors of a shard are the ones of the full files
 		randombytes(seed, 48);
-		fprintBstr(fp_req, "seed = ", seed, 48);
 		mlen = 33 * (i + 1);
-		fprintf(fp_req, "mlen = %llu\n", mlen);
 		randombytes(msg, mlen);
+		if ( i < first ) {
+			continue;
+		}
+		fprintf(fp_req, "count = %d\n", i);
+		fprintBstr(fp_req, "seed = ", seed, 48);
+		fprintf(fp_req, "mlen = %llu\n", mlen);
 		fprintBstr(fp_req, "msg = ", msg, mlen);
 		fprintf(fp_req, "pk =\n");
 		fprintf(fp_req, "sk =\n");
@@ -78,7 +106,9 @@ main(void) {
 		return KAT_FILE_OPEN_ERROR;
 	}
 
-	fprintf(fp_rsp, "# %s\n\n", CRYPTO_ALGNAME);
+	if ( first == 0 ) {
+		fprintf(fp_rsp, "# %s\n\n", CRYPTO_ALGNAME);
+	}
 	done = 0;
 	do {
 		if ( FindMarker(fp_req, "count = ") ) {
@@ -0,0 +1,100 @@
+#include <stdlib.h>
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+
+#include "api.h"
+#include "eqstore.h"
+
+/* Builder of the expanded equations store (see eqstore.h):
+ *   eqstore_build <store> <pk_file> [<pk_file> ...]
+ * builds the store from files holding concatenated raw public keys, and
+ *   eqstore_build --check <store>
+ * checks the integrity of all the entries of an existing store */
+
+/* Only the equations expansion is used: no randomness is needed */
+int randombytes(unsigned char* x, unsigned long long xlen) {
+	(void)x;
+	(void)xlen;
+	return -1;
+}
+
+static int check_store(const char *path) {
+	eqstore_t *store = NULL;
+
+	if (crypto_sign_eqstore_open(&store, path, EQSTORE_CHECK_ALL)) {
+		fprintf(stderr, "Error: store %s is invalid or corrupted (or built for another parameter set)\n", path);
+		return -1;
+	}
+	printf("%s: %s, %llu public keys, %llu bytes\n", path, store->header->label,
+	       (unsigned long long)store->header->nb_entries, (unsigned long long)store->header->file_size);
+	crypto_sign_eqstore_close(store);
+
+	return 0;
+}
+
+int main(int argc, char *argv[]) {
+	int ret = -1, i;
+	uint8_t *pks = NULL, *tmp;
+	const unsigned char **pk = NULL;
+	unsigned long long nb_pks = 0, j;
+	long size;
+	FILE *f;
+
+	if ((argc == 3) && (strcmp(argv[1], "--check") == 0)) {
+		return (check_store(argv[2]) == 0) ? EXIT_SUCCESS : EXIT_FAILURE;
+	}
+	if ((argc < 3) || (argv[1][0] == '-')) {
+		printf("Usage: %s <store> <pk_file> [<pk_file> ...]\n", argv[0]);
+		printf("       %s --check <store>\n", argv[0]);
+		return EXIT_FAILURE;
+	}
+
+	/* Read the public keys */
+	for (i = 2; i < argc; i++) {
+		f = fopen(argv[i], "rb");
+		if ((f == NULL) || fseek(f, 0, SEEK_END) || ((size = ftell(f)) < 0) || fseek(f, 0, SEEK_SET)) {
+			fprintf(stderr, "Error: cannot read %s\n", argv[i]);
+			if (f != NULL) {
+				fclose(f);
+			}
+			goto err;
+		}
+		if ((size % CRYPTO_PUBLICKEYBYTES) != 0) {
+			fprintf(stderr, "Error: the size of %s is not a multiple of the public key size (%ld bytes)\n", argv[i], CRYPTO_PUBLICKEYBYTES);
+			fclose(f);
+			goto err;
+		}
+		tmp = (uint8_t*)realloc(pks, (nb_pks * CRYPTO_PUBLICKEYBYTES) + (size_t)size + 1);
+		if (tmp == NULL) {
+			fclose(f);
+			goto err;
+		}
+		pks = tmp;
+		if (fread(&pks[nb_pks * CRYPTO_PUBLICKEYBYTES], 1, (size_t)size, f) != (size_t)size) {
+			fprintf(stderr, "Error: cannot read %s\n", argv[i]);
+			fclose(f);
+			goto err;
+		}
+		fclose(f);
+		nb_pks += (unsigned long long)size / CRYPTO_PUBLICKEYBYTES;
+	}
+	pk = (const unsigned char**)malloc(((nb_pks != 0) ? nb_pks : 1) * sizeof(const unsigned char*));
+	if (pk == NULL) {
+		goto err;
+	}
+	for (j = 0; j < nb_pks; j++) {
+		pk[j] = &pks[j * CRYPTO_PUBLICKEYBYTES];
+	}
+
+	if (crypto_sign_eqstore_build(argv[1], pk, nb_pks)) {
+		fprintf(stderr, "Error: cannot build the store %s\n", argv[1]);
+		goto err;
+	}
+	ret = check_store(argv[1]);
+
+err:
+	free(pk);
+	free(pks);
+	return (ret == 0) ? EXIT_SUCCESS : EXIT_FAILURE;
+}
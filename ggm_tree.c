@@ -252,6 +252,22 @@ static inline void SeedDerive_x8_pub(enc_ctx_pub *ctx1, enc_ctx_pub *ctx2, enc_c
 	return;
 }
 
+static inline void SeedDerive_x8_x8(enc_ctx_x8 *ctx, const uint8_t *seed[8], uint8_t *new_seed[8]) {
+	uint32_t i;
+	uint8_t linortho_seed[8][MQOM2_PARAM_SEED_SIZE];
+	for (i = 0; i < 8; i++) {
+		LinOrtho(seed[i], linortho_seed[i]);
+	}
+	/* Encrypt the seed with the tweaked salt */
+	enc_encrypt_x8_x8(ctx, seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], seed[6], seed[7],
+	                  new_seed[0], new_seed[1], new_seed[2], new_seed[3], new_seed[4], new_seed[5], new_seed[6], new_seed[7]);
+	/* Xor with LinOrtho seed */
+	for (i = 0; i < 8; i++) {
+		xor_blocks(new_seed[i], linortho_seed[i], new_seed[i]);
+	}
+	return;
+}
+
 /* NOTE: in the "node" tree representation, we accept to remove the two first cells to simplify the indices computations.
  * The first cell is used to avoid the "0" index, and the second cell is the root of the correlated tree that is not used.
  * */
@@ -907,6 +923,82 @@ err:
 	return ret;
 }
 
+int GGMTree_InitIncrementalExpansion_x8(ggmtree_ctx_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t rseed[8][MQOM2_PARAM_SEED_SIZE], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], const uint32_t e[8]) {
+	uint32_t i, j;
+	int ret = -1;
+	uint8_t tweaked_salt[8][MQOM2_PARAM_SEED_SIZE];
+	for (j = 1; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+		for (i = 0; i < 8; i++) {
+			TweakSalt(salt, tweaked_salt[i], 2, e[i], j - 1);
+		}
+		if (j < GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY + 1) {
+			for (i = 0; i < 8; i++) {
+				memcpy(ctx->tweaked_salts[i][j - 1], tweaked_salt[i], MQOM2_PARAM_SALT_SIZE);
+			}
+		} else {
+			ret = enc_key_sched_x8(&ctx->ctx_enc_x8[j - 1 - GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY], tweaked_salt[0], tweaked_salt[1], tweaked_salt[2], tweaked_salt[3], tweaked_salt[4], tweaked_salt[5], tweaked_salt[6], tweaked_salt[7]);
+			ERR(ret, err);
+		}
+	}
+	for (i = 0; i < 8; i++) {
+		memcpy(ctx->path[i][0], delta, MQOM2_PARAM_SEED_SIZE);
+		memcpy(ctx->path[i][1], rseed[i], MQOM2_PARAM_SEED_SIZE);
+	}
+	ctx->active = 0;
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int GGMTree_GetNextLeaf_x8(ggmtree_ctx_x8_t* ctx, uint8_t lseed[8][MQOM2_PARAM_SEED_SIZE]) {
+	enc_ctx_x8 DECL_VAR(ctx_enc_x8);
+	uint32_t i, j;
+	int ret = -1;
+
+	if (ctx->active) {
+		uint32_t new_num_leaf = ctx->num_leaf + 1;
+		uint32_t diff = ctx->num_leaf ^ new_num_leaf;
+		ctx->num_leaf = new_num_leaf;
+		j = 1;
+		while (((diff >> (MQOM2_PARAM_NB_EVALS_LOG - j)) & 0x1) == 0) {
+			j++;
+		}
+		for (i = 0; i < 8; i++) {
+			xor_blocks(ctx->path[i][j - 1], ctx->path[i][j], ctx->path[i][j]);
+		}
+	} else {
+		ctx->num_leaf = 0;
+		ctx->active = 1;
+		j = 1;
+	}
+	enc_ctx_x8* ctx_enc_ptr = &ctx_enc_x8;
+	for (; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+		const uint8_t *seed[8];
+		uint8_t *new_seed[8];
+		if (j < GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY + 1) {
+			ret = enc_key_sched_x8(ctx_enc_ptr, ctx->tweaked_salts[0][j-1], ctx->tweaked_salts[1][j-1], ctx->tweaked_salts[2][j-1], ctx->tweaked_salts[3][j-1],
+			                       ctx->tweaked_salts[4][j-1], ctx->tweaked_salts[5][j-1], ctx->tweaked_salts[6][j-1], ctx->tweaked_salts[7][j-1]);
+			ERR(ret, err);
+		} else {
+			ctx_enc_ptr = &ctx->ctx_enc_x8[j - 1 - GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY];
+		}
+		for (i = 0; i < 8; i++) {
+			seed[i] = ctx->path[i][j];
+			new_seed[i] = ctx->path[i][j + 1];
+		}
+		SeedDerive_x8_x8(ctx_enc_ptr, seed, new_seed);
+	}
+	for (i = 0; i < 8; i++) {
+		memcpy(lseed[i], ctx->path[i][MQOM2_PARAM_NB_EVALS_LOG], MQOM2_PARAM_SEED_SIZE);
+	}
+
+	ret = 0;
+err:
+	enc_clean_ctx_x8(&ctx_enc_x8);
+	return ret;
+}
+
 int GGMTree_InitIncrementalPartialExpansion(ggmtree_ctx_partial_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t path[MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE], uint32_t e, uint32_t i_star) {
 	uint32_t j;
 	int ret = -1;
@@ -1211,3 +1303,104 @@ err:
 
 	return ret;
 }
+
+int GGMTree_InitIncrementalPartialExpansion_x8(ggmtree_ctx_partial_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t (*path[8])[MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE], const uint32_t e[8], const uint32_t i_star[8]) {
+	uint32_t i, j;
+	int ret = -1;
+	uint8_t tweaked_salt[MQOM2_PARAM_SEED_SIZE];
+	for (i = 0; i < 8; i++) {
+		for (j = 1; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+			if (j < GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY + 1) {
+				TweakSalt(salt, ctx->tweaked_salts[i][j - 1], 2, e[i], j - 1);
+			} else {
+				TweakSalt(salt, tweaked_salt, 2, e[i], j - 1);
+				ret = enc_key_sched_pub(&ctx->ctx_enc[i][j - 1 - GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY], tweaked_salt);
+				ERR(ret, err);
+			}
+		}
+		memcpy((uint8_t*) ctx->opening[i], (uint8_t*) path[i], sizeof(ctx->opening[i]));
+		ctx->i_star[i] = i_star[i];
+	}
+	ctx->active = 0;
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int GGMTree_GetNextLeafPartial_x8(ggmtree_ctx_partial_x8_t* ctx, uint8_t lseed[8][MQOM2_PARAM_SEED_SIZE]) {
+	enc_ctx_pub DECL_VAR(ctx_enc[8]);
+	uint32_t i, j;
+	int ret = -1;
+
+	if (ctx->active) {
+		uint32_t new_num_leaf = ctx->num_leaf + 1;
+		uint32_t diff = ctx->num_leaf ^ new_num_leaf;
+		ctx->num_leaf = new_num_leaf;
+		j = 1;
+		while (((diff >> (MQOM2_PARAM_NB_EVALS_LOG - j)) & 0x1) == 0) {
+			j++;
+		}
+	} else {
+		ctx->num_leaf = 0;
+		ctx->active = 1;
+		j = 1;
+	}
+	uint32_t diffs[8];
+	uint8_t node_map[8][MQOM2_PARAM_NB_EVALS_LOG];
+	for (i = 0; i < 8; i++) {
+		uint32_t higher = 1;
+		diffs[i] = ctx->num_leaf ^ ctx->i_star[i];
+		if (diffs[i]) {
+			while (((diffs[i] >> (MQOM2_PARAM_NB_EVALS_LOG - higher)) & 0x1) == 0) {
+				higher++;
+			}
+		} else {
+			higher = MQOM2_PARAM_NB_EVALS_LOG;
+		}
+		for (uint32_t k = j; k < higher; k++) {
+			node_map[i][k] = 0;
+		}
+		for (uint32_t k = higher; k < MQOM2_PARAM_NB_EVALS_LOG; k++) {
+			node_map[i][k] = 1;
+		}
+		if (j > higher) {
+			xor_blocks(ctx->path[i][j - 1], ctx->path[i][j], ctx->path[i][j]);
+		} else if (j <= higher && diffs[i]) {
+			memcpy(ctx->path[i][higher], ctx->opening[i][MQOM2_PARAM_NB_EVALS_LOG - higher], MQOM2_PARAM_SEED_SIZE);
+		}
+	}
+	for (; j < MQOM2_PARAM_NB_EVALS_LOG; j++) {
+		enc_ctx_pub* ctx_enc_j[8];
+		uint8_t *seed[8];
+		for (i = 0; i < 8; i++) {
+			seed[i] = node_map[i][j] ? ctx->path[i][j] : NULL;
+			if (j < GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY + 1) {
+				ctx_enc_j[i] = &ctx_enc[i];
+				ret = enc_key_sched_pub(ctx_enc_j[i], ctx->tweaked_salts[i][j - 1]);
+				ERR(ret, err);
+			} else {
+				ctx_enc_j[i] = &ctx->ctx_enc[i][j - 1 - GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY];
+			}
+		}
+		SeedDerive_x8_pub(ctx_enc_j[0], ctx_enc_j[1], ctx_enc_j[2], ctx_enc_j[3], ctx_enc_j[4], ctx_enc_j[5], ctx_enc_j[6], ctx_enc_j[7],
+		                  seed[0], seed[1], seed[2], seed[3], seed[4], seed[5], seed[6], seed[7],
+		                  ctx->path[0][j + 1], ctx->path[1][j + 1], ctx->path[2][j + 1], ctx->path[3][j + 1],
+		                  ctx->path[4][j + 1], ctx->path[5][j + 1], ctx->path[6][j + 1], ctx->path[7][j + 1]);
+	}
+	for (i = 0; i < 8; i++) {
+		if (diffs[i]) {
+			memcpy(lseed[i], ctx->path[i][MQOM2_PARAM_NB_EVALS_LOG], MQOM2_PARAM_SEED_SIZE);
+		} else {
+			memset(lseed[i], 0, MQOM2_PARAM_SEED_SIZE);
+		}
+	}
+
+	ret = 0;
+err:
+	for (j = 0; j < 8; j++) {
+		enc_clean_ctx_pub(&ctx_enc[j]);
+	}
+
+	return ret;
+}
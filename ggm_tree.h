@@ -16,15 +16,19 @@
 #define GGMTree_InitIncrementalExpansion MQOM_NAMESPACE(GGMTree_InitIncrementalExpansion)
 #define GGMTree_InitIncrementalExpansion_x2 MQOM_NAMESPACE(GGMTree_InitIncrementalExpansion_x2)
 #define GGMTree_InitIncrementalExpansion_x4 MQOM_NAMESPACE(GGMTree_InitIncrementalExpansion_x4)
+#define GGMTree_InitIncrementalExpansion_x8 MQOM_NAMESPACE(GGMTree_InitIncrementalExpansion_x8)
 #define GGMTree_GetNextLeaf MQOM_NAMESPACE(GGMTree_GetNextLeaf)
 #define GGMTree_GetNextLeaf_x2 MQOM_NAMESPACE(GGMTree_GetNextLeaf_x2)
 #define GGMTree_GetNextLeaf_x4 MQOM_NAMESPACE(GGMTree_GetNextLeaf_x4)
+#define GGMTree_GetNextLeaf_x8 MQOM_NAMESPACE(GGMTree_GetNextLeaf_x8)
 #define GGMTree_InitIncrementalPartialExpansion MQOM_NAMESPACE(GGMTree_InitIncrementalPartialExpansion)
 #define GGMTree_InitIncrementalPartialExpansion_x2 MQOM_NAMESPACE(GGMTree_InitIncrementalPartialExpansion_x2)
 #define GGMTree_InitIncrementalPartialExpansion_x4 MQOM_NAMESPACE(GGMTree_InitIncrementalPartialExpansion_x4)
+#define GGMTree_InitIncrementalPartialExpansion_x8 MQOM_NAMESPACE(GGMTree_InitIncrementalPartialExpansion_x8)
 #define GGMTree_GetNextLeafPartial MQOM_NAMESPACE(GGMTree_GetNextLeafPartial)
 #define GGMTree_GetNextLeafPartial_x2 MQOM_NAMESPACE(GGMTree_GetNextLeafPartial_x2)
 #define GGMTree_GetNextLeafPartial_x4 MQOM_NAMESPACE(GGMTree_GetNextLeafPartial_x4)
+#define GGMTree_GetNextLeafPartial_x8 MQOM_NAMESPACE(GGMTree_GetNextLeafPartial_x8)
 
 int GGMTree_Expand(const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t rseed[MQOM2_PARAM_SEED_SIZE], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], uint32_t e, uint8_t node[MQOM2_PARAM_FULL_TREE_SIZE + 1][MQOM2_PARAM_SEED_SIZE], uint8_t lseed[MQOM2_PARAM_NB_EVALS][MQOM2_PARAM_SEED_SIZE]);
 
@@ -128,6 +132,34 @@ int GGMTree_InitIncrementalExpansion_x4(ggmtree_ctx_x4_t* ctx, const uint8_t sal
 
 int GGMTree_GetNextLeaf_x4(ggmtree_ctx_x4_t* ctx, uint8_t lseed[4][MQOM2_PARAM_SEED_SIZE]);
 
+typedef struct {
+	uint32_t active;
+	uint32_t num_leaf;
+	uint8_t tweaked_salts[8][GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY][MQOM2_PARAM_SEED_SIZE];
+#if GGMTREE_NB_ENC_CTX_IN_MEMORY == 0
+	/* Dummy value, not used */
+	enc_ctx_x8 *ctx_enc_x8;
+#else
+	enc_ctx_x8 ctx_enc_x8[GGMTREE_NB_ENC_CTX_IN_MEMORY];
+#endif
+	uint8_t path[8][MQOM2_PARAM_NB_EVALS_LOG + 1][MQOM2_PARAM_SEED_SIZE];
+} ggmtree_ctx_x8_t;
+
+/* Cleaning function */
+static inline void ggmtree_ctx_x8_t_clean(ggmtree_ctx_x8_t *ctx) {
+	(void)ctx;
+#if GGMTREE_NB_ENC_CTX_IN_MEMORY > 0
+	unsigned int i;
+	for(i = 0; i < GGMTREE_NB_ENC_CTX_IN_MEMORY; i++){
+		enc_clean_ctx_x8(&ctx->ctx_enc_x8[i]);
+	}
+#endif
+}
+
+int GGMTree_InitIncrementalExpansion_x8(ggmtree_ctx_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t rseed[8][MQOM2_PARAM_SEED_SIZE], const uint8_t delta[MQOM2_PARAM_SEED_SIZE], const uint32_t e[8]);
+
+int GGMTree_GetNextLeaf_x8(ggmtree_ctx_x8_t* ctx, uint8_t lseed[8][MQOM2_PARAM_SEED_SIZE]);
+
 typedef struct {
 	uint32_t active;
 	uint32_t num_leaf;
@@ -222,4 +254,36 @@ int GGMTree_InitIncrementalPartialExpansion_x4(ggmtree_ctx_partial_x4_t* ctx, co
 
 int GGMTree_GetNextLeafPartial_x4(ggmtree_ctx_partial_x4_t* ctx, uint8_t lseed[4][MQOM2_PARAM_SEED_SIZE]);
 
+typedef struct {
+	uint32_t active;
+	uint32_t num_leaf;
+	uint8_t tweaked_salts[8][GGMTREE_NB_TWEAKED_SALTS_IN_MEMORY][MQOM2_PARAM_SEED_SIZE];
+#if GGMTREE_NB_ENC_CTX_IN_MEMORY == 0
+	/* Dummy value, not used */
+	enc_ctx_pub **ctx_enc;
+#else
+	enc_ctx_pub ctx_enc[8][GGMTREE_NB_ENC_CTX_IN_MEMORY];
+#endif
+	uint8_t path[8][MQOM2_PARAM_NB_EVALS_LOG + 1][MQOM2_PARAM_SEED_SIZE];
+	const uint8_t opening[8][MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE];
+	uint32_t i_star[8];
+} ggmtree_ctx_partial_x8_t;
+
+/* Cleaning function */
+static inline void ggmtree_ctx_partial_x8_t_clean(ggmtree_ctx_partial_x8_t *ctx) {
+	(void)ctx;
+#if GGMTREE_NB_ENC_CTX_IN_MEMORY > 0
+	unsigned int i, k;
+	for(i = 0; i < GGMTREE_NB_ENC_CTX_IN_MEMORY; i++){
+		for(k = 0; k < 8; k++){
+			enc_clean_ctx_pub(&ctx->ctx_enc[k][i]);
+		}
+	}
+#endif
+}
+
+int GGMTree_InitIncrementalPartialExpansion_x8(ggmtree_ctx_partial_x8_t* ctx, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t (*path[8])[MQOM2_PARAM_NB_EVALS_LOG][MQOM2_PARAM_SEED_SIZE], const uint32_t e[8], const uint32_t i_star[8]);
+
+int GGMTree_GetNextLeafPartial_x8(ggmtree_ctx_partial_x8_t* ctx, uint8_t lseed[8][MQOM2_PARAM_SEED_SIZE]);
+
 #endif /* __GGM_TREE_H__ */
@@ -3,9 +3,15 @@ import time
 import os, json, sys, signal
 
 CATEGORIES = {'cat1': '128', 'cat3': '192', 'cat5': '256'}
-BASE_FIELDS = {'gf2': '1', 'gf16': '4', 'gf256': '8'}
+BASE_FIELDS = {'gf2': '1', 'gf4': '2', 'gf16': '4', 'gf256': '8'}
 TRADE_OFFS = {'short': '1', 'fast': '0'}
 VARIANTS = {'r3': '3', 'r5': '5'}
+# PIOP implementations: the Makefile toggles selecting them
+PIOP_IMPLEMENTATIONS = {
+    'default': {},
+    'memopt': {'MEMORY_EFFICIENT_PIOP': '1', 'USE_PIOP_CACHE': '0'},
+    'bitslice': {'PIOP_BITSLICE': '1'},
+}
 
 # List all choices
 choices_scheme_sets = ['all']
@@ -31,6 +37,7 @@ parser_compile.add_argument('--no-bench', action='store_true', dest='b_no_bench'
 parser_compile.add_argument('--verbose', action='store_true', dest='b_verbose', help='Activate verbose compilation')
 parser_compile.add_argument('-p', '--parallel-jobs', dest='parallel_jobs', type=int, default=0, help='Number of parallel jobs (-1 means max, 0 means monojob)')
 parser_compile.add_argument('-o', '--only-print', action='store_true', dest='b_compile_only_print', help='Do not compile, only print the compilation invocation to be used')
+parser_compile.add_argument('--piop', nargs='+', choices=list(PIOP_IMPLEMENTATIONS), default=['default'], dest='piops', help='PIOP implementations to compile (default is "default"), the non default ones being built in the <scheme>_<piop> folders')
 
 parser_set = subparsers.add_parser('env', help='get environment variables')
 parser_set.add_argument('scheme', choices=choices_schemes, help='scheme to get')
@@ -43,23 +50,70 @@ parser_bench.add_argument('-n', '--nb-repetitions', dest='nb_repetitions', type=
 parser_bench.add_argument('-p', '--parallel-jobs', dest='parallel_jobs', type=int, default=0, help='Number of parallel jobs (-1 means max, 0 means monojob)')
 parser_bench.add_argument('--verbose', action='store_true', dest='b_verbose', help='Activate verbose benchmarks')
 parser_bench.add_argument('--memory', action='store_true', dest='b_bench_memory', help='Bench also memory usage')
+parser_bench.add_argument('--massif', action='store_true', dest='b_bench_massif', help='Cross-check the memory usage with valgrind massif (much slower)')
 parser_bench.add_argument('-o', '--output', dest='b_bench_file_name', help='Specify the output json benchmarking filename')
 parser_bench.add_argument('-f', '--build-folder', dest='b_bench_build_folder_name', help='Specify the build folder (default is "build/")')
+parser_bench.add_argument('--throughput', action='store_true', dest='b_bench_throughput', help='Bench the multi-core throughput (signatures/sec) instead of the latencies')
+parser_bench.add_argument('--duration', dest='throughput_duration', type=int, default=5, help='Duration in seconds of each throughput phase (sign, verify)')
+parser_bench.add_argument('--max-workers', dest='throughput_max_workers', type=int, default=os.cpu_count(), help='Throughput scaling curve from 1 to this number of workers (default is the number of CPUs)')
+parser_bench.add_argument('--expanded-key', action='store_true', dest='b_bench_expanded_key', help='Sign in throughput mode with a pre-expanded secret key')
+parser_bench.add_argument('--warmup', dest='bench_warmup', type=int, default=0, help='Number of discarded warmup iterations before the measured repetitions')
+parser_bench.add_argument('--target-ci', dest='bench_target_ci', type=float, default=None, help='Repeat beyond the number of repetitions until the 95%% confidence intervals of the median times are within +/- this percentage')
+parser_bench.add_argument('--max-repetitions', dest='bench_max_repetitions', type=int, default=None, help='Maximum number of repetitions with --target-ci (default is 10 times the number of repetitions)')
+parser_bench.add_argument('--pin', action='store_true', dest='b_bench_pin', help='Pin each benchmark process to its own CPU (the parallel jobs run on distinct CPUs)')
+parser_bench.add_argument('--no-smt', action='store_true', dest='b_bench_no_smt', help='With --pin, use only one logical CPU per physical core (implies --pin)')
+parser_bench.add_argument('--history', nargs='?', const='stats/history.sqlite', default=None, dest='b_bench_history', help='Also append the results to the SQLite benchmark history (default is "stats/history.sqlite")')
+parser_bench.add_argument('--piop', nargs='+', choices=list(PIOP_IMPLEMENTATIONS), default=['default'], dest='piops', help='PIOP implementations to benchmark (default is "default"), the non default ones being built in the <scheme>_<piop> folders')
+
+parser_tune = subparsers.add_parser('tune', help='search the build toggles for the fastest/smallest configuration')
+parser_tune.add_argument('schemes', nargs='+', choices=choices_scheme_sets, help='schemes to tune')
+parser_tune.add_argument('-n', '--nb-repetitions', dest='nb_repetitions', type=int, default=20, help='Number of repetitions of each benchmark')
+parser_tune.add_argument('--objective', dest='tune_objective', choices=['keygen', 'sign', 'verif', 'memory'], default='sign', help='Metric to minimize for the recommended configuration (default is the signing time)')
+parser_tune.add_argument('--max-memory', dest='tune_max_memory', type=int, default=None, help='Only recommend configurations whose signing peak memory (in bytes) is below this budget')
+parser_tune.add_argument('--exhaustive', action='store_true', dest='b_tune_exhaustive', help='Explore the full toggle space instead of a greedy per-toggle search')
+parser_tune.add_argument('--allow-non-constant-time', action='store_true', dest='b_tune_non_ct', help='Also explore the non constant time table based Rijndael and GF(256) multiplication')
+parser_tune.add_argument('--no-cache', action='store_true', dest='b_tune_no_cache', help='Do not reuse the measurements of the tuning cache')
+parser_tune.add_argument('-o', '--output', dest='b_tune_file_name', help='Specify the output json tuning filename')
+parser_tune.add_argument('--verbose', action='store_true', dest='b_verbose', help='Activate verbose tuning')
+
+parser_compare = subparsers.add_parser('compare', help='compare two benchmark stats files and detect the regressions')
+parser_compare.add_argument('baseline', help='baseline json benchmarking file')
+parser_compare.add_argument('candidate', help='candidate json benchmarking file')
+parser_compare.add_argument('-t', '--threshold', dest='compare_threshold', type=float, default=5., help='Relative change (in percent) beyond which a significant change is reported (default is 5)')
+parser_compare.add_argument('-a', '--alpha', dest='compare_alpha', type=float, default=0.05, help='Significance level of the tests and 1 - confidence of the intervals (default is 0.05)')
+parser_compare.add_argument('--all', action='store_true', dest='b_compare_all', help='Display all the metrics, not only the significant changes')
+parser_compare.add_argument('-o', '--output', dest='b_compare_file_name', help='Specify the output json comparison filename')
+
+parser_report = subparsers.add_parser('report', help='render the trends of the benchmark history and flag the drifts')
+parser_report.add_argument('schemes', nargs='*', choices=choices_scheme_sets, help='schemes to report (default is all the schemes of the history)')
+parser_report.add_argument('--history', dest='report_history', default='stats/history.sqlite', help='SQLite benchmark history (default is "stats/history.sqlite")')
+parser_report.add_argument('--import', nargs='+', dest='report_import', default=[], help='Import json benchmarking files in the history before reporting')
+parser_report.add_argument('--format', dest='report_formats', choices=['html', 'csv'], nargs='+', default=['html', 'csv'], help='Output formats (default is both)')
+parser_report.add_argument('-o', '--output', dest='report_output', default='stats/report', help='Output folder (default is "stats/report")')
+parser_report.add_argument('-w', '--window', dest='report_window', type=int, default=5, help='Number of previous runs the last run of a configuration is compared to (default is 5)')
+parser_report.add_argument('-t', '--threshold', dest='report_threshold', type=float, default=5., help='Relative drift (in percent) beyond which a metric is flagged (default is 5)')
+
+parser_fields = subparsers.add_parser('fields', help='compare the base fields of the benchmarked schemes')
+parser_fields.add_argument('stats', nargs='+', help='json benchmarking files')
+parser_fields.add_argument('--objective', dest='fields_objective', choices=['keygen', 'sign', 'verif'], default='sign', help='Timing traded off against the signature size (default is the signing time)')
+parser_fields.add_argument('-o', '--output', dest='b_fields_file_name', help='Specify the output csv comparison filename')
 
 parser_test = subparsers.add_parser('test', help='test')
 parser_test.add_argument('schemes', nargs='+', choices=choices_scheme_sets, help='schemes to test')
 parser_test.add_argument('-n', '--nb-repetitions', dest='nb_repetitions', type=int, default=10, help='Number of repetitions')
-parser_test.add_argument('-c', '--compare-kat', dest='compare_kat', default=None, help='Compare KAT (provide a ZIP file representing a submission package)')
+parser_test.add_argument('-c', '--compare-kat', dest='compare_kat', default=None, help='Compare KAT with a kats.json file of SHA-256 digests, a KAT folder or a ZIP file representing a submission package (default is integration/liboqs/kats.json)')
+parser_test.add_argument('-k', '--kat-shards', dest='kat_shards', type=int, default=os.cpu_count(), help='Number of parallel processes generating the KAT of a scheme (default is the number of CPUs)')
 parser_test.add_argument('--no-kat-check', action='store_true', dest='b_no_kat_check', help='Avoid executing the KAT check (only the gen is executed)')
 parser_test.add_argument('--no-valgrind', action='store_true', dest='b_no_valgrind', help='Avoid using valgrind')
 parser_test.add_argument('-p', '--parallel-jobs', dest='parallel_jobs', type=int, default=0, help='Number of parallel jobs (-1 means max, 0 means monojob)')
 parser_test.add_argument('--verbose', action='store_true', dest='b_verbose', help='Activate verbose tests')
 parser_test.add_argument('-f', '--build-folder', dest='b_test_build_folder_name', help='Specify the build folder (default is "build/")')
+parser_test.add_argument('--piop', nargs='+', choices=list(PIOP_IMPLEMENTATIONS), default=['default'], dest='piops', help='PIOP implementations to test (default is "default"), the non default ones being built in the <scheme>_<piop> folders')
 
 arguments = parser.parse_args()
 
 # Utility to execute command
-def run_command(command, cwd, shell=False):
+def run_command(command, cwd, shell=False, cpus=None):
     import subprocess
     if shell:
         process = subprocess.Popen(command, cwd=cwd, shell=shell,
@@ -69,15 +123,443 @@ def run_command(command, cwd, shell=False):
         process = subprocess.Popen(command.split(), cwd=cwd,
             stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
+    # Optionally pin the process (without shell) to a set of CPUs: this is done
+    # from the parent, preexec_fn being unsafe with the threaded parallel jobs
+    if cpus is not None:
+        os.sched_setaffinity(process.pid, cpus)
     stdout, stderr = process.communicate()
     stdout = stdout.decode('utf8') if stdout is not None else None
     stderr = stderr.decode('utf8') if stdout is not None else None
     return stdout, stderr
 
+# Utility to copy the source tree (used to compile out of tree)
+def is_source_file(filename):
+    _, file_extension = os.path.splitext(filename)
+    return file_extension in ['.h', '.c', '.inc', '.macros', '.S'] or filename in ['Makefile', '.gitignore']
+
+def copy_folder(src_path, dst_path, only_root=False):
+    import shutil
+    for root, dirs, files in os.walk(src_path):
+        subpath = root[len(src_path)+1:]
+        root_created = False
+        for filename in files:
+            if is_source_file(filename):
+                if not root_created:
+                    os.makedirs(os.path.join(dst_path, subpath),  exist_ok = True)
+                    root_created = True
+                shutil.copyfile(
+                    os.path.join(src_path, subpath, filename),
+                    os.path.join(dst_path, subpath, filename)
+                )
+
+# Utility to get a digest of the source tree
+def get_sources_digest():
+    import hashlib
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(str(CWD)):
+        # Deterministic walk, without the build products
+        dirs[:] = sorted(d for d in dirs if d not in ['build', 'stats', '.git'])
+        for filename in sorted(files):
+            if is_source_file(filename):
+                digest.update(os.path.relpath(os.path.join(root, filename), str(CWD)).encode())
+                with open(os.path.join(root, filename), 'rb') as _file:
+                    digest.update(_file.read())
+    return digest.hexdigest()
+
+# Utility to describe the host (CPU and compiler)
+def get_host():
+    import platform
+    model = platform.processor()
+    try:
+        with open('/proc/cpuinfo') as _file:
+            for line in _file:
+                if line.startswith('model name'):
+                    model = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    compiler, _ = run_command('%s --version' % os.getenv('CC', 'cc'), CWD, shell=True)
+    return {
+        'machine': platform.machine(),
+        'cpu': model,
+        'nb_cpus': os.cpu_count(),
+        'compiler': compiler.split('\n')[0],
+    }
+
+# KAT files: the generator can be sharded by count range, the concatenation of
+# the shards in count order being the same as the unsharded files
+KAT_NUM_VECTORS = 100
+
+# Merges KAT shards in one streaming pass (the shards are removed), and gets
+# the SHA-256 digests of the merged file ("file") and the ones of the liboqs
+# kats.json: of all the vectors without the "# <name>" header and the final
+# empty line ("all"), and of the first vector only ("single")
+def merge_kat_shards(shard_paths, merged_path):
+    import hashlib
+    digests = {'file': hashlib.sha256(), 'all': hashlib.sha256(), 'single': hashlib.sha256()}
+    in_header, in_first, pending = True, True, None
+    with open(merged_path, 'wb') as merged:
+        for shard_path in shard_paths:
+            with open(shard_path, 'rb') as shard:
+                for line in shard:
+                    merged.write(line)
+                    digests['file'].update(line)
+                    if in_header:
+                        if not line.startswith(b'count = '):
+                            continue
+                        in_header = False
+                    if in_first:
+                        if line == b'\n':
+                            in_first = False
+                        else:
+                            digests['single'].update(line)
+                    if pending is not None:
+                        digests['all'].update(pending)
+                    pending = line
+            os.remove(shard_path)
+    if pending is not None:
+        digests['all'].update(pending[:-1])
+    return {name: digest.hexdigest() for name, digest in digests.items()}
+
+# Streaming SHA-256 of a file object
+def get_file_digest(_file):
+    import hashlib
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: _file.read(1 << 20), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+# Utilities for the benchmarking conditions (from the Linux sysfs)
+def read_sysfs(path):
+    try:
+        with open(path) as _file:
+            return _file.read().strip()
+    except OSError:
+        return None
+
+# CPUs available for the benchmarks, optionally keeping one logical CPU per
+# physical core (the SMT siblings share the caches and the execution units)
+def get_bench_cpus(skip_smt_siblings):
+    cpus = sorted(os.sched_getaffinity(0))
+    if skip_smt_siblings:
+        kept, cores = [], set()
+        for cpu in cpus:
+            core = read_sysfs(f'/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list') or str(cpu)
+            if core not in cores:
+                cores.add(core)
+                kept.append(cpu)
+        cpus = kept
+    return cpus
+
+def get_cpu_conditions(cpu):
+    cpufreq = f'/sys/devices/system/cpu/cpu{cpu}/cpufreq/'
+    def read_khz(name):
+        value = read_sysfs(cpufreq + name)
+        return int(value) if value is not None and value.isdigit() else None
+    return {
+        'cpu': cpu,
+        'governor': read_sysfs(cpufreq + 'scaling_governor'),
+        'cur_freq_khz': read_khz('scaling_cur_freq'),
+        'min_freq_khz': read_khz('scaling_min_freq'),
+        'max_freq_khz': read_khz('scaling_max_freq'),
+    }
+
+def get_turbo_state():
+    no_turbo = read_sysfs('/sys/devices/system/cpu/intel_pstate/no_turbo')
+    if no_turbo is not None:
+        return no_turbo == '0'
+    boost = read_sysfs('/sys/devices/system/cpu/cpufreq/boost')
+    if boost is not None:
+        return boost == '1'
+    return None
+
+# Check the frequency scaling of the benchmarking CPUs: returns the conditions
+# to be recorded and the warnings about the sources of noise
+def check_bench_conditions(cpus):
+    warnings = []
+    governors = {}
+    for cpu in cpus:
+        governor = get_cpu_conditions(cpu)['governor']
+        governors[cpu] = governor
+        if governor is not None and governor != 'performance':
+            warnings.append(f'the frequency governor of CPU {cpu} is "{governor}" (not "performance")')
+    if all(governor is None for governor in governors.values()):
+        warnings.append('the frequency governor cannot be read (no cpufreq)')
+    turbo = get_turbo_state()
+    if turbo:
+        warnings.append('the turbo boost is enabled')
+    loadavg = os.getloadavg()
+    if loadavg[0] > 0.5:
+        warnings.append(f'the system is loaded (load average {loadavg[0]:.2f})')
+    conditions = {
+        'governors': governors,
+        'turbo': turbo,
+        'loadavg': loadavg,
+        'warnings': warnings,
+    }
+    return conditions
+
+# Utility to get the git revision of the sources (with a "-dirty" suffix when
+# the tracked files are modified), or None outside of a git repository
+def get_git_revision():
+    revision, _ = run_command('git rev-parse HEAD', CWD, shell=True)
+    revision = revision.strip()
+    if not revision:
+        return None
+    status, _ = run_command('git status --porcelain --untracked-files=no', CWD, shell=True)
+    return revision + ('-dirty' if status.strip() else '')
+
+# Utility to run a graph of jobs: jobs maps a job name to a (function, dependencies)
+# pair, a job being run once all its dependencies succeeded. The functions return
+# whether they succeeded, and the jobs depending on a failed one are not run.
+# At most nb_jobs jobs run at the same time: they mostly wait for the processes
+# (compiler, make, ...) they spawn
+def run_job_graph(jobs, nb_jobs):
+    import concurrent.futures
+    status = {}
+    pending = dict(jobs)
+    running = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(nb_jobs, 1)) as executor:
+        while pending or running:
+            changed = True
+            while changed:
+                changed = False
+                for name in list(pending):
+                    function, dependencies = pending[name]
+                    if any(status.get(dependency) is False for dependency in dependencies):
+                        status[name] = False
+                        del pending[name]
+                        changed = True
+                    elif all(status.get(dependency) for dependency in dependencies):
+                        running[executor.submit(function)] = name
+                        del pending[name]
+            if not running:
+                # Unknown dependencies
+                for name in pending:
+                    status[name] = False
+                break
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status[name] = bool(future.result())
+                except Exception as exception:
+                    print(f'[-] Job {name} failed: {exception}')
+                    status[name] = False
+    return status
+
+# Utilities for the statistics of the benchmark comparisons
+def regularized_incomplete_beta(x, a, b):
+    import math
+    if x <= 0. or x >= 1.:
+        return max(0., min(1., x))
+    # Continued fraction (modified Lentz), on the side where it converges fast
+    if x > (a + 1.) / (a + b + 2.):
+        return 1. - regularized_incomplete_beta(1. - x, b, a)
+    tiny = 1e-300
+    c, d = 1., 1. - (a + b) * x / (a + 1.)
+    d = 1. / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 1000):
+        for numerator in [m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)), -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))]:
+            d = 1. + numerator * d
+            d = 1. / (d if abs(d) > tiny else tiny)
+            c = 1. + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.) < 1e-14:
+            break
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    return front * h / a
+
+def student_t_cdf(t, df):
+    tail = regularized_incomplete_beta(df / (df + t * t), df / 2., 0.5) / 2.
+    return 1. - tail if t > 0 else tail
+
+def student_t_quantile(p, df):
+    low, high = -1e3, 1e3
+    for _ in range(200):
+        middle = (low + high) / 2.
+        if student_t_cdf(middle, df) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2.
+
+def summarize_samples(samples):
+    n = len(samples)
+    mean = sum(samples) / n
+    var = sum((x - mean) ** 2 for x in samples) / (n - 1) if n > 1 else None
+    return {'n': n, 'mean': mean, 'var': var}
+
+# Welch test of the difference between the candidate and baseline means: returns
+# the relative change, its confidence interval (relative to the baseline mean)
+# and the two-sided p-value
+def welch_compare(baseline, candidate, alpha):
+    import math
+    if baseline['mean'] == 0:
+        return None
+    change = (candidate['mean'] - baseline['mean']) / baseline['mean']
+    if baseline['var'] is None or candidate['var'] is None:
+        return {'change': change, 'ci': None, 'p_value': None}
+    se2_b, se2_c = baseline['var'] / baseline['n'], candidate['var'] / candidate['n']
+    se = math.sqrt(se2_b + se2_c)
+    if se == 0:
+        p_value = 1. if change == 0 else 0.
+        return {'change': change, 'ci': (change, change), 'p_value': p_value}
+    # Welch-Satterthwaite degrees of freedom
+    df = (se2_b + se2_c) ** 2 / ((se2_b ** 2 / (baseline['n'] - 1)) + (se2_c ** 2 / (candidate['n'] - 1)))
+    t = (candidate['mean'] - baseline['mean']) / se
+    p_value = 2. * (1. - student_t_cdf(abs(t), df))
+    margin = student_t_quantile(1. - alpha / 2., df) * se / abs(baseline['mean'])
+    return {'change': change, 'ci': (change - margin, change + margin), 'p_value': p_value}
+
+# Points not dominated on all the (lower is better) objectives
+def pareto_front(points, objectives):
+    front = []
+    for point in points:
+        dominated = False
+        for other in points:
+            if other is point:
+                continue
+            if all(other[o] <= point[o] for o in objectives) and any(other[o] < point[o] for o in objectives):
+                dominated = True
+                break
+        if not dominated:
+            front.append(point)
+    return sorted(front, key=lambda x: tuple(x[o] for o in objectives))
+
+# Metrics of a benchmark record: name -> (summary, lower_is_better, exact)
+# where the summary is computed from the raw samples when available, and
+# from the recorded mean and standard deviation otherwise
+def get_record_metrics(record):
+    metrics = {}
+    samples = record.get('samples', {})
+    nb_tests = record.get('correctness', 0)
+    timers = [key for key in ['keygen', 'sign', 'verif'] if key in record]
+    timers += sorted(key for key in record if key.startswith('detailed_'))
+    for key in timers:
+        value = record[key]
+        if key in samples and len(samples[key].get('ms', [])) > 0:
+            metrics[f'{key}_ms'] = (summarize_samples(samples[key]['ms']), True, False)
+        elif key.startswith('detailed_'):
+            metrics[f'{key}_ms'] = ({'n': 1, 'mean': value[0], 'var': None}, True, False)
+        else:
+            var = value[1] ** 2 * nb_tests / (nb_tests - 1) if nb_tests > 1 else None
+            metrics[f'{key}_ms'] = ({'n': nb_tests, 'mean': value[0], 'var': var}, True, False)
+        if key in samples and len(samples[key].get('cycles', [])) > 0:
+            metrics[f'{key}_cycles'] = (summarize_samples(samples[key]['cycles']), True, False)
+        elif key.startswith('detailed_') and value[1] is not None:
+            metrics[f'{key}_cycles'] = ({'n': 1, 'mean': value[1], 'var': None}, True, False)
+        elif f'{key}_cycles' in record:
+            metrics[f'{key}_cycles'] = ({'n': 1, 'mean': record[f'{key}_cycles'], 'var': None}, True, False)
+    # The sizes and the memory peaks are deterministic
+    for key in ['pk_size', 'sk_size', 'sig_size_max']:
+        if key in record:
+            metrics[key] = ({'n': 1, 'mean': record[key], 'var': None}, True, True)
+    if 'sig_size' in record and nb_tests > 1:
+        metrics['sig_size'] = ({'n': nb_tests, 'mean': record['sig_size'][0], 'var': record['sig_size'][1] ** 2 * nb_tests / (nb_tests - 1)}, True, False)
+    for algo, value in record.get('memory', {}).items():
+        metrics[f'memory_{algo}'] = ({'n': 1, 'mean': value, 'var': None}, True, True)
+    if 'alloc_peak_usage' in record:
+        metrics['alloc_peak_usage'] = ({'n': 1, 'mean': record['alloc_peak_usage'], 'var': None}, True, True)
+    # Hardware performance counters (only the IPC is higher is better)
+    for key, counters in record.get('perf', {}).items():
+        for event, value in counters.items():
+            if value is not None:
+                metrics[f'{key}_{event}'] = ({'n': 1, 'mean': value, 'var': None}, event != 'ipc', False)
+    # Throughput scaling curve (higher is better)
+    throughput = record.get('throughput')
+    if throughput is not None:
+        for algo in ['sign', 'verif']:
+            for nb_workers, point in zip(throughput['nb_workers'], throughput[algo]):
+                metrics[f'throughput_{algo}_{nb_workers}w'] = ({'n': 1, 'mean': point['ops_per_sec'], 'var': None}, False, False)
+    return metrics
+
+# Per-phase table of the hardware performance counters of a benchmark record
+# (see BENCHMARK_PERF=1), with n/a for the events not available on the host
+PERF_REPORT_EVENTS = [
+    ('instructions', 'instructions'), ('ipc', 'IPC'), ('l1d_read_misses', 'L1D rd misses'), ('llc_misses', 'LLC misses'),
+    ('branch_misses', 'branch misses'), ('stalled_cycles_frontend', 'stalls front'), ('stalled_cycles_backend', 'stalls back'),
+]
+def format_perf_report(record):
+    if record.get('perf_error') is not None:
+        return f'Warning: {record["path"]}: performance counters unavailable ({record["perf_error"]})'
+    labels = {'keygen': 'Key Generation', 'sign': 'Signing', 'verif': 'Verification'}
+    lines = [f'Performance counters of {record["path"]} (per iteration):']
+    lines.append(f'  {"":<34}' + ''.join(f' {title:>14}' for _, title in PERF_REPORT_EVENTS))
+    for key, counters in record['perf'].items():
+        label = labels.get(key, key[len('detailed_'):] if key.startswith('detailed_') else key)
+        values = []
+        for event, _ in PERF_REPORT_EVENTS:
+            value = counters.get(event)
+            if value is None:
+                values.append(f' {"n/a":>14}')
+            elif event == 'ipc':
+                values.append(f' {value:>14.2f}')
+            else:
+                values.append(f' {value:>14.0f}')
+        lines.append(f'  {label:<34}' + ''.join(values))
+    return '\n'.join(lines)
+
+# Benchmark history: a SQLite database with one row per benchmarked scheme in
+# the "runs" table (with its context: git revision, host, compiler, instruction
+# sets and compilation flags), and its metrics (see get_record_metrics) in the
+# "metrics" table
+HISTORY_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    scheme TEXT NOT NULL,
+    name TEXT,
+    git_revision TEXT,
+    host TEXT,
+    compiler TEXT,
+    instruction_sets TEXT,
+    compilation TEXT,
+    nb_tests INTEGER,
+    record TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_scheme ON runs (scheme, timestamp);
+CREATE INDEX IF NOT EXISTS runs_revision ON runs (git_revision);
+CREATE INDEX IF NOT EXISTS runs_configuration ON runs (instruction_sets, compilation);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    std REAL,
+    n INTEGER,
+    PRIMARY KEY (run_id, metric)
+);
+'''
+
+def open_history(path):
+    import sqlite3
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), check_same_thread=False)
+    connection.executescript(HISTORY_SCHEMA)
+    return connection
+
+def history_add_record(connection, record, git_revision, host):
+    import math
+    # The raw samples, percentiles and histograms are summarized by the metrics
+    kept = {key: value for key, value in record.items() if key not in ['samples', 'percentiles', 'histograms']}
+    cursor = connection.execute(
+        'INSERT INTO runs (timestamp, scheme, name, git_revision, host, compiler, instruction_sets, compilation, nb_tests, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (record.get('timestamp', time.time()), record.get('path', record.get('name')), record.get('name'), git_revision,
+         host.get('cpu') if host else None, host.get('compiler') if host else None,
+         record.get('instruction_sets'), record.get('compilation'), record.get('correctness'), json.dumps(kept)))
+    for metric, (summary, _, _) in get_record_metrics(record).items():
+        std = math.sqrt(summary['var']) if summary['var'] is not None else None
+        connection.execute('INSERT INTO metrics (run_id, metric, value, std, n) VALUES (?, ?, ?, ?, ?)',
+                           (cursor.lastrowid, metric, summary['mean'], std, summary['n']))
+    connection.commit()
+
 # Utility to get the selected schemes
 class MQOMInstance:
-    def __init__(self, scheme, dst_path):
+    def __init__(self, scheme, dst_path, piop='default'):
         self.scheme = scheme
+        self.piop = piop
         self.dst_path = dst_path / self.get_label()
         self.dst_path.mkdir(parents=True, exist_ok=True) 
 
@@ -93,161 +575,276 @@ class MQOMInstance:
         self.compilation_prefix = {
             'EXTRA_CFLAGS': extra_cflags,
         }
+        self.compilation_prefix.update(PIOP_IMPLEMENTATIONS[piop])
 
-    def get_label(self):
+    def get_scheme_label(self):
         (cat, field, tradeoff, variant) = self.scheme
         return f'{cat}_{field}_{tradeoff}_{variant}'
 
+    def get_label(self):
+        # The default PIOP keeps the plain scheme label
+        if self.piop == 'default':
+            return self.get_scheme_label()
+        return f'{self.get_scheme_label()}_{self.piop}'
+
+    def get_make_prefix(self):
+        # Variables of the make invocations
+        return ' '.join(f'{key}="{value}"' for key, value in self.compilation_prefix.items())
+
     def clean(self):
         run_command('make clean', CWD, shell=True)
 
     def compile_bench(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (bench) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench', folder, shell=True)
 
     def compile_bench_mem_keygen(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (bench write) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_keygen')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_keygen')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_keygen', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_keygen', folder, shell=True)
         
     def compile_bench_mem_sign(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (bench write) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_sign')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_sign')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_sign', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_sign', folder, shell=True)
 
     def compile_bench_mem_open(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (bench read) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_open')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_open')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_open', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_mem_open', folder, shell=True)
+
+    def compile_bench_throughput(self, folder):
+        make_prefix = self.get_make_prefix()
+        prefix_exec = self.get_label()
+        dst_path = self.dst_path
+        if arguments.b_compile_only_print:
+            print("=== Compilation (bench throughput) of %s" % prefix_exec)
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_throughput')
+            return "",""
+        else:
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make bench_throughput', folder, shell=True)
+
+    def compile_targets(self, folder, targets, make_variables={}):
+        make_prefix = self.get_make_prefix()
+        prefix_exec = self.get_label()
+        dst_path = self.dst_path
+        variables = ' '.join(f'{key}={value}' for key, value in make_variables.items())
+        return run_command(f'{variables} {make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make {" ".join(targets)}', folder, shell=True)
+
+    def get_cflags(self, folder, make_variables={}):
+        make_prefix = self.get_make_prefix()
+        variables = ' '.join(f'{key}={value}' for key, value in make_variables.items())
+        stdout, _ = run_command(f'{variables} {make_prefix} make --no-print-directory print_cflags', folder, shell=True)
+        return stdout.strip().split()
 
     def compile_kat_gen(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (kat gen) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_gen')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_gen')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_gen', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_gen', folder, shell=True)
 
     def compile_kat_check(self, folder):
-        extra_cflags = self.compilation_prefix['EXTRA_CFLAGS']
+        make_prefix = self.get_make_prefix()
         prefix_exec = self.get_label()
         dst_path = self.dst_path
         if arguments.b_compile_only_print:
             print("=== Compilation (kat check) of %s" % prefix_exec)
-            print(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_check')
+            print(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_check')
             return "",""
         else:
-            return run_command(f'EXTRA_CFLAGS="{extra_cflags}" DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_check', folder, shell=True)
+            return run_command(f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{prefix_exec}" make kat_check', folder, shell=True)
 
-    def run_bench(self, nb_experiments):
+    def run_bench(self, nb_experiments, options='', cpus=None):
         scheme_label = self.get_label()
         dst_path = self.dst_path
-        stdout, stderr = run_command(f'{dst_path}/{scheme_label}_bench {nb_experiments}', cwd=CWD)
+        stdout, stderr = run_command(f'{dst_path}/{scheme_label}_bench {nb_experiments}{options} --json', cwd=CWD, cpus=cpus)
         assert (not stderr), stderr
         if arguments.b_verbose:
             print(stdout)
+        # The bench executable emits one JSON record
+        record = json.loads(stdout)
+        config = record['config']
+        sizes = record['sizes']
+        algorithms = record['algorithms']
 
-        # check that the score is maximal
         data = {
             'path': scheme_label,
-            'name':             get_info(stdout, r'\[API\] Algo Name: (.+)'),
-            'version':          get_info(stdout, r'\[API\] Algo Version: (.+)'),
-            'instruction_sets': get_info(stdout, r'Instruction Sets:\s*(\S.+)?'),
+            'scheme':           self.get_scheme_label(),
+            'piop':             self.piop,
+            'name':             config['name'],
+            'version':          config['version'],
+            'instruction_sets': ' '.join([f'[Platform = {config["platform"]}]'] + config['instruction_sets']),
             'compilation'     : ' '.join(f'{key}="{value}"' for key, value in self.compilation_prefix.items()),
-            'debug':            get_info(stdout, r'Debug: (.+)'),
-            'correctness':      get_info(stdout, r'Correctness: (.+)/{}'.format(nb_experiments)),
-            'keygen': get_info(stdout, r' - Key Gen: (.+) ms \(std=(.+)\)'),
-            'sign':   get_info(stdout, r' - Sign:    (.+) ms \(std=(.+)\)'),
-            'verif':  get_info(stdout, r' - Verify:  (.+) ms \(std=(.+)\)'),
-            'pk_size':      get_info(stdout, r' - PK size: (.+) B'),
-            'sk_size':      get_info(stdout, r' - SK size: (.+) B'),
-            'sig_size_max': get_info(stdout, r' - Signature size \(MAX\): (.+) B'),
-            'sig_size':     get_info(stdout, r' - Signature size: (.+) B \(std=(.+)\)'),
+            'debug':            config['debug'],
+            'correctness':      record['correctness'],
+            'nb_tests':         record['nb_tests'],
+            'keygen': (algorithms['keygen']['mean_ms'], algorithms['keygen']['std_ms']),
+            'sign':   (algorithms['sign']['mean_ms'], algorithms['sign']['std_ms']),
+            'verif':  (algorithms['verify']['mean_ms'], algorithms['verify']['std_ms']),
+            'pk_size':      sizes['pk'],
+            'sk_size':      sizes['sk'],
+            'sig_size_max': sizes['sig_max'],
+            'sig_size':     (sizes['sig_mean'], sizes['sig_std']),
+            'config': config,
             'timestamp' : time.time(),
         }
-        try:
-            keygen_cycles = get_info(stdout, r' - Key Gen: (.+) cycles')
-            sign_cycles = get_info(stdout, r' - Sign:    (.+) cycles')
-            verif_cycles = get_info(stdout, r' - Verify:  (.+) cycles')
-            data['keygen_cycles'] = keygen_cycles
-            data['sign_cycles'] = sign_cycles
-            data['verif_cycles'] = verif_cycles
-            # Try to extract the detailed elements
-            blc_commit_dict = {
-                'total' : 'BLC.Commit',
-                'expand_trees' : r'\[BLC.Commit\] Expand Trees',
-                'seed_commit' : r'\[BLC.Commit\] Seed Commit',
-                'prg' : r'\[BLC.Commit\] PRG',
-                'xof' : r'\[BLC.Commit\] XOF',
-                'arithm' : r'\[BLC.Commit\] Arithm',
-            }
-            piop_compute_dict = {
-                'total' : 'PIOP.Compute',
-                'expand_mq' : r'\[PIOP.Compute\] ExpandMQ',
-                'expand_batching_mat' : r'\[PIOP.Compute\] Expand Batching Mat',
-                'matrix_mult_ext' : r'\[PIOP.Compute\] Matrix Mul Ext',
-                'compute_t1' : r'\[PIOP.Compute\] Compute t1',
-                'compute_p_zi' : r'\[PIOP.Compute\] Compute P_zi',
-                'batch_and_mask' : r'\[PIOP.Compute\] Batch and Mask',
-            }
-            sample_challenge_dict = {
-                'total' : 'Sample Challenge',
-            }
-            blc_open_dict = {
-                'total' : 'BLC.Open',
-            }
-            for d in blc_commit_dict:
-                data['detailed_' + 'blc_commit_' + d] = (float(get_info(stdout, r'.*- %s: (.+) cycles\)' % blc_commit_dict[d]).split("ms")[0]), float(get_info(stdout, r'.*- %s: (.+) cycles\)' % blc_commit_dict[d]).split("(")[1])) 
-            for d in piop_compute_dict:
-                data['detailed_' + 'piop_compute_' + d] = (float(get_info(stdout, r'.*- %s: (.+) cycles\)' % piop_compute_dict[d]).split("ms")[0]), float(get_info(stdout, r'.*- %s: (.+) cycles\)' % piop_compute_dict[d]).split("(")[1])) 
-            for d in sample_challenge_dict:
-                data['detailed_' + 'sample_challenge_' + d] = (float(get_info(stdout, r'.*- %s: (.+) cycles\)' % sample_challenge_dict[d]).split("ms")[0]), float(get_info(stdout, r'.*- %s: (.+) cycles\)' % sample_challenge_dict[d]).split("(")[1])) 
-            for d in blc_open_dict:
-                data['detailed_' + 'blc_open_' + d] = (float(get_info(stdout, r'.*- %s: (.+) cycles\)' % blc_open_dict[d]).split("ms")[0]), float(get_info(stdout, r'.*- %s: (.+) cycles\)' % blc_open_dict[d]).split("(")[1])) 
-        except ValueError:
-            pass
-        if arguments.b_verbose:
-            print(data)
+        if 'alloc_peak_usage' in record:
+            data['alloc_peak_usage'] = record['alloc_peak_usage']
+        # Raw per-iteration samples for post-processing, and the tail latency
+        # percentiles and log-bucketed histograms of each algorithm and phase
+        samples = {}
+        percentiles = {'sig_size': sizes['percentiles_sig']}
+        histograms = {'sig_size': sizes['histogram_sig']}
+        def add_distributions(label, timer):
+            samples[label] = {'ms': timer['samples_ms']}
+            percentiles[label] = timer['percentiles_ms']
+            histograms[label] = timer['histogram_ms']
+            if 'samples_cycles' in timer:
+                samples[label]['cycles'] = timer['samples_cycles']
+                percentiles[label + '_cycles'] = timer['percentiles_cycles']
+                histograms[label + '_cycles'] = timer['histogram_cycles']
+        median_ci = {}
+        for algo_label, algo in [('keygen', 'keygen'), ('sign', 'sign'), ('verif', 'verify')]:
+            add_distributions(algo_label, algorithms[algo])
+            if 'median_ci_ms' in algorithms[algo]:
+                median_ci[algo_label] = algorithms[algo]['median_ci_ms']
+            if 'mean_cycles' in algorithms[algo]:
+                data[f'{algo_label}_cycles'] = algorithms[algo]['mean_cycles']
+        # Detailed timers (only with BENCHMARK=1)
+        for key, timer in record.get('detailed', {}).items():
+            data['detailed_' + key] = (timer['mean_ms'], timer.get('mean_cycles'))
+            add_distributions('detailed_' + key, timer)
+        data['percentiles'] = percentiles
+        data['histograms'] = histograms
+        data['samples'] = samples
+        # 95% confidence intervals of the median times
+        data['median_ci'] = median_ci
+        # Per-iteration hardware performance counters of each algorithm and
+        # phase (only with BENCHMARK_PERF=1, None for the unavailable events)
+        if 'perf_error' in record:
+            perf = {}
+            for algo_label, algo in [('keygen', 'keygen'), ('sign', 'sign'), ('verif', 'verify')]:
+                perf[algo_label] = algorithms[algo]['perf']
+            for key, timer in record.get('detailed', {}).items():
+                perf['detailed_' + key] = timer['perf']
+            data['perf'] = perf
+            data['perf_error'] = record['perf_error']
         return data
     
+    def run_bench_throughput(self, max_workers, duration, expanded_key):
+        scheme_label = self.get_label()
+        dst_path = self.dst_path
+        options = ' --expanded-key' if expanded_key else ''
+        data = {
+            'path': scheme_label,
+            'scheme': self.get_scheme_label(),
+            'piop': self.piop,
+            'compilation': ' '.join(f'{key}="{value}"' for key, value in self.compilation_prefix.items()),
+            'timestamp': time.time(),
+        }
+        # Scaling curve: aggregated ops/sec for 1 to max_workers workers, and the
+        # per-core efficiency ops(n) / (n * ops(1))
+        throughput = {'duration': duration, 'expanded_key': expanded_key, 'nb_workers': [], 'sign': [], 'verif': []}
+        for nb_workers in range(1, max_workers+1):
+            stdout, stderr = run_command(f'{dst_path}/{scheme_label}_bench_throughput {nb_workers} {duration}{options} --json', cwd=CWD)
+            assert (not stderr), stderr
+            record = json.loads(stdout)
+            assert record['failures'] == 0, record['failures']
+            data['config'] = record['config']
+            throughput['nb_workers'].append(nb_workers)
+            for algo_label, algo in [('sign', 'sign'), ('verif', 'verify')]:
+                ops_per_sec = record[algo]['ops_per_sec']
+                single = throughput[algo_label][0]['ops_per_sec'] if nb_workers > 1 else ops_per_sec
+                throughput[algo_label].append({
+                    'ops': record[algo]['ops'],
+                    'ops_per_sec': ops_per_sec,
+                    'per_worker_ops_per_sec': record[algo]['per_worker_ops_per_sec'],
+                    'efficiency': ops_per_sec / (nb_workers * single) if single > 0 else 0.,
+                })
+            if arguments.b_verbose:
+                print(' - %d worker(s): sign %.2f ops/s (efficiency %.2f), verify %.2f ops/s (efficiency %.2f)' % (
+                    nb_workers, throughput['sign'][-1]['ops_per_sec'], throughput['sign'][-1]['efficiency'],
+                    throughput['verif'][-1]['ops_per_sec'], throughput['verif'][-1]['efficiency']))
+        data['name'] = data['config']['name']
+        data['throughput'] = throughput
+        return data
+
+    def get_memory_workdir(self):
+        # The memory benchmarks chain through files in their working directory:
+        # each scheme has its own one, which also keeps the massif artifacts
+        workdir = self.dst_path / 'memory'
+        workdir.mkdir(parents=True, exist_ok=True)
+        return workdir
+
     def run_bench_memory(self):
+        # Native peak memory measurement of the memory benchmarks ("--probe"
+        # mode): stack high water mark (stack painting) and heap peak (the
+        # allocation probes of mqom_malloc/mqom_calloc)
+        import re
+        scheme_label = self.get_label()
+        dst_path = self.dst_path
+        workdir = self.get_memory_workdir()
+        data = {}
+        reg_stack = re.compile(r'Stack peak usage: (\d+) bytes')
+        reg_heap = re.compile(r'Heap peak usage: (\d+) bytes')
+        for cmd, algo_label in [('keygen', 'Key Generation'), ('sign', 'Signing'), ('open', 'Verification')]:
+            stdout, stderr = run_command(f'{dst_path}/{scheme_label}_bench_mem_{cmd} --probe', cwd=workdir)
+            assert (not stderr) and ('Failure' not in stdout) and ('WARNING' not in stdout), (stdout, stderr)
+            stack, heap = reg_stack.search(stdout), reg_heap.search(stdout)
+            assert (stack is not None) and (heap is not None), stdout
+            data[cmd] = {
+                'stack': int(stack.group(1)),
+                'heap': int(heap.group(1)),
+            }
+            # Upper bound: the two peaks are not necessarily simultaneous
+            data[cmd]['total'] = data[cmd]['stack'] + data[cmd]['heap']
+            if arguments.b_verbose:
+                print(f' - {algo_label}: {data[cmd]['total']} B (stack {data[cmd]['stack']} B, heap {data[cmd]['heap']} B)')
+        if arguments.b_verbose:
+            print()
+        return data
+
+    def run_bench_memory_massif(self):
         import re
         scheme_label = self.get_label()
         dst_path = self.dst_path
+        workdir = self.get_memory_workdir()
         data = {}
         for cmd, algo_label in [('keygen', 'Key Generation'), ('sign', 'Signing'), ('open', 'Verification')]:
-            _, stderr = run_command(f'valgrind --max-stackframe=10000000 --tool=massif --stacks=yes --log-file=massif.read.log --massif-out-file=massif.read.out {dst_path}/{scheme_label}_bench_mem_{cmd}', cwd=CWD)
+            _, stderr = run_command(f'valgrind --max-stackframe=10000000 --tool=massif --stacks=yes --log-file=massif.{cmd}.log --massif-out-file=massif.{cmd}.out {dst_path}/{scheme_label}_bench_mem_{cmd}', cwd=workdir)
             assert (not stderr), stderr
             stats = None
-            with open('massif.read.out') as _file:
+            with open(workdir / f'massif.{cmd}.out') as _file:
                 stats = _file.readlines()
             current_snapshot = None
             snapshots = []
@@ -281,15 +878,36 @@ class MQOMInstance:
             data[cmd] = snapshots
             if arguments.b_verbose:
                 peak_memory_snapshot = max(snapshots, key=lambda x: x['total'])
-                print(f' - {algo_label}: {peak_memory_snapshot['total']} B')
+                print(f' - {algo_label} (massif): {peak_memory_snapshot['total']} B')
         if arguments.b_verbose:
             print()
         return data
     
-    def run_kat_gen(self):
+    def run_kat_gen(self, sk_size, nb_shards=1):
+        import subprocess
         scheme_label = self.get_label()
         dst_path = self.dst_path
-        return run_command(f'cd {dst_path} && ./{scheme_label}_kat_gen', cwd=CWD, shell=True)
+        # Contiguous count ranges generated by parallel processes, then merged
+        nb_shards = max(1, min(nb_shards, KAT_NUM_VECTORS))
+        bounds = [KAT_NUM_VECTORS * i // nb_shards for i in range(nb_shards + 1)]
+        processes = [
+            subprocess.Popen([f'./{scheme_label}_kat_gen', str(first), str(last)], cwd=dst_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            for first, last in zip(bounds[:-1], bounds[1:])
+        ]
+        stdout, stderr = '', ''
+        failed = False
+        for process in processes:
+            out, err = process.communicate()
+            stdout += out.decode('utf8')
+            stderr += err.decode('utf8')
+            failed = failed or (process.returncode != 0)
+        if failed:
+            return stdout, stderr, None
+        digests = {}
+        for ext in ['req', 'rsp']:
+            kat_file = f'{dst_path}/PQCsignKAT_{sk_size}.{ext}'
+            digests[ext] = merge_kat_shards([f'{kat_file}.{first:03d}' for first in bounds[:-1]], kat_file)
+        return stdout, stderr, digests
 
     def run_kat_check(self):
         scheme_label = self.get_label()
@@ -304,7 +922,7 @@ class MQOMInstance:
         return summary
 
     @classmethod
-    def get_schemes(cls, schemes_arg, *args, **kwargs):
+    def get_schemes(cls, schemes_arg, *args, piops=('default',), **kwargs):
         schemes = []
         include_all = ('all' in schemes_arg)
         for cat in CATEGORIES:
@@ -317,7 +935,8 @@ class MQOMInstance:
                         include_variant = (f'{cat}_{field}_{tradeoff}_{variant}' in schemes_arg)
                         include_scheme = include_all or include_cat or include_field or include_tradeoff or include_variant
                         if include_scheme:
-                            schemes.append(cls((cat, field, tradeoff, variant), *args, **kwargs))
+                            for piop in piops:
+                                schemes.append(cls((cat, field, tradeoff, variant), *args, piop=piop, **kwargs))
         return schemes
     
     @classmethod
@@ -332,113 +951,276 @@ class MQOMInstance:
                             scheme = cls((cat, field, tradeoff, variant), *args, **kwargs)
         return scheme
 
-def get_info(lines, regex_str):
-    import re
-    lines = lines if type(lines) is list else lines.split('\n')
-    regex = re.compile(regex_str)
-    for line in lines:
-        res = regex.fullmatch(line)
-        if res:
-            values = []
-            for v in res.groups():
-                if v is None:
-                    values.append('')
-                    continue
-                try:
-                    # Test if integer
-                    values.append(int(v))
-                except ValueError:
-                    try:
-                        # Test if decimal
-                        values.append(float(v))
-                    except ValueError:
-                        # So, it is a string
-                        values.append(v)
-            if len(values) == 1:
-                return values[0]
-            else:
-                return tuple(values)
-    raise ValueError('This regex does not match with any line.')
-
 import pathlib, os
 CWD = pathlib.Path(__file__).absolute().parent
 BUILD_PATH = CWD.joinpath('build')
 
 if arguments.command == 'compile':
-    import contextlib, atexit, tempfile, shutil
-
-    tempdir_names = []
-
-    def cleanup_stuff():
-        global tempdir_names
-        for t in tempdir_names:
-            shutil.rmtree(t, ignore_errors=True)
+    import hashlib, shlex, shutil, threading
 
     def signal_handler(sig, frame):
         print('You pressed Ctrl+C! Exiting')
-        cleanup_stuff()
-        sys.exit(0)
-
-    def copy_folder(src_path, dst_path, only_root=False):
-        for root, dirs, files in os.walk(src_path):
-            subpath = root[len(src_path)+1:]
-            root_created = False
-            for filename in files:
-                _, file_extension = os.path.splitext(filename)
-                if file_extension in ['.h', '.c', '.inc', '.macros', '.S'] or filename in ['Makefile', '.gitignore']:
-                    if not root_created:
-                        os.makedirs(os.path.join(dst_path, subpath),  exist_ok = True)
-                        root_created = True
-                    shutil.copyfile(
-                        os.path.join(src_path, subpath, filename),
-                        os.path.join(dst_path, subpath, filename)
-                    )
+        os._exit(1)
 
     # Register the signal handler
     signal.signal(signal.SIGINT, signal_handler)
 
-    # Register At exist handler
-    atexit.register(cleanup_stuff)
+    # Only print the compilation invocations
+    if arguments.b_compile_only_print:
+        for scheme in MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH, piops=arguments.piops):
+            if not arguments.b_no_bench:
+                scheme.compile_bench(CWD)
+                scheme.compile_bench_mem_keygen(CWD)
+                scheme.compile_bench_mem_sign(CWD)
+                scheme.compile_bench_mem_open(CWD)
+                scheme.compile_bench_throughput(CWD)
+            if not arguments.b_no_kat:
+                scheme.compile_kat_gen(CWD)
+                scheme.compile_kat_check(CWD)
+        sys.exit(0)
 
-    def handle_scheme_compile(scheme):
-        print(f'[+] {scheme.get_label()}')
-        scheme.clean()
-        tname = '/tmp/' + scheme.get_label()
-        tempdir_names.append(tname)
-        # Copy the source tree to the temporary folder
-        copy_folder(str(CWD), tname)
-        if not arguments.b_no_bench:
-            stdout, stderr = scheme.compile_bench(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-            stdout, stderr = scheme.compile_bench_mem_keygen(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-            stdout, stderr = scheme.compile_bench_mem_sign(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-            stdout, stderr = scheme.compile_bench_mem_open(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-        if not arguments.b_no_kat:
-            stdout, stderr = scheme.compile_kat_gen(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-            stdout, stderr = scheme.compile_kat_check(tname)
-            if arguments.b_verbose or stderr:
-                print(stdout, stderr)
-    # Register the signal handler
-    signal.signal(signal.SIGINT, signal_handler)
-    # Create build folder
-    BUILD_PATH.mkdir(parents=True, exist_ok=True) 
-    # Compile all the selected schemes
-    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH)
-    if arguments.parallel_jobs != 0:
-        from joblib import Parallel, delayed
-        results = Parallel(n_jobs=arguments.parallel_jobs, backend="threading")(map(delayed(handle_scheme_compile), schemes))
-    else:
-        for scheme in schemes:
-            handle_scheme_compile(scheme)
+    # The objects are compiled in place of the source tree (no copy), in a cache
+    # shared by all the schemes and all the invocations:
+    # - an object is stored under the digest of the compiler, of its code generation
+    #   flags and of its preprocessed source, so that the objects not depending
+    #   on the parameter set (Rijndael, Keccak wrappers, fields, ...) are built once
+    #   for all the schemes, and the unchanged objects are never rebuilt;
+    # - libhash is built once per compiler, platform and user flags;
+    # - the executables of a scheme are only linked again when one of their inputs
+    #   changed (see the .build_stamp file of the scheme folder).
+    CACHE_PATH = BUILD_PATH.joinpath('.cache')
+    OBJS_CACHE_PATH = CACHE_PATH.joinpath('objs')
+    LIBHASH_CACHE_PATH = CACHE_PATH.joinpath('libhash')
+    OBJS_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    LIBHASH_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+
+    targets = []
+    if not arguments.b_no_bench:
+        targets += ['bench', 'bench_mem_keygen', 'bench_mem_sign', 'bench_mem_open', 'bench_throughput']
+    if not arguments.b_no_kat:
+        targets += ['kat_gen', 'kat_check']
+    nb_jobs = os.cpu_count() if arguments.parallel_jobs < 0 else max(arguments.parallel_jobs, 1)
+    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH, piops=arguments.piops)
+    sources_digest = get_sources_digest()
+    lock = threading.Lock()
+    counters = {'compiled': 0, 'reused': 0, 'linked': 0, 'up_to_date': 0}
+
+    def log(message, stdout='', stderr=''):
+        with lock:
+            if message:
+                print(message)
+            if arguments.b_verbose and stdout:
+                print(stdout)
+            if stderr:
+                print(stderr)
+
+    def get_build_info(scheme):
+        make_prefix = scheme.get_make_prefix()
+        stdout, stderr = run_command(f'{make_prefix} make -s --no-print-directory print_build_info', CWD, shell=True)
+        info = {}
+        for line in stdout.splitlines():
+            key, _, value = line.partition('=')
+            info[key] = value.strip()
+        if 'OBJS' not in info:
+            log(f'[-] {scheme.get_label()}: cannot get the build configuration', stderr=stderr)
+            return None
+        return {
+            'cc': shlex.split(info['CC']),
+            'cflags': shlex.split(info['CFLAGS']),
+            'asmflags': shlex.split(info['ASMFLAGS']),
+            'objs': info['OBJS'].split(),
+            'keccak_platform': info['KECCAK_PLATFORM'],
+        }
+
+    # Collect the build configuration of all the schemes
+    build_infos = {}
+    def get_build_info_job(scheme):
+        build_infos[scheme.get_label()] = get_build_info(scheme)
+        return build_infos[scheme.get_label()] is not None
+    run_job_graph({scheme.get_label(): ((lambda scheme=scheme: get_build_info_job(scheme)), []) for scheme in schemes}, nb_jobs)
+
+    compiler_ids = {}
+    def get_compiler_id(cc):
+        key = ' '.join(cc)
+        with lock:
+            if key in compiler_ids:
+                return compiler_ids[key]
+        stdout, stderr = run_command(shlex.join(cc + ['-v']), CWD, shell=True)
+        compiler_ids[key] = f'{shutil.which(cc[0])}\n{stdout}{stderr}'
+        return compiler_ids[key]
+
+    def get_codegen_flags(flags):
+        # The macros and include paths only act through the preprocessed source
+        codegen_flags = []
+        skip = False
+        for flag in flags:
+            if skip:
+                skip = False
+            elif flag in ['-D', '-U', '-I']:
+                skip = True
+            elif flag[:2] not in ['-D', '-U', '-I']:
+                codegen_flags.append(flag)
+        return codegen_flags
+
+    # Objects being compiled by another job
+    in_flight = {}
+
+    def get_object_source(obj):
+        base, _ = os.path.splitext(obj)
+        for extension in ['.c', '.S', '.s']:
+            if os.path.exists(os.path.join(str(CWD), base + extension)):
+                return base + extension
+        return None
+
+    def compile_object(label, info, obj, digests):
+        src = get_object_source(obj)
+        if src is None:
+            log(f'[-] {label}: no source for {obj}')
+            return False
+        flags = info['cflags'] + (info['asmflags'] if not src.endswith('.c') else [])
+        # Digest of the object
+        digest = hashlib.sha256()
+        digest.update(get_compiler_id(info['cc']).encode())
+        digest.update(json.dumps(get_codegen_flags(flags)).encode())
+        digest.update(os.path.splitext(src)[1].encode())
+        if src.endswith('.s'):
+            with open(os.path.join(str(CWD), src), 'rb') as _file:
+                digest.update(_file.read())
+        else:
+            stdout, stderr = run_command(shlex.join(info['cc'] + flags + ['-E', src]), CWD, shell=True)
+            if not stdout:
+                log(f'[-] {label}: cannot preprocess {src}', stderr=stderr)
+                return False
+            digest.update(stdout.encode())
+        digest = digest.hexdigest()
+        digests[obj] = digest
+        cached_obj = OBJS_CACHE_PATH.joinpath(f'{digest}.o')
+        # Wait for the same object compiled by another job
+        with lock:
+            event = in_flight.get(digest)
+            owner = (event is None) and (not cached_obj.exists())
+            if owner:
+                in_flight[digest] = threading.Event()
+        if event is not None:
+            event.wait()
+        if not owner:
+            with lock:
+                counters['reused'] += 1
+            return cached_obj.exists()
+        tmp_obj = OBJS_CACHE_PATH.joinpath(f'{digest}.{os.getpid()}.{threading.get_ident()}.tmp.o')
+        try:
+            command = shlex.join(info['cc'] + flags + ['-c', '-o', str(tmp_obj), src])
+            stdout, stderr = run_command(command, CWD, shell=True)
+            log(f'    {command}' if arguments.b_verbose else '', stdout, stderr)
+            if not tmp_obj.exists():
+                log(f'[-] {label}: compilation of {src} failed')
+                return False
+            os.replace(str(tmp_obj), str(cached_obj))
+            with lock:
+                counters['compiled'] += 1
+        finally:
+            # Partial object of a failed compilation (already moved on success)
+            tmp_obj.unlink(missing_ok=True)
+            with lock:
+                in_flight.pop(digest).set()
+        return True
+
+    def get_libhash_key(scheme, info):
+        # The parameter set does not act on libhash
+        extra_cflags = [flag for flag in scheme.compilation_prefix['EXTRA_CFLAGS'].split() if '-DMQOM2_PARAM_' not in flag]
+        digest = hashlib.sha256()
+        digest.update(get_compiler_id(info['cc']).encode())
+        digest.update(json.dumps([info['keccak_platform'], extra_cflags]).encode())
+        for root, dirs, files in os.walk(str(CWD.joinpath('sha3'))):
+            dirs.sort()
+            for filename in sorted(files):
+                if is_source_file(filename):
+                    digest.update(os.path.relpath(os.path.join(root, filename), str(CWD)).encode())
+                    with open(os.path.join(root, filename), 'rb') as _file:
+                        digest.update(_file.read())
+        return digest.hexdigest(), ' '.join(extra_cflags)
+
+    def compile_libhash(info, key, extra_cflags):
+        libhash_path = LIBHASH_CACHE_PATH.joinpath(key)
+        if libhash_path.joinpath('libhash.a').exists():
+            return True
+        tmp_path = LIBHASH_CACHE_PATH.joinpath(f'{key}.{os.getpid()}.tmp')
+        shutil.rmtree(str(tmp_path), ignore_errors=True)
+        shutil.copytree(str(CWD.joinpath('sha3')), str(tmp_path), ignore=shutil.ignore_patterns('*.o', '*.a'))
+        cc = shlex.join(info['cc'])
+        command = f'CC="{cc}" KECCAK_PLATFORM="{info["keccak_platform"]}" EXTRA_CFLAGS="{extra_cflags}" make'
+        stdout, stderr = run_command(command, tmp_path, shell=True)
+        log(f'    {command}' if arguments.b_verbose else '', stdout, stderr)
+        if not tmp_path.joinpath('libhash.a').exists():
+            log('[-] Compilation of libhash failed')
+            shutil.rmtree(str(tmp_path), ignore_errors=True)
+            return False
+        shutil.rmtree(str(libhash_path), ignore_errors=True)
+        os.replace(str(tmp_path), str(libhash_path))
+        return True
+
+    def get_scheme_stamp(scheme, info, libhash_key):
+        # The sources digest covers all the inputs of the executables
+        label = scheme.get_label()
+        stamp = hashlib.sha256(json.dumps([
+            targets, get_compiler_id(info['cc']), info['cflags'], info['objs'], libhash_key, sources_digest,
+        ]).encode()).hexdigest()
+        stamp_path = scheme.dst_path.joinpath('.build_stamp')
+        executables = [scheme.dst_path.joinpath(f'{label}_{target}') for target in targets]
+        up_to_date = stamp_path.exists() and stamp_path.read_text() == stamp and all(e.exists() for e in executables)
+        return stamp, up_to_date
+
+    def link_scheme(scheme, info, digests, libhash_key, stamp):
+        label = scheme.get_label()
+        dst_path = scheme.dst_path
+        stamp_path = dst_path.joinpath('.build_stamp')
+        executables = [dst_path.joinpath(f'{label}_{target}') for target in targets]
+        if stamp_path.exists():
+            stamp_path.unlink()
+        objs = ' '.join(str(OBJS_CACHE_PATH.joinpath(f'{digests[obj]}.o')) for obj in info['objs'])
+        make_prefix = scheme.get_make_prefix()
+        libhash_path = LIBHASH_CACHE_PATH.joinpath(libhash_key)
+        command = f'{make_prefix} DESTINATION_PATH="{dst_path}" PREFIX_EXEC="{label}" make --no-print-directory {" ".join(targets)} OBJS="{objs}" LIB_HASH_DIR="{libhash_path}"'
+        stdout, stderr = run_command(command, CWD, shell=True)
+        log(f'[+] {label}', stdout, stderr)
+        if not all(e.exists() for e in executables):
+            log(f'[-] {label}: link failed')
+            return False
+        stamp_path.write_text(stamp)
+        with lock:
+            counters['linked'] += 1
+        return True
+
+    # Job graph: objects and libhash, then the executables of each scheme
+    jobs = {}
+    for scheme in schemes:
+        label = scheme.get_label()
+        info = build_infos[label]
+        if info is None:
+            continue
+        digests = {}
+        libhash_key, libhash_extra_cflags = get_libhash_key(scheme, info)
+        stamp, up_to_date = get_scheme_stamp(scheme, info, libhash_key)
+        if up_to_date:
+            print(f'[+] {label} (up to date)')
+            counters['up_to_date'] += 1
+            continue
+        if f'libhash_{libhash_key}' not in jobs:
+            jobs[f'libhash_{libhash_key}'] = ((lambda info=info, key=libhash_key, flags=libhash_extra_cflags: compile_libhash(info, key, flags)), [])
+        dependencies = [f'libhash_{libhash_key}']
+        for obj in info['objs']:
+            jobs[f'{label}:{obj}'] = ((lambda label=label, info=info, obj=obj, digests=digests: compile_object(label, info, obj, digests)), [])
+            dependencies.append(f'{label}:{obj}')
+        jobs[label] = ((lambda scheme=scheme, info=info, digests=digests, key=libhash_key, stamp=stamp: link_scheme(scheme, info, digests, key, stamp)), dependencies)
+    status = run_job_graph(jobs, nb_jobs)
+
+    failed = [label for label in jobs if label in build_infos and not status.get(label)]
+    failed += [label for label in build_infos if build_infos[label] is None]
+    print(f'[+] Objects: {counters["compiled"]} compiled, {counters["reused"]} reused from the cache')
+    print(f'[+] Schemes: {counters["linked"]} linked, {counters["up_to_date"]} up to date, {len(failed)} failed')
+    if failed:
+        print(f'[-] Failed: {" ".join(failed)}')
+        sys.exit(1)
 
 elif arguments.command == 'env':
     # Get the selected schemes
@@ -486,16 +1268,45 @@ elif arguments.command == 'bench':
 
     def handle_scheme_bench(scheme):
         print(f'[+] {scheme.get_label()}')
-        data = scheme.run_bench(nb_experiments)
-        assert data['correctness'] == nb_experiments, (data['correctness'], nb_experiments)
+        if bench_throughput:
+            data = scheme.run_bench_throughput(arguments.throughput_max_workers, arguments.throughput_duration, arguments.b_bench_expanded_key)
+        else:
+            # Take a free CPU of the pool for the time of the benchmark
+            cpu = cpus_pool.get() if cpus_pool is not None else None
+            try:
+                cpu_before = get_cpu_conditions(cpu) if cpu is not None else None
+                data = scheme.run_bench(nb_experiments, bench_options, {cpu} if cpu is not None else None)
+                cpu_after = get_cpu_conditions(cpu) if cpu is not None else None
+            finally:
+                if cpu is not None:
+                    cpus_pool.put(cpu)
+            assert data['correctness'] == data['nb_tests'], (data['correctness'], data['nb_tests'])
+            data['conditions'] = dict(bench_conditions, cpu=cpu, cpu_before=cpu_before, cpu_after=cpu_after)
+            if arguments.bench_target_ci is not None:
+                for algo, (low, high) in data['median_ci'].items():
+                    median = data['percentiles'][algo]['p50']
+                    if (high - low) > 2 * (arguments.bench_target_ci / 100.) * median:
+                        print(f'Warning: {scheme.get_label()}: the {algo} median is within [{low}, {high}] ms after {data["nb_tests"]} repetitions, above the +/-{arguments.bench_target_ci}% target')
         #assert data['debug'].lower() == 'off', data['debug']
         if bench_memory:
             data_mem = scheme.run_bench_memory()
             data['memory'] = {
-                'keygen':  max(data_mem['keygen'], key=lambda x: x['total'])['total'],
-                'sign':  max(data_mem['sign'], key=lambda x: x['total'])['total'],
-                'verif':  max(data_mem['open'], key=lambda x: x['total'])['total'],
+                'keygen':  data_mem['keygen']['total'],
+                'sign':  data_mem['sign']['total'],
+                'verif':  data_mem['open']['total'],
+            }
+            data['memory_details'] = {
+                'keygen':  data_mem['keygen'],
+                'sign':  data_mem['sign'],
+                'verif':  data_mem['open'],
             }
+            if bench_massif:
+                data_mem = scheme.run_bench_memory_massif()
+                data['memory_massif'] = {
+                    'keygen':  max(data_mem['keygen'], key=lambda x: x['total'])['total'],
+                    'sign':  max(data_mem['sign'], key=lambda x: x['total'])['total'],
+                    'verif':  max(data_mem['open'], key=lambda x: x['total'])['total'],
+                }
         with lock:
             if len(all_data) != 0:
                 stats_file.write(',')
@@ -504,19 +1315,70 @@ elif arguments.command == 'bench':
             stats_file.flush()
             os.fsync(stats_file)
             all_data.append(data)
+            if history is not None:
+                history_add_record(history, data, git_revision, host)
+            if 'perf' in data:
+                print(format_perf_report(data))
             
 
     # Register the signal handler
     signal.signal(signal.SIGINT, signal_handler)
 
     nb_experiments = arguments.nb_repetitions
-    bench_memory = arguments.b_bench_memory
-    print(f'Nb repetitions: {nb_experiments}')
-    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH)
+    # Benchmarking conditions: warmup, adaptive repetitions and CPU pinning
+    bench_options = ''
+    if arguments.bench_warmup > 0:
+        bench_options += f' --warmup {arguments.bench_warmup}'
+    if arguments.bench_target_ci is not None:
+        bench_options += f' --target-ci {arguments.bench_target_ci}'
+        if arguments.bench_max_repetitions is not None:
+            bench_options += f' --max-tests {arguments.bench_max_repetitions}'
+    bench_pin = arguments.b_bench_pin or arguments.b_bench_no_smt
+    cpus_pool = None
+    cpus = get_bench_cpus(arguments.b_bench_no_smt) if bench_pin else sorted(os.sched_getaffinity(0))
+    if bench_pin:
+        import queue
+        cpus_pool = queue.Queue()
+        for cpu in cpus:
+            cpus_pool.put(cpu)
+    bench_conditions = check_bench_conditions(cpus)
+    bench_conditions.update({
+        'warmup': arguments.bench_warmup,
+        'target_ci': arguments.bench_target_ci,
+        'max_repetitions': arguments.bench_max_repetitions,
+        'pinned': bench_pin,
+        'skip_smt_siblings': arguments.b_bench_no_smt,
+        'parallel_jobs': arguments.parallel_jobs,
+    })
+    for warning in bench_conditions['warnings']:
+        print(f'Warning: {warning}')
+    bench_memory = arguments.b_bench_memory or arguments.b_bench_massif
+    bench_massif = arguments.b_bench_massif
+    bench_throughput = arguments.b_bench_throughput
+    if bench_throughput:
+        print(f'Throughput: 1 to {arguments.throughput_max_workers} worker(s), {arguments.throughput_duration} s per phase')
+        if arguments.parallel_jobs != 0:
+            # The throughput workers already use all the cores
+            print('Warning: the schemes are benchmarked sequentially in throughput mode')
+            arguments.parallel_jobs = 0
+    else:
+        print(f'Nb repetitions: {nb_experiments}')
+    history = None
+    if arguments.b_bench_history is not None:
+        history = open_history(CWD.joinpath(arguments.b_bench_history))
+        git_revision = get_git_revision()
+        host = get_host()
+    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH, piops=arguments.piops)
     all_data = []
+    failed = []
     if arguments.parallel_jobs != 0:
-        from joblib import Parallel, delayed
-        results = Parallel(n_jobs=arguments.parallel_jobs, backend="threading")(map(delayed(handle_scheme_bench), schemes))
+        # The pinned benchmarks run on distinct CPUs: at most one job per CPU
+        nb_jobs = len(cpus) if arguments.parallel_jobs < 0 else arguments.parallel_jobs
+        if bench_pin and nb_jobs > len(cpus):
+            print(f'Warning: {nb_jobs} parallel jobs for {len(cpus)} CPUs, only {len(cpus)} are run at the same time')
+            nb_jobs = len(cpus)
+        status = run_job_graph({scheme.get_label(): ((lambda scheme=scheme: handle_scheme_bench(scheme) or True), []) for scheme in schemes}, nb_jobs)
+        failed = [label for label, ok in status.items() if not ok]
     else:
         for scheme in schemes:
             handle_scheme_bench(scheme)
@@ -527,14 +1389,486 @@ elif arguments.command == 'bench':
         print('Stats written in stats file %s' % stats_file_name.relative_to(CWD))
     except:
         pass
+    if history is not None:
+        history.close()
+        print('Stats appended to the history %s' % arguments.b_bench_history)
+    if failed:
+        print(f'[-] Failed: {" ".join(failed)}')
+        sys.exit(1)
 
-elif arguments.command == 'test':
-    import contextlib, atexit, tempfile, filecmp, shutil
+elif arguments.command == 'tune':
+    import hashlib, itertools, shutil
+    STATS_PATH = CWD.joinpath('stats')
+    STATS_PATH.mkdir(parents=True, exist_ok=True)
+    TUNE_PATH = BUILD_PATH.joinpath('tune')
+    TUNE_CACHE_PATH = STATS_PATH.joinpath('tune_cache.json')
 
-    KAT_Folder = None
-    tempdir_obj = None
-    tempdir_name = None
+    # The explored toggles: each knob is a list of alternative sets of Makefile
+    # variables, the first one being the default configuration
+    rijndael_choices = [{}, {'RIJNDAEL_AES_NI': '1'}, {'RIJNDAEL_BITSLICE': '1'}]
+    fields_choices = [{}, {'FIELDS_REF': '1'}, {'FIELDS_AVX2': '1'}, {'FIELDS_AVX512': '1'}]
+    if arguments.b_tune_non_ct:
+        # XXX: these are NOT constant time and are only explored on demand
+        rijndael_choices.append({'RIJNDAEL_TABLE': '1'})
+        fields_choices.append({'FIELDS_REF': '1', 'USE_GF256_TABLE_MULT': '1'})
+    knobs = [
+        ('prg_cache', [{}, {'NO_EXPANDMQ_PRG_CACHE': '1'}, {'NO_BLC_PRG_CACHE': '1'}, {'USE_PRG_CACHE': '0'}]),
+        ('rijndael_ctx', [{}, {'PRG_ONE_RIJNDAEL_CTX': '1'}, {'SEED_COMMIT_MEMOPT': '1'}, {'PRG_ONE_RIJNDAEL_CTX': '1', 'SEED_COMMIT_MEMOPT': '1'}]),
+        ('rijndael', rijndael_choices),
+        ('fields', fields_choices),
+        ('blc', [{}, {'MEMORY_EFFICIENT_BLC': '1', 'BLC_INTERNAL_X1': '1'}, {'MEMORY_EFFICIENT_BLC': '1', 'BLC_INTERNAL_X8': '1'}]),
+        ('piop', list(PIOP_IMPLEMENTATIONS.values())),
+    ]
+
+    def merge_choices(choices):
+        make_variables = {}
+        for choice in choices:
+            make_variables.update(choice)
+        return dict(sorted(make_variables.items()))
+
+    def recommended_extra_cflags(default_cflags, cflags):
+        # The defines added by the toggles, and the default ones they remove
+        # (EXTRA_CFLAGS comes last on the compilation command line)
+        added = [flag for flag in cflags if flag.startswith('-D') and flag not in default_cflags]
+        removed = ['-U' + flag[2:].split('=')[0] for flag in default_cflags if flag.startswith('-D') and flag not in cflags]
+        return ' '.join(added + removed)
+
+    host = get_host()
+    sources_digest = get_sources_digest()
+    # Measurements are cached by host, sources and effective compilation flags
+    tune_cache = {}
+    if (not arguments.b_tune_no_cache) and TUNE_CACHE_PATH.exists():
+        with open(TUNE_CACHE_PATH) as _file:
+            tune_cache = json.load(_file)
+
+    def save_cache():
+        with open(TUNE_CACHE_PATH, 'w') as _file:
+            json.dump(tune_cache, _file)
+
+    def signal_handler(sig, frame):
+        print('You pressed Ctrl+C! Exiting')
+        save_cache()
+        shutil.rmtree(TUNE_PATH, ignore_errors=True)
+        sys.exit(0)
+    signal.signal(signal.SIGINT, signal_handler)
+
+    nb_experiments = arguments.nb_repetitions
+    objective = arguments.tune_objective
+    print(f'Host: {host["cpu"]} ({host["compiler"]})')
+    print(f'Nb repetitions: {nb_experiments}, objective: {objective}')
+
+    def handle_scheme_tune(scheme_label):
+        print(f'[+] {scheme_label}')
+        tname = TUNE_PATH.joinpath(scheme_label, 'src')
+        shutil.rmtree(tname, ignore_errors=True)
+        copy_folder(str(CWD), str(tname))
+        default_cflags = None
+        points = {}
+
+        def measure(make_variables):
+            variant_id = hashlib.sha256(json.dumps(make_variables).encode()).hexdigest()[:12]
+            scheme = MQOMInstance.get_scheme(scheme_label, TUNE_PATH.joinpath(scheme_label, variant_id))
+            # The coarse default clock cannot discriminate the variants
+            scheme.compilation_prefix['EXTRA_CFLAGS'] += ' -DBENCHMARK_USE_GETTIMEOFDAY'
+            cflags = scheme.get_cflags(str(tname), make_variables)
+            key = hashlib.sha256(json.dumps([host, sources_digest, cflags]).encode()).hexdigest()
+            # Toggles sets yielding the same compilation flags are only measured once
+            if key in points:
+                return points[key]
+            if key in tune_cache:
+                point = tune_cache[key]
+                status = 'cached'
+            else:
+                point = {'cflags': cflags}
+                run_command('make clean', str(tname), shell=True)
+                _, stderr = scheme.compile_targets(str(tname), ['bench', 'bench_mem_keygen', 'bench_mem_sign', 'bench_mem_open'], make_variables)
+                if not os.path.exists(f'{scheme.dst_path}/{scheme_label}_bench'):
+                    # Pruned: this combination does not build on this host
+                    point['failed'] = True
+                    if arguments.b_verbose:
+                        print(stderr)
+                else:
+                    data = scheme.run_bench(nb_experiments)
+                    point['correctness'] = (data['correctness'] == nb_experiments)
+                    for algo in ['keygen', 'sign', 'verif']:
+                        point[algo] = data[algo][0]
+                    # Same metric as bench --memory: signing stack and heap peaks
+                    point['memory'] = scheme.run_bench_memory()['sign']['total']
+                    point['alloc_peak_usage'] = data.get('alloc_peak_usage')
+                    point['failed'] = not point['correctness']
+                shutil.rmtree(scheme.dst_path, ignore_errors=True)
+                tune_cache[key] = point
+                save_cache()
+                status = 'failed' if point['failed'] else 'measured'
+            point = dict(point, make_variables=make_variables)
+            points[key] = point
+            if point['failed']:
+                print(f' - {status:8} {make_variables}')
+            else:
+                print(f' - {status:8} {make_variables}: keygen {point["keygen"]:.3f} ms, sign {point["sign"]:.3f} ms, verif {point["verif"]:.3f} ms, memory {point["memory"]} B')
+            return point
+
+        def score(point):
+            if point['failed']:
+                return float('inf')
+            if (arguments.tune_max_memory is not None) and (point['memory'] > arguments.tune_max_memory):
+                return float('inf')
+            return point[objective]
+
+        default_point = measure({})
+        default_cflags = default_point['cflags']
+        if arguments.b_tune_exhaustive:
+            for choices in itertools.product(*[values for _, values in knobs]):
+                measure(merge_choices(choices))
+        else:
+            # Greedy search: each knob in turn, keeping the best choice of the
+            # previous ones
+            current = [values[0] for _, values in knobs]
+            for i, (_, values) in enumerate(knobs):
+                best = None
+                for value in values:
+                    candidate = current[:i] + [value] + current[i+1:]
+                    point = measure(merge_choices(candidate))
+                    if (best is None) or (score(point) < best[0]):
+                        best = (score(point), value)
+                current[i] = best[1]
+
+        valid = [point for point in points.values() if not point['failed']]
+        front = pareto_front(valid, ['sign', 'memory'])
+        candidates = [point for point in valid if score(point) != float('inf')]
+        recommended = min(candidates, key=score) if candidates else None
+        print(' => Pareto front (sign time / peak memory):')
+        for point in front:
+            print(f'    {point["sign"]:.3f} ms, {point["memory"]} B: {point["make_variables"]}')
+        result = {
+            'path': scheme_label,
+            'points': valid,
+            'pruned': [point['make_variables'] for point in points.values() if point['failed']],
+            'pareto': front,
+            'recommended': None,
+        }
+        if recommended is not None:
+            extra_cflags = recommended_extra_cflags(default_cflags, recommended['cflags'])
+            result['recommended'] = dict(recommended, extra_cflags=extra_cflags)
+            print(f' => Recommended ({objective}): EXTRA_CFLAGS="{extra_cflags}"')
+            print(f'    (i.e. the Makefile toggles {recommended["make_variables"]})')
+        else:
+            print(' => No configuration fulfills the constraints')
+        shutil.rmtree(tname, ignore_errors=True)
+        return result
+
+    schemes = [scheme.get_label() for scheme in MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH)]
+    results = {
+        'host': host,
+        'sources': sources_digest,
+        'objective': objective,
+        'max_memory': arguments.tune_max_memory,
+        'timestamp': time.time(),
+        'schemes': [handle_scheme_tune(scheme_label) for scheme_label in schemes],
+    }
+    save_cache()
+    shutil.rmtree(TUNE_PATH, ignore_errors=True)
+
+    if arguments.b_tune_file_name is not None:
+        tune_file_name = pathlib.Path(arguments.b_tune_file_name)
+    else:
+        tune_file_name = STATS_PATH.joinpath('tune_%s.json' % time.strftime("%Y%m%d_%H%M%S"))
+    with open(tune_file_name, 'w') as _file:
+        json.dump(results, _file)
+    print('Tuning results written in %s' % tune_file_name)
 
+elif arguments.command == 'compare':
+    def load_stats(file_name):
+        try:
+            with open(file_name, 'r') as _file:
+                records = json.load(_file)
+        except (OSError, ValueError) as exception:
+            print(f'Error: cannot read the stats file {file_name} ({exception})')
+            sys.exit(-1)
+        indexed = {}
+        for record in records:
+            label = record.get('path', record.get('name'))
+            if label in indexed:
+                print(f'Warning: several records for {label} in {file_name}, the last one is used')
+            indexed[label] = record
+        return indexed
+
+    baseline = load_stats(arguments.baseline)
+    candidate = load_stats(arguments.candidate)
+    threshold = arguments.compare_threshold / 100.
+    alpha = arguments.compare_alpha
+    print(f'Threshold: {arguments.compare_threshold}%, confidence: {100 * (1 - alpha):g}%')
+
+    report = {'baseline': arguments.baseline, 'candidate': arguments.candidate, 'threshold': threshold, 'alpha': alpha, 'schemes': {}}
+    regressions = []
+    for label in baseline:
+        if label not in candidate:
+            print(f'Warning: {label} is missing from {arguments.candidate}')
+            continue
+        print(f'[+] {label}')
+        metrics_b = get_record_metrics(baseline[label])
+        metrics_c = get_record_metrics(candidate[label])
+        rows = {}
+        for metric, (summary_b, lower_is_better, exact) in metrics_b.items():
+            if metric not in metrics_c:
+                continue
+            summary_c = metrics_c[metric][0]
+            result = welch_compare(summary_b, summary_c, alpha)
+            if result is None:
+                continue
+            worse = result['change'] if lower_is_better else -result['change']
+            # Without any dispersion information, only the exact metrics are tested
+            significant = exact or (result['p_value'] is not None and result['p_value'] < alpha)
+            if significant and worse > threshold:
+                status = 'regression'
+                regressions.append((label, metric))
+            elif significant and worse < -threshold:
+                status = 'improvement'
+            else:
+                status = ''
+            rows[metric] = dict(result, baseline=summary_b['mean'], candidate=summary_c['mean'], status=status)
+            if status or arguments.b_compare_all:
+                ci = '[%+7.2f%%, %+7.2f%%]' % (100 * result['ci'][0], 100 * result['ci'][1]) if result['ci'] is not None else ' ' * 20
+                p_value = 'p=%.4f' % result['p_value'] if result['p_value'] is not None else ' ' * 8
+                print(' - %-40s %14.3f -> %14.3f  %+7.2f%% %s %s %s' % (metric, summary_b['mean'], summary_c['mean'], 100 * result['change'], ci, p_value, status.upper()))
+        report['schemes'][label] = rows
+    for label in candidate:
+        if label not in baseline:
+            print(f'Warning: {label} is missing from {arguments.baseline}')
+    report['regressions'] = [f'{label}:{metric}' for label, metric in regressions]
+
+    if arguments.b_compare_file_name is not None:
+        with open(arguments.b_compare_file_name, 'w') as _file:
+            json.dump(report, _file, indent=2)
+    if regressions:
+        print(f'[-] {len(regressions)} significant regression(s) beyond {arguments.compare_threshold}%:')
+        for label, metric in regressions:
+            print(f'    {label}: {metric}')
+        sys.exit(1)
+    print('[+] No significant regression')
+
+elif arguments.command == 'report':
+    import csv, html, statistics
+    history = open_history(CWD.joinpath(arguments.report_history))
+
+    # Import json benchmarking files (the runs already in the history are skipped)
+    for file_name in arguments.report_import:
+        try:
+            with open(file_name, 'r') as _file:
+                records = json.load(_file)
+        except (OSError, ValueError) as exception:
+            print(f'Error: cannot read the stats file {file_name} ({exception})')
+            sys.exit(-1)
+        nb_imported = 0
+        for record in records:
+            label = record.get('path', record.get('name'))
+            if history.execute('SELECT 1 FROM runs WHERE scheme = ? AND timestamp = ?', (label, record.get('timestamp'))).fetchone() is None:
+                history_add_record(history, record, None, None)
+                nb_imported += 1
+        print(f'[+] {file_name}: {nb_imported} run(s) imported')
+
+    def is_selected(label):
+        if not arguments.schemes or 'all' in arguments.schemes:
+            return True
+        return any(label == prefix or label.startswith(prefix + '_') for prefix in arguments.schemes)
+
+    # Series of runs of the same scheme in the same configuration
+    series = {}
+    for run in history.execute('SELECT id, timestamp, scheme, git_revision, host, compiler, instruction_sets, compilation FROM runs ORDER BY timestamp'):
+        (run_id, timestamp, label, git_revision, host, compiler, instruction_sets, compilation) = run
+        if not is_selected(label):
+            continue
+        key = (label, host or '', compiler or '', instruction_sets or '', compilation or '')
+        series.setdefault(key, []).append({'id': run_id, 'timestamp': timestamp, 'git_revision': git_revision, 'metrics': {}})
+    runs_by_id = {run['id']: run for runs in series.values() for run in runs}
+    for (run_id, metric, value, std, n) in history.execute('SELECT run_id, metric, value, std, n FROM metrics'):
+        if run_id in runs_by_id:
+            runs_by_id[run_id]['metrics'][metric] = (value, std, n)
+    history.close()
+    if not series:
+        print('Error: no run in the history %s' % arguments.report_history)
+        sys.exit(-1)
+
+    # Drift of the last run of each series: relative change with respect to the
+    # median of the previous runs of the window, beyond the threshold and beyond
+    # the noise (3 scaled median absolute deviations of the window, and twice the
+    # standard error of the last run)
+    threshold = arguments.report_threshold / 100.
+    def get_trend(values, lower_is_better, last_std_error):
+        trend = {'last': values[-1], 'median': None, 'change': None, 'status': ''}
+        previous = values[-1-arguments.report_window:-1]
+        if len(previous) < 2:
+            return trend
+        median = statistics.median(previous)
+        trend['median'] = median
+        if median == 0:
+            return trend
+        trend['change'] = (values[-1] - median) / median
+        noise = max(3 * 1.4826 * statistics.median(abs(value - median) for value in previous), 2 * last_std_error)
+        worse = trend['change'] if lower_is_better else -trend['change']
+        if abs(values[-1] - median) > noise and abs(worse) > threshold:
+            trend['status'] = 'regression' if worse > 0 else 'improvement'
+        return trend
+
+    def date(timestamp):
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+    trends = {}
+    drifts = []
+    for key, runs in series.items():
+        metric_names = sorted(set(metric for run in runs for metric in run['metrics']))
+        trends[key] = {}
+        for metric in metric_names:
+            points = [(run, run['metrics'][metric][0]) for run in runs if metric in run['metrics']]
+            (_, std, n) = runs[-1]['metrics'].get(metric, (None, None, None))
+            last_std_error = std / n ** 0.5 if (std is not None and n) else 0.
+            trend = get_trend([value for _, value in points], not metric.startswith('throughput_'), last_std_error)
+            trend['points'] = points
+            trends[key][metric] = trend
+            if trend['status']:
+                drifts.append((key, metric, trend))
+
+    output_path = CWD.joinpath(arguments.report_output)
+    output_path.mkdir(parents=True, exist_ok=True)
+    if 'csv' in arguments.report_formats:
+        with open(output_path.joinpath('history.csv'), 'w', newline='') as _file:
+            writer = csv.writer(_file)
+            writer.writerow(['date', 'scheme', 'git_revision', 'host', 'compiler', 'instruction_sets', 'compilation', 'metric', 'value', 'std'])
+            for key, runs in series.items():
+                for run in runs:
+                    for metric, (value, std, _) in sorted(run['metrics'].items()):
+                        writer.writerow([date(run['timestamp']), key[0], run['git_revision'] or '', *key[1:], metric, value, '' if std is None else std])
+        with open(output_path.joinpath('drifts.csv'), 'w', newline='') as _file:
+            writer = csv.writer(_file)
+            writer.writerow(['scheme', 'host', 'compiler', 'instruction_sets', 'compilation', 'metric', 'status', 'last', 'median', 'change'])
+            for key, metric, trend in drifts:
+                writer.writerow([*key, metric, trend['status'], trend['last'], trend['median'], trend['change']])
+    if 'html' in arguments.report_formats:
+        def sparkline(values, width=160, height=28):
+            low, high = min(values), max(values)
+            scale = (high - low) if high > low else 1.
+            step = width / max(len(values) - 1, 1)
+            points = ' '.join('%.1f,%.1f' % (i * step, height - 2 - (value - low) / scale * (height - 4)) for i, value in enumerate(values))
+            return f'<svg width="{width}" height="{height}"><polyline fill="none" stroke="#36c" stroke-width="1.5" points="{points}"/></svg>'
+
+        def trend_row(metric, trend):
+            change = '%+.2f%%' % (100 * trend['change']) if trend['change'] is not None else ''
+            median = '%.6g' % trend['median'] if trend['median'] is not None else ''
+            revisions = ', '.join(sorted(set((run['git_revision'] or '?')[:12] for run, _ in trend['points'])))
+            return (f'<tr class="{trend["status"]}"><td>{html.escape(metric)}</td><td>{len(trend["points"])}</td>'
+                    f'<td>{sparkline([value for _, value in trend["points"]])}</td><td>{trend["last"]:.6g}</td><td>{median}</td>'
+                    f'<td>{change}</td><td>{trend["status"].upper()}</td><td title="{html.escape(revisions)}">{date(trend["points"][-1][0]["timestamp"])}</td></tr>')
+
+        header = '<tr><th>Metric</th><th>Runs</th><th>Trend</th><th>Last</th><th>Median (window)</th><th>Change</th><th>Drift</th><th>Last run</th></tr>'
+        lines = [
+            '<!DOCTYPE html>', '<html><head><meta charset="utf-8"><title>MQOM benchmark history</title>',
+            '<style>body{font-family:sans-serif;font-size:13px} table{border-collapse:collapse;margin-bottom:1em} td,th{border:1px solid #ccc;padding:2px 6px} tr.regression{background:#fdd} tr.improvement{background:#dfd} .context{color:#555}</style>',
+            '</head><body>', '<h1>MQOM benchmark history</h1>',
+            f'<p>{len(runs_by_id)} run(s), {len(series)} configuration(s). The last run of each configuration is compared to the median of the {arguments.report_window} previous ones (drift threshold: {arguments.report_threshold}%).</p>',
+            f'<h2>Drifts ({len(drifts)})</h2>', '<table>', '<tr><th>Scheme</th><th>Metric</th><th>Drift</th><th>Median (window)</th><th>Last</th><th>Change</th></tr>',
+        ]
+        for key, metric, trend in drifts:
+            lines.append(f'<tr class="{trend["status"]}"><td>{html.escape(key[0])}</td><td>{html.escape(metric)}</td><td>{trend["status"].upper()}</td><td>{trend["median"]:.6g}</td><td>{trend["last"]:.6g}</td><td>{100 * trend["change"]:+.2f}%</td></tr>')
+        lines.append('</table>')
+        for key in sorted(series):
+            (label, host, compiler, instruction_sets, compilation) = key
+            lines.append(f'<h2>{html.escape(label)}</h2>')
+            lines.append(f'<p class="context">{html.escape(host)} &mdash; {html.escape(compiler)}<br>{html.escape(instruction_sets)}<br>{html.escape(compilation)}</p>')
+            main = [metric for metric in trends[key] if not metric.startswith('detailed_')]
+            detailed = [metric for metric in trends[key] if metric.startswith('detailed_')]
+            lines += ['<table>', header] + [trend_row(metric, trends[key][metric]) for metric in main] + ['</table>']
+            if detailed:
+                lines += ['<details><summary>Detailed sub-timers</summary><table>', header]
+                lines += [trend_row(metric, trends[key][metric]) for metric in detailed] + ['</table></details>']
+        lines.append('</body></html>')
+        with open(output_path.joinpath('index.html'), 'w') as _file:
+            _file.write('\n'.join(lines))
+
+    for key, metric, trend in drifts:
+        print(' - %s: %s %s (%+.2f%% from the median of the window)' % (key[0], metric, trend['status'].upper(), 100 * trend['change']))
+    print(f'[+] {len(series)} configuration(s), {len(drifts)} drift(s), report written in {output_path.relative_to(CWD) if output_path.is_relative_to(CWD) else output_path}')
+
+elif arguments.command == 'fields':
+    import csv
+    records = []
+    for file_name in arguments.stats:
+        try:
+            with open(file_name, 'r') as _file:
+                records += json.load(_file)
+        except (OSError, ValueError) as exception:
+            print(f'Error: cannot read the stats file {file_name} ({exception})')
+            sys.exit(-1)
+
+    # The schemes only differing by their base field: same category, trade-off,
+    # variant and PIOP implementation
+    groups = {}
+    for record in records:
+        if 'sign' not in record:
+            # Throughput records
+            continue
+        parts = record.get('path', '').split('_')
+        if len(parts) < 4 or parts[1] not in BASE_FIELDS:
+            print(f'Warning: cannot identify the scheme of the record {record.get("path")}')
+            continue
+        (cat, field, tradeoff, variant) = parts[:4]
+        piop = record.get('piop', parts[4] if len(parts) > 4 else 'default')
+        group = groups.setdefault((cat, tradeoff, variant, piop), {})
+        if field in group:
+            print(f'Warning: several records for {record["path"]}, the last one is used')
+        group[field] = record
+    if not groups:
+        print('Error: no latency benchmark record in %s' % ' '.join(arguments.stats))
+        sys.exit(-1)
+
+    # Fields on the Pareto front of the timing objective and of the signature size
+    objective = arguments.fields_objective
+    print(f'Objective: {objective} time / signature size')
+    rows = []
+    on_front = {field: 0 for field in BASE_FIELDS}
+    def group_order(key):
+        (cat, tradeoff, variant, piop) = key
+        return (list(CATEGORIES).index(cat), list(TRADE_OFFS).index(tradeoff), list(VARIANTS).index(variant), list(PIOP_IMPLEMENTATIONS).index(piop) if piop in PIOP_IMPLEMENTATIONS else len(PIOP_IMPLEMENTATIONS))
+    for key in sorted(groups, key=group_order):
+        (cat, tradeoff, variant, piop) = key
+        points = []
+        for field in BASE_FIELDS:
+            if field not in groups[key]:
+                continue
+            record = groups[key][field]
+            points.append({
+                'field': field,
+                'keygen': record['keygen'][0],
+                'sign': record['sign'][0],
+                'verif': record['verif'][0],
+                'pk_size': record['pk_size'],
+                'sig_size': record['sig_size_max'],
+                'memory': record.get('memory', {}).get('sign', record.get('alloc_peak_usage')),
+            })
+        front = pareto_front(points, [objective, 'sig_size'])
+        best_time = min(point[objective] for point in points)
+        best_size = min(point['sig_size'] for point in points)
+        print(f'[+] {cat}_{tradeoff}_{variant} (PIOP {piop})')
+        print('    %-6s %10s %10s %10s %8s %8s %12s %9s %9s' % ('field', 'keygen ms', 'sign ms', 'verif ms', 'pk B', 'sig B', 'memory B', objective + ' x', 'size x'))
+        for point in points:
+            pareto = any(point is other for other in front)
+            if pareto:
+                on_front[point['field']] += 1
+            memory = '%12d' % point['memory'] if point['memory'] is not None else '%12s' % 'n/a'
+            print('    %-6s %10.3f %10.3f %10.3f %8d %8d %s %9.2f %9.2f %s' % (
+                point['field'], point['keygen'], point['sign'], point['verif'], point['pk_size'], point['sig_size'], memory,
+                point[objective] / best_time if best_time > 0 else 1., point['sig_size'] / best_size, 'PARETO' if pareto else ''))
+            rows.append([cat, tradeoff, variant, piop, point['field'], point['keygen'], point['sign'], point['verif'],
+                         point['pk_size'], point['sig_size'], '' if point['memory'] is None else point['memory'], int(pareto)])
+    print('[+] Number of configurations where each field is on the Pareto front: %s' % ', '.join(f'{field} {count}' for field, count in on_front.items()))
+
+    if arguments.b_fields_file_name is not None:
+        with open(arguments.b_fields_file_name, 'w', newline='') as _file:
+            writer = csv.writer(_file)
+            writer.writerow(['category', 'tradeoff', 'variant', 'piop', 'field', 'keygen_ms', 'sign_ms', 'verif_ms', 'pk_size', 'sig_size_max', 'memory_sign', 'pareto'])
+            writer.writerows(rows)
+        print('Comparison written in %s' % arguments.b_fields_file_name)
+
+elif arguments.command == 'test':
     # Override build folder if asked to
     if arguments.b_test_build_folder_name is not None:
         BUILD_PATH = CWD.joinpath(arguments.b_test_build_folder_name)
@@ -546,76 +1880,62 @@ elif arguments.command == 'test':
         print('You pressed Ctrl+C! Exiting')
         sys.exit(0)
 
-    @contextlib.contextmanager
-    def cd(newdir, cleanup=lambda: True):
-        prevdir = os.getcwd()
-        os.chdir(os.path.expanduser(newdir))
-        try:
-            yield
-        finally:
-            os.chdir(prevdir)
-            cleanup()
-
-    @contextlib.contextmanager
-    def tempdir():
-        dirpath = tempfile.mkdtemp()
-        def cleanup():
-            shutil.rmtree(dirpath)
-        with cd(dirpath, cleanup):
-            yield dirpath
-
-    def cleanup_stuff():
-        global tempdir_name
-        if tempdir_name is not None:
-            shutil.rmtree(tempdir_name)
-            tempdir_name = None
-
     # Register the signal handler
     signal.signal(signal.SIGINT, signal_handler)
 
-    # Register At exit handler
-    atexit.register(cleanup_stuff)
-
-    compare_kat_zip = False
-    if arguments.compare_kat != None:
-        # Is it a zip file or a folder?
-        if ".zip" in arguments.compare_kat:
-            import zipfile, re
+    # Reference KAT: the SHA-256 digests of a kats.json file (by default the
+    # one of the liboqs integration), or the .rsp files of a KAT folder or of
+    # a submission package ZIP file (streamed from the archive, not extracted)
+    kat_reference = arguments.compare_kat
+    if kat_reference is None:
+        kat_reference = str(CWD.joinpath('integration', 'liboqs', 'kats.json'))
+    kat_reference_digests = None
+    kat_reference_zip = None
+    if kat_reference.endswith('.json'):
+        try:
+            with open(kat_reference) as _file:
+                text = _file.read()
             try:
-                zf = zipfile.ZipFile(arguments.compare_kat)
-                tempdir_obj = tempdir()
-                tempdir_name = str(tempdir_obj)
-                zf.extractall(tempdir_name)
-            except:
-                print("Error: cannot handle provided ZIP package %s" % arguments.compare_kat)
-                sys.exit(-1)
-            # The uncompressed folder should contain a KAT folder, find it
-            subm_pack = None
-            for root, dirs, files in os.walk(tempdir_name):
-                for d in dirs:
-                    subm_pack = re.search(r'submission_package_v2.*', d)
-                    print(d)
-                    if subm_pack is not None:
-                        subm_pack = subm_pack[0]
-                        break
-                if subm_pack is not None:
-                    break
-            if subm_pack is None:
-                print("Error: cannot find submission package in provided ZIP package %s" % arguments.compare_kat)
-                sys.exit(-1)
-            KAT_Folder = tempdir_name + '/' + subm_pack + "/KAT"
-            print(KAT_Folder)
-            if not os.path.isdir(KAT_Folder):
-                print("Error: no KAT folder in the uncompressed ZIP package %s" % arguments.compare_kat)
-                sys.exit(-1)
-            print("[+] KAT folder found in the provided ZIP package %s" % arguments.compare_kat)
-            compare_kat_zip = True
+                kat_reference_digests = json.loads(text)
+            except ValueError:
+                # The entries of the integration are to be inserted in the
+                # kats.json of liboqs: no braces and a trailing comma
+                kat_reference_digests = json.loads('{' + text.strip().rstrip(',') + '}')
+        except (OSError, ValueError):
+            print("Error: cannot read the KAT digests %s" % kat_reference)
+            sys.exit(-1)
+    elif kat_reference.endswith('.zip'):
+        import zipfile
+        try:
+            kat_reference_zip = zipfile.ZipFile(kat_reference)
+        except (OSError, zipfile.BadZipFile):
+            print("Error: cannot handle provided ZIP package %s" % kat_reference)
+            sys.exit(-1)
+    elif not os.path.isdir(kat_reference):
+        print("Error: KAT folder %s does not exist" % kat_reference)
+        sys.exit(-1)
+
+    def get_reference_kat_digests(scheme_label, sk_size):
+        names = [f'mqom2_{scheme_label}', scheme_label]
+        file_rsp = f'PQCsignKAT_{sk_size}.rsp'
+        if kat_reference_digests is not None:
+            for name in names:
+                if name in kat_reference_digests:
+                    return {key: value for key, value in kat_reference_digests[name].items() if key in ['all', 'single']}
+        elif kat_reference_zip is not None:
+            # <submission package>/KAT/<scheme>/<rsp file>
+            for member in kat_reference_zip.namelist():
+                parts = member.split('/')
+                if len(parts) >= 3 and parts[-1] == file_rsp and parts[-2] in names and parts[-3] == 'KAT':
+                    with kat_reference_zip.open(member) as _file:
+                        return {'file': get_file_digest(_file)}
         else:
-            # See if the folder exists
-            if not os.path.isdir(arguments.compare_kat):
-                print("Error: KAT folder %s does not exist" % arguments.compare_kat)
-                sys.exit(-1)
-            KAT_Folder = arguments.compare_kat
+            for name in names:
+                path = os.path.join(kat_reference, name, file_rsp)
+                if os.path.exists(path):
+                    with open(path, 'rb') as _file:
+                        return {'file': get_file_digest(_file)}
+        return None
 
     def handle_scheme_test(scheme):
         print(f'[+] {scheme.get_label()}')
@@ -624,16 +1944,12 @@ elif arguments.command == 'test':
         assert data['correctness'] == nb_experiments, (data['correctness'], nb_experiments)
         if arguments.b_verbose:
             print(data)
-        # Generate KAT
-        stdout, stderr = scheme.run_kat_gen()
+        # Generate KAT (sharded), the digests being computed while merging
+        stdout, stderr, digests = scheme.run_kat_gen(data['sk_size'], arguments.kat_shards)
         assert (not stderr), stderr
         if arguments.b_verbose:
             print(stdout)
-        file_req = 'PQCsignKAT_{}.req'.format(data['sk_size'])
-        file_rsp = 'PQCsignKAT_{}.rsp'.format(data['sk_size'])
-        has_file_req = os.path.exists(os.path.join(scheme.dst_path, file_req))
-        has_file_rsp = os.path.exists(os.path.join(scheme.dst_path, file_rsp))
-        if has_file_req and has_file_rsp:
+        if digests is not None:
             print(' - KAT generation: ok (for %s)' % scheme.get_label())
         else:
             print(' - KAT generation: ERROR! (for %s)' % scheme.get_label())
@@ -646,33 +1962,36 @@ elif arguments.command == 'test':
                 print(stdout)
             assert ('Everything is fine!' in stdout), stdout
             print(' - KAT check: ok (for %s)' % scheme.get_label())
-        # Compare the KAT with an existing reference one?
-        if KAT_Folder is not None:
-            # Check that we indeed have the KAT for the tested scheme
-            if compare_kat_zip:
-                scheme_name = 'mqom2_%s' % scheme.get_label()
-            else:
-                scheme_name = '%s' % scheme.get_label()
-                CHECK_KAT_file_name_scheme = KAT_Folder + "/" + scheme_name + "/" + "PQCsignKAT_" + str(data['sk_size']) + ".rsp"
-                if not os.path.exists(CHECK_KAT_file_name_scheme):
-                    scheme_name = 'mqom2_%s' % scheme.get_label()
-            # Check that our KAT files exist
-            KAT_file_name_scheme = KAT_Folder + "/" + scheme_name + "/" + "PQCsignKAT_" + str(data['sk_size']) + ".rsp"
-            KAT_file_name_scheme_generated = str(scheme.dst_path) + "/" + "PQCsignKAT_" + str(data['sk_size']) + ".rsp"
-            if not os.path.exists(KAT_file_name_scheme):
-                print("Error: KAT file %s not found ..." % KAT_file_name_scheme)
-                sys.exit(-1)
-            # Now make a bin diff between the two files
-            if filecmp.cmp(KAT_file_name_scheme, KAT_file_name_scheme_generated) is True:
-                print(' - KAT check with reference KAT: ok (for %s)' % scheme.get_label())
-            else:
-                print(' - KAT check with reference KAT: ERROR! (for %s)' % KAT_file_name_scheme_generated)
+        # The PIOP implementations of a scheme must produce the same KAT
+        with kat_lock:
+            other = kat_digests.setdefault(scheme.get_scheme_label(), (scheme.piop, digests['rsp']['file']))
+        if other[1] != digests['rsp']['file']:
+            print(' - KAT consistency with the %s PIOP: ERROR! (for %s)' % (other[0], scheme.get_label()))
+            sys.exit(-1)
+        elif other[0] != scheme.piop:
+            print(' - KAT consistency with the %s PIOP: ok (for %s)' % (other[0], scheme.get_label()))
+        # Compare the KAT digests with the reference ones
+        reference = get_reference_kat_digests(scheme.get_scheme_label(), data['sk_size'])
+        if reference is None:
+            if arguments.compare_kat is not None:
+                print("Error: no reference KAT for %s in %s ..." % (scheme.get_scheme_label(), kat_reference))
                 sys.exit(-1)
+            print(' - KAT check with reference KAT: skipped (no reference for %s)' % scheme.get_scheme_label())
+        elif all(digests['rsp'][key] == value for key, value in reference.items()):
+            print(' - KAT check with reference KAT: ok (for %s)' % scheme.get_label())
+        else:
+            mismatches = ', '.join(key for key, value in reference.items() if digests['rsp'][key] != value)
+            print(' - KAT check with reference KAT: ERROR! (for %s, %s digest)' % (scheme.get_label(), mismatches))
+            sys.exit(-1)
         if not arguments.b_no_valgrind:
             summary = scheme.run_valgrind_bench()
             print(f' - Valgrind: "{summary}" (for %s)' % scheme.get_label())
 
-    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH)
+    # KAT digests of the first tested PIOP implementation of each scheme
+    import threading
+    kat_lock = threading.Lock()
+    kat_digests = {}
+    schemes = MQOMInstance.get_schemes(arguments.schemes, BUILD_PATH, piops=arguments.piops)
     if arguments.parallel_jobs != 0:
         from joblib import Parallel, delayed
         results = Parallel(n_jobs=arguments.parallel_jobs, backend="threading")(map(delayed(handle_scheme_test), schemes))
@@ -0,0 +1,59 @@
+#include "multiparam.h"
+
+#include <string.h>
+
+/* The compiled parameter sets are provided by the Makefile as a list of
+ * MULTIPARAM_PARAM_SET(<name>) */
+#if !defined(MULTIPARAM_PARAM_SETS)
+#error "The multi-parameter library needs at least one parameter set"
+#endif
+
+typedef struct {
+	const char *name;
+	const multiparam_scheme_t *scheme;
+} multiparam_param_set_t;
+
+/* Declare the function table entry of each parameter set */
+#define MULTIPARAM_PARAM_SET(n) extern const multiparam_scheme_t mqom2_##n##_multiparam_entry;
+MULTIPARAM_PARAM_SETS
+#undef MULTIPARAM_PARAM_SET
+
+#define MULTIPARAM_PARAM_SET(n) { #n, &mqom2_##n##_multiparam_entry },
+static const multiparam_param_set_t param_sets[] = {
+	MULTIPARAM_PARAM_SETS
+};
+#undef MULTIPARAM_PARAM_SET
+
+/* Compare a parameter set name with the dashes of MQOM2_VARIANT taken as underscores */
+static int multiparam_name_match(const char *name, const char *ref) {
+	for (; (*name != '\0') && (*ref != '\0'); name++, ref++) {
+		if ((*name != *ref) && !((*name == '-') && (*ref == '_'))) {
+			return 0;
+		}
+	}
+
+	return (*name == '\0') && (*ref == '\0');
+}
+
+const multiparam_scheme_t *crypto_sign_multiparam_lookup(const char *name) {
+	uint32_t i;
+
+	if (name == NULL) {
+		return NULL;
+	}
+	for (i = 0; i < sizeof(param_sets) / sizeof(param_sets[0]); i++) {
+		if (multiparam_name_match(name, param_sets[i].name)) {
+			return param_sets[i].scheme;
+		}
+	}
+
+	return NULL;
+}
+
+const char *crypto_sign_multiparam_name(unsigned int i) {
+	if (i >= sizeof(param_sets) / sizeof(param_sets[0])) {
+		return NULL;
+	}
+
+	return param_sets[i].name;
+}
@@ -0,0 +1,63 @@
+#ifndef __MULTIPARAM_H__
+#define __MULTIPARAM_H__
+
+#include "common.h"
+
+#if defined(MQOM2_FOR_MUPQ) || defined(MQOM2_FOR_LIBOQS)
+#error "The multi-parameter library only exposes the native API"
+#endif
+
+/* Deal with namespacing */
+#define crypto_sign_multiparam_lookup MQOM_PUBLIC_API_NAMESPACE(crypto_sign_multiparam_lookup)
+#define crypto_sign_multiparam_name MQOM_PUBLIC_API_NAMESPACE(crypto_sign_multiparam_name)
+/* Entry of the function table of each parameter set, defined by multiparam_entry.c */
+#define multiparam_entry MQOM_PUBLIC_API_NAMESPACE(multiparam_entry)
+
+/* Function table of one of the compiled parameter sets: each parameter set is
+ * a build of the library with its own MQOM2_VARIANT and its own namespace, the
+ * parameter independent Keccak and Rijndael objects being shared */
+typedef struct {
+	const char *algname;
+	unsigned long long public_key_bytes;
+	unsigned long long secret_key_bytes;
+	unsigned long long signature_bytes;
+	int (*keypair)(unsigned char *pk, unsigned char *sk);
+	int (*signature)(unsigned char *sig, unsigned long long *siglen, const unsigned char *m,
+	                 unsigned long long mlen, const unsigned char *sk);
+	int (*sign)(unsigned char *sm, unsigned long long *smlen, const unsigned char *m,
+	            unsigned long long mlen, const unsigned char *sk);
+	int (*verify)(const unsigned char *sig, unsigned long long siglen, const unsigned char *m,
+	              unsigned long long mlen, const unsigned char *pk);
+	int (*open)(unsigned char *m, unsigned long long *mlen, const unsigned char *sm,
+	            unsigned long long smlen, const unsigned char *pk);
+} multiparam_scheme_t;
+
+/*************************************************
+* Name:        crypto_sign_multiparam_lookup
+*
+* Description: Gets the function table of a parameter set compiled in the
+*              multi-parameter library.
+*
+* Arguments:   - const char *name: name of the parameter set, e.g.
+*                                  "cat1_gf16_fast_r5" (the dashed form
+*                                  "cat1-gf16-fast-r5" of MQOM2_VARIANT is
+*                                  also accepted)
+*
+* Returns the function table, or NULL if the parameter set is unknown or
+* has not been compiled in the library
+**************************************************/
+const multiparam_scheme_t *crypto_sign_multiparam_lookup(const char *name);
+
+/*************************************************
+* Name:        crypto_sign_multiparam_name
+*
+* Description: Enumerates the parameter sets compiled in the multi-parameter
+*              library.
+*
+* Arguments:   - unsigned int i: index of the parameter set
+*
+* Returns the name of the i-th parameter set, or NULL if i is out of range
+**************************************************/
+const char *crypto_sign_multiparam_name(unsigned int i);
+
+#endif /* __MULTIPARAM_H__ */
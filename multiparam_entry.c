@@ -0,0 +1,17 @@
+#include "api.h"
+#include "multiparam.h"
+
+/* Function table of the parameter set of this build, compiled once per
+ * parameter set of the multi-parameter library (see the multiparam target of
+ * the Makefile) and referenced by the lookup table of multiparam.c */
+const multiparam_scheme_t multiparam_entry = {
+	CRYPTO_ALGNAME,
+	CRYPTO_PUBLICKEYBYTES,
+	CRYPTO_SECRETKEYBYTES,
+	CRYPTO_BYTES,
+	crypto_sign_keypair,
+	crypto_sign_signature,
+	crypto_sign,
+	crypto_sign_verify,
+	crypto_sign_open,
+};
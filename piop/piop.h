@@ -7,6 +7,8 @@
 
 #define ComputePAlpha_default MQOM_NAMESPACE(ComputePAlpha_default)
 #define RecomputePAlpha_default MQOM_NAMESPACE(RecomputePAlpha_default)
+#define ComputePAlpha_expanded_default MQOM_NAMESPACE(ComputePAlpha_expanded_default)
+#define RecomputePAlpha_expanded_default MQOM_NAMESPACE(RecomputePAlpha_expanded_default)
 #define ComputePAlpha_memopt MQOM_NAMESPACE(ComputePAlpha_memopt)
 #define RecomputePAlpha_memopt MQOM_NAMESPACE(RecomputePAlpha_memopt)
 #define ComputePAlpha_bitslice MQOM_NAMESPACE(ComputePAlpha_bitslice)
@@ -4,11 +4,14 @@
 #include <common.h>
 #include <stdlib.h>
 #include <fields.h>
+#include "workspace.h"
 
 /**** PIOP cache handling functions *********/
 /*
- * This is a cache to factorize t1 computation across all the tau
- * repetitions.
+ * This is a cache of the t1 = A_i x + b_i vectors, for the PIOP variants
+ * processing the tau repetitions one at a time. The default PIOP does not
+ * use it: it processes all the repetitions of an equation at once, hence
+ * computes each t1 only once.
  */
 typedef struct {
 	uint8_t active;
@@ -30,7 +33,7 @@ static inline void set_entry_piop_cache(piop_cache *cache, uint32_t i, const fie
 /* Function that deals with the PIOP cache */
 static inline void destroy_piop_cache(piop_cache *cache) {
 	if (cache != NULL) {
-		mqom_free(cache, cache->size);
+		workspace_free(cache, cache->size);
 	}
 }
 
@@ -43,7 +46,7 @@ static inline piop_cache *init_piop_cache(uint32_t num_elt) {
 	piop_cache *cache = NULL;
 
 #ifdef USE_PIOP_CACHE
-	cache = (piop_cache*)mqom_calloc(num_elt, sizeof(piop_cache));
+	cache = (piop_cache*)workspace_calloc(num_elt, sizeof(piop_cache));
 	if (cache == NULL) {
 		goto err;
 	}
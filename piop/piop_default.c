@@ -1,10 +1,12 @@
 #include "piop.h"
+#include "piop_default.h"
 #if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
 #include "xof.h"
 #endif
-#include "piop_cache.h"
 #include "benchmark.h"
 #include "expand_mq.h"
+#include "threadpool.h"
+#include "workspace.h"
 
 /* Some useful types definition */
 /* NOTE: we use multi-dimensional array types to ease usage of indices.
@@ -13,59 +15,101 @@
 typedef field_ext_elt (*MatrixSetMQ)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 typedef field_ext_elt (*VectorSetMQ)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 
-static inline void compute_t1(const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt t1[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], uint32_t i, piop_cache *cache) {
-	if (is_entry_active_piop_cache(cache, i)) {
-		get_entry_piop_cache(cache, i, t1);
-	} else {
-		field_ext_base_mat_mult((field_ext_elt*)A_hat[i], x, t1, MQOM2_PARAM_MQ_N, TRI_INF);
-		field_ext_vect_add(t1, b_hat[i], t1, MQOM2_PARAM_MQ_N);
-		set_entry_piop_cache(cache, i, t1);
-	}
-
-	return;
-}
-
+/* Shared data of the per equation tasks of ComputePz */
+typedef struct {
+	const field_ext_elt (*x0)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	const field_base_elt *x;
+	const field_ext_elt (*A_hat)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	const field_ext_elt (*b_hat)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*z0)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	field_ext_elt (*z1)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+} compute_pz_task_t;
 
-static int ComputePz(const field_ext_elt x0_e[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt z0[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], field_ext_elt z1[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], piop_cache *cache) {
+/* Compute the i-th coefficients of the P_z of all the repetitions: A_hat[i] is
+ * multiplied by the tau vectors x0[e] at once, so that A_hat is streamed from
+ * memory once per signature instead of once per repetition, and t1 = A_i x + b_i
+ * is computed once for all the repetitions */
+static int ComputePz_task(void *arg, uint32_t i) {
 	int ret = -1;
-	uint32_t i;
+	const compute_pz_task_t *t = (const compute_pz_task_t*) arg;
+	uint32_t e;
 
-	field_ext_elt t0[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt t0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 	field_ext_elt t1[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 	field_ext_elt z_0i, z_1i;
 
-	for (i = 0; i < MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU; i++) {
-		/* Compute P_t(X) = t_0 + t_1 X = A_i P_x(X) + b_i X */
-		__BENCHMARK_START__(BS_PIOP_MAT_MUL_EXT);
-		field_ext_mat_mult((field_ext_elt*)A_hat[i], x0_e, t0, MQOM2_PARAM_MQ_N, TRI_INF);
-		__BENCHMARK_STOP__(BS_PIOP_MAT_MUL_EXT);
-		__BENCHMARK_START__(BS_PIOP_COMPUTE_T1);
-		compute_t1(A_hat, x, b_hat, t1, i, cache);
-		__BENCHMARK_STOP__(BS_PIOP_COMPUTE_T1);
-
-		/* Compute P_{z,i}(X) = z_{0,i} + z_{1,i} X = P_t(X)^T P_x(X) - y_i X^2 */
-		__BENCHMARK_START__(BS_PIOP_COMPUTE_PZI);
-		z_0i = field_ext_vect_mult(t0, x0_e, MQOM2_PARAM_MQ_N);
-		field_ext_elt t0_x = field_ext_vect_mult(t1, x0_e, MQOM2_PARAM_MQ_N); /* t0^T x */
-		field_ext_elt t0_x0 = field_ext_base_vect_mult(t0, x, MQOM2_PARAM_MQ_N);   /* t1^T x0[e] */
+	/* Compute P_t(X) = t_0 + t_1 X = A_i P_x(X) + b_i X */
+	__BENCHMARK_START__(BS_PIOP_MAT_MUL_EXT);
+	field_ext_mat_mult_multi((const field_ext_elt*)t->A_hat[i], (const field_ext_elt*)t->x0, (field_ext_elt*)t0, MQOM2_PARAM_MQ_N, TRI_INF, MQOM2_PARAM_TAU);
+	__BENCHMARK_STOP__(BS_PIOP_MAT_MUL_EXT);
+	__BENCHMARK_START__(BS_PIOP_COMPUTE_T1);
+	field_ext_base_mat_mult((const field_ext_elt*)t->A_hat[i], t->x, t1, MQOM2_PARAM_MQ_N, TRI_INF);
+	field_ext_vect_add(t1, t->b_hat[i], t1, MQOM2_PARAM_MQ_N);
+	__BENCHMARK_STOP__(BS_PIOP_COMPUTE_T1);
+
+	/* Compute P_{z,i}(X) = z_{0,i} + z_{1,i} X = P_t(X)^T P_x(X) - y_i X^2 */
+	__BENCHMARK_START__(BS_PIOP_COMPUTE_PZI);
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+		z_0i = field_ext_vect_mult(t0[e], t->x0[e], MQOM2_PARAM_MQ_N);
+		field_ext_elt t0_x = field_ext_vect_mult(t1, t->x0[e], MQOM2_PARAM_MQ_N); /* t0^T x */
+		field_ext_elt t0_x0 = field_ext_base_vect_mult(t0[e], t->x, MQOM2_PARAM_MQ_N);   /* t1^T x0[e] */
 		field_ext_vect_add(&t0_x, &t0_x0, &z_1i, 1);
-		field_ext_vect_pack(z_0i, z0, i);
-		field_ext_vect_pack(z_1i, z1, i);
-		__BENCHMARK_STOP__(BS_PIOP_COMPUTE_PZI);
+		field_ext_vect_pack(z_0i, t->z0[e], i);
+		field_ext_vect_pack(z_1i, t->z1[e], i);
 	}
+	__BENCHMARK_STOP__(BS_PIOP_COMPUTE_PZI);
 
 	ret = 0;
 	return ret;
 }
 
-int ComputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
-	int ret = -1;
-	uint32_t e;
-	field_ext_elt *_A_hat = NULL;
-	field_ext_elt *_b_hat = NULL;
+/* Shared data of the per repetition tasks of ComputePAlpha */
+typedef struct {
+	const field_ext_elt (*z0)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	const field_ext_elt (*z1)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	const field_ext_elt (*u0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	const field_ext_elt (*u1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	const field_ext_elt (*Gamma)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+#endif
+	field_ext_elt (*alpha0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt (*alpha1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+} compute_p_alpha_task_t;
 
-	/* Initialize the PIOP cache for t1 */
-	piop_cache *t1_cache = init_piop_cache(MQOM2_PARAM_MQ_M);
+static int ComputePAlpha_task(void *arg, uint32_t e) {
+	const compute_p_alpha_task_t *t = (const compute_p_alpha_task_t*) arg;
+
+	__BENCHMARK_START__(BS_PIOP_BATCH_AND_MASK);
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	uint32_t i;
+	field_ext_elt tmp[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	for (i = 0; i < MQOM2_PARAM_ETA; i++) {
+		field_ext_vect_pack(
+		    field_ext_vect_mult(t->Gamma[i], t->z0[e], MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
+		    tmp, i
+		);
+	}
+	field_ext_vect_add(tmp, t->u0[e], t->alpha0[e], MQOM2_PARAM_ETA);
+	for (i = 0; i < MQOM2_PARAM_ETA; i++) {
+		field_ext_vect_pack(
+		    field_ext_vect_mult(t->Gamma[i], t->z1[e], MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
+		    tmp, i
+		);
+	}
+	field_ext_vect_add(tmp, t->u1[e], t->alpha1[e], MQOM2_PARAM_ETA);
+#else
+	field_ext_vect_add(t->z0[e], t->u0[e], t->alpha0[e], MQOM2_PARAM_ETA);
+	field_ext_vect_add(t->z1[e], t->u1[e], t->alpha1[e], MQOM2_PARAM_ETA);
+#endif
+	__BENCHMARK_STOP__(BS_PIOP_BATCH_AND_MASK);
+
+	return 0;
+}
+
+int ComputePAlpha_expanded_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	field_ext_elt z0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	field_ext_elt z1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
 
 	__BENCHMARK_START__(BS_PIOP_EXPAND_BATCHING_MAT);
 #if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
@@ -90,13 +134,52 @@ int ComputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const fiel
 #endif
 	__BENCHMARK_STOP__(BS_PIOP_EXPAND_BATCHING_MAT);
 
+	/* The equations are computed in parallel, for all the repetitions at once */
+	compute_pz_task_t pz_task = {
+		.x0 = x0,
+		.x = x,
+		.A_hat = A_hat,
+		.b_hat = b_hat,
+		.z0 = z0,
+		.z1 = z1,
+	};
+	ret = parallel_for(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU, ComputePz_task, &pz_task);
+	ERR(ret, err);
+
+	compute_p_alpha_task_t task = {
+		.z0 = (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)]) z0,
+		.z1 = (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)]) z1,
+		.u0 = u0,
+		.u1 = u1,
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+		.Gamma = (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)]) Gamma,
+#endif
+		.alpha0 = alpha0,
+		.alpha1 = alpha1,
+	};
+	ret = parallel_for(MQOM2_PARAM_TAU, ComputePAlpha_task, &task);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	xof_clean_ctx(&xof_ctx);
+#endif
+	return ret;
+}
+
+int ComputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	field_ext_elt *_A_hat = NULL;
+	field_ext_elt *_b_hat = NULL;
+
 	/* Expand the public matrices */
-	_A_hat = (field_ext_elt*)mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	_A_hat = (field_ext_elt*)workspace_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	if (_A_hat == NULL) {
 		ret = -1;
 		goto err;
 	}
-	_b_hat = (field_ext_elt*)mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	_b_hat = (field_ext_elt*)workspace_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	if (_b_hat == NULL) {
 		ret = -1;
 		goto err;
@@ -109,85 +192,106 @@ int ComputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const fiel
 	ERR(ret, err);
 	__BENCHMARK_STOP__(BS_PIOP_EXPAND_MQ);
 
-	field_ext_elt z0[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], z1[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
-		ret = ComputePz(x0[e], x, (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])A_hat, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])b_hat, z0, z1, t1_cache);
-		ERR(ret, err);
-		__BENCHMARK_START__(BS_PIOP_BATCH_AND_MASK);
-#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
-		field_ext_elt tmp[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
-		for (i = 0; i < MQOM2_PARAM_ETA; i++) {
-			field_ext_vect_pack(
-			    field_ext_vect_mult(Gamma[i], z0, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
-			    tmp, i
-			);
-		}
-		field_ext_vect_add(tmp, u0[e], alpha0[e], MQOM2_PARAM_ETA);
-		for (i = 0; i < MQOM2_PARAM_ETA; i++) {
-			field_ext_vect_pack(
-			    field_ext_vect_mult(Gamma[i], z1, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
-			    tmp, i
-			);
-		}
-		field_ext_vect_add(tmp, u1[e], alpha1[e], MQOM2_PARAM_ETA);
-#else
-		field_ext_vect_add(z0, u0[e], alpha0[e], MQOM2_PARAM_ETA);
-		field_ext_vect_add(z1, u1[e], alpha1[e], MQOM2_PARAM_ETA);
-#endif
-		__BENCHMARK_STOP__(BS_PIOP_BATCH_AND_MASK);
-	}
+	ret = ComputePAlpha_expanded_default(com, x0, u0, u1, x, (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])A_hat, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])b_hat, alpha0, alpha1);
+	ERR(ret, err);
 
 	ret = 0;
 err:
-	destroy_piop_cache(t1_cache);
-	if (_A_hat) {
-		mqom_free(_A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
-	}
+	/* Release in the reverse order of the allocations */
 	if (_b_hat) {
-		mqom_free(_b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+		workspace_free(_b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	if (_A_hat) {
+		workspace_free(_A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	}
-#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
-	xof_clean_ctx(&xof_ctx);
-#endif
 	return ret;
 }
 
 /***************************************************************/
 /***************************************************************/
 
-static int ComputePzEval(field_ext_elt r, const field_ext_elt v_x[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], field_ext_elt v_z[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)]) {
+/* Shared data of the per equation tasks of ComputePzEval */
+typedef struct {
+	const field_ext_elt *r;
+	const field_ext_elt (*x_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	const field_ext_elt (*A_hat)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	const field_ext_elt (*b_hat)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*v_z)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+} compute_pz_eval_task_t;
+
+/* Compute the i-th coefficients of the P_z(r) of all the repetitions, A_hat[i]
+ * being multiplied by the tau vectors v_x = x_eval[e] at once */
+static int ComputePzEval_task(void *arg, uint32_t i) {
 	int ret = -1;
-	uint32_t i;
+	const compute_pz_eval_task_t *t = (const compute_pz_eval_task_t*) arg;
+	uint32_t e;
 
 	field_ext_elt v_t[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
-	field_ext_elt tmp[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt tmp[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 	field_ext_elt v_zi;
 
-	field_ext_elt r2 = field_ext_mult(r, r);
-	field_ext_elt y_r2[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
-	field_ext_constant_vect_mult(r2, y, y_r2, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU);
-
-	for (i = 0; i < MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU; i++) {
+	field_ext_mat_mult_multi((const field_ext_elt*)t->A_hat[i], (const field_ext_elt*)t->x_eval, (field_ext_elt*)tmp, MQOM2_PARAM_MQ_N, TRI_INF, MQOM2_PARAM_TAU);
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
 		/* Compute v_t = P_t(r) = A_i P_x(r) + b_i r */
-		field_ext_mat_mult((field_ext_elt*)A_hat[i], v_x, tmp, MQOM2_PARAM_MQ_N, TRI_INF);
-		field_ext_constant_vect_mult(r, b_hat[i], v_t, MQOM2_PARAM_MQ_N);
-		field_ext_vect_add(v_t, tmp, v_t, MQOM2_PARAM_MQ_N);
+		field_ext_constant_vect_mult(t->r[e], t->b_hat[i], v_t, MQOM2_PARAM_MQ_N);
+		field_ext_vect_add(v_t, tmp[e], v_t, MQOM2_PARAM_MQ_N);
 
 		/* Compute v_{z,i} = P_{z,i}(r) = v_t^T v_r - y_i r^2 */
-		v_zi = field_ext_vect_mult(v_t, v_x, MQOM2_PARAM_MQ_N);
-		field_ext_vect_pack(v_zi, v_z, i);
+		v_zi = field_ext_vect_mult(v_t, t->x_eval[e], MQOM2_PARAM_MQ_N);
+		field_ext_vect_pack(v_zi, t->v_z[e], i);
 	}
-	field_ext_vect_add(v_z, y_r2, v_z, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU);
 
 	ret = 0;
 	return ret;
 }
 
-int RecomputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const uint16_t i_star[MQOM2_PARAM_TAU], const field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE], const field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+/* Shared data of the per repetition tasks of RecomputePAlpha */
+typedef struct {
+	const field_ext_elt (*alpha1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	const field_ext_elt *r;
+	const field_ext_elt (*u_eval)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	const field_ext_elt *y;
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	const field_ext_elt (*Gamma)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+#endif
+	field_ext_elt (*v_z)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	field_ext_elt (*alpha0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+} recompute_p_alpha_task_t;
+
+static int RecomputePAlpha_task(void *arg, uint32_t e) {
+	const recompute_p_alpha_task_t *t = (const recompute_p_alpha_task_t*) arg;
+	field_ext_elt v_alpha[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt y_r2[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+
+	field_ext_elt r = t->r[e];
+	field_ext_elt r2 = field_ext_mult(r, r);
+	field_ext_constant_vect_mult(r2, t->y, y_r2, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU);
+	field_ext_vect_add(t->v_z[e], y_r2, t->v_z[e], MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU);
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	uint32_t i;
+	for (i = 0; i < MQOM2_PARAM_ETA; i++) {
+		field_ext_vect_pack(
+		    field_ext_vect_mult(t->Gamma[i], t->v_z[e], MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
+		    v_alpha, i
+		);
+	}
+	field_ext_vect_add(v_alpha, t->u_eval[e], v_alpha, MQOM2_PARAM_ETA);
+	field_ext_constant_vect_mult(r, t->alpha1[e], t->alpha0[e], MQOM2_PARAM_ETA);
+	field_ext_vect_add(v_alpha, t->alpha0[e], t->alpha0[e], MQOM2_PARAM_ETA);
+#else
+	field_ext_vect_add(t->v_z[e], t->u_eval[e], v_alpha, MQOM2_PARAM_ETA);
+	field_ext_constant_vect_mult(r, t->alpha1[e], t->alpha0[e], MQOM2_PARAM_ETA);
+	field_ext_vect_add(v_alpha, t->alpha0[e], t->alpha0[e], MQOM2_PARAM_ETA);
+#endif
+
+	return 0;
+}
+
+int RecomputePAlpha_expanded_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const uint16_t i_star[MQOM2_PARAM_TAU], const field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
 	int ret = -1;
 	uint32_t e;
-	field_ext_elt *_A_hat = NULL;
-	field_ext_elt *_b_hat = NULL;
+	field_ext_elt r[MQOM2_PARAM_TAU];
+	field_ext_elt v_z[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
 
 #if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
 	uint32_t i;
@@ -210,13 +314,55 @@ int RecomputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const fi
 	(void) com;
 #endif
 
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+		r[e] = get_evaluation_point(i_star[e]);
+	}
+
+	/* The equations are computed in parallel, for all the repetitions at once */
+	compute_pz_eval_task_t pz_task = {
+		.r = r,
+		.x_eval = x_eval,
+		.A_hat = A_hat,
+		.b_hat = b_hat,
+		.v_z = v_z,
+	};
+	ret = parallel_for(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU, ComputePzEval_task, &pz_task);
+	ERR(ret, err);
+
+	recompute_p_alpha_task_t task = {
+		.alpha1 = alpha1,
+		.r = r,
+		.u_eval = u_eval,
+		.y = y,
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+		.Gamma = (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)]) Gamma,
+#endif
+		.v_z = v_z,
+		.alpha0 = alpha0,
+	};
+	ret = parallel_for(MQOM2_PARAM_TAU, RecomputePAlpha_task, &task);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
+	xof_clean_ctx(&xof_ctx);
+#endif
+	return ret;
+}
+
+int RecomputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const uint16_t i_star[MQOM2_PARAM_TAU], const field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)], const uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE], const field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)]) {
+	int ret = -1;
+	field_ext_elt *_A_hat = NULL;
+	field_ext_elt *_b_hat = NULL;
+
 	/* Expand the public matrices */
-	_A_hat = (field_ext_elt*)mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	_A_hat = (field_ext_elt*)workspace_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	if (_A_hat == NULL) {
 		ret = -1;
 		goto err;
 	}
-	_b_hat = (field_ext_elt*)mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	_b_hat = (field_ext_elt*)workspace_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	if (_b_hat == NULL) {
 		ret = -1;
 		goto err;
@@ -227,39 +373,17 @@ int RecomputePAlpha_default(const uint8_t com[MQOM2_PARAM_DIGEST_SIZE], const fi
 	ret = ExpandEquations(mseed_eq, A_hat, b_hat);
 	ERR(ret, err);
 
-	field_ext_elt v_z[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
-	field_ext_elt v_alpha[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
-	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
-		field_ext_elt r = get_evaluation_point(i_star[e]);
-		ret = ComputePzEval(r, x_eval[e], (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])A_hat, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])b_hat, y, v_z);
-		ERR(ret, err);
-#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
-		for (i = 0; i < MQOM2_PARAM_ETA; i++) {
-			field_ext_vect_pack(
-			    field_ext_vect_mult(Gamma[i], v_z, MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU),
-			    v_alpha, i
-			);
-		}
-		field_ext_vect_add(v_alpha, u_eval[e], v_alpha, MQOM2_PARAM_ETA);
-		field_ext_constant_vect_mult(r, alpha1[e], alpha0[e], MQOM2_PARAM_ETA);
-		field_ext_vect_add(v_alpha, alpha0[e], alpha0[e], MQOM2_PARAM_ETA);
-#else
-		field_ext_vect_add(v_z, u_eval[e], v_alpha, MQOM2_PARAM_ETA);
-		field_ext_constant_vect_mult(r, alpha1[e], alpha0[e], MQOM2_PARAM_ETA);
-		field_ext_vect_add(v_alpha, alpha0[e], alpha0[e], MQOM2_PARAM_ETA);
-#endif
-	}
+	ret = RecomputePAlpha_expanded_default(com, alpha1, i_star, x_eval, u_eval, (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])A_hat, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])b_hat, y, alpha0);
+	ERR(ret, err);
 
 	ret = 0;
 err:
-	if (_A_hat) {
-		mqom_free(_A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
-	}
+	/* Release in the reverse order of the allocations */
 	if (_b_hat) {
-		mqom_free(_b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+		workspace_free(_b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	if (_A_hat) {
+		workspace_free(_A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
 	}
-#if MQOM2_PARAM_WITH_STATISTICAL_BATCHING == 1
-	xof_clean_ctx(&xof_ctx);
-#endif
 	return ret;
 }
@@ -0,0 +1,415 @@
+#ifdef SUPERCOP
+#include "crypto_sign.h"
+#include "crypto_declassify.h"
+#else
+#include "api.h"
+#endif
+
+#include <stdlib.h>
+#include "common.h"
+#include "fields.h"
+#include "xof.h"
+#include "blc.h"
+#include "piop.h"
+#include "benchmark.h"
+#include "sign.h"
+#include "presign.h"
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+#ifdef SUPERCOP
+extern void randombytes(unsigned char* x, unsigned long long xlen);
+#else
+extern int randombytes(unsigned char* x, unsigned long long xlen);
+#endif
+#else
+#include "randombytes.h"
+#endif
+
+#if defined(__unix__) || (defined(__APPLE__) && defined(__MACH__))
+#include <time.h>
+static inline double presig_get_time(void) {
+	struct timespec ts;
+	if (clock_gettime(CLOCK_MONOTONIC, &ts)) {
+		return 0.0;
+	}
+	return (double)ts.tv_sec + ((double)ts.tv_nsec / 1e9);
+}
+#else
+/* No time source: the refill rate is not computed */
+static inline double presig_get_time(void) {
+	return 0.0;
+}
+#endif
+
+#if defined(USE_PTHREADS)
+#define presig_pool_lock(pool) pthread_mutex_lock(&(pool)->lock)
+#define presig_pool_unlock(pool) pthread_mutex_unlock(&(pool)->lock)
+#else
+#define presig_pool_lock(pool)
+#define presig_pool_unlock(pool)
+#endif
+
+int Presign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], presig_t *presig) {
+	int ret = -1;
+	int e;
+	field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt x0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt u0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt u1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	/* Aliasing to save stack space */
+	field_ext_elt (*alpha0)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)] = u0;
+	field_ext_elt (*alpha1)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)] = u1;
+	uint8_t alpha[BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)];
+	xof_context DECL_VAR(xof_ctx);
+
+	if (presig == NULL) {
+		goto err;
+	}
+	presig->valid = 0;
+	memcpy(presig->salt, salt, MQOM2_PARAM_SALT_SIZE);
+
+	/* Parse the secret key */
+	field_base_parse(&sk[(2 * MQOM2_PARAM_SEED_SIZE) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], MQOM2_PARAM_MQ_N, x);
+
+	/* Commit Lines */
+	__BENCHMARK_START__(BS_BLC_COMMIT);
+	ret = BLC_Commit(mseed, salt, x, presig->com1, &presig->key, x0, u0, u1);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_COMMIT);
+
+	/* Compute P_alpha */
+	__BENCHMARK_START__(BS_PIOP_COMPUTE);
+	ret = ComputePAlpha(presig->com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x0,
+	                    (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u0,
+	                    (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u1,
+	                    x, &sk[0], alpha0, alpha1);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_PIOP_COMPUTE);
+
+	/* Hash P_alpha */
+	ret = xof_init(&xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, (const uint8_t*) "\x03", 1);
+	ERR(ret, err);
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+		field_ext_serialize(alpha0[e], MQOM2_PARAM_ETA, alpha);
+		ret = xof_update(&xof_ctx, alpha, BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+		ERR(ret, err);
+	}
+	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+		uint8_t *buffer = &presig->serialized_alpha1[e * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)];
+		field_ext_serialize(alpha1[e], MQOM2_PARAM_ETA, buffer);
+		ret = xof_update(&xof_ctx, buffer, BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+		ERR(ret, err);
+	}
+	ret = xof_squeeze(&xof_ctx, presig->com2, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	presig->valid = 1;
+	ret = 0;
+err:
+	xof_clean_ctx(&xof_ctx);
+	mqom_cleanse((void*)x, sizeof(x));
+	mqom_cleanse((void*)x0, sizeof(x0));
+	mqom_cleanse((void*)u0, sizeof(u0));
+	mqom_cleanse((void*)u1, sizeof(u1));
+	/* In case of error, clean the presignature */
+	if (ret && (presig != NULL)) {
+		mqom_cleanse((void*)presig, sizeof(presig_t));
+	}
+
+	return ret;
+}
+
+int Sign_with_presig(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, presig_t *presig, uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], hash[MQOM2_PARAM_DIGEST_SIZE];
+	uint16_t i_star[MQOM2_PARAM_TAU];
+	xof_context DECL_VAR(xof_ctx);
+
+	/* Single-use: refuse to open an already consumed presignature */
+	if ((presig == NULL) || (presig->valid != 1)) {
+		goto err;
+	}
+	/* Consume the presignature right away */
+	presig->valid = 0;
+
+	/* Prepare the signature */
+	unsigned int pos = 0;
+	memcpy(&sig[pos], presig->salt, MQOM2_PARAM_SALT_SIZE);
+	pos += MQOM2_PARAM_SALT_SIZE;
+	memcpy(&sig[pos], presig->com1, MQOM2_PARAM_DIGEST_SIZE);
+	pos += MQOM2_PARAM_DIGEST_SIZE;
+	memcpy(&sig[pos], presig->com2, MQOM2_PARAM_DIGEST_SIZE);
+	pos += MQOM2_PARAM_DIGEST_SIZE;
+	memcpy(&sig[pos], presig->serialized_alpha1, MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU));
+	pos += MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU);
+	uint8_t *opening = &sig[pos];
+	uint8_t *nonce = &sig[MQOM2_SIG_SIZE - 4];
+
+	/* Hash message */
+	ret = xof_init(&xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, (const uint8_t*) "\x02", 1);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, msg, mlen);
+	ERR(ret, err);
+	ret = xof_squeeze(&xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	/* Compute Fiat-Shamir hash */
+	ret = xof_init(&xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, (const uint8_t*) "\x04", 1);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, pk, MQOM2_PK_SIZE);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, presig->com1, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, presig->com2, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+	ret = xof_update(&xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+	ret = xof_squeeze(&xof_ctx, hash, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	/* Sample Challenge */
+	__BENCHMARK_START__(BS_SAMPLE_CHALLENGE);
+	ret = SampleChallenge(hash, i_star, nonce);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_SAMPLE_CHALLENGE);
+
+	/* Open Line Evaluation */
+	__BENCHMARK_START__(BS_BLC_OPEN);
+	ret = BLC_Open(&presig->key, i_star, opening);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_BLC_OPEN);
+
+	ret = 0;
+err:
+	xof_clean_ctx(&xof_ctx);
+	mqom_cleanse((void*)msg_hash, sizeof(msg_hash));
+	/* The presignature is never reused: wipe it */
+	if (presig != NULL) {
+		mqom_cleanse((void*)presig, sizeof(presig_t));
+	}
+	/* In case of error, clean the signature buffer */
+	if (ret) {
+		memset(sig, 0, MQOM2_SIG_SIZE);
+	}
+
+	return ret;
+}
+
+/* Update the derived statistics, must be called with the pool locked
+ * (the number of ready presignatures is tracked at the slot transitions) */
+static inline void presig_pool_update_stats(presig_pool_t *pool) {
+	if (pool->stats.generation_time > 0.0) {
+		pool->stats.refill_rate = (double)pool->stats.generated / pool->stats.generation_time;
+	}
+}
+
+int crypto_sign_presig_pool_init(presig_pool_t **pool, const unsigned char *sk, uint32_t capacity) {
+	int ret = -1;
+	presig_pool_t *p = NULL;
+
+	if ((pool == NULL) || (sk == NULL) || (capacity == 0)) {
+		goto err;
+	}
+	(*pool) = NULL;
+
+	p = (presig_pool_t*)mqom_calloc(1, sizeof(presig_pool_t));
+	if (p == NULL) {
+		goto err;
+	}
+	p->slots = (presig_t*)mqom_calloc(capacity, sizeof(presig_t));
+	p->state = (presig_slot_state_t*)mqom_calloc(capacity, sizeof(presig_slot_state_t));
+	p->ready_fifo = (uint32_t*)mqom_calloc(capacity, sizeof(uint32_t));
+	if ((p->slots == NULL) || (p->state == NULL) || (p->ready_fifo == NULL)) {
+		goto err;
+	}
+#if defined(USE_PTHREADS)
+	if (pthread_mutex_init(&p->lock, NULL)) {
+		goto err;
+	}
+#endif
+	memcpy(p->sk, sk, MQOM2_SK_SIZE);
+	p->capacity = capacity;
+	p->stats.capacity = capacity;
+	(*pool) = p;
+
+	ret = 0;
+err:
+	if (ret && (p != NULL)) {
+		mqom_free(p->slots, capacity * sizeof(presig_t));
+		mqom_free(p->state, capacity * sizeof(presig_slot_state_t));
+		mqom_free(p->ready_fifo, capacity * sizeof(uint32_t));
+		mqom_free(p, sizeof(presig_pool_t));
+	}
+	return ret;
+}
+
+int crypto_sign_presig_pool_fill(presig_pool_t *pool, uint32_t n, uint32_t *added) {
+	int ret = -1;
+	uint32_t i, j, slot;
+	uint8_t mseed[MQOM2_PARAM_SEED_SIZE];
+	uint8_t salt[MQOM2_PARAM_SALT_SIZE];
+	double t0, t1;
+
+	if (added != NULL) {
+		(*added) = 0;
+	}
+	if (pool == NULL) {
+		goto err;
+	}
+
+	for (i = 0; i < n; i++) {
+		/* Reserve an empty slot */
+		presig_pool_lock(pool);
+		slot = pool->capacity;
+		for (j = 0; j < pool->capacity; j++) {
+			if (pool->state[j] == PRESIG_SLOT_EMPTY) {
+				slot = j;
+				pool->state[j] = PRESIG_SLOT_FILLING;
+				break;
+			}
+		}
+		presig_pool_unlock(pool);
+		if (slot == pool->capacity) {
+			/* The pool is full */
+			break;
+		}
+
+		t0 = presig_get_time();
+		/* Sample mseed and salt */
+#if defined(SUPERCOP) || defined(MQOM2_FOR_LIBOQS)
+		randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+		randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+#else
+		ret = randombytes(mseed, MQOM2_PARAM_SEED_SIZE);
+		if (!ret) {
+			ret = randombytes(salt, MQOM2_PARAM_SALT_SIZE);
+		}
+		if (ret) {
+			presig_pool_lock(pool);
+			pool->state[slot] = PRESIG_SLOT_EMPTY;
+			presig_pool_unlock(pool);
+			goto err;
+		}
+#endif
+#ifdef SUPERCOP
+		/* Salt declassification (as it is public) for SUPERCOP */
+		crypto_declassify(salt, MQOM2_PARAM_SALT_SIZE);
+#endif
+		ret = Presign(pool->sk, salt, mseed, &pool->slots[slot]);
+		t1 = presig_get_time();
+
+		presig_pool_lock(pool);
+		if (ret) {
+			pool->state[slot] = PRESIG_SLOT_EMPTY;
+		}
+		else {
+			pool->state[slot] = PRESIG_SLOT_READY;
+			pool->ready_fifo[(pool->ready_head + pool->stats.ready) % pool->capacity] = slot;
+			pool->stats.ready++;
+			pool->stats.generated++;
+			pool->stats.generation_time += (t1 - t0);
+		}
+		presig_pool_update_stats(pool);
+		presig_pool_unlock(pool);
+		ERR(ret, err);
+		if (added != NULL) {
+			(*added)++;
+		}
+	}
+
+	ret = 0;
+err:
+	mqom_cleanse((void*)mseed, sizeof(mseed));
+	return ret;
+}
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+int crypto_sign_signature_presig(presig_pool_t *pool, unsigned char *sig, unsigned long long *siglen,
+                                 const unsigned char *m, unsigned long long mlen)
+#else
+int
+crypto_sign_signature_presig(presig_pool_t *pool, unsigned char *sig, size_t *siglen,
+                             const unsigned char *m, size_t mlen)
+#endif
+{
+	int ret = -1;
+	uint32_t slot;
+
+	if (pool == NULL) {
+		goto err;
+	}
+
+	/* Take the oldest ready presignature at the head of the FIFO: once
+	 * taken, no other caller can see it anymore */
+	presig_pool_lock(pool);
+	slot = pool->capacity;
+	if (pool->stats.ready > 0) {
+		slot = pool->ready_fifo[pool->ready_head];
+		pool->ready_head = (pool->ready_head + 1) % pool->capacity;
+		pool->state[slot] = PRESIG_SLOT_CONSUMING;
+		pool->stats.ready--;
+		pool->stats.consumed++;
+	}
+	else {
+		pool->stats.misses++;
+	}
+	presig_pool_update_stats(pool);
+	presig_pool_unlock(pool);
+
+	if (slot == pool->capacity) {
+		/* Empty pool: fallback to the full signature */
+		ret = crypto_sign_signature(sig, siglen, m, mlen, pool->sk);
+		ERR(ret, err);
+	}
+	else {
+		/* Sign_with_presig wipes the presignature in any case */
+		ret = Sign_with_presig(&pool->sk[0], m, mlen, &pool->slots[slot], sig);
+		presig_pool_lock(pool);
+		pool->state[slot] = PRESIG_SLOT_EMPTY;
+		presig_pool_unlock(pool);
+		ERR(ret, err);
+		if (siglen != NULL) {
+			*siglen = MQOM2_SIG_SIZE;
+		}
+	}
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_presig_pool_stats(presig_pool_t *pool, presig_pool_stats_t *stats) {
+	if ((pool == NULL) || (stats == NULL)) {
+		return -1;
+	}
+	presig_pool_lock(pool);
+	presig_pool_update_stats(pool);
+	memcpy(stats, &pool->stats, sizeof(presig_pool_stats_t));
+	presig_pool_unlock(pool);
+
+	return 0;
+}
+
+void crypto_sign_presig_pool_destroy(presig_pool_t *pool) {
+	if (pool == NULL) {
+		return;
+	}
+	/* Wipe all the secrets */
+	mqom_cleanse((void*)pool->slots, pool->capacity * sizeof(presig_t));
+	mqom_cleanse((void*)pool->sk, sizeof(pool->sk));
+	mqom_free(pool->slots, pool->capacity * sizeof(presig_t));
+	mqom_free(pool->state, pool->capacity * sizeof(presig_slot_state_t));
+	mqom_free(pool->ready_fifo, pool->capacity * sizeof(uint32_t));
+#if defined(USE_PTHREADS)
+	pthread_mutex_destroy(&pool->lock);
+#endif
+	mqom_free(pool, sizeof(presig_pool_t));
+
+	return;
+}
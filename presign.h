@@ -0,0 +1,156 @@
+#ifndef __PRESIGN_H__
+#define __PRESIGN_H__
+
+#include "common.h"
+#include "blc.h"
+
+#if defined(USE_PTHREADS)
+#include <pthread.h>
+#endif
+
+/* Deal with namespacing */
+#define Presign MQOM_NAMESPACE(Presign)
+#define Sign_with_presig MQOM_NAMESPACE(Sign_with_presig)
+#define crypto_sign_presig_pool_init MQOM_PUBLIC_API_NAMESPACE(crypto_sign_presig_pool_init)
+#define crypto_sign_presig_pool_fill MQOM_PUBLIC_API_NAMESPACE(crypto_sign_presig_pool_fill)
+#define crypto_sign_signature_presig MQOM_PUBLIC_API_NAMESPACE(crypto_sign_signature_presig)
+#define crypto_sign_presig_pool_stats MQOM_PUBLIC_API_NAMESPACE(crypto_sign_presig_pool_stats)
+#define crypto_sign_presig_pool_destroy MQOM_PUBLIC_API_NAMESPACE(crypto_sign_presig_pool_destroy)
+
+/* A presignature gathers everything in a signature that does not depend
+ * on the message: the salt, the BLC commitment com1, the PIOP commitment com2,
+ * the serialized alpha1 and the BLC key that is needed to open the commitment
+ * once the challenge is known.
+ * XXX: a presignature holds secret material (the BLC key) and MUST be used
+ * at most once: reusing it for two different messages leaks the secret key.
+ */
+typedef struct {
+	uint8_t salt[MQOM2_PARAM_SALT_SIZE];
+	uint8_t com1[MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t com2[MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t serialized_alpha1[MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)];
+	blc_key_t key;
+	uint8_t valid;
+} presig_t;
+
+/* Offline phase: commit and compute the PIOP, independently of the message */
+int Presign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], presig_t *presig);
+
+/* Online phase: hash the message, sample the challenge and open the commitment.
+ * The presignature is consumed (wiped) whatever the outcome.
+ * With the same (sk, salt, mseed), Presign followed by Sign_with_presig produces
+ * exactly the same signature as Sign */
+int Sign_with_presig(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, presig_t *presig, uint8_t sig[MQOM2_SIG_SIZE]);
+
+/* Bounded pool of presignatures bound to one secret key */
+typedef enum {
+	PRESIG_SLOT_EMPTY = 0,
+	PRESIG_SLOT_FILLING = 1,
+	PRESIG_SLOT_READY = 2,
+	PRESIG_SLOT_CONSUMING = 3,
+} presig_slot_state_t;
+
+typedef struct {
+	uint32_t capacity;       /* Maximum number of presignatures in the pool */
+	uint32_t ready;          /* Current fill level (presignatures ready to be consumed) */
+	uint64_t generated;      /* Total number of presignatures generated */
+	uint64_t consumed;       /* Total number of presignatures consumed by online signatures */
+	uint64_t misses;         /* Online signatures that found the pool empty (full signing fallback) */
+	double generation_time;  /* Cumulated time (in seconds) spent in the offline phase */
+	double refill_rate;      /* Refill rate in presignatures per second of offline work (0 if unknown) */
+} presig_pool_stats_t;
+
+typedef struct {
+	uint8_t sk[MQOM2_SK_SIZE];
+	uint32_t capacity;
+	presig_t *slots;
+	presig_slot_state_t *state;
+	/* Ring buffer of the ready slots, from the oldest one at ready_head
+	 * (its fill level is stats.ready) */
+	uint32_t *ready_fifo;
+	uint32_t ready_head;
+	presig_pool_stats_t stats;
+#if defined(USE_PTHREADS)
+	pthread_mutex_t lock;
+#endif
+} presig_pool_t;
+
+#if !defined(MQOM2_FOR_MUPQ) && !defined(MQOM2_FOR_LIBOQS)
+/*************************************************
+* Name:        crypto_sign_presig_pool_init
+*
+* Description: Allocates a pool of at most capacity presignatures
+*              bound to the secret key sk (which is copied in the pool).
+*
+* Arguments:   - presig_pool_t **pool: pointer to the allocated pool
+*              - const uint8_t *sk:    pointer to bit-packed secret key
+*              - uint32_t capacity:    maximum number of presignatures
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_presig_pool_init(presig_pool_t **pool, const unsigned char *sk, uint32_t capacity);
+
+/*************************************************
+* Name:        crypto_sign_presig_pool_fill
+*
+* Description: Computes up to n presignatures (offline phase) and stores
+*              them in the pool, stopping when the pool is full. Can be
+*              called concurrently from idle threads when USE_PTHREADS is set.
+*
+* Arguments:   - presig_pool_t *pool: pointer to the pool
+*              - uint32_t n:          number of presignatures to compute
+*              - uint32_t *added:     pointer to output number of added
+*                                     presignatures (can be NULL)
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_presig_pool_fill(presig_pool_t *pool, uint32_t n, uint32_t *added);
+
+/*************************************************
+* Name:        crypto_sign_signature_presig
+*
+* Description: Computes signature (online phase) by consuming the oldest
+*              presignature of the pool. When the pool is empty, falls back
+*              to a full signature computation (counted as a miss).
+*
+* Arguments:   - presig_pool_t *pool: pointer to the pool
+*              - uint8_t *sig:        pointer to output signature (of length CRYPTO_BYTES)
+*              - size_t *siglen:      pointer to output length of signature
+*              - uint8_t *m:          pointer to message to be signed
+*              - size_t mlen:         length of message
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_signature_presig(presig_pool_t *pool, unsigned char *sig, unsigned long long *siglen,
+                                 const unsigned char *m, unsigned long long mlen);
+#else
+int
+crypto_sign_presig_pool_init(presig_pool_t **pool, const unsigned char *sk, uint32_t capacity);
+
+int
+crypto_sign_presig_pool_fill(presig_pool_t *pool, uint32_t n, uint32_t *added);
+
+int
+crypto_sign_signature_presig(presig_pool_t *pool, unsigned char *sig, size_t *siglen,
+                             const unsigned char *m, size_t mlen);
+#endif
+
+/*************************************************
+* Name:        crypto_sign_presig_pool_stats
+*
+* Description: Gets a snapshot of the pool statistics (fill level,
+*              consumption and refill rate).
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_presig_pool_stats(presig_pool_t *pool, presig_pool_stats_t *stats);
+
+/*************************************************
+* Name:        crypto_sign_presig_pool_destroy
+*
+* Description: Wipes all the remaining presignatures as well as the
+*              secret key, and releases the pool.
+**************************************************/
+void crypto_sign_presig_pool_destroy(presig_pool_t *pool);
+
+#endif /* __PRESIGN_H__ */
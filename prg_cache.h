@@ -4,6 +4,7 @@
 #include <common.h>
 #include <stdlib.h>
 #include "enc.h"
+#include "workspace.h"
 
 /**** PRG cache handling functions *********/
 #ifndef CEIL
@@ -40,7 +41,7 @@ static inline void concat2(destroy_prg_cache, PRG_CACHE_SUFFIX)(concat2(prg_key_
 				concat2(enc_clean_ctx, PRG_CACHE_SUFFIX)(&cache[i].ctx);
 			}
 		}
-		mqom_free(cache, cache->size);
+		workspace_free(cache, cache->size);
 	}
 }
 
@@ -73,7 +74,7 @@ static inline concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX) *concat2(init_prg_c
 	concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX) *prg_cache = NULL;
 
 #ifdef USE_PRG_CACHE
-	prg_cache = (concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX)*)mqom_calloc(CEIL(n_bytes, MQOM2_PARAM_SEED_SIZE), sizeof(concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX)));
+	prg_cache = (concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX)*)workspace_calloc(CEIL(n_bytes, MQOM2_PARAM_SEED_SIZE), sizeof(concat2(prg_key_sched_cache, PRG_CACHE_SUFFIX)));
 	if (prg_cache == NULL) {
 		goto err;
 	}
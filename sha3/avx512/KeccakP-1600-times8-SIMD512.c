@@ -0,0 +1,557 @@
+/*
+The Keccak-p permutations, designed by Guido Bertoni, Joan Daemen, Michaël Peeters and Gilles Van Assche.
+
+Implementation by Ronny Van Keer, hereby denoted as "the implementer".
+
+For more information, feedback or questions, please refer to the Keccak Team website:
+https://keccak.team/
+
+To the extent possible under law, the implementer has waived all copyright
+and related or neighboring rights to the source code in this file.
+http://creativecommons.org/publicdomain/zero/1.0/
+
+---
+
+This file implements Keccak-p[1600]×8 in a PlSnP-compatible way.
+Please refer to PlSnP-documentation.h for more details.
+
+This implementation comes with KeccakP-1600-times8-SnP.h in the same folder.
+Please refer to LowLevel.build for the exact list of other files it must be combined with.
+*/
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <immintrin.h>
+#include "align.h"
+#include "KeccakP-1600-times8-SnP.h"
+#include "SIMD512-8-config.h"
+
+#include "brg_endian.h"
+#if (PLATFORM_BYTE_ORDER != IS_LITTLE_ENDIAN)
+#error Expecting a little-endian platform
+#endif
+
+/* The 8 instances are interleaved lane by lane: lane i of the 8 states fills the
+ * i-th 512-bit register, so that one permutation round processes the 8 instances
+ * with full width AVX-512 instructions */
+
+typedef __m256i     V256;
+typedef __m512i     V512;
+
+#if defined(KeccakP1600times8_useAVX512)
+
+#define XOR(a,b)                    _mm512_xor_si512(a,b)
+#define XOR3(a,b,c)                 _mm512_ternarylogic_epi64(a,b,c,0x96)
+#define XOR5(a,b,c,d,e)             XOR3(XOR3(a,b,c),d,e)
+#define ROL(a,offset)               _mm512_rol_epi64(a,offset)
+#define Chi(a,b,c)                  _mm512_ternarylogic_epi64(a,b,c,0xD2)
+
+#define CONST512_64(a)              _mm512_set1_epi64(a)
+#define LOAD8_32(a,b,c,d,e,f,g,h)   _mm256_set_epi32((uint64_t)(a), (uint32_t)(b), (uint32_t)(c), (uint32_t)(d), (uint32_t)(e), (uint32_t)(f), (uint32_t)(g), (uint32_t)(h))
+#define LOAD_GATHER8_64(idx,p)      _mm512_i32gather_epi64( idx, (const void*)(p), 8)
+#define STORE_SCATTER8_64(p,idx, v) _mm512_i32scatter_epi64( (void*)(p), idx, v, 8)
+
+#endif
+
+#define laneIndex(instanceIndex, lanePosition)  ((lanePosition)*8 + instanceIndex)
+#define SnP_laneLengthInBytes                   8
+#define LANE_OFFSETS_INDEX(laneOffset)          LOAD8_32(7 * (laneOffset), 6 * (laneOffset), 5 * (laneOffset), 4 * (laneOffset), \
+                                                         3 * (laneOffset), 2 * (laneOffset), 1 * (laneOffset), 0 * (laneOffset))
+
+void KeccakP1600times8_InitializeAll(void *states) {
+	memset(states, 0, KeccakP1600times8_statesSizeInBytes);
+}
+
+void KeccakP1600times8_AddBytes(void *states, unsigned int instanceIndex, const unsigned char *data, unsigned int offset, unsigned int length) {
+	unsigned int sizeLeft = length;
+	unsigned int lanePosition = offset / SnP_laneLengthInBytes;
+	unsigned int offsetInLane = offset % SnP_laneLengthInBytes;
+	const unsigned char *curData = data;
+	uint64_t *statesAsLanes = states;
+
+	if ((sizeLeft > 0) && (offsetInLane != 0)) {
+		unsigned int bytesInLane = SnP_laneLengthInBytes - offsetInLane;
+		uint64_t lane = 0;
+		if (bytesInLane > sizeLeft) {
+			bytesInLane = sizeLeft;
+		}
+		memcpy((unsigned char*)&lane + offsetInLane, curData, bytesInLane);
+		statesAsLanes[laneIndex(instanceIndex, lanePosition)] ^= lane;
+		sizeLeft -= bytesInLane;
+		lanePosition++;
+		curData += bytesInLane;
+	}
+
+	while (sizeLeft >= SnP_laneLengthInBytes) {
+		uint64_t lane = *((const uint64_t*)curData);
+		statesAsLanes[laneIndex(instanceIndex, lanePosition)] ^= lane;
+		sizeLeft -= SnP_laneLengthInBytes;
+		lanePosition++;
+		curData += SnP_laneLengthInBytes;
+	}
+
+	if (sizeLeft > 0) {
+		uint64_t lane = 0;
+		memcpy(&lane, curData, sizeLeft);
+		statesAsLanes[laneIndex(instanceIndex, lanePosition)] ^= lane;
+	}
+}
+
+void KeccakP1600times8_AddLanesAll(void *states, const unsigned char *data, unsigned int laneCount, unsigned int laneOffset) {
+	V512 *stateAsLanes = states;
+	const uint64_t *dataAsLanes = (const uint64_t *)data;
+	unsigned int i;
+	V256 index = LANE_OFFSETS_INDEX(laneOffset);
+
+	for (i = 0; i < laneCount; i++) {
+		stateAsLanes[i] = XOR(stateAsLanes[i], LOAD_GATHER8_64(index, dataAsLanes + i));
+	}
+}
+
+void KeccakP1600times8_OverwriteBytes(void *states, unsigned int instanceIndex, const unsigned char *data, unsigned int offset, unsigned int length) {
+	unsigned int sizeLeft = length;
+	unsigned int lanePosition = offset / SnP_laneLengthInBytes;
+	unsigned int offsetInLane = offset % SnP_laneLengthInBytes;
+	const unsigned char *curData = data;
+	uint64_t *statesAsLanes = states;
+
+	if ((sizeLeft > 0) && (offsetInLane != 0)) {
+		unsigned int bytesInLane = SnP_laneLengthInBytes - offsetInLane;
+		if (bytesInLane > sizeLeft) {
+			bytesInLane = sizeLeft;
+		}
+		memcpy( ((unsigned char *)&statesAsLanes[laneIndex(instanceIndex, lanePosition)]) + offsetInLane, curData, bytesInLane);
+		sizeLeft -= bytesInLane;
+		lanePosition++;
+		curData += bytesInLane;
+	}
+
+	while (sizeLeft >= SnP_laneLengthInBytes) {
+		uint64_t lane = *((const uint64_t*)curData);
+		statesAsLanes[laneIndex(instanceIndex, lanePosition)] = lane;
+		sizeLeft -= SnP_laneLengthInBytes;
+		lanePosition++;
+		curData += SnP_laneLengthInBytes;
+	}
+
+	if (sizeLeft > 0) {
+		memcpy(&statesAsLanes[laneIndex(instanceIndex, lanePosition)], curData, sizeLeft);
+	}
+}
+
+void KeccakP1600times8_OverwriteLanesAll(void *states, const unsigned char *data, unsigned int laneCount, unsigned int laneOffset) {
+	V512 *stateAsLanes = states;
+	const uint64_t *dataAsLanes = (const uint64_t *)data;
+	unsigned int i;
+	V256 index = LANE_OFFSETS_INDEX(laneOffset);
+
+	for (i = 0; i < laneCount; i++) {
+		stateAsLanes[i] = LOAD_GATHER8_64(index, dataAsLanes + i);
+	}
+}
+
+void KeccakP1600times8_OverwriteWithZeroes(void *states, unsigned int instanceIndex, unsigned int byteCount) {
+	unsigned int sizeLeft = byteCount;
+	unsigned int lanePosition = 0;
+	uint64_t *statesAsLanes = states;
+
+	while (sizeLeft >= SnP_laneLengthInBytes) {
+		statesAsLanes[laneIndex(instanceIndex, lanePosition)] = 0;
+		sizeLeft -= SnP_laneLengthInBytes;
+		lanePosition++;
+	}
+
+	if (sizeLeft > 0) {
+		memset(&statesAsLanes[laneIndex(instanceIndex, lanePosition)], 0, sizeLeft);
+	}
+}
+
+void KeccakP1600times8_ExtractBytes(const void *states, unsigned int instanceIndex, unsigned char *data, unsigned int offset, unsigned int length) {
+	unsigned int sizeLeft = length;
+	unsigned int lanePosition = offset / SnP_laneLengthInBytes;
+	unsigned int offsetInLane = offset % SnP_laneLengthInBytes;
+	unsigned char *curData = data;
+	const uint64_t *statesAsLanes = states;
+
+	if ((sizeLeft > 0) && (offsetInLane != 0)) {
+		unsigned int bytesInLane = SnP_laneLengthInBytes - offsetInLane;
+		if (bytesInLane > sizeLeft) {
+			bytesInLane = sizeLeft;
+		}
+		memcpy( curData, ((unsigned char *)&statesAsLanes[laneIndex(instanceIndex, lanePosition)]) + offsetInLane, bytesInLane);
+		sizeLeft -= bytesInLane;
+		lanePosition++;
+		curData += bytesInLane;
+	}
+
+	while (sizeLeft >= SnP_laneLengthInBytes) {
+		*(uint64_t*)curData = statesAsLanes[laneIndex(instanceIndex, lanePosition)];
+		sizeLeft -= SnP_laneLengthInBytes;
+		lanePosition++;
+		curData += SnP_laneLengthInBytes;
+	}
+
+	if (sizeLeft > 0) {
+		memcpy( curData, &statesAsLanes[laneIndex(instanceIndex, lanePosition)], sizeLeft);
+	}
+}
+
+void KeccakP1600times8_ExtractLanesAll(const void *states, unsigned char *data, unsigned int laneCount, unsigned int laneOffset) {
+	const V512 *stateAsLanes = states;
+	uint64_t *dataAsLanes = (uint64_t *)data;
+	unsigned int i;
+	V256 index = LANE_OFFSETS_INDEX(laneOffset);
+
+	for (i = 0; i < laneCount; i++) {
+		STORE_SCATTER8_64(dataAsLanes + i, index, stateAsLanes[i]);
+	}
+}
+
+void KeccakP1600times8_ExtractAndAddBytes(const void *states, unsigned int instanceIndex, const unsigned char *input, unsigned char *output, unsigned int offset, unsigned int length) {
+	unsigned int sizeLeft = length;
+	unsigned int lanePosition = offset / SnP_laneLengthInBytes;
+	unsigned int offsetInLane = offset % SnP_laneLengthInBytes;
+	const unsigned char *curInput = input;
+	unsigned char *curOutput = output;
+	const uint64_t *statesAsLanes = states;
+
+	if ((sizeLeft > 0) && (offsetInLane != 0)) {
+		unsigned int bytesInLane = SnP_laneLengthInBytes - offsetInLane;
+		uint64_t lane = statesAsLanes[laneIndex(instanceIndex, lanePosition)] >> (8 * offsetInLane);
+		if (bytesInLane > sizeLeft) {
+			bytesInLane = sizeLeft;
+		}
+		sizeLeft -= bytesInLane;
+		do {
+			*(curOutput++) = *(curInput++) ^ (unsigned char)lane;
+			lane >>= 8;
+		} while ( --bytesInLane != 0);
+		lanePosition++;
+	}
+
+	while (sizeLeft >= SnP_laneLengthInBytes) {
+		*((uint64_t*)curOutput) = *((uint64_t*)curInput) ^ statesAsLanes[laneIndex(instanceIndex, lanePosition)];
+		sizeLeft -= SnP_laneLengthInBytes;
+		lanePosition++;
+		curInput += SnP_laneLengthInBytes;
+		curOutput += SnP_laneLengthInBytes;
+	}
+
+	if (sizeLeft != 0) {
+		uint64_t lane = statesAsLanes[laneIndex(instanceIndex, lanePosition)];
+		do {
+			*(curOutput++) = *(curInput++) ^ (unsigned char)lane;
+			lane >>= 8;
+		} while ( --sizeLeft != 0);
+	}
+}
+
+void KeccakP1600times8_ExtractAndAddLanesAll(const void *states, const unsigned char *input, unsigned char *output, unsigned int laneCount, unsigned int laneOffset) {
+	const V512 *stateAsLanes = states;
+	const uint64_t *inAsLanes = (const uint64_t *)input;
+	uint64_t *outAsLanes = (uint64_t *)output;
+	unsigned int i;
+	V256 index = LANE_OFFSETS_INDEX(laneOffset);
+
+	for (i = 0; i < laneCount; i++) {
+		STORE_SCATTER8_64(outAsLanes + i, index, XOR(stateAsLanes[i], LOAD_GATHER8_64(index, inAsLanes + i)));
+	}
+}
+
+static ALIGN(KeccakP1600times8_statesAlignment) const uint64_t KeccakP1600RoundConstants[24] = {
+	0x0000000000000001ULL,
+	0x0000000000008082ULL,
+	0x800000000000808aULL,
+	0x8000000080008000ULL,
+	0x000000000000808bULL,
+	0x0000000080000001ULL,
+	0x8000000080008081ULL,
+	0x8000000000008009ULL,
+	0x000000000000008aULL,
+	0x0000000000000088ULL,
+	0x0000000080008009ULL,
+	0x000000008000000aULL,
+	0x000000008000808bULL,
+	0x800000000000008bULL,
+	0x8000000000008089ULL,
+	0x8000000000008003ULL,
+	0x8000000000008002ULL,
+	0x8000000000000080ULL,
+	0x000000000000800aULL,
+	0x800000008000000aULL,
+	0x8000000080008081ULL,
+	0x8000000000008080ULL,
+	0x0000000080000001ULL,
+	0x8000000080008008ULL
+};
+
+#define KeccakP_DeclareVars \
+    V512    _Ba, _Be, _Bi, _Bo, _Bu; \
+    V512    _Da, _De, _Di, _Do, _Du; \
+    V512    _ba, _be, _bi, _bo, _bu; \
+    V512    _ga, _ge, _gi, _go, _gu; \
+    V512    _ka, _ke, _ki, _ko, _ku; \
+    V512    _ma, _me, _mi, _mo, _mu; \
+    V512    _sa, _se, _si, _so, _su
+
+#define KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Bb1, _Bb2, _Bb3, _Bb4, _Bb5, _Rr1, _Rr2, _Rr3, _Rr4, _Rr5 ) \
+    _Bb1 = XOR(_L1, _Da); \
+    _Bb2 = XOR(_L2, _De); \
+    _Bb3 = XOR(_L3, _Di); \
+    _Bb4 = XOR(_L4, _Do); \
+    _Bb5 = XOR(_L5, _Du); \
+    if (_Rr1 != 0) _Bb1 = ROL(_Bb1, _Rr1); \
+    _Bb2 = ROL(_Bb2, _Rr2); \
+    _Bb3 = ROL(_Bb3, _Rr3); \
+    _Bb4 = ROL(_Bb4, _Rr4); \
+    _Bb5 = ROL(_Bb5, _Rr5); \
+    _L1 = Chi( _Ba, _Be, _Bi); \
+    _L2 = Chi( _Be, _Bi, _Bo); \
+    _L3 = Chi( _Bi, _Bo, _Bu); \
+    _L4 = Chi( _Bo, _Bu, _Ba); \
+    _L5 = Chi( _Bu, _Ba, _Be);
+
+#define KeccakP_ThetaRhoPiChiIota0( _L1, _L2, _L3, _L4, _L5, _rc ) \
+    _Ba = XOR5( _ba, _ga, _ka, _ma, _sa ); /* Theta effect */ \
+    _Be = XOR5( _be, _ge, _ke, _me, _se ); \
+    _Bi = XOR5( _bi, _gi, _ki, _mi, _si ); \
+    _Bo = XOR5( _bo, _go, _ko, _mo, _so ); \
+    _Bu = XOR5( _bu, _gu, _ku, _mu, _su ); \
+    _Da = ROL( _Be, 1 ); \
+    _De = ROL( _Bi, 1 ); \
+    _Di = ROL( _Bo, 1 ); \
+    _Do = ROL( _Bu, 1 ); \
+    _Du = ROL( _Ba, 1 ); \
+    _Da = XOR( _Da, _Bu ); \
+    _De = XOR( _De, _Ba ); \
+    _Di = XOR( _Di, _Be ); \
+    _Do = XOR( _Do, _Bi ); \
+    _Du = XOR( _Du, _Bo ); \
+    KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Ba, _Be, _Bi, _Bo, _Bu,  0, 44, 43, 21, 14 ); \
+    _L1 = XOR(_L1, _rc) /* Iota */
+
+#define KeccakP_ThetaRhoPiChi1( _L1, _L2, _L3, _L4, _L5 ) \
+    KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Bi, _Bo, _Bu, _Ba, _Be,  3, 45, 61, 28, 20 )
+
+#define KeccakP_ThetaRhoPiChi2( _L1, _L2, _L3, _L4, _L5 ) \
+    KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Bu, _Ba, _Be, _Bi, _Bo, 18,  1,  6, 25,  8 )
+
+#define KeccakP_ThetaRhoPiChi3( _L1, _L2, _L3, _L4, _L5 ) \
+    KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Be, _Bi, _Bo, _Bu, _Ba, 36, 10, 15, 56, 27 )
+
+#define KeccakP_ThetaRhoPiChi4( _L1, _L2, _L3, _L4, _L5 ) \
+    KeccakP_ThetaRhoPiChi( _L1, _L2, _L3, _L4, _L5, _Bo, _Bu, _Ba, _Be, _Bi, 41,  2, 62, 55, 39 )
+
+#define KeccakP_4rounds( i ) \
+    KeccakP_ThetaRhoPiChiIota0(_ba, _ge, _ki, _mo, _su, CONST512_64(KeccakP1600RoundConstants[i]) ); \
+    KeccakP_ThetaRhoPiChi1(    _ka, _me, _si, _bo, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _sa, _be, _gi, _ko, _mu ); \
+    KeccakP_ThetaRhoPiChi3(    _ga, _ke, _mi, _so, _bu ); \
+    KeccakP_ThetaRhoPiChi4(    _ma, _se, _bi, _go, _ku ); \
+\
+    KeccakP_ThetaRhoPiChiIota0(_ba, _me, _gi, _so, _ku, CONST512_64(KeccakP1600RoundConstants[i+1]) ); \
+    KeccakP_ThetaRhoPiChi1(    _sa, _ke, _bi, _mo, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _ma, _ge, _si, _ko, _bu ); \
+    KeccakP_ThetaRhoPiChi3(    _ka, _be, _mi, _go, _su ); \
+    KeccakP_ThetaRhoPiChi4(    _ga, _se, _ki, _bo, _mu ); \
+\
+    KeccakP_ThetaRhoPiChiIota0(_ba, _ke, _si, _go, _mu, CONST512_64(KeccakP1600RoundConstants[i+2]) ); \
+    KeccakP_ThetaRhoPiChi1(    _ma, _be, _ki, _so, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _ga, _me, _bi, _ko, _su ); \
+    KeccakP_ThetaRhoPiChi3(    _sa, _ge, _mi, _bo, _ku ); \
+    KeccakP_ThetaRhoPiChi4(    _ka, _se, _gi, _mo, _bu ); \
+\
+    KeccakP_ThetaRhoPiChiIota0(_ba, _be, _bi, _bo, _bu, CONST512_64(KeccakP1600RoundConstants[i+3]) ); \
+    KeccakP_ThetaRhoPiChi1(    _ga, _ge, _gi, _go, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _ka, _ke, _ki, _ko, _ku ); \
+    KeccakP_ThetaRhoPiChi3(    _ma, _me, _mi, _mo, _mu ); \
+    KeccakP_ThetaRhoPiChi4(    _sa, _se, _si, _so, _su )
+
+#define KeccakP_2rounds( i ) \
+    KeccakP_ThetaRhoPiChiIota0(_ba, _ke, _si, _go, _mu, CONST512_64(KeccakP1600RoundConstants[i]) ); \
+    KeccakP_ThetaRhoPiChi1(    _ma, _be, _ki, _so, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _ga, _me, _bi, _ko, _su ); \
+    KeccakP_ThetaRhoPiChi3(    _sa, _ge, _mi, _bo, _ku ); \
+    KeccakP_ThetaRhoPiChi4(    _ka, _se, _gi, _mo, _bu ); \
+\
+    KeccakP_ThetaRhoPiChiIota0(_ba, _be, _bi, _bo, _bu, CONST512_64(KeccakP1600RoundConstants[i+1]) ); \
+    KeccakP_ThetaRhoPiChi1(    _ga, _ge, _gi, _go, _gu ); \
+    KeccakP_ThetaRhoPiChi2(    _ka, _ke, _ki, _ko, _ku ); \
+    KeccakP_ThetaRhoPiChi3(    _ma, _me, _mi, _mo, _mu ); \
+    KeccakP_ThetaRhoPiChi4(    _sa, _se, _si, _so, _su )
+
+#ifdef KeccakP1600times8_fullUnrolling
+
+#define rounds12 \
+    KeccakP_4rounds( 12 ); \
+    KeccakP_4rounds( 16 ); \
+    KeccakP_4rounds( 20 )
+
+#define rounds24 \
+    KeccakP_4rounds( 0 ); \
+    KeccakP_4rounds( 4 ); \
+    KeccakP_4rounds( 8 ); \
+    KeccakP_4rounds( 12 ); \
+    KeccakP_4rounds( 16 ); \
+    KeccakP_4rounds( 20 )
+
+#elif (KeccakP1600times8_unrolling == 4)
+
+#define rounds12 \
+    i = 12; \
+    do { \
+        KeccakP_4rounds( i ); \
+    } while( (i += 4) < 24 )
+
+#define rounds24 \
+    i = 0; \
+    do { \
+        KeccakP_4rounds( i ); \
+    } while( (i += 4) < 24 )
+
+#elif (KeccakP1600times8_unrolling == 12)
+
+#define rounds12 \
+    KeccakP_4rounds( 12 ); \
+    KeccakP_4rounds( 16 ); \
+    KeccakP_4rounds( 20 )
+
+#define rounds24 \
+    i = 0; \
+    do { \
+        KeccakP_4rounds( i ); \
+        KeccakP_4rounds( i+4 ); \
+        KeccakP_4rounds( i+8 ); \
+    } while( (i += 12) < 24 )
+
+#else
+#error "Unrolling is not correctly specified!"
+#endif
+
+#define copyFromState2rounds(pState) \
+    _ba = pState[ 0]; \
+    _be = pState[16]; /* me */ \
+    _bi = pState[ 7]; /* gi */ \
+    _bo = pState[23]; /* so */ \
+    _bu = pState[14]; /* ku */ \
+    _ga = pState[20]; /* sa */ \
+    _ge = pState[11]; /* ke */ \
+    _gi = pState[ 2]; /* bi */ \
+    _go = pState[18]; /* mo */ \
+    _gu = pState[ 9]; \
+    _ka = pState[15]; /* ma */ \
+    _ke = pState[ 6]; /* ge */ \
+    _ki = pState[22]; /* si */ \
+    _ko = pState[13]; \
+    _ku = pState[ 4]; /* bu */ \
+    _ma = pState[10]; /* ka */ \
+    _me = pState[ 1]; /* be */ \
+    _mi = pState[17]; \
+    _mo = pState[ 8]; /* go */ \
+    _mu = pState[24]; /* su */ \
+    _sa = pState[ 5]; /* ga */ \
+    _se = pState[21]; \
+    _si = pState[12]; /* ki */ \
+    _so = pState[ 3]; /* bo */ \
+    _su = pState[19]  /* mu */
+
+#define copyFromState(pState) \
+    _ba = pState[ 0]; \
+    _be = pState[ 1]; \
+    _bi = pState[ 2]; \
+    _bo = pState[ 3]; \
+    _bu = pState[ 4]; \
+    _ga = pState[ 5]; \
+    _ge = pState[ 6]; \
+    _gi = pState[ 7]; \
+    _go = pState[ 8]; \
+    _gu = pState[ 9]; \
+    _ka = pState[10]; \
+    _ke = pState[11]; \
+    _ki = pState[12]; \
+    _ko = pState[13]; \
+    _ku = pState[14]; \
+    _ma = pState[15]; \
+    _me = pState[16]; \
+    _mi = pState[17]; \
+    _mo = pState[18]; \
+    _mu = pState[19]; \
+    _sa = pState[20]; \
+    _se = pState[21]; \
+    _si = pState[22]; \
+    _so = pState[23]; \
+    _su = pState[24]
+
+#define copyToState(pState) \
+    pState[ 0] = _ba; \
+    pState[ 1] = _be; \
+    pState[ 2] = _bi; \
+    pState[ 3] = _bo; \
+    pState[ 4] = _bu; \
+    pState[ 5] = _ga; \
+    pState[ 6] = _ge; \
+    pState[ 7] = _gi; \
+    pState[ 8] = _go; \
+    pState[ 9] = _gu; \
+    pState[10] = _ka; \
+    pState[11] = _ke; \
+    pState[12] = _ki; \
+    pState[13] = _ko; \
+    pState[14] = _ku; \
+    pState[15] = _ma; \
+    pState[16] = _me; \
+    pState[17] = _mi; \
+    pState[18] = _mo; \
+    pState[19] = _mu; \
+    pState[20] = _sa; \
+    pState[21] = _se; \
+    pState[22] = _si; \
+    pState[23] = _so; \
+    pState[24] = _su
+
+void KeccakP1600times8_PermuteAll_24rounds(void *states) {
+	V512 *statesAsLanes = states;
+	KeccakP_DeclareVars;
+#ifndef KeccakP1600times8_fullUnrolling
+	unsigned int i;
+	(void)i;
+#endif
+
+	copyFromState(statesAsLanes);
+	rounds24;
+	copyToState(statesAsLanes);
+}
+
+void KeccakP1600times8_PermuteAll_12rounds(void *states) {
+	V512 *statesAsLanes = states;
+	KeccakP_DeclareVars;
+#if (KeccakP1600times8_unrolling < 12)
+	unsigned int i;
+	(void)i;
+#endif
+
+	copyFromState(statesAsLanes);
+	rounds12;
+	copyToState(statesAsLanes);
+}
+
+void KeccakP1600times8_PermuteAll_6rounds(void *states) {
+	V512 *statesAsLanes = states;
+	KeccakP_DeclareVars;
+
+	copyFromState2rounds(statesAsLanes);
+	KeccakP_2rounds( 18 );
+	KeccakP_4rounds( 20 );
+	copyToState(statesAsLanes);
+}
+
+void KeccakP1600times8_PermuteAll_4rounds(void *states) {
+	V512 *statesAsLanes = states;
+	KeccakP_DeclareVars;
+
+	copyFromState(statesAsLanes);
+	KeccakP_4rounds( 20 );
+	copyToState(statesAsLanes);
+}
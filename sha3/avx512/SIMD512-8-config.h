@@ -0,0 +1,7 @@
+/*
+This file defines some parameters of the implementation in the parent directory.
+*/
+
+#define KeccakP1600times8_implementation_config "AVX512, all rounds unrolled"
+#define KeccakP1600times8_fullUnrolling
+#define KeccakP1600times8_useAVX512
@@ -9,3 +9,4 @@
 #define XKCP_has_FIPS202
 #define XKCP_has_KeccakP1600
 #define XKCP_has_KeccakP1600times4
+#define XKCP_has_KeccakP1600times8
@@ -12,44 +12,72 @@
 #include "expand_mq.h"
 #include "blc.h"
 #include "piop.h"
+#include "piop_default.h"
 #include "benchmark.h"
 #include "sign.h"
 
-#if defined(USE_XOF_X4)
+#if defined(USE_XOF_X8)
+/* Grind SAMPLE_CHALLENGE_LANES nonces per iteration with the x8 XOF */
+#define SAMPLE_CHALLENGE_LANES 8
+#define sample_challenge_xof_context xof_context_x8
+#define sample_challenge_xof_init xof_init_x8
+#define sample_challenge_xof_update xof_update_x8
+#define sample_challenge_xof_squeeze xof_squeeze_x8
+#define sample_challenge_xof_clean_ctx xof_clean_ctx_x8
+#elif defined(USE_XOF_X4)
+/* Grind SAMPLE_CHALLENGE_LANES nonces per iteration with the x4 XOF */
+#define SAMPLE_CHALLENGE_LANES 4
+#define sample_challenge_xof_context xof_context_x4
+#define sample_challenge_xof_init xof_init_x4
+#define sample_challenge_xof_update xof_update_x4
+#define sample_challenge_xof_squeeze xof_squeeze_x4
+#define sample_challenge_xof_clean_ctx xof_clean_ctx_x4
+#endif
+
+#if defined(SAMPLE_CHALLENGE_LANES)
 int SampleChallenge(const uint8_t hash[MQOM2_PARAM_DIGEST_SIZE], uint16_t i_star[MQOM2_PARAM_TAU], uint8_t nonce[4]) {
 	int ret = -1;
 	int e;
-	xof_context_x4 DECL_VAR(xof_ctx);
-	uint32_t nonce_int[4] = { 0, 1, 2, 3 };
-	uint8_t _nonce[4][4];
-	uint16_t _i_star[4][MQOM2_PARAM_TAU];
+	sample_challenge_xof_context DECL_VAR(xof_ctx);
+	uint32_t nonce_int[SAMPLE_CHALLENGE_LANES];
+	uint8_t _nonce[SAMPLE_CHALLENGE_LANES][4];
+	uint16_t _i_star[SAMPLE_CHALLENGE_LANES][MQOM2_PARAM_TAU];
 	unsigned int i;
-	const uint8_t *constant_5[4] = { (const uint8_t*) "\x05", (const uint8_t*) "\x05", (const uint8_t*) "\x05", (const uint8_t*) "\x05" };
-	const uint8_t *hash_ptr[4] = { hash, hash, hash, hash };
-	uint8_t *nonce_ptr[4] = { _nonce[0], _nonce[1], _nonce[2], _nonce[3] };
+	const uint8_t *constant_5[SAMPLE_CHALLENGE_LANES];
+	const uint8_t *hash_ptr[SAMPLE_CHALLENGE_LANES];
+	uint8_t *nonce_ptr[SAMPLE_CHALLENGE_LANES];
 
 	uint16_t val;
-	uint8_t tmp[4][MQOM2_PARAM_TAU * 2 + 2];
-	uint8_t *tmp_ptr[4] = { tmp[0], tmp[1], tmp[2], tmp[3] };
-
+	uint8_t tmp[SAMPLE_CHALLENGE_LANES][MQOM2_PARAM_TAU * 2 + 2];
+	uint8_t *tmp_ptr[SAMPLE_CHALLENGE_LANES];
+
+	for (i = 0; i < SAMPLE_CHALLENGE_LANES; i++) {
+		nonce_int[i] = i;
+		constant_5[i] = (const uint8_t*) "\x05";
+		hash_ptr[i] = hash;
+		nonce_ptr[i] = _nonce[i];
+		tmp_ptr[i] = tmp[i];
+	}
 	do {
-		for (i = 0; i < 4; i++) {
+		for (i = 0; i < SAMPLE_CHALLENGE_LANES; i++) {
 			_nonce[i][0] = nonce_int[i] & 0xff;
 			_nonce[i][1] = (nonce_int[i] >> 8) & 0xff;
 			_nonce[i][2] = (nonce_int[i] >> 16) & 0xff;
 			_nonce[i][3] = (nonce_int[i] >> 24) & 0xff;
 		}
-		ret = xof_init_x4(&xof_ctx);
+		ret = sample_challenge_xof_init(&xof_ctx);
 		ERR(ret, err);
-		ret = xof_update_x4(&xof_ctx, constant_5, 1);
+		ret = sample_challenge_xof_update(&xof_ctx, constant_5, 1);
 		ERR(ret, err);
-		ret = xof_update_x4(&xof_ctx, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
+		ret = sample_challenge_xof_update(&xof_ctx, hash_ptr, MQOM2_PARAM_DIGEST_SIZE);
 		ERR(ret, err);
-		ret = xof_update_x4(&xof_ctx, (const uint8_t**)nonce_ptr, 4);
+		ret = sample_challenge_xof_update(&xof_ctx, (const uint8_t**)nonce_ptr, 4);
 		ERR(ret, err);
-		ret = xof_squeeze_x4(&xof_ctx, tmp_ptr, MQOM2_PARAM_TAU * 2 + 2);
+		ret = sample_challenge_xof_squeeze(&xof_ctx, tmp_ptr, MQOM2_PARAM_TAU * 2 + 2);
 		ERR(ret, err);
-		for (i = 0; i < 4; i++) {
+		/* The lanes are checked in increasing nonce order: the first valid nonce is the
+		 * one found by the serial loop */
+		for (i = 0; i < SAMPLE_CHALLENGE_LANES; i++) {
 			for (e = 0; e < MQOM2_PARAM_TAU; e++) {
 				_i_star[i][e] = (tmp[i][2 * e] + 256 * tmp[i][2 * e + 1]) & ((1 << MQOM2_PARAM_NB_EVALS_LOG) -1);
 			}
@@ -61,7 +89,7 @@ int SampleChallenge(const uint8_t hash[MQOM2_PARAM_DIGEST_SIZE], uint16_t i_star
 			if (val == 0) {
 				goto out_loop;
 			}
-			nonce_int[i] += 4;
+			nonce_int[i] += SAMPLE_CHALLENGE_LANES;
 		}
 	} while (1);
 
@@ -71,7 +99,7 @@ out_loop:
 
 	ret = 0;
 err:
-	xof_clean_ctx_x4(&xof_ctx);
+	sample_challenge_xof_clean_ctx(&xof_ctx);
 	return ret;
 }
 #else
@@ -122,11 +150,12 @@ err:
 #error "Error: USE_SIGNATURE_BUFFER_AS_TEMP and libOQS are NOT compatible ..."
 #endif
 
-int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
+/* Internal signature: when ctx is not NULL, the parsed witness and the expanded
+ * equations are taken from it instead of being recomputed */
+static int Sign_internal(const uint8_t sk[MQOM2_SK_SIZE], const sign_ctx_t *ctx, const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
 	int ret = -1;
 	int e;
-	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
-	uint8_t *hash = msg_hash;
+	uint8_t hash[MQOM2_PARAM_DIGEST_SIZE];
 	blc_key_t key;
 	field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
 	/* XXX: alignment of u0 because of aliasing of i_star */
@@ -185,17 +214,12 @@ int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long
 
 	/* Parse the secret key */
 	const uint8_t *pk = &sk[0];
-	field_base_parse(&sk[(2 * MQOM2_PARAM_SEED_SIZE) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], MQOM2_PARAM_MQ_N, x);
-
-	/* Hash message */
-	ret = xof_init(xof_ctx);
-	ERR(ret, err);
-	ret = xof_update(xof_ctx, (const uint8_t*) "\x02", 1);
-	ERR(ret, err);
-	ret = xof_update(xof_ctx, msg, mlen);
-	ERR(ret, err);
-	ret = xof_squeeze(xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
-	ERR(ret, err);
+	if (ctx != NULL) {
+		memcpy(x, ctx->x, sizeof(x));
+	}
+	else {
+		field_base_parse(&sk[(2 * MQOM2_PARAM_SEED_SIZE) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], MQOM2_PARAM_MQ_N, x);
+	}
 
 	/* Commit Lines */
 	__BENCHMARK_START__(BS_BLC_COMMIT);
@@ -205,10 +229,19 @@ int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long
 
 	/* Compute P_alpha */
 	__BENCHMARK_START__(BS_PIOP_COMPUTE);
-	ret = ComputePAlpha(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x0,
-				  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u0,
-				  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u1,
-				  x, &sk[0], alpha0, alpha1);
+	if (ctx != NULL) {
+		ret = ComputePAlpha_expanded_default(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x0,
+					  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u0,
+					  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u1,
+					  x, (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])ctx->A_hat,
+					  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])ctx->b_hat, alpha0, alpha1);
+	}
+	else {
+		ret = ComputePAlpha(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x0,
+					  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u0,
+					  (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u1,
+					  x, &sk[0], alpha0, alpha1);
+	}
 	ERR(ret, err);
 	__BENCHMARK_STOP__(BS_PIOP_COMPUTE);
 
@@ -283,7 +316,7 @@ int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long
 err:
 	mqom_cleanse((void*)&key, sizeof(key));
 	mqom_cleanse((void*)x, sizeof(x));
-	mqom_cleanse((void*)msg_hash, sizeof(msg_hash));
+	mqom_cleanse((void*)hash, sizeof(hash));
 #if defined(USE_SIGNATURE_BUFFER_AS_TEMP)
 	/* XXX: do not cleanse if temporary variable is aliased */
 	if((MQOM2_PARAM_TAU * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt)) < sizeof(blc_key_t)){
@@ -307,11 +340,172 @@ err:
 	return ret;
 }
 
-int Verify_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]) {
+int HashMessage_init(sign_stream_t *stream) {
+	int ret = -1;
+
+	if (stream == NULL) {
+		goto err;
+	}
+	memset(&stream->xof_ctx, 0, sizeof(xof_context));
+	ret = xof_init(&stream->xof_ctx);
+	ERR(ret, err);
+	ret = xof_update(&stream->xof_ctx, (const uint8_t*) "\x02", 1);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int HashMessage_update(sign_stream_t *stream, const uint8_t *msg, unsigned long long mlen) {
+	int ret = -1;
+
+	if ((stream == NULL) || (stream->xof_ctx.xof_finalized)) {
+		goto err;
+	}
+	ret = xof_update(&stream->xof_ctx, msg, mlen);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int HashMessage_final(sign_stream_t *stream, uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE]) {
+	int ret = -1;
+
+	if ((stream == NULL) || (stream->xof_ctx.xof_finalized)) {
+		goto err;
+	}
+	ret = xof_squeeze(&stream->xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+/* One-shot message hash, used by the signature and verification primitives
+ * taking the full message */
+int HashMessage(const uint8_t *msg, unsigned long long mlen, uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE]) {
+	int ret = -1;
+	sign_stream_t stream;
+
+	ret = HashMessage_init(&stream);
+	ERR(ret, err);
+	ret = HashMessage_update(&stream, msg, mlen);
+	ERR(ret, err);
+	ret = HashMessage_final(&stream, msg_hash);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	xof_clean_ctx(&stream.xof_ctx);
+	return ret;
+}
+
+int Sign_hashed(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
+	return Sign_internal(sk, NULL, msg_hash, salt, mseed, sig);
+}
+
+int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	ret = HashMessage(msg, mlen, msg_hash);
+	ERR(ret, err);
+	ret = Sign_internal(sk, NULL, msg_hash, salt, mseed, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	mqom_cleanse((void*)msg_hash, sizeof(msg_hash));
+	return ret;
+}
+
+int SignCtx_init(const uint8_t sk[MQOM2_SK_SIZE], sign_ctx_t *ctx) {
+	int ret = -1;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	memset(ctx, 0, sizeof(sign_ctx_t));
+
+	ctx->A_hat = (field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	if (ctx->A_hat == NULL) {
+		ret = -1;
+		goto err;
+	}
+	ctx->b_hat = (field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	if (ctx->b_hat == NULL) {
+		ret = -1;
+		goto err;
+	}
+
+	/* Parse the secret key */
+	memcpy(ctx->sk, sk, MQOM2_SK_SIZE);
+	field_base_parse(&sk[(2 * MQOM2_PARAM_SEED_SIZE) + BYTE_SIZE_FIELD_EXT(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)], MQOM2_PARAM_MQ_N, ctx->x);
+
+	/* Expand the equations once and for all */
+	__BENCHMARK_START__(BS_PIOP_EXPAND_MQ);
+	ret = ExpandEquations(&sk[0], ctx->A_hat, ctx->b_hat);
+	ERR(ret, err);
+	__BENCHMARK_STOP__(BS_PIOP_EXPAND_MQ);
+
+	ret = 0;
+err:
+	if (ret) {
+		SignCtx_clean(ctx);
+	}
+	return ret;
+}
+
+void SignCtx_clean(sign_ctx_t *ctx) {
+	if (ctx == NULL) {
+		return;
+	}
+	if (ctx->A_hat != NULL) {
+		mqom_cleanse((void*)ctx->A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+		mqom_free(ctx->A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	if (ctx->b_hat != NULL) {
+		mqom_cleanse((void*)ctx->b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+		mqom_free(ctx->b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	mqom_cleanse((void*)ctx, sizeof(sign_ctx_t));
+
+	return;
+}
+
+int Sign_with_ctx_hashed(const sign_ctx_t *ctx, const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
+	if ((ctx == NULL) || (ctx->A_hat == NULL) || (ctx->b_hat == NULL)) {
+		return -1;
+	}
+	return Sign_internal(ctx->sk, ctx, msg_hash, salt, mseed, sig);
+}
+
+int Sign_with_ctx(const sign_ctx_t *ctx, const uint8_t *msg, unsigned long long mlen, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	ret = HashMessage(msg, mlen, msg_hash);
+	ERR(ret, err);
+	ret = Sign_with_ctx_hashed(ctx, msg_hash, salt, mseed, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	mqom_cleanse((void*)msg_hash, sizeof(msg_hash));
+	return ret;
+}
+
+/* Verify from the public key, with the already expanded equations (A_hat, b_hat)
+ * when not NULL and re-expanding them otherwise */
+static int Verify_hashed_internal(const uint8_t pk[MQOM2_PK_SIZE], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t sig[MQOM2_SIG_SIZE]) {
 	int ret = -1;
 	int e;
 	uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE];
-	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], hash[MQOM2_PARAM_DIGEST_SIZE], com2_[MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t hash[MQOM2_PARAM_DIGEST_SIZE], com2_[MQOM2_PARAM_DIGEST_SIZE];
 	field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
 	field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
 
@@ -352,16 +546,6 @@ int Verify_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned
 	const uint8_t *opening = &sig[pos];
 	const uint8_t *nonce = &sig[MQOM2_SIG_SIZE - 4];
 
-	/* Hash message */
-	ret = xof_init(xof_ctx);
-	ERR(ret, err);
-	ret = xof_update(xof_ctx, (const uint8_t*) "\x02", 1);
-	ERR(ret, err);
-	ret = xof_update(xof_ctx, msg, mlen);
-	ERR(ret, err);
-	ret = xof_squeeze(xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
-	ERR(ret, err);
-
 	/* Compute Fiat-Shamir hash */
 	ret = xof_init(xof_ctx);
 	ERR(ret, err);
@@ -411,9 +595,15 @@ int Verify_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned
 	for (e = 0; e < MQOM2_PARAM_TAU; e++) {
 		field_ext_parse(&serialized_alpha1[e * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)], MQOM2_PARAM_ETA, alpha1[e]);
 	}
-	ret = RecomputePAlpha(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])alpha1, i_star,
-				    (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x_eval,
-				    (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u_eval, mseed_eq, y, alpha0);
+	if (A_hat != NULL) {
+		ret = RecomputePAlpha_expanded_default(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])alpha1, i_star,
+						       (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x_eval,
+						       (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u_eval, A_hat, b_hat, y, alpha0);
+	} else {
+		ret = RecomputePAlpha(com1, (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])alpha1, i_star,
+				      (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x_eval,
+				      (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u_eval, mseed_eq, y, alpha0);
+	}
 	ERR(ret, err);
 
 	/* Hash P_alpha */
@@ -442,3 +632,299 @@ err:
 	xof_clean_ctx(xof_ctx);
 	return ret;
 }
+
+int Verify_hashed_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t sig[MQOM2_SIG_SIZE]) {
+	return Verify_hashed_internal(pk, NULL, NULL, msg_hash, sig);
+}
+
+int Verify_expanded(const uint8_t pk[MQOM2_PK_SIZE], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	if ((A_hat == NULL) || (b_hat == NULL)) {
+		goto err;
+	}
+	ret = HashMessage(msg, mlen, msg_hash);
+	ERR(ret, err);
+	ret = Verify_hashed_internal(pk, A_hat, b_hat, msg_hash, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int Verify_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	ret = HashMessage(msg, mlen, msg_hash);
+	ERR(ret, err);
+	ret = Verify_hashed_default(pk, msg_hash, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+/* Hash with the XOF "domain || chunks[0] || ... || chunks[nb_chunks - 1]" for nb
+ * lanes (nb in [1, 4]), all the lanes having the same chunks lengths. The x4 XOF
+ * is used when more than one lane is active */
+static int xof_hash_lanes(uint8_t domain, uint32_t nb, uint32_t nb_chunks, const uint8_t *chunks[][4], const size_t chunks_len[], uint8_t *out[4], uint32_t out_len) {
+	int ret = -1;
+	uint32_t c, l;
+#if defined(USE_XOF_X4)
+	xof_context_x4 DECL_VAR(xof_ctx_x4);
+	const uint8_t *domain_ptr[4] = { &domain, &domain, &domain, &domain };
+	uint8_t *out_[4];
+	uint8_t dummy[3][MQOM2_PARAM_TAU * 2 + 2 + MQOM2_PARAM_DIGEST_SIZE];
+#endif
+	xof_context DECL_VAR(xof_ctx);
+
+#if defined(USE_XOF_X4)
+	if ((nb > 1) && (out_len <= sizeof(dummy[0]))) {
+		/* Inactive lanes are fed with lane 0 and squeezed in dummy buffers */
+		for (l = 0; l < 4; l++) {
+			out_[l] = (l < nb) ? out[l] : dummy[l - 1];
+		}
+		ret = xof_init_x4(&xof_ctx_x4);
+		ERR(ret, err);
+		ret = xof_update_x4(&xof_ctx_x4, domain_ptr, 1);
+		ERR(ret, err);
+		for (c = 0; c < nb_chunks; c++) {
+			const uint8_t *chunk[4];
+			for (l = 0; l < 4; l++) {
+				chunk[l] = (l < nb) ? chunks[c][l] : chunks[c][0];
+			}
+			ret = xof_update_x4(&xof_ctx_x4, chunk, chunks_len[c]);
+			ERR(ret, err);
+		}
+		ret = xof_squeeze_x4(&xof_ctx_x4, out_, out_len);
+		ERR(ret, err);
+		ret = 0;
+		goto err;
+	}
+#endif
+	for (l = 0; l < nb; l++) {
+		ret = xof_init(&xof_ctx);
+		ERR(ret, err);
+		ret = xof_update(&xof_ctx, &domain, 1);
+		ERR(ret, err);
+		for (c = 0; c < nb_chunks; c++) {
+			ret = xof_update(&xof_ctx, chunks[c][l], chunks_len[c]);
+			ERR(ret, err);
+		}
+		ret = xof_squeeze(&xof_ctx, out[l], out_len);
+		ERR(ret, err);
+	}
+
+	ret = 0;
+err:
+#if defined(USE_XOF_X4)
+	xof_clean_ctx_x4(&xof_ctx_x4);
+#endif
+	xof_clean_ctx(&xof_ctx);
+	return ret;
+}
+
+int VerifyCtx_init(const uint8_t pk[MQOM2_PK_SIZE], verify_ctx_t *ctx) {
+	int ret = -1;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	memset(ctx, 0, sizeof(verify_ctx_t));
+
+	ctx->A_hat = (field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	if (ctx->A_hat == NULL) {
+		ret = -1;
+		goto err;
+	}
+	ctx->b_hat = (field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])mqom_malloc((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	if (ctx->b_hat == NULL) {
+		ret = -1;
+		goto err;
+	}
+
+	/* Parse the public key */
+	memcpy(ctx->pk, pk, MQOM2_PK_SIZE);
+	field_ext_parse(&pk[2 * MQOM2_PARAM_SEED_SIZE], MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU, ctx->y);
+
+	/* Expand the equations once and for all */
+	ret = ExpandEquations(&pk[0], ctx->A_hat, ctx->b_hat);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	if (ret) {
+		VerifyCtx_clean(ctx);
+	}
+	return ret;
+}
+
+void VerifyCtx_clean(verify_ctx_t *ctx) {
+	if (ctx == NULL) {
+		return;
+	}
+	if (ctx->A_hat != NULL) {
+		mqom_free(ctx->A_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	if (ctx->b_hat != NULL) {
+		mqom_free(ctx->b_hat, (MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt));
+	}
+	memset(ctx, 0, sizeof(verify_ctx_t));
+
+	return;
+}
+
+int Verify_with_ctx_x4(const verify_ctx_t *ctx, const uint8_t *msg[4], const unsigned long long mlen[4], const uint8_t *sig[4], uint32_t nb, int results[4]) {
+	int ret = -1;
+	uint32_t l, e;
+	uint8_t msg_hash[4][MQOM2_PARAM_DIGEST_SIZE], hash[4][MQOM2_PARAM_DIGEST_SIZE], com2_[4][MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t tmp[4][MQOM2_PARAM_TAU * 2 + 2];
+	uint8_t serialized_alpha0[4][MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)];
+	uint16_t i_star[MQOM2_PARAM_TAU];
+	field_ext_elt x_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt u_eval[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt alpha0[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	field_ext_elt alpha1[MQOM2_PARAM_TAU][FIELD_EXT_PACKING(MQOM2_PARAM_ETA)];
+	const uint8_t *chunks[4][4];
+	size_t chunks_len[4];
+	uint8_t *out[4] = { NULL, NULL, NULL, NULL };
+	xof_context DECL_VAR(xof_ctx);
+
+	if ((ctx == NULL) || (ctx->A_hat == NULL) || (ctx->b_hat == NULL) || (nb == 0) || (nb > 4)) {
+		goto err;
+	}
+	for (l = 0; l < nb; l++) {
+		results[l] = -1;
+	}
+
+	/* Parse the signatures */
+	const uint8_t *salt[4], *com1[4], *com2[4], *serialized_alpha1[4], *opening[4], *nonce[4];
+	for (l = 0; l < nb; l++) {
+		unsigned int pos = 0;
+		salt[l] = &sig[l][pos];
+		pos += MQOM2_PARAM_SALT_SIZE;
+		com1[l] = &sig[l][pos];
+		pos += MQOM2_PARAM_DIGEST_SIZE;
+		com2[l] = &sig[l][pos];
+		pos += MQOM2_PARAM_DIGEST_SIZE;
+		serialized_alpha1[l] = &sig[l][pos];
+		pos += MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU);
+		opening[l] = &sig[l][pos];
+		nonce[l] = &sig[l][MQOM2_SIG_SIZE - 4];
+	}
+
+	/* Hash messages: interleaved only when all the lengths are the same */
+	uint8_t same_mlen = 1;
+	for (l = 1; l < nb; l++) {
+		if (mlen[l] != mlen[0]) {
+			same_mlen = 0;
+		}
+	}
+	if (same_mlen) {
+		for (l = 0; l < nb; l++) {
+			chunks[0][l] = msg[l];
+			out[l] = msg_hash[l];
+		}
+		chunks_len[0] = (size_t)mlen[0];
+		ret = xof_hash_lanes(0x02, nb, 1, chunks, chunks_len, out, MQOM2_PARAM_DIGEST_SIZE);
+		ERR(ret, err);
+	}
+	else {
+		for (l = 0; l < nb; l++) {
+			ret = xof_init(&xof_ctx);
+			ERR(ret, err);
+			ret = xof_update(&xof_ctx, (const uint8_t*) "\x02", 1);
+			ERR(ret, err);
+			ret = xof_update(&xof_ctx, msg[l], mlen[l]);
+			ERR(ret, err);
+			ret = xof_squeeze(&xof_ctx, msg_hash[l], MQOM2_PARAM_DIGEST_SIZE);
+			ERR(ret, err);
+		}
+	}
+
+	/* Compute Fiat-Shamir hashes */
+	for (l = 0; l < nb; l++) {
+		chunks[0][l] = ctx->pk;
+		chunks[1][l] = com1[l];
+		chunks[2][l] = com2[l];
+		chunks[3][l] = msg_hash[l];
+		out[l] = hash[l];
+	}
+	chunks_len[0] = MQOM2_PK_SIZE;
+	chunks_len[1] = chunks_len[2] = chunks_len[3] = MQOM2_PARAM_DIGEST_SIZE;
+	ret = xof_hash_lanes(0x04, nb, 4, chunks, chunks_len, out, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	/* Sample Challenges */
+	for (l = 0; l < nb; l++) {
+		chunks[0][l] = hash[l];
+		chunks[1][l] = nonce[l];
+		out[l] = tmp[l];
+	}
+	chunks_len[0] = MQOM2_PARAM_DIGEST_SIZE;
+	chunks_len[1] = 4;
+	ret = xof_hash_lanes(0x05, nb, 2, chunks, chunks_len, out, MQOM2_PARAM_TAU * 2 + 2);
+	ERR(ret, err);
+
+	/* Per signature BLC evaluation and PIOP, sharing the expanded equations */
+	for (l = 0; l < nb; l++) {
+		uint16_t val = (tmp[l][2 * MQOM2_PARAM_TAU] + tmp[l][2 * MQOM2_PARAM_TAU + 1] * 256) & ((1 << MQOM2_PARAM_W) -1);
+		memset(serialized_alpha0[l], 0, sizeof(serialized_alpha0[l]));
+		if (val != 0) {
+			continue;
+		}
+		for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+			i_star[e] = (tmp[l][2 * e] + 256 * tmp[l][2 * e + 1]) & ((1 << MQOM2_PARAM_NB_EVALS_LOG) -1);
+		}
+		/* Get Opened Evaluations */
+		if (BLC_Eval(salt[l], com1[l], opening[l], i_star, x_eval, u_eval)) {
+			continue;
+		}
+		/* Recompute P_alpha */
+		for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+			field_ext_parse(&serialized_alpha1[l][e * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)], MQOM2_PARAM_ETA, alpha1[e]);
+		}
+		if (RecomputePAlpha_expanded_default(com1[l], (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])alpha1, i_star,
+		                                     (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])x_eval,
+		                                     (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_ETA)])u_eval,
+		                                     (const field_ext_elt (*)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])ctx->A_hat,
+		                                     (const field_ext_elt (*)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)])ctx->b_hat,
+		                                     ctx->y, alpha0)) {
+			continue;
+		}
+		for (e = 0; e < MQOM2_PARAM_TAU; e++) {
+			field_ext_serialize(alpha0[e], MQOM2_PARAM_ETA, &serialized_alpha0[l][e * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU)]);
+		}
+		/* Candidate: the final decision is taken on com2 */
+		results[l] = 0;
+	}
+
+	/* Hash P_alpha */
+	for (l = 0; l < nb; l++) {
+		chunks[0][l] = serialized_alpha0[l];
+		chunks[1][l] = serialized_alpha1[l];
+		out[l] = com2_[l];
+	}
+	chunks_len[0] = chunks_len[1] = MQOM2_PARAM_TAU * BYTE_SIZE_FIELD_BASE(MQOM2_PARAM_ETA * MQOM2_PARAM_MU);
+	ret = xof_hash_lanes(0x03, nb, 2, chunks, chunks_len, out, MQOM2_PARAM_DIGEST_SIZE);
+	ERR(ret, err);
+
+	for (l = 0; l < nb; l++) {
+		if ((results[l] != 0) || memcmp(com2[l], com2_[l], MQOM2_PARAM_DIGEST_SIZE)) {
+			results[l] = -1;
+			ret = -1;
+		}
+	}
+	if (ret) {
+		goto err;
+	}
+
+	ret = 0;
+err:
+	xof_clean_ctx(&xof_ctx);
+	return ret;
+}
@@ -2,25 +2,114 @@
 #define __SIGN_H__
 
 #include "common.h"
+#include "fields.h"
+#include "xof.h"
 
 /* Deal with namespacing */
 #define SampleChallenge MQOM_NAMESPACE(SampleChallenge)
 #define Sign MQOM_NAMESPACE(Sign)
+#define Sign_hashed MQOM_NAMESPACE(Sign_hashed)
+#define HashMessage MQOM_NAMESPACE(HashMessage)
+#define HashMessage_init MQOM_NAMESPACE(HashMessage_init)
+#define HashMessage_update MQOM_NAMESPACE(HashMessage_update)
+#define HashMessage_final MQOM_NAMESPACE(HashMessage_final)
 #define Verify_default MQOM_NAMESPACE(Verify_default)
 #define Verify_memopt MQOM_NAMESPACE(Verify_memopt)
+#define Verify_hashed_default MQOM_NAMESPACE(Verify_hashed_default)
+#define Verify_hashed_memopt MQOM_NAMESPACE(Verify_hashed_memopt)
+#define Verify_expanded MQOM_NAMESPACE(Verify_expanded)
+#define SignCtx_init MQOM_NAMESPACE(SignCtx_init)
+#define SignCtx_clean MQOM_NAMESPACE(SignCtx_clean)
+#define Sign_with_ctx MQOM_NAMESPACE(Sign_with_ctx)
+#define Sign_with_ctx_hashed MQOM_NAMESPACE(Sign_with_ctx_hashed)
+#define VerifyCtx_init MQOM_NAMESPACE(VerifyCtx_init)
+#define VerifyCtx_clean MQOM_NAMESPACE(VerifyCtx_clean)
+#define Verify_with_ctx_x4 MQOM_NAMESPACE(Verify_with_ctx_x4)
+
+/* Expanded secret key context: holds the parsed witness x and the
+ * expanded equations (A_hat, b_hat) so that they are computed once and
+ * shared by all the signatures under the same key.
+ * XXX: this context holds secret data and must be cleaned with SignCtx_clean.
+ */
+typedef struct sign_ctx_t {
+	uint8_t sk[MQOM2_SK_SIZE];
+	field_base_elt x[FIELD_BASE_PACKING(MQOM2_PARAM_MQ_N)];
+	/* Heap allocated as these are too large for the stack */
+	field_ext_elt (*A_hat)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*b_hat)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+} sign_ctx_t;
+
+/* Expanded public key context: holds the parsed public key and the
+ * expanded equations (A_hat, b_hat) shared by all the verifications
+ * under the same public key.
+ */
+typedef struct verify_ctx_t {
+	uint8_t pk[MQOM2_PK_SIZE];
+	field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
+	/* Heap allocated as these are too large for the stack */
+	field_ext_elt (*A_hat)[MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+	field_ext_elt (*b_hat)[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)];
+} verify_ctx_t;
+
+/* Streaming message hash context: the message is only used through its
+ * hash "\x02" || msg, which can hence be absorbed by chunks */
+typedef struct sign_stream_t {
+	xof_context xof_ctx;
+} sign_stream_t;
+
+int HashMessage_init(sign_stream_t *stream);
+
+int HashMessage_update(sign_stream_t *stream, const uint8_t *msg, unsigned long long mlen);
+
+int HashMessage_final(sign_stream_t *stream, uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE]);
+
+/* One-shot message hash */
+int HashMessage(const uint8_t *msg, unsigned long long mlen, uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE]);
 
 int SampleChallenge(const uint8_t hash[MQOM2_PARAM_DIGEST_SIZE], uint16_t i_star[MQOM2_PARAM_TAU], uint8_t nonce[4]);
 
 int Sign(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]);
 
+/* Signature of an already hashed message (see HashMessage) */
+int Sign_hashed(const uint8_t sk[MQOM2_SK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]);
+
+int SignCtx_init(const uint8_t sk[MQOM2_SK_SIZE], sign_ctx_t *ctx);
+
+void SignCtx_clean(sign_ctx_t *ctx);
+
+int Sign_with_ctx(const sign_ctx_t *ctx, const uint8_t *msg, unsigned long long mlen, const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]);
+
+int Sign_with_ctx_hashed(const sign_ctx_t *ctx, const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t salt[MQOM2_PARAM_SALT_SIZE], const uint8_t mseed[MQOM2_PARAM_SEED_SIZE], uint8_t sig[MQOM2_SIG_SIZE]);
+
+int VerifyCtx_init(const uint8_t pk[MQOM2_PK_SIZE], verify_ctx_t *ctx);
+
+void VerifyCtx_clean(verify_ctx_t *ctx);
+
+/* Verify up to 4 signatures (nb in [1, 4]) under the public key of ctx,
+ * interleaving the hash computations across the x4 XOF lanes.
+ * results[i] is set to 0 for valid signatures and -1 otherwise, and
+ * 0 is returned when all the signatures are valid */
+int Verify_with_ctx_x4(const verify_ctx_t *ctx, const uint8_t *msg[4], const unsigned long long mlen[4], const uint8_t *sig[4], uint32_t nb, int results[4]);
+
 int Verify_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]);
 
 int Verify_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]);
 
+/* Verification of an already hashed message (see HashMessage) */
+int Verify_hashed_default(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t sig[MQOM2_SIG_SIZE]);
+
+int Verify_hashed_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t sig[MQOM2_SIG_SIZE]);
+
+/* Verification with the equations (A_hat, b_hat) of pk already expanded
+ * (e.g. by VerifyCtx_init or from an equations store, see eqstore.h) */
+int Verify_expanded(const uint8_t pk[MQOM2_PK_SIZE], const field_ext_elt A_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][MQOM2_PARAM_MQ_N][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const field_ext_elt b_hat[MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU][FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N)], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]);
+
 #ifdef VERIFY_MEMOPT
 #define Verify Verify_memopt
+#define Verify_hashed Verify_hashed_memopt
 #else
 #define Verify Verify_default
+#define Verify_hashed Verify_hashed_default
 #endif
 
 #endif /* __SIGN_H__ */
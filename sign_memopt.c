@@ -36,11 +36,11 @@ extern int randombytes(unsigned char* x, unsigned long long xlen);
 #error "Verify memopt relies on PIOP memopt, which is not defined."
 #endif
 
-int Verify_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]) {
+int Verify_hashed_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], const uint8_t sig[MQOM2_SIG_SIZE]) {
 	int ret = -1;
 	int e;
 	uint8_t mseed_eq[2 * MQOM2_PARAM_SEED_SIZE];
-	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE], hash[MQOM2_PARAM_DIGEST_SIZE], com2_[MQOM2_PARAM_DIGEST_SIZE];
+	uint8_t hash[MQOM2_PARAM_DIGEST_SIZE], com2_[MQOM2_PARAM_DIGEST_SIZE];
 	field_ext_elt y[FIELD_EXT_PACKING(MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU)];
 	xof_context DECL_VAR(xof_ctx);
 
@@ -61,16 +61,6 @@ int Verify_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned
 	const uint8_t *opening = &sig[pos];
 	const uint8_t *nonce = &sig[MQOM2_SIG_SIZE - 4];
 
-	/* Hash message */
-	ret = xof_init(&xof_ctx);
-	ERR(ret, err);
-	ret = xof_update(&xof_ctx, (const uint8_t*) "\x02", 1);
-	ERR(ret, err);
-	ret = xof_update(&xof_ctx, msg, mlen);
-	ERR(ret, err);
-	ret = xof_squeeze(&xof_ctx, msg_hash, MQOM2_PARAM_DIGEST_SIZE);
-	ERR(ret, err);
-
 	/* Compute Fiat-Shamir hash */
 	ret = xof_init(&xof_ctx);
 	ERR(ret, err);
@@ -185,3 +175,17 @@ err:
 	xof_clean_ctx(&xof_ctx);
 	return ret;
 }
+
+int Verify_memopt(const uint8_t pk[MQOM2_PK_SIZE], const uint8_t *msg, unsigned long long mlen, const uint8_t sig[MQOM2_SIG_SIZE]) {
+	int ret = -1;
+	uint8_t msg_hash[MQOM2_PARAM_DIGEST_SIZE];
+
+	ret = HashMessage(msg, mlen, msg_hash);
+	ERR(ret, err);
+	ret = Verify_hashed_memopt(pk, msg_hash, sig);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
@@ -0,0 +1,104 @@
+#include <stdlib.h>
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+#include <pthread.h>
+
+#include "api.h"
+
+/* Concurrent usage of the caller-owned workspaces: NB_THREADS threads sign and
+ * verify in a loop, each with its own workspace, while another thread signs
+ * with the heap allocating API. Any failure means that a thread has seen the
+ * workspace attached by another one */
+
+#define NB_THREADS 4
+#define NB_ITERATIONS 20
+#define MLEN 32
+
+static uint8_t pk[CRYPTO_PUBLICKEYBYTES];
+static uint8_t sk[CRYPTO_SECRETKEYBYTES];
+
+static pthread_mutex_t rng_lock = PTHREAD_MUTEX_INITIALIZER;
+
+int randombytes(unsigned char* x, unsigned long long xlen) {
+	pthread_mutex_lock(&rng_lock);
+	for (unsigned long long j = 0; j < xlen; j++) {
+		x[j] = (uint8_t) rand();
+	}
+	pthread_mutex_unlock(&rng_lock);
+	return 0;
+}
+
+typedef struct {
+	uint32_t index;
+	int use_ws;
+	uint32_t nb_failures;
+} worker_t;
+
+static void *run_worker(void *arg) {
+	worker_t *w = (worker_t*)arg;
+	uint8_t m[MLEN] = {0};
+	uint8_t sig[CRYPTO_BYTES];
+	unsigned long long siglen, wslen = crypto_sign_workspace_size();
+	uint32_t i;
+	void *ws = NULL;
+	int ret;
+
+	if (w->use_ws) {
+		ws = malloc(wslen);
+		if (ws == NULL) {
+			w->nb_failures = NB_ITERATIONS;
+			return NULL;
+		}
+	}
+	m[0] = (uint8_t)w->index;
+	for (i = 0; i < NB_ITERATIONS; i++) {
+		m[1] = (uint8_t)i;
+		if (w->use_ws) {
+			ret = crypto_sign_signature_ws(sig, &siglen, m, MLEN, sk, ws, wslen);
+			if (!ret) {
+				ret = crypto_sign_verify_ws(sig, siglen, m, MLEN, pk, ws, wslen);
+			}
+		} else {
+			ret = crypto_sign_signature(sig, &siglen, m, MLEN, sk);
+			if (!ret) {
+				ret = crypto_sign_verify(sig, siglen, m, MLEN, pk);
+			}
+		}
+		if (ret) {
+			w->nb_failures++;
+		}
+	}
+	free(ws);
+
+	return NULL;
+}
+
+int main(void) {
+	pthread_t threads[NB_THREADS + 1];
+	worker_t workers[NB_THREADS + 1];
+	uint32_t i, nb_failures = 0;
+
+	if (crypto_sign_keypair(pk, sk)) {
+		printf("Error: key generation failed\n");
+		return EXIT_FAILURE;
+	}
+	/* The last worker uses the heap allocating API */
+	for (i = 0; i <= NB_THREADS; i++) {
+		workers[i].index = i;
+		workers[i].use_ws = (i < NB_THREADS);
+		workers[i].nb_failures = 0;
+		if (pthread_create(&threads[i], NULL, run_worker, &workers[i])) {
+			printf("Error: cannot create thread %u\n", i);
+			return EXIT_FAILURE;
+		}
+	}
+	for (i = 0; i <= NB_THREADS; i++) {
+		pthread_join(threads[i], NULL);
+		nb_failures += workers[i].nb_failures;
+	}
+
+	printf("%s: %u threads with workspaces and 1 without, %u failures out of %u sign/verify\n",
+	       CRYPTO_ALGNAME, NB_THREADS, nb_failures, (NB_THREADS + 1) * NB_ITERATIONS);
+	return (nb_failures == 0) ? EXIT_SUCCESS : EXIT_FAILURE;
+}
@@ -0,0 +1,286 @@
+#include "threadpool.h"
+#include "workspace.h"
+
+#if defined(PARALLEL_REPETITIONS)
+#include <pthread.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+/* Maximum number of threads of the pool (including the calling thread) */
+#ifndef PARALLEL_REPETITIONS_MAX_THREADS
+#define PARALLEL_REPETITIONS_MAX_THREADS 64
+#endif
+/* Stack size of the worker threads: the tasks keep a whole GGM tree
+ * and its expansion on the stack, we do not rely on the (platform dependent)
+ * default size */
+#ifndef PARALLEL_REPETITIONS_STACK_SIZE
+#define PARALLEL_REPETITIONS_STACK_SIZE (8 * 1024 * 1024)
+#endif
+
+typedef struct {
+	pthread_mutex_t lock;
+	pthread_cond_t work_cond;
+	pthread_cond_t done_cond;
+	pthread_t workers[PARALLEL_REPETITIONS_MAX_THREADS - 1];
+	uint32_t nb_workers;
+	/* Configured number of threads, 0 when not yet resolved */
+	uint32_t nb_threads;
+	uint8_t started;
+	uint8_t shutdown;
+	uint8_t busy;
+	/* The current job */
+	uint64_t generation;
+	parallel_task_fn fn;
+	void *arg;
+	uint32_t nb_tasks;
+	uint32_t next_task;
+	uint32_t pending;
+	int error;
+	/* Workspace of the calling thread, if any */
+	workspace_t *ws;
+} threadpool_t;
+
+static threadpool_t pool = {
+	.lock = PTHREAD_MUTEX_INITIALIZER,
+	.work_cond = PTHREAD_COND_INITIALIZER,
+	.done_cond = PTHREAD_COND_INITIALIZER,
+};
+
+static uint32_t threadpool_default_nb_threads(void) {
+	long n = 0;
+	const char *env = getenv("MQOM2_NB_THREADS");
+
+	if (env != NULL) {
+		n = strtol(env, NULL, 10);
+	}
+#if defined(PARALLEL_REPETITIONS_NB_THREADS)
+	if (n <= 0) {
+		n = PARALLEL_REPETITIONS_NB_THREADS;
+	}
+#endif
+#if defined(_SC_NPROCESSORS_ONLN)
+	if (n <= 0) {
+		n = sysconf(_SC_NPROCESSORS_ONLN);
+	}
+#endif
+	if (n <= 0) {
+		n = 1;
+	}
+	if (n > PARALLEL_REPETITIONS_MAX_THREADS) {
+		n = PARALLEL_REPETITIONS_MAX_THREADS;
+	}
+	return (uint32_t)n;
+}
+
+/* Consume the tasks of the current job, must be called with the pool locked */
+static void threadpool_run_tasks(void) {
+	while (pool.next_task < pool.nb_tasks) {
+		uint32_t task = pool.next_task++;
+		parallel_task_fn fn = pool.fn;
+		void *arg = pool.arg;
+		int ret;
+
+		pthread_mutex_unlock(&pool.lock);
+		ret = fn(arg, task);
+		pthread_mutex_lock(&pool.lock);
+
+		if (ret) {
+			pool.error = -1;
+		}
+		pool.pending--;
+		if (pool.pending == 0) {
+			pthread_cond_broadcast(&pool.done_cond);
+		}
+	}
+}
+
+static void *threadpool_worker(void *arg) {
+	uint64_t generation = 0;
+	/* The index of the worker selects its arena in the workspace of the job */
+	uint32_t index = (uint32_t)(uintptr_t)arg;
+
+	pthread_mutex_lock(&pool.lock);
+	while (1) {
+		while ((!pool.shutdown) && (pool.generation == generation)) {
+			pthread_cond_wait(&pool.work_cond, &pool.lock);
+		}
+		if (pool.shutdown) {
+			break;
+		}
+		generation = pool.generation;
+		workspace_task_enter(pool.ws, index);
+		threadpool_run_tasks();
+		workspace_task_leave();
+	}
+	pthread_mutex_unlock(&pool.lock);
+
+	return NULL;
+}
+
+/* Start the worker threads, must be called with the pool locked */
+static int threadpool_start(void) {
+	int ret = -1;
+	uint32_t i;
+	pthread_attr_t attr;
+
+	if (pool.nb_threads == 0) {
+		pool.nb_threads = threadpool_default_nb_threads();
+	}
+	pool.shutdown = 0;
+	pool.nb_workers = 0;
+	if (pthread_attr_init(&attr)) {
+		goto err;
+	}
+	pthread_attr_setstacksize(&attr, PARALLEL_REPETITIONS_STACK_SIZE);
+	for (i = 0; i < pool.nb_threads - 1; i++) {
+		if (pthread_create(&pool.workers[i], &attr, threadpool_worker, (void*)(uintptr_t)i)) {
+			/* Go on with the workers we have */
+			break;
+		}
+		pool.nb_workers++;
+	}
+	pthread_attr_destroy(&attr);
+	pool.started = 1;
+
+	ret = 0;
+err:
+	return ret;
+}
+
+/* Stop the worker threads, must be called with the pool locked and not busy */
+static void threadpool_stop(void) {
+	uint32_t i, nb_workers = pool.nb_workers;
+
+	if (!pool.started) {
+		return;
+	}
+	pool.shutdown = 1;
+	pool.busy = 1;
+	pthread_cond_broadcast(&pool.work_cond);
+	pthread_mutex_unlock(&pool.lock);
+	for (i = 0; i < nb_workers; i++) {
+		pthread_join(pool.workers[i], NULL);
+	}
+	pthread_mutex_lock(&pool.lock);
+	pool.nb_workers = 0;
+	pool.started = 0;
+	pool.busy = 0;
+}
+
+int parallel_for(uint32_t nb_tasks, parallel_task_fn fn, void *arg) {
+	int ret = -1;
+	uint32_t task;
+
+	pthread_mutex_lock(&pool.lock);
+	if ((!pool.busy) && (!pool.started)) {
+		/* On failure, we fall back to the sequential loop */
+		threadpool_start();
+	}
+	if (pool.busy || (pool.nb_workers == 0) || (nb_tasks <= 1)) {
+		/* Nothing to share, or the pool is used by another thread:
+		 * run the tasks in the calling thread */
+		pthread_mutex_unlock(&pool.lock);
+		for (task = 0; task < nb_tasks; task++) {
+			ret = fn(arg, task);
+			ERR(ret, err);
+		}
+		ret = 0;
+		goto err;
+	}
+
+	pool.busy = 1;
+	pool.fn = fn;
+	pool.arg = arg;
+	pool.nb_tasks = nb_tasks;
+	pool.next_task = 0;
+	pool.pending = nb_tasks;
+	pool.error = 0;
+	pool.ws = workspace_current();
+	pool.generation++;
+	pthread_cond_broadcast(&pool.work_cond);
+	/* The calling thread also takes its share */
+	threadpool_run_tasks();
+	while (pool.pending != 0) {
+		pthread_cond_wait(&pool.done_cond, &pool.lock);
+	}
+	ret = pool.error;
+	pool.fn = NULL;
+	pool.arg = NULL;
+	pool.ws = NULL;
+	pool.busy = 0;
+	pthread_mutex_unlock(&pool.lock);
+
+err:
+	return ret;
+}
+
+int crypto_sign_set_nb_threads(uint32_t nb_threads) {
+	int ret = -1;
+
+	if (nb_threads > PARALLEL_REPETITIONS_MAX_THREADS) {
+		goto err;
+	}
+	pthread_mutex_lock(&pool.lock);
+	if (pool.busy) {
+		pthread_mutex_unlock(&pool.lock);
+		goto err;
+	}
+	threadpool_stop();
+	pool.nb_threads = nb_threads;
+	pthread_mutex_unlock(&pool.lock);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+uint32_t crypto_sign_get_nb_threads(void) {
+	uint32_t nb_threads;
+
+	pthread_mutex_lock(&pool.lock);
+	if (pool.nb_threads == 0) {
+		pool.nb_threads = threadpool_default_nb_threads();
+	}
+	nb_threads = pool.nb_threads;
+	pthread_mutex_unlock(&pool.lock);
+
+	return nb_threads;
+}
+
+void crypto_sign_threads_release(void) {
+	pthread_mutex_lock(&pool.lock);
+	if (!pool.busy) {
+		threadpool_stop();
+	}
+	pthread_mutex_unlock(&pool.lock);
+}
+
+#else
+/* No worker pool: the tasks are run sequentially */
+int parallel_for(uint32_t nb_tasks, parallel_task_fn fn, void *arg) {
+	int ret = -1;
+	uint32_t task;
+
+	for (task = 0; task < nb_tasks; task++) {
+		ret = fn(arg, task);
+		ERR(ret, err);
+	}
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int crypto_sign_set_nb_threads(uint32_t nb_threads) {
+	(void)nb_threads;
+	return 0;
+}
+
+uint32_t crypto_sign_get_nb_threads(void) {
+	return 1;
+}
+
+void crypto_sign_threads_release(void) {
+	return;
+}
+#endif
@@ -0,0 +1,63 @@
+#ifndef __THREADPOOL_H__
+#define __THREADPOOL_H__
+
+#include "common.h"
+
+#if defined(PARALLEL_REPETITIONS) && !defined(USE_PTHREADS)
+#error "PARALLEL_REPETITIONS needs USE_PTHREADS"
+#endif
+
+/* Deal with namespacing */
+#define parallel_for MQOM_NAMESPACE(parallel_for)
+#define crypto_sign_set_nb_threads MQOM_PUBLIC_API_NAMESPACE(crypto_sign_set_nb_threads)
+#define crypto_sign_get_nb_threads MQOM_PUBLIC_API_NAMESPACE(crypto_sign_get_nb_threads)
+#define crypto_sign_threads_release MQOM_PUBLIC_API_NAMESPACE(crypto_sign_threads_release)
+
+/* A task of a parallel loop: must only write to outputs that are
+ * specific to the task index so that the result does not depend on
+ * the scheduling */
+typedef int (*parallel_task_fn)(void *arg, uint32_t task);
+
+/* Run the tasks 0 ... nb_tasks - 1, spread over the worker pool when
+ * PARALLEL_REPETITIONS is set and sequentially otherwise (or when the pool
+ * is already busy with another call).
+ * Returns 0 when all the tasks succeeded and -1 otherwise */
+int parallel_for(uint32_t nb_tasks, parallel_task_fn fn, void *arg);
+
+/*************************************************
+* Name:        crypto_sign_set_nb_threads
+*
+* Description: Sets the number of threads (including the calling one)
+*              used to compute the tau repetitions. 0 restores the
+*              default: the MQOM2_NB_THREADS environment variable when
+*              set, and the number of online CPUs otherwise. The worker
+*              threads are (re)created on the next signature or verification
+*              and are reused between calls.
+*              No-op when the library is not built with PARALLEL_REPETITIONS.
+*
+* Arguments:   - uint32_t nb_threads: number of threads
+*
+* Returns 0 (success) and -1 otherwise
+**************************************************/
+int crypto_sign_set_nb_threads(uint32_t nb_threads);
+
+/*************************************************
+* Name:        crypto_sign_get_nb_threads
+*
+* Description: Gets the number of threads used to compute the
+*              tau repetitions (1 without PARALLEL_REPETITIONS).
+*
+* Returns the number of threads
+**************************************************/
+uint32_t crypto_sign_get_nb_threads(void);
+
+/*************************************************
+* Name:        crypto_sign_threads_release
+*
+* Description: Stops and joins the worker threads. The pool is
+*              transparently restarted by the next signature or
+*              verification.
+**************************************************/
+void crypto_sign_threads_release(void);
+
+#endif /* __THREADPOOL_H__ */
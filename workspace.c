@@ -0,0 +1,223 @@
+#include "workspace.h"
+#include "prg.h"
+#include "blc_common.h"
+
+/* The attached workspace is thread specific, including when the library does
+ * not spawn threads itself (USE_PTHREADS not set): the callers may still sign
+ * and verify concurrently, e.g. with one workspace per thread */
+#if defined(MQOM2_FOR_MUPQ)
+/* Single threaded embedded targets */
+#define WORKSPACE_TLS
+#elif defined(_MSC_VER)
+#define WORKSPACE_TLS __declspec(thread)
+#else
+#define WORKSPACE_TLS __thread
+#endif
+
+static WORKSPACE_TLS workspace_t *current_ws = NULL;
+static WORKSPACE_TLS workspace_arena_t *current_arena = NULL;
+
+/**** Sizes of the temporary buffers of sign and verify *********/
+#define WS_MAX(a, b) (((a) > (b)) ? (a) : (b))
+
+/* PRG key schedule cache covering n_bytes of PRG output (see prg_cache.h) */
+#ifdef USE_PRG_CACHE
+#define PRG_CACHE_WS_SIZE(type, n_bytes) WORKSPACE_CHUNK(CEIL((n_bytes), MQOM2_PARAM_SEED_SIZE) * sizeof(type))
+#else
+#define PRG_CACHE_WS_SIZE(type, n_bytes) ((size_t)0)
+#endif
+
+/* PRG output for the expansion of one MQ equation (see expand_mq.c) */
+#define EXPAND_MQ_NB_BYTES (((MQOM2_PARAM_MQ_N + (MQOM2_PARAM_MQ_N * (MQOM2_PARAM_MQ_N + 1) / 2)) * FIELD_EXT_LOG2_CARD) / 8)
+
+/* The PRG caches of BLC_Commit and BLC_Eval, one repetition (group) at a time */
+static size_t workspace_blc_size(void) {
+	size_t size = 0;
+
+#if !defined(NO_BLC_PRG_CACHE)
+#if defined(MEMORY_EFFICIENT_BLC)
+	size = WS_MAX(PRG_CACHE_WS_SIZE(prg_key_sched_cache, PRG_BLC_SIZE), PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub, PRG_BLC_SIZE));
+#if defined(BLC_INTERNAL_X2) || defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_x2, PRG_BLC_SIZE));
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub_x2, PRG_BLC_SIZE));
+#endif
+#if defined(BLC_INTERNAL_X4) || defined(BLC_INTERNAL_X8)
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_x4, PRG_BLC_SIZE));
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub_x4, PRG_BLC_SIZE));
+#endif
+#if defined(BLC_INTERNAL_X8)
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_x8, PRG_BLC_SIZE));
+	size = WS_MAX(size, PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub_x8, PRG_BLC_SIZE));
+#endif
+#else
+	size = WS_MAX(PRG_CACHE_WS_SIZE(prg_key_sched_cache_x8, PRG_BLC_SIZE), PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub_x8, PRG_BLC_SIZE));
+#endif
+#endif
+
+	return size;
+}
+
+/* The expanded equations of ComputePAlpha and RecomputePAlpha */
+static size_t workspace_piop_size(void) {
+	size_t expand = 0;
+
+#ifndef NO_EXPANDMQ_PRG_CACHE
+	expand = PRG_CACHE_WS_SIZE(prg_key_sched_cache_pub, EXPAND_MQ_NB_BYTES);
+#endif
+#if defined(PIOP_BITSLICE) || defined(MEMORY_EFFICIENT_PIOP)
+	/* The equations are expanded row by row */
+	return expand;
+#else
+	expand += WORKSPACE_CHUNK(EXPAND_MQ_NB_BYTES);
+	return WORKSPACE_CHUNK((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * MQOM2_PARAM_MQ_N * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt)) +
+	       WORKSPACE_CHUNK((MQOM2_PARAM_MQ_M / MQOM2_PARAM_MU) * FIELD_EXT_PACKING(MQOM2_PARAM_MQ_N) * sizeof(field_ext_elt)) +
+	       expand;
+#endif
+}
+
+/* Only the BLC_Commit and BLC_Eval tasks allocate in the worker threads */
+static size_t workspace_task_arena_size(void) {
+#if defined(PARALLEL_REPETITIONS) && !defined(MEMORY_EFFICIENT_BLC)
+	return workspace_blc_size();
+#else
+	return 0;
+#endif
+}
+
+static uint32_t workspace_nb_task_arenas(uint32_t nb_threads) {
+	return ((workspace_task_arena_size() != 0) && (nb_threads > 1)) ? (nb_threads - 1) : 0;
+}
+
+size_t workspace_size(uint32_t nb_threads) {
+	uint32_t nb_task_arenas = workspace_nb_task_arenas(nb_threads);
+
+	/* The caller's buffer is not necessarily aligned */
+	return (WORKSPACE_ALIGN - 1) + WORKSPACE_CHUNK(sizeof(workspace_t)) +
+	       WORKSPACE_CHUNK(nb_task_arenas * sizeof(workspace_arena_t)) +
+	       WS_MAX(workspace_blc_size(), workspace_piop_size()) +
+	       (nb_task_arenas * workspace_task_arena_size());
+}
+
+/**** Attach and detach *********/
+static void workspace_arena_init(workspace_arena_t *arena, uint8_t *base, size_t size) {
+	arena->base = base;
+	arena->size = size;
+	arena->used = 0;
+	arena->peak = 0;
+}
+
+int workspace_attach(void *buf, size_t len, uint32_t nb_threads) {
+	int ret = -1;
+	uint32_t i, nb_task_arenas = workspace_nb_task_arenas(nb_threads);
+	size_t task_size = workspace_task_arena_size();
+	uint8_t *ptr;
+	workspace_t *ws;
+
+	if ((buf == NULL) || (current_ws != NULL) || (len < workspace_size(nb_threads))) {
+		goto err;
+	}
+	ptr = (uint8_t*)buf + ((WORKSPACE_ALIGN - ((uintptr_t)buf % WORKSPACE_ALIGN)) % WORKSPACE_ALIGN);
+	ws = (workspace_t*)ptr;
+	ptr += WORKSPACE_CHUNK(sizeof(workspace_t));
+	ws->nb_task_arenas = nb_task_arenas;
+	ws->task = (workspace_arena_t*)ptr;
+	ptr += WORKSPACE_CHUNK(nb_task_arenas * sizeof(workspace_arena_t));
+	workspace_arena_init(&ws->main, ptr, WS_MAX(workspace_blc_size(), workspace_piop_size()));
+	ptr += ws->main.size;
+	for (i = 0; i < nb_task_arenas; i++) {
+		workspace_arena_init(&ws->task[i], ptr, task_size);
+		ptr += task_size;
+	}
+	current_ws = ws;
+	current_arena = &ws->main;
+
+	ret = 0;
+err:
+	return ret;
+}
+
+void workspace_detach(void) {
+	uint32_t i;
+	workspace_t *ws = current_ws;
+
+	if (ws == NULL) {
+		return;
+	}
+	/* Wipe what has been used: the task arenas are not in use anymore
+	 * since parallel_for waits for all its tasks */
+	mqom_cleanse(ws->main.base, ws->main.peak);
+	for (i = 0; i < ws->nb_task_arenas; i++) {
+		mqom_cleanse(ws->task[i].base, ws->task[i].peak);
+	}
+	mqom_cleanse(ws->task, ws->nb_task_arenas * sizeof(workspace_arena_t));
+	mqom_cleanse(ws, sizeof(workspace_t));
+	current_ws = NULL;
+	current_arena = NULL;
+}
+
+workspace_t *workspace_current(void) {
+	return current_ws;
+}
+
+void workspace_task_enter(workspace_t *ws, uint32_t index) {
+	current_ws = ws;
+	/* Without an arena for this worker, the allocations fail (the PRG caches
+	 * are then simply not used) rather than silently falling back to the heap */
+	current_arena = ((ws != NULL) && (index < ws->nb_task_arenas)) ? &ws->task[index] : NULL;
+}
+
+void workspace_task_leave(void) {
+	current_ws = NULL;
+	current_arena = NULL;
+}
+
+/**** Allocations *********/
+void *workspace_malloc(size_t size) {
+	void *ptr = NULL;
+	workspace_arena_t *arena = current_arena;
+
+	if (current_ws == NULL) {
+		return mqom_malloc(size);
+	}
+	if ((arena == NULL) || (WORKSPACE_CHUNK(size) > (arena->size - arena->used))) {
+		goto err;
+	}
+	ptr = arena->base + arena->used;
+	arena->used += WORKSPACE_CHUNK(size);
+	if (arena->used > arena->peak) {
+		arena->peak = arena->used;
+	}
+err:
+	return ptr;
+}
+
+void *workspace_calloc(size_t nmemb, size_t size) {
+	void *ptr;
+
+	if (current_ws == NULL) {
+		return mqom_calloc(nmemb, size);
+	}
+	ptr = workspace_malloc(nmemb * size);
+	if (ptr != NULL) {
+		memset(ptr, 0, nmemb * size);
+	}
+	return ptr;
+}
+
+void workspace_free(void *ptr, size_t len) {
+	workspace_arena_t *arena = current_arena;
+
+	if (ptr == NULL) {
+		return;
+	}
+	if ((current_ws == NULL) || (arena == NULL) || ((uint8_t*)ptr < arena->base) || ((uint8_t*)ptr >= (arena->base + arena->size))) {
+		/* Not carved from the workspace */
+		mqom_free(ptr, len);
+		return;
+	}
+	/* Only the last chunk is given back: the space of the others is
+	 * reclaimed by the detach */
+	if (((uint8_t*)ptr + WORKSPACE_CHUNK(len)) == (arena->base + arena->used)) {
+		arena->used -= WORKSPACE_CHUNK(len);
+	}
+}
@@ -0,0 +1,68 @@
+#ifndef __WORKSPACE_H__
+#define __WORKSPACE_H__
+
+#include "common.h"
+
+/* Deal with namespacing */
+#define workspace_size MQOM_NAMESPACE(workspace_size)
+#define workspace_attach MQOM_NAMESPACE(workspace_attach)
+#define workspace_detach MQOM_NAMESPACE(workspace_detach)
+#define workspace_current MQOM_NAMESPACE(workspace_current)
+#define workspace_task_enter MQOM_NAMESPACE(workspace_task_enter)
+#define workspace_task_leave MQOM_NAMESPACE(workspace_task_leave)
+#define workspace_malloc MQOM_NAMESPACE(workspace_malloc)
+#define workspace_calloc MQOM_NAMESPACE(workspace_calloc)
+#define workspace_free MQOM_NAMESPACE(workspace_free)
+
+/* The chunks carved from a workspace are aligned on a cache line */
+#define WORKSPACE_ALIGN 64
+#define WORKSPACE_CHUNK(len) ((((size_t)(len)) + WORKSPACE_ALIGN - 1) & ~((size_t)WORKSPACE_ALIGN - 1))
+
+/* A bump allocator over a slice of the caller's buffer: the chunks are
+ * released in LIFO order (the release of any other chunk is deferred to
+ * the detach), and the high water mark is tracked to only wipe what has
+ * been used */
+typedef struct {
+	uint8_t *base;
+	size_t size;
+	size_t used;
+	size_t peak;
+} workspace_arena_t;
+
+/* The workspace header, stored at the beginning of the caller's buffer: the
+ * arena of the calling thread, followed by the arenas of the worker threads
+ * running the tasks of parallel_for (see threadpool.c) */
+typedef struct {
+	workspace_arena_t main;
+	uint32_t nb_task_arenas;
+	workspace_arena_t *task;
+} workspace_t;
+
+/* Size in bytes of a workspace for sign and verify with nb_threads threads
+ * (including the calling one) */
+size_t workspace_size(uint32_t nb_threads);
+
+/* Attach (resp. detach) a caller's buffer to the calling thread: until the
+ * detach, the workspace_* allocations of the thread and of the tasks it spreads
+ * over the worker pool are carved from the buffer. The detach wipes the used
+ * part of the buffer.
+ * workspace_attach returns -1 when the buffer is too small for nb_threads */
+int workspace_attach(void *buf, size_t len, uint32_t nb_threads);
+void workspace_detach(void);
+
+/* Workspace attached to the calling thread, NULL if none */
+workspace_t *workspace_current(void);
+
+/* Make a worker thread of the pool allocate from the task arena
+ * index of ws (no-op when ws is NULL) */
+void workspace_task_enter(workspace_t *ws, uint32_t index);
+void workspace_task_leave(void);
+
+/* Drop-in replacements of mqom_malloc, mqom_calloc and mqom_free for the
+ * temporary buffers of sign and verify: they fall back to the heap when
+ * no workspace is attached to the calling thread */
+void *workspace_malloc(size_t size);
+void *workspace_calloc(size_t nmemb, size_t size);
+void workspace_free(void *ptr, size_t len);
+
+#endif /* __WORKSPACE_H__ */
@@ -110,4 +110,57 @@ void xof_clean_ctx_x4(xof_context_x4 *ctx) {
 	_XOF_Release_x4(&(ctx->ctx));
 }
 
+int xof_init_x8(xof_context_x8 *ctx) {
+	int ret = -1;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	ctx->xof_finalized = 0;
+	ret = _XOF_Init_x8(&(ctx->ctx));
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int xof_update_x8(xof_context_x8 *ctx, const uint8_t *data[8], size_t byte_len) {
+	int ret = -1;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	ret = _XOF_Update_x8(&(ctx->ctx), data, byte_len << 3);
+	ERR(ret, err);
+
+	ret = 0;
+err:
+	return ret;
+}
+
+int xof_squeeze_x8(xof_context_x8 *ctx, uint8_t *out[8], uint32_t byte_len) {
+	int ret = -1;
+
+	if (ctx == NULL) {
+		goto err;
+	}
+	/* NOTE: we transparently finalize the XOF to avoid inapropriate
+	 * squeezing
+	 * */
+	if (ctx->xof_finalized != 1) {
+		ret = _XOF_Final_x8(&(ctx->ctx), NULL);
+		ERR(ret, err);
+		ctx->xof_finalized = 1;
+	}
+	ret = _XOF_Squeeze_x8(&(ctx->ctx), out, byte_len << 3);
+	ERR(ret, err);
 
+	ret = 0;
+err:
+	return ret;
+}
+
+void xof_clean_ctx_x8(xof_context_x8 *ctx) {
+	_XOF_Release_x8(&(ctx->ctx));
+}
@@ -11,6 +11,7 @@
 /* Include the underlying Keccak header for hash and XOF */
 #include "sha3/KeccakHash.h"
 #include "sha3/KeccakHashtimes4.h"
+#include "sha3/KeccakHashtimes8.h"
 
 /* For common helpers */
 #include "common.h"
@@ -24,24 +25,30 @@
 #if MQOM2_PARAM_SECURITY == 128
 #define _XOF_Init Keccak_HashInitialize_SHAKE128
 #define _XOF_Init_x4 Keccak_HashInitializetimes4_SHAKE128
+#define _XOF_Init_x8 Keccak_HashInitializetimes8_SHAKE128
 /* === 192 bits security === */
 #elif MQOM2_PARAM_SECURITY == 192
 #define _XOF_Init Keccak_HashInitialize_SHAKE256
 #define _XOF_Init_x4 Keccak_HashInitializetimes4_SHAKE256
+#define _XOF_Init_x8 Keccak_HashInitializetimes8_SHAKE256
 /* === 256 bits security === */
 #elif MQOM2_PARAM_SECURITY == 256
 #define _XOF_Init Keccak_HashInitialize_SHAKE256
 #define _XOF_Init_x4 Keccak_HashInitializetimes4_SHAKE256
+#define _XOF_Init_x8 Keccak_HashInitializetimes8_SHAKE256
 #else
 #error "No XOF implementation for this security level"
 #endif
 /* Common defines for XOF */
 #define _XOF_Update Keccak_HashUpdate
 #define _XOF_Update_x4 Keccak_HashUpdatetimes4
+#define _XOF_Update_x8 Keccak_HashUpdatetimes8
 #define _XOF_Final Keccak_HashFinal
 #define _XOF_Final_x4 Keccak_HashFinaltimes4
+#define _XOF_Final_x8 Keccak_HashFinaltimes8
 #define _XOF_Squeeze Keccak_HashSqueeze
 #define _XOF_Squeeze_x4 Keccak_HashSqueezetimes4
+#define _XOF_Squeeze_x8 Keccak_HashSqueezetimes8
 static inline void _XOF_Release(Keccak_HashInstance *ctx) {
 	(void)ctx;
 	return;
@@ -50,6 +57,10 @@ static inline void _XOF_Release_x4(Keccak_HashInstancetimes4 *ctx) {
 	(void)ctx;
 	return;
 }
+static inline void _XOF_Release_x8(Keccak_HashInstancetimes8 *ctx) {
+	(void)ctx;
+	return;
+}
 
 /*************************************/
 /********** MUPQ API *****************/
@@ -92,6 +103,10 @@ typedef struct {
 	Keccak_HashInstance ctx[4];
 } Keccak_HashInstancetimes4;
 
+typedef struct {
+	Keccak_HashInstance ctx[8];
+} Keccak_HashInstancetimes8;
+
 /**/
 static inline int _XOF_Init(Keccak_HashInstance *ctx) {
 	__XOF_Init(ctx);
@@ -104,6 +119,13 @@ static inline int _XOF_Init_x4(Keccak_HashInstancetimes4 *ctx) {
 	}
 	return 0;
 }
+static inline int _XOF_Init_x8(Keccak_HashInstancetimes8 *ctx) {
+	unsigned int i;
+	for (i = 0; i < 8; i++) {
+		__XOF_Init(&ctx->ctx[i]);
+	}
+	return 0;
+}
 /**/
 static inline int _XOF_Update(Keccak_HashInstance *ctx, const uint8_t* data, size_t byte_len) {
 	__XOF_Update(ctx, data, byte_len >> 3);
@@ -116,6 +138,13 @@ static inline int _XOF_Update_x4(Keccak_HashInstancetimes4 *ctx, const uint8_t *
 	}
 	return 0;
 }
+static inline int _XOF_Update_x8(Keccak_HashInstancetimes8 *ctx, const uint8_t *data[8], size_t byte_len) {
+	unsigned int i;
+	for (i = 0; i < 8; i++) {
+		__XOF_Update(&ctx->ctx[i], data[i], byte_len >> 3);
+	}
+	return 0;
+}
 /**/
 static inline int _XOF_Squeeze(Keccak_HashInstance *ctx, uint8_t* data, size_t byte_len) {
 	__XOF_Squeeze(data, byte_len >> 3, ctx);
@@ -128,6 +157,13 @@ static inline int _XOF_Squeeze_x4(Keccak_HashInstancetimes4 *ctx, uint8_t *data[
 	}
 	return 0;
 }
+static inline int _XOF_Squeeze_x8(Keccak_HashInstancetimes8 *ctx, uint8_t *data[8], size_t byte_len) {
+	unsigned int i;
+	for (i = 0; i < 8; i++) {
+		__XOF_Squeeze(data[i], byte_len >> 3, &ctx->ctx[i]);
+	}
+	return 0;
+}
 /**/
 static inline int _XOF_Final(Keccak_HashInstance *ctx, const uint8_t* dummy) {
 	(void)dummy;
@@ -142,6 +178,14 @@ static inline int _XOF_Final_x4(Keccak_HashInstancetimes4 *ctx, const uint8_t* d
 	}
 	return 0;
 }
+static inline int _XOF_Final_x8(Keccak_HashInstancetimes8 *ctx, const uint8_t* dummy) {
+	unsigned int i;
+	(void)dummy;
+	for (i = 0; i < 8; i++) {
+		__XOF_Final(&ctx->ctx[i]);
+	}
+	return 0;
+}
 static inline void _XOF_Release(Keccak_HashInstance *ctx) {
 	(void)ctx;
 	return;
@@ -150,6 +194,10 @@ static inline void _XOF_Release_x4(Keccak_HashInstancetimes4 *ctx) {
 	(void)ctx;
 	return;
 }
+static inline void _XOF_Release_x8(Keccak_HashInstancetimes8 *ctx) {
+	(void)ctx;
+	return;
+}
 
 /***************************************/
 /********** libOQS API *****************/
@@ -333,6 +381,45 @@ static inline void _XOF_Release_x4(Keccak_HashInstancetimes4 *ctx) {
 	return;
 }
 
+/* liboqs only provides x4 SHAKE instances: the x8 instance is made of two of them */
+typedef struct {
+	Keccak_HashInstancetimes4 ctx[2];
+} Keccak_HashInstancetimes8;
+static inline int _XOF_Init_x8(Keccak_HashInstancetimes8 *ctx) {
+	if (ctx == NULL) {
+		return -1;
+	}
+	if (_XOF_Init_x4(&(ctx->ctx[0])) || _XOF_Init_x4(&(ctx->ctx[1]))) {
+		return -1;
+	}
+	return 0;
+}
+static inline int _XOF_Update_x8(Keccak_HashInstancetimes8 *ctx, const uint8_t *data[8], size_t byte_len) {
+	if ((ctx == NULL) || _XOF_Update_x4(&(ctx->ctx[0]), &data[0], byte_len) || _XOF_Update_x4(&(ctx->ctx[1]), &data[4], byte_len)) {
+		return -1;
+	}
+	return 0;
+}
+static inline int _XOF_Squeeze_x8(Keccak_HashInstancetimes8 *ctx, uint8_t *data[8], size_t byte_len) {
+	if ((ctx == NULL) || _XOF_Squeeze_x4(&(ctx->ctx[0]), &data[0], byte_len) || _XOF_Squeeze_x4(&(ctx->ctx[1]), &data[4], byte_len)) {
+		return -1;
+	}
+	return 0;
+}
+static inline int _XOF_Final_x8(Keccak_HashInstancetimes8 *ctx, const uint8_t* dummy) {
+	if ((ctx == NULL) || _XOF_Final_x4(&(ctx->ctx[0]), dummy) || _XOF_Final_x4(&(ctx->ctx[1]), dummy)) {
+		return -1;
+	}
+	return 0;
+}
+static inline void _XOF_Release_x8(Keccak_HashInstancetimes8 *ctx) {
+	if (ctx != NULL) {
+		_XOF_Release_x4(&(ctx->ctx[0]));
+		_XOF_Release_x4(&(ctx->ctx[1]));
+	}
+	return;
+}
+
 #endif
 
 /* Deal with namespacing */
@@ -344,6 +431,10 @@ static inline void _XOF_Release_x4(Keccak_HashInstancetimes4 *ctx) {
 #define xof_update_x4 MQOM_NAMESPACE(xof_update_x4)
 #define xof_squeeze_x4 MQOM_NAMESPACE(xof_squeeze_x4)
 #define xof_clean_ctx_x4 MQOM_NAMESPACE(xof_clean_ctx_x4)
+#define xof_init_x8 MQOM_NAMESPACE(xof_init_x8)
+#define xof_update_x8 MQOM_NAMESPACE(xof_update_x8)
+#define xof_squeeze_x8 MQOM_NAMESPACE(xof_squeeze_x8)
+#define xof_clean_ctx_x8 MQOM_NAMESPACE(xof_clean_ctx_x8)
 
 /* Hash and XOF contexts are simply Keccak instances, with XOF finalization state
  * for XOF
@@ -359,7 +450,13 @@ typedef struct {
 	Keccak_HashInstancetimes4 ctx;
 } xof_context_x4;
 
-/* Exported API for XOF, simple and x4 */
+/* x8 (8 times) context */
+typedef struct {
+	uint8_t xof_finalized;
+	Keccak_HashInstancetimes8 ctx;
+} xof_context_x8;
+
+/* Exported API for XOF, simple, x4 and x8 */
 int xof_init(xof_context *ctx);
 int xof_update(xof_context *ctx, const uint8_t *data, size_t byte_len);
 int xof_squeeze(xof_context *ctx, uint8_t *out, uint32_t byte_len);
@@ -370,4 +467,9 @@ int xof_update_x4(xof_context_x4 *ctx, const uint8_t *data[4], size_t byte_len);
 int xof_squeeze_x4(xof_context_x4 *ctx, uint8_t *out[4], uint32_t byte_len);
 void xof_clean_ctx_x4(xof_context_x4 *ctx);
 
+int xof_init_x8(xof_context_x8 *ctx);
+int xof_update_x8(xof_context_x8 *ctx, const uint8_t *data[8], size_t byte_len);
+int xof_squeeze_x8(xof_context_x8 *ctx, uint8_t *out[8], uint32_t byte_len);
+void xof_clean_ctx_x8(xof_context_x8 *ctx);
+
 #endif /* __HASH_XOF_H__ */